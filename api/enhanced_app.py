@@ -105,6 +105,8 @@ async def lifespan(app: FastAPI):
     finally:
         # Cleanup
         logger.info("Shutting down Algosat API consumer service")
+        if security_manager:
+            await security_manager.close()
         # if vps_optimizer:
         #     await vps_optimizer.stop()
 
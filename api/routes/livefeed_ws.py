@@ -1,6 +1,7 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
 from starlette.websockets import WebSocketState
 from algosat.brokers.fyers import FyersWrapper
+from algosat.core.tick_bus import FyersTickSource, get_tick_bus
 import asyncio
 import logging
 from jose import jwt, JWTError
@@ -50,10 +51,14 @@ fyers_feed_task = None
 fyers_connection_lock = asyncio.Lock()
 fyers_wrapper_instance = FyersWrapper()
 
+DASHBOARD_FEED_OWNER = "dashboard"
+DASHBOARD_SYMBOLS = ['NSE:NIFTY50-INDEX', 'NSE:NIFTYBANK-INDEX', 'NSE:INDIAVIX-INDEX']
+
 async def fyers_live_feed_loop():
     """
-    A single, long-running task that connects to the Fyers WebSocket,
-    subscribes to symbols, and broadcasts data to all connected clients.
+    A single, long-running task that subscribes the dashboard symbols on the shared tick bus
+    (starting the bus on a Fyers socket if nothing else has) and broadcasts its messages
+    to all connected clients.
     This loop will shut down when the last client disconnects or when markets are closed.
     """
     global fyers_feed_task
@@ -94,40 +99,28 @@ async def fyers_live_feed_loop():
             logger.info("[FyersFeedLoop] Markets still closed after wait. Terminating.")
             return
 
+    tick_bus = get_tick_bus()
+    owns_bus = False
+    queue = None
     try:
-        login_success = await fyers_wrapper_instance.login()
-        if not login_success:
-            logger.error("[FyersFeedLoop] Fyers login failed. Aborting loop.")
-            await manager.broadcast({"error": "Data provider login failed."})
+        if not tick_bus.running:
+            login_success = await fyers_wrapper_instance.login()
+            if not login_success:
+                logger.error("[FyersFeedLoop] Fyers login failed. Aborting loop.")
+                await manager.broadcast({"error": "Data provider login failed."})
+                return
+            tick_bus.attach_source(FyersTickSource(fyers_wrapper_instance))
+            await tick_bus.start()
+            owns_bus = True
+        elif tick_bus.broker_name != "fyers":
+            logger.error(f"[FyersFeedLoop] Tick bus is running on {tick_bus.broker_name}, not Fyers. Aborting loop.")
+            await manager.broadcast({"error": "Live feed unavailable for the current data provider."})
             return
 
-        queue = asyncio.Queue()
-        loop = asyncio.get_running_loop()
-
-        def on_message(msg):
-            loop.call_soon_threadsafe(queue.put_nowait, msg)
-
-        def on_error(msg):
-            logger.error(f"[FyersFeedLoop] Fyers WS error: {msg}")
-            loop.call_soon_threadsafe(queue.put_nowait, {"error": "Fyers WS Error", "details": msg})
-
-        def on_close(msg):
-            logger.info(f"[FyersFeedLoop] Fyers WS closed: {msg}")
-            fyers_wrapper_instance.ws_connected = False
-            loop.call_soon_threadsafe(queue.put_nowait, {"event": "close"})
-
-        def on_connect():
-            logger.info("[FyersFeedLoop] Fyers WS connected. Subscribing...")
-            fyers_wrapper_instance.ws_connected = True
-            symbols = ['NSE:NIFTY50-INDEX', 'NSE:NIFTYBANK-INDEX', 'NSE:INDIAVIX-INDEX']
-            data_type = "SymbolUpdate"
-            fyers_wrapper_instance.subscribe_websocket(symbols, data_type=data_type)
-
-        fyers_wrapper_instance.init_websocket(
-            on_connect=on_connect, on_message=on_message, on_error=on_error, on_close=on_close
-        )
-        fyers_wrapper_instance.connect_websocket()
-        logger.info("[FyersFeedLoop] Fyers WebSocket connection process initiated.")
+        # Fan out from the shared tick bus instead of opening a second Fyers socket
+        queue = tick_bus.listen()
+        tick_bus.set_interest(DASHBOARD_FEED_OWNER, DASHBOARD_SYMBOLS)
+        logger.info("[FyersFeedLoop] Subscribed dashboard symbols on the tick bus.")
 
         # Send market open status to clients
         market_status = get_market_status()
@@ -165,9 +158,9 @@ async def fyers_live_feed_loop():
             
             try:
                 msg = await asyncio.wait_for(queue.get(), timeout=1.0)
-                if msg.get("event") == "close":
-                    logger.warning("[FyersFeedLoop] Received close event. Exiting.")
-                    break
+                # The bus carries every subscribed symbol; clients only get the dashboard ones
+                if isinstance(msg, dict) and msg.get("symbol") and msg.get("symbol") not in DASHBOARD_SYMBOLS:
+                    continue
                 await manager.broadcast(msg)
             except asyncio.TimeoutError:
                 continue
@@ -175,11 +168,15 @@ async def fyers_live_feed_loop():
     except Exception as e:
         logger.error(f"[FyersFeedLoop] An exception occurred in the feed loop: {e}", exc_info=True)
     finally:
-        logger.info("[FyersFeedLoop] Cleaning up Fyers connection.")
-        try:
-            fyers_wrapper_instance.close_websocket()
-        except Exception as e:
-            logger.error(f"[FyersFeedLoop] Error closing Fyers websocket: {e}")
+        logger.info("[FyersFeedLoop] Leaving the tick bus.")
+        if queue is not None:
+            tick_bus.unlisten(queue)
+        tick_bus.set_interest(DASHBOARD_FEED_OWNER, [])
+        if owns_bus and not tick_bus.desired_symbols():
+            try:
+                await tick_bus.stop()
+            except Exception as e:
+                logger.error(f"[FyersFeedLoop] Error stopping tick bus: {e}")
         
         async with fyers_connection_lock:
             fyers_feed_task = None
@@ -17,7 +17,8 @@ from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from algosat.common.logger import get_logger
+from algosat.common.logger import get_logger, get_logging_stats
+from algosat.core.log_index import LogIndex, parse_record
 from ..auth_dependencies import get_current_user
 
 logger = get_logger("api.logs")
@@ -26,6 +27,8 @@ router = APIRouter()
 
 # Constants
 LOGS_BASE_DIR = Path("/opt/algosat/logs")
+# Sidecar indexes live outside LOGS_BASE_DIR so the log file scanners never see them
+LOG_INDEX_DIR = LOGS_BASE_DIR.parent / "log_index"
 MAX_LOG_RETENTION_DAYS = 30  # Extended from 7 to 30 days
 LOG_PATTERNS = {
     "rollover": r"(api|algosat|broker_monitor)-(\d{4}-\d{2}-\d{2})\.log\.(\d+)",  # Proper numeric rollover
@@ -42,6 +45,8 @@ LOG_TYPE_MAPPINGS = {
     "broker-monitor": "broker-monitor",  # Keep UI name consistent
 }
 
+log_index = LogIndex(LOG_INDEX_DIR, LOGS_BASE_DIR)
+
 # In-memory store for streaming sessions (in production, use Redis or similar)
 STREAMING_SESSIONS: Dict[str, Dict[str, Any]] = {}
 
@@ -80,23 +85,10 @@ class LogStreamResponse(BaseModel):
 def parse_log_line(line: str) -> Optional[LogEntry]:
     """Parse a single log line into structured data"""
     try:
-        # Pattern: 2025-06-06 05:04:43 - api.app - enhanced_app.py:64 - INFO - Starting Algosat API consumer service
-        pattern = r"(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) - ([^-]+) - ([^:]+):(\d+) - (\w+) - (.+)"
-        match = re.match(pattern, line.strip())
-        
-        if match:
-            timestamp_str, logger_name, module, line_num, level, message = match.groups()
-            timestamp = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-            
-            return LogEntry(
-                timestamp=timestamp,
-                level=level,
-                logger=logger_name.strip(),
-                module=module.strip(),
-                line=int(line_num),
-                message=message.strip(),
-                raw=line.strip()
-            )
+        # Same line format the log index parses (core.log_index.LOG_LINE_PATTERN)
+        record = parse_record(line)
+        if record is not None:
+            return LogEntry(**record._asdict())
     except Exception as e:
         logger.warning(f"Failed to parse log line: {e}")
     
@@ -300,6 +292,7 @@ async def cleanup_old_logs():
                 log_file.unlink()
                 deleted_count += 1
                 logger.info(f"Deleted old log file: {log_file.name}")
+        log_index.prune()
     except Exception as e:
         logger.error(f"Error during log cleanup: {e}")
     
@@ -500,45 +493,16 @@ async def get_log_content(
                 detail=f"No {log_type} log files found for {date}. Available types: {', '.join(available_types)}"
             )
         
-        # Read from the main log file (and rollover files if needed)
-        all_entries = []
-        
-        for log_file in sorted(target_files, key=lambda x: x.name):
-            try:
-                # Verify file still exists before trying to open
-                log_path = Path(log_file.path)
-                if not log_path.exists():
-                    logger.warning(f"Log file {log_file.path} no longer exists, skipping")
-                    continue
-                    
-                async with aiofiles.open(log_file.path, 'r') as f:
-                    async for line in f:
-                        entry = parse_log_line(line)
-                        if entry:
-                            # Apply filters
-                            if level and entry.level != level.upper():
-                                continue
-                            if search and search.lower() not in entry.message.lower():
-                                continue
-                            all_entries.append(entry)
-            except (IOError, OSError) as file_error:
-                logger.error(f"Error reading log file {log_file.path}: {file_error}")
-                # Continue with other files instead of failing completely
-                continue
-        
-        # If no entries were read from any file, return appropriate error
-        if not all_entries and target_files:
-            raise HTTPException(
-                status_code=500, 
-                detail=f"Unable to read any log files for {date}. Files may be corrupted or inaccessible."
-            )
-        
-        # Sort by timestamp (newest first)
-        all_entries.sort(key=lambda x: x.timestamp, reverse=True)
-        
-        # Apply pagination
-        total_count = len(all_entries)
-        paginated_entries = all_entries[offset:offset + limit]
+        # Only the minutes that fall on the requested page are read, via the sidecar indexes
+        records, total_count = await asyncio.to_thread(
+            log_index.query,
+            [log_file.path for log_file in target_files],
+            offset,
+            limit,
+            level,
+            search,
+        )
+        paginated_entries = [LogEntry(**record._asdict()) for record in records]
         
         return {
             "entries": paginated_entries,
@@ -751,7 +715,8 @@ async def get_log_stats(
             "retention_days": MAX_LOG_RETENTION_DAYS,
             "log_types": list(LOG_PATTERNS.keys()),
             "files_by_type": {},
-            "total_size": 0
+            "total_size": 0,
+            "pipeline": get_logging_stats()
         }
         
         for date in available_dates:
@@ -1,11 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from typing import Dict, Any, List, Optional
 
 from algosat.core.db import (
-    get_all_orders, 
+    get_orders_with_broker_executions,
+    encode_order_cursor,
     get_orders_by_symbol, 
-    get_orders_by_broker, 
-    get_orders_by_broker_and_strategy,
     get_order_by_id,
     get_broker_executions_for_order,
     # get_granular_executions_for_order,
@@ -42,10 +41,21 @@ router = APIRouter(dependencies=[Depends(get_current_user)])
 input_validator = EnhancedInputValidator()
 logger = get_logger("api.orders")
 
+# Upper bound for a single page of /orders
+ORDER_LIST_MAX_LIMIT = 1000
+
 @router.get("/", response_model=List[OrderListResponse])
 async def list_orders(
+    response: Response,
     broker_name: Optional[str] = Query(None, description="Filter orders by broker name"),
     strategy_config_id: Optional[int] = Query(None, description="Filter orders by strategy config ID"),
+    status: Optional[str] = Query(None, description="Comma-separated order statuses, e.g. OPEN,CLOSED"),
+    start_date: Optional[str] = Query(None, description="Only orders signalled on/after this date (YYYY-MM-DD, IST)"),
+    end_date: Optional[str] = Query(None, description="Only orders signalled on/before this date (YYYY-MM-DD, IST)"),
+    limit: Optional[int] = Query(None, ge=1, le=ORDER_LIST_MAX_LIMIT, description="Page size; enables keyset pagination"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated order columns to load (id, status, signal_time and parent_order_id are always included)"),
+    include_executions: bool = Query(True, description="Include broker executions for each order"),
     db=Depends(get_db), 
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
@@ -56,6 +66,10 @@ async def list_orders(
     - No filters: Returns all orders
     - broker_name only: Returns orders for specific broker
     - broker_name + strategy_config_id: Returns orders for specific broker and strategy config
+    - status / start_date / end_date: Narrow any of the above by status and signal date
+    
+    Pagination: pass limit to get one page, newest first. When more rows may follow, the
+    X-Next-Cursor response header carries the cursor for the next page.
     
     Returns basic order information including symbol, broker, status, and pricing.
     """
@@ -73,21 +87,27 @@ async def list_orders(
         if strategy_config_id:
             validated_strategy_config_id = input_validator.validate_integer(strategy_config_id, "strategy_config_id", min_value=1)
         
-        # Execute query based on filters
-        if validated_broker and validated_strategy_config_id:
-            # Filter by both broker and strategy config
-            rows = await get_orders_by_broker_and_strategy(db, validated_broker, validated_strategy_config_id)
-        elif validated_broker:
-            # Filter by broker only
-            rows = await get_orders_by_broker(db, validated_broker)
-        else:
-            # No filters - get all orders
-            rows = await get_all_orders(db)
+        statuses = _split_csv(status, "status", pattern=r"^[A-Z_]+$", transform=str.upper)
+        columns = _split_csv(fields, "fields", pattern=r"^[a-z_]+$", transform=str.lower)
+        parsed_start_date = input_validator.validate_date(start_date) if start_date else None
+        parsed_end_date = input_validator.validate_date(end_date) if end_date else None
+        
+        # One query for the orders and one for all of their broker executions
+        rows = await get_orders_with_broker_executions(
+            db,
+            broker_name=validated_broker,
+            strategy_config_id=validated_strategy_config_id,
+            statuses=statuses,
+            start_date=parsed_start_date,
+            end_date=parsed_end_date,
+            cursor=cursor,
+            limit=limit,
+            columns=columns,
+            include_executions=include_executions,
+        )
         
-        # Debug logging
-        print(f"DEBUG: rows returned from db: {len(rows) if rows else 0}")
-        if rows:
-            print(f"DEBUG: first row: {rows[0]}")
+        if limit is not None and len(rows) == limit:
+            response.headers["X-Next-Cursor"] = encode_order_cursor(rows[-1])
         
         # Add order_id field (alias for id) and compute is_hedge field for each row
         for row in rows:
@@ -95,17 +115,29 @@ async def list_orders(
             # Set is_hedge to True if parent_order_id is present, False otherwise
             row['is_hedge'] = bool(row.get('parent_order_id'))
         
-        orders = [OrderListResponse(**row) for row in rows]
-        print(f"DEBUG: orders after schema conversion: {len(orders)}")
+        # Rows are already ordered by signal_time DESC NULLS LAST, id DESC
+        return [OrderListResponse(**row) for row in rows]
         
-        return sorted(orders, key=lambda o: o.signal_time or "", reverse=True)
-        
-    except InvalidInputError as e:
+    except (InvalidInputError, ValueError) as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in list_orders: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve orders")
 
+def _split_csv(value: Optional[str], field_name: str, pattern: str, transform=None) -> Optional[List[str]]:
+    """Split and validate a comma-separated query parameter."""
+    if not value:
+        return None
+    items = []
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        if transform:
+            item = transform(item)
+        items.append(input_validator.validate_and_sanitize(item, field_name, expected_type=str, max_length=64, pattern=pattern))
+    return items or None
+
 # === Statistics Routes (Must come before /{order_id} to avoid path conflicts) ===
 
 @router.get("/pnl-stats", response_model=OrdersPnlStatsResponse)
@@ -490,17 +522,12 @@ async def get_orders_by_symbol_endpoint(
         
         if not strategy_symbol:
             # Symbol not found in strategy_symbols table
-            print(f"DEBUG: strategy symbol '{validated_symbol}' not found")
+            logger.debug(f"Strategy symbol '{validated_symbol}' not found")
             return []
         
         # Get orders by strategy_symbol_id
         rows = await get_orders_by_strategy_symbol_id(db, strategy_symbol['id'])
         
-        # Debug logging
-        print(f"DEBUG: orders for strategy_symbol_id {strategy_symbol['id']} (symbol: '{validated_symbol}'): {len(rows) if rows else 0}")
-        if rows:
-            print(f"DEBUG: first order: {rows[0]}")
-        
         # Add order_id field (alias for id) to each row
         for row in rows:
             row['order_id'] = row['id']
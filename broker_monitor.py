@@ -7,6 +7,7 @@ from algosat.core.db import (
     get_all_brokers, upsert_broker_balance_summary
 )
 from algosat.core.time_utils import get_ist_now
+from algosat.core.trading_calendar import MARKET_CLOSE, MARKET_OPEN
 from algosat.common.logger import get_logger, cleanup_logs_and_cache, clean_broker_monitor_logs
 from algosat.common.broker_utils import update_broker_status
 
@@ -23,8 +24,8 @@ def seconds_until_next_6_01am_ist():
 
 def seconds_until_next_market_open(now_ist):
     """Return seconds until next market open (9:15 IST)."""
-    market_open = now_ist.replace(hour=9, minute=15, second=0, microsecond=0)
-    if now_ist.time() < dt_time(9, 15):
+    market_open = now_ist.replace(hour=MARKET_OPEN.hour, minute=MARKET_OPEN.minute, second=0, microsecond=0)
+    if now_ist.time() < MARKET_OPEN:
         return (market_open - now_ist).total_seconds()
     # If after market close, next open is tomorrow
     market_open += timedelta(days=1)
@@ -32,9 +33,7 @@ def seconds_until_next_market_open(now_ist):
 
 def is_market_hours(now_ist):
     """Return True if now_ist is within market hours (IST 9:15 to 15:30)."""
-    market_open = dt_time(9, 15)
-    market_close = dt_time(15, 30)
-    return market_open <= now_ist.time() <= market_close
+    return MARKET_OPEN <= now_ist.time() <= MARKET_CLOSE
 
 async def serial_health_check(broker_name, broker):
     now_ist = get_ist_now()
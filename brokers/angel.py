@@ -14,6 +14,7 @@ from algosat.common.broker_utils import get_broker_credentials, upsert_broker_cr
 from algosat.common.logger import get_logger
 from typing import Dict, Any, List
 from algosat.core.time_utils import get_ist_datetime
+from algosat.core.instrument_master import get_instrument_master
 
 logger = get_logger("angel_wrapper")
 
@@ -314,8 +315,8 @@ class AngelWrapper(BrokerInterface):
             await upsert_broker_credentials(self.broker_name, full_config)
             logger.debug(f"Angel login successful for '{username}' and new tokens updated in DB.")
 
-            # Clear instruments cache after successful login to ensure fresh data
-            self.clear_instruments_cache()
+            # Instruments are not cleared here: the instrument master reloads the ScripMaster
+            # once per trading day, independently of the session
 
             return True
 
@@ -794,12 +795,14 @@ class AngelWrapper(BrokerInterface):
             pd.DataFrame: Instruments data with columns like 'symbol', 'token', 'exchange', etc.
         """
         try:
-            # Return cached data if available
-            if self._instruments_cache is not None:
+            # Return today's instruments if already loaded
+            master = get_instrument_master()
+            table = master.get("angel")
+            if table is not None:
                 logger.debug("Angel: Using cached instruments data")
-                return self._instruments_cache
+                return table.frame
             
-            logger.debug("Angel: Fetching and caching instruments data")
+            logger.debug("Angel: Loading instruments data into the instrument master")
             
             # Fetch instruments data from Angel API
             loop = asyncio.get_event_loop()
@@ -830,27 +833,29 @@ class AngelWrapper(BrokerInterface):
                 
                 return instruments_data
             
-            # Execute in thread pool to avoid blocking
-            instruments_data = await loop.run_in_executor(None, _fetch_instruments)
-            
-            # Convert to DataFrame
-            df = pd.DataFrame(instruments_data)
-            
-            # Validate DataFrame structure
-            if df.empty:
-                raise ValueError("Converted DataFrame is empty")
-            
-            logger.debug(f"Angel: Successfully fetched {len(df)} instruments")
-            
-            # Log sample of available columns for debugging
-            if not df.empty:
+            async def _load_instruments():
+                # Execute in thread pool to avoid blocking
+                instruments_data = await loop.run_in_executor(None, _fetch_instruments)
+                
+                # Convert to DataFrame
+                df = pd.DataFrame(instruments_data)
+                
+                # Validate DataFrame structure
+                if df.empty:
+                    raise ValueError("Converted DataFrame is empty")
+                
+                logger.debug(f"Angel: Successfully fetched {len(df)} instruments")
+                
+                # Log sample of available columns for debugging
                 logger.debug(f"Angel instruments columns: {list(df.columns)}")
                 logger.debug(f"Angel instruments sample: {df.head(2).to_dict('records')}")
+                return df
             
-            # Cache the DataFrame
-            self._instruments_cache = df
+            # Today's snapshot is used if present; otherwise the ScripMaster is downloaded once for the day
+            table = await master.load("angel", _load_instruments)
+            self._instruments_cache = table.frame
             
-            return df
+            return table.frame
             
         except requests.exceptions.Timeout:
             logger.error("Angel: Timeout while fetching instruments data")
@@ -871,6 +876,14 @@ class AngelWrapper(BrokerInterface):
             logger.error(f"Angel: Unexpected error fetching instruments data: {e}", exc_info=True)
             return pd.DataFrame()
     
+    async def get_instrument_table(self):
+        """
+        Today's instruments as an InstrumentTable (dict-indexed lookups by symbol, name,
+        contract and token), or None if the ScripMaster could not be loaded.
+        """
+        await self.get_instruments()
+        return get_instrument_master().get("angel")
+    
     def clear_instruments_cache(self):
         """
         Clear the cached instruments data.
@@ -878,6 +891,7 @@ class AngelWrapper(BrokerInterface):
         """
         logger.debug("Angel: Clearing instruments cache")
         self._instruments_cache = None
+        get_instrument_master().invalidate("angel")
     
     async def get_instrument_token(self, symbol: str, exchange: str = None) -> str:
         """
@@ -892,10 +906,9 @@ class AngelWrapper(BrokerInterface):
             str: Instrument token if found, None otherwise
         """
         try:
-            # Get instruments DataFrame
-            instruments_df = await self.get_instruments()
+            table = await self.get_instrument_table()
             
-            if instruments_df.empty:
+            if table is None:
                 logger.error(f"Angel: Cannot get token for {symbol} - instruments data not available")
                 return None
             
@@ -904,33 +917,18 @@ class AngelWrapper(BrokerInterface):
             if ':' in symbol:
                 sanitized_symbol = symbol.split(':', 1)[1]
             
-            # Create filter conditions
-            symbol_match = instruments_df['symbol'].str.upper() == sanitized_symbol.upper()
-            
-            # Apply exchange filter if provided
-            if exchange:
-                exchange_match = instruments_df['exch_seg'].str.upper() == exchange.upper()
-                match = instruments_df[symbol_match & exchange_match]
-            else:
-                match = instruments_df[symbol_match]
-            
-            if not match.empty:
-                token = match.iloc[0]['token']
+            row = table.find_symbol(sanitized_symbol, segment=exchange)
+            if row is not None:
+                token = table.token(row)
                 logger.debug(f"Angel: Found token {token} for symbol {symbol}")
                 return str(token)
             
             # If no direct match, try name field as well
-            if 'name' in instruments_df.columns:
-                name_match = instruments_df['name'].str.upper() == sanitized_symbol.upper()
-                if exchange:
-                    match = instruments_df[name_match & exchange_match]
-                else:
-                    match = instruments_df[name_match]
-                
-                if not match.empty:
-                    token = match.iloc[0]['token']
-                    logger.debug(f"Angel: Found token {token} for symbol {symbol} (matched by name)")
-                    return str(token)
+            row = table.find_name(sanitized_symbol, segment=exchange)
+            if row is not None:
+                token = table.token(row)
+                logger.debug(f"Angel: Found token {token} for symbol {symbol} (matched by name)")
+                return str(token)
             
             logger.warning(f"Angel: Token not found for symbol {symbol} in exchange {exchange}")
             return None
@@ -957,39 +955,15 @@ class AngelWrapper(BrokerInterface):
             pd.DataFrame: Filtered instruments data
         """
         try:
-            # Get instruments DataFrame
-            instruments_df = await self.get_instruments()
+            table = await self.get_instrument_table()
             
-            if instruments_df.empty:
+            if table is None:
                 logger.error("Angel: Cannot search instruments - data not available")
                 return pd.DataFrame()
             
-            # Start with full dataset
-            filtered_df = instruments_df.copy()
-            
-            # Apply symbol pattern filter
-            if symbol_pattern:
-                symbol_mask = (
-                    filtered_df['symbol'].str.contains(symbol_pattern, case=False, na=False) |
-                    filtered_df['name'].str.contains(symbol_pattern, case=False, na=False)
-                )
-                filtered_df = filtered_df[symbol_mask]
-            
-            # Apply exchange filter
-            if exchange:
-                filtered_df = filtered_df[
-                    filtered_df['exch_seg'].str.upper() == exchange.upper()
-                ]
-            
-            # Apply instrument type filter
-            if instrument_type:
-                filtered_df = filtered_df[
-                    filtered_df['instrumenttype'].str.upper() == instrument_type.upper()
-                ]
-            
-            # Apply limit
-            if limit and limit > 0:
-                filtered_df = filtered_df.head(limit)
+            # Exchange and instrument type are compared on the master's columns; only the
+            # remaining rows are matched against the pattern
+            filtered_df = table.search(symbol_pattern, segment=exchange, instrument_type=instrument_type, limit=limit).copy()
             
             logger.debug(f"Angel: Search returned {len(filtered_df)} instruments")
             return filtered_df
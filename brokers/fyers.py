@@ -36,7 +36,7 @@ import pytz
 import requests
 from asynciolimiter import Limiter
 from fyers_apiv3 import fyersModel
-from fyers_apiv3.FyersWebsocket import data_ws
+from fyers_apiv3.FyersWebsocket import data_ws, order_ws
 from selenium.webdriver.common.by import By
 from seleniumbase import SB
 
@@ -131,6 +131,7 @@ class FyersWrapper(BrokerInterface):
         self.appId = None
         self.ws = None  # WebSocket instance
         self.ws_connected = False
+        self.order_ws = None  # Order-update WebSocket instance
         self._ws_callbacks = {}
 
     def _make_margin_request(self, data):
@@ -1341,6 +1342,15 @@ class FyersWrapper(BrokerInterface):
         self.ws.subscribe(symbols=symbols, data_type=data_type)
         logger.info(f"Subscribed to {symbols} for {data_type}.")
 
+    def unsubscribe_websocket(self, symbols, data_type="SymbolUpdate"):
+        """
+        Unsubscribe symbols from the data type on the WebSocket.
+        """
+        if not self.ws or not self.ws_connected:
+            raise RuntimeError("WebSocket not connected. Call connect_websocket() first.")
+        self.ws.unsubscribe(symbols=symbols, data_type=data_type)
+        logger.info(f"Unsubscribed from {symbols} for {data_type}.")
+
     def keep_websocket_running(self):
         """
         Keep the WebSocket running to receive real-time data.
@@ -1358,6 +1368,55 @@ class FyersWrapper(BrokerInterface):
             self.ws_connected = False
             logger.info("Fyers WebSocket connection closed.")
 
+    def init_order_websocket(self, access_token=None, log_path="", write_to_file=False, reconnect=True,
+                             on_connect=None, on_close=None, on_error=None, on_orders=None):
+        """
+        Initialize the Fyers order-update WebSocket (the OnOrders channel). on_orders receives
+        every order update pushed by Fyers. Call this after login/setup_auth.
+        """
+        if not access_token:
+            if not self.token or not self.appId:
+                raise RuntimeError("FyersWrapper: Access token not available. Please login first.")
+            access_token = f"{self.appId}:{self.token}"
+        self.order_ws = order_ws.FyersOrderSocket(
+            access_token=access_token,
+            log_path=log_path,
+            write_to_file=write_to_file,
+            reconnect=reconnect,
+            on_connect=on_connect or self._default_on_connect,
+            on_close=on_close or self._default_on_close,
+            on_error=on_error or self._default_on_error,
+            on_orders=on_orders or self._default_on_message,
+        )
+        logger.info("Fyers order WebSocket initialized.")
+
+    def connect_order_websocket(self):
+        """
+        Connect to the Fyers order WebSocket. Call after init_order_websocket().
+        """
+        if not self.order_ws:
+            raise RuntimeError("Order WebSocket not initialized. Call init_order_websocket() first.")
+        self.order_ws.connect()
+        logger.info("Fyers order WebSocket connection started.")
+
+    def subscribe_order_updates(self, data_type="OnOrders"):
+        """
+        Subscribe to order updates on the order WebSocket. Call from its on_connect callback.
+        """
+        if not self.order_ws:
+            raise RuntimeError("Order WebSocket not initialized. Call init_order_websocket() first.")
+        self.order_ws.subscribe(data_type=data_type)
+        logger.info(f"Subscribed to Fyers {data_type} updates.")
+
+    def close_order_websocket(self):
+        """
+        Close the Fyers order WebSocket connection.
+        """
+        if self.order_ws:
+            self.order_ws.close_connection()
+            self.order_ws = None
+            logger.info("Fyers order WebSocket connection closed.")
+
     # Default callbacks (can be overridden)
     def _default_on_message(self, message):
         logger.info(f"WebSocket Response: {message}")
@@ -17,6 +17,7 @@ from seleniumbase import SB
 from pyvirtualdisplay import Display
 from urllib.parse import urlparse, parse_qs
 from algosat.core.time_utils import get_ist_datetime
+from algosat.core.instrument_master import get_instrument_master
 import pandas as pd
 import datetime
 from algosat.core.order_request import OrderRequest, Side, OrderType
@@ -269,6 +270,24 @@ class ZerodhaWrapper(BrokerInterface):
             logger.error(f"Failed to fetch Zerodha positions: {e}")
             return [{"error": str(e)}]
         
+    async def get_instrument_table(self, refresh: bool = False):
+        """
+        Today's Zerodha instruments as an InstrumentTable from the shared instrument master.
+        kite.instruments() is downloaded at most once per trading day (restarts reuse the
+        daily snapshot); refresh=True discards it and downloads again.
+        """
+        master = get_instrument_master()
+        if refresh:
+            master.invalidate("zerodha")
+
+        async def _fetch_instruments():
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(None, lambda: pd.DataFrame(self.kite.instruments()))
+
+        table = await master.load("zerodha", _fetch_instruments)
+        self._instruments_cache = table.frame
+        return table
+
     async def get_history(self, symbol, from_date, to_date, ohlc_interval="5minute", ins_type=""):
         """
         Fetch historical market data for an option symbol using instrument_token.
@@ -301,63 +320,28 @@ class ZerodhaWrapper(BrokerInterface):
         valid_intervals = set(interval_map.values())
         if interval not in valid_intervals:
             interval = "5minute"
-        def get_token(kite, symbol, instruments_cache=None):
-            # Use cached DataFrame if available, else fetch and cache
-            if instruments_cache is not None:
-                df = instruments_cache
-            else:
-                instruments = pd.DataFrame(kite.instruments())
-                df = instruments
-            
+        def get_token(table, symbol):
             # Sanitize symbol (remove exchange prefix if present)
             sanitized_symbol = symbol
             if ':' in symbol:
                 sanitized_symbol = symbol.split(':', 1)[1]
             sanitized_symbol = sanitized_symbol.split('-')[0] if '-' in sanitized_symbol else sanitized_symbol
             
-            # Determine instrument type based on symbol pattern
-            instrument_type = None
+            # Indices are matched by name in the INDICES segment (ignoring spaces), everything else by tradingsymbol
             if sanitized_symbol in ['NIFTY 50', 'NIFTYBANK', 'BANKNIFTY']:
                 logger.debug(f"Zerodha: Detected index symbol {sanitized_symbol}, using INDEX segment")
-                instrument_type = 'INDEX'
-            elif sanitized_symbol.endswith('CE') or sanitized_symbol.endswith('PE'):
-                instrument_type = 'NFO-OPT'
-                logger.debug(f"Zerodha: Detected option symbol {sanitized_symbol}, using NFO-OPT segment")
-            else:
-                instrument_type = 'NSE'
-                logger.debug(f"Zerodha: Detected equity symbol {sanitized_symbol}, using NSE segment")
-            
-            match = None
-            # For index (e.g., NIFTY, BANKNIFTY)
-            if instrument_type == 'INDEX':
-                # Zerodha uses 'INDICES' for index segment, match by name (ignoring spaces)
-                match = df[(df['segment'] == 'INDICES') & (df['name'].str.replace(' ', '').str.upper() == sanitized_symbol.replace(' ', '').upper())]
-            # For equity
-            elif instrument_type == 'EQ':
-                match = df[(df['segment'] == 'NSE') & (df['name'].str.upper() == sanitized_symbol.upper())]
-            # For options (NFO-OPT)
-            elif instrument_type == 'NFO':
-                match = df[(df['segment'] == 'NFO-OPT') & (df['tradingsymbol'].str.upper() == sanitized_symbol.upper())]
-            # Fallback: just match tradingsymbol
+                row = table.find_name(sanitized_symbol, segment='INDICES', ignore_spaces=True)
             else:
-                match = df[df['tradingsymbol'].str.upper() == sanitized_symbol.upper()]
+                row = table.find_symbol(sanitized_symbol)
             
-            if match is not None and not match.empty:
-                row = match.iloc[0]
-                return row['instrument_token']
+            if row is not None:
+                return table.token(row)
             
             raise Exception(f"Token not found for {symbol}")
         loop = asyncio.get_event_loop()
         try:
-            # Use cached instruments if available, else fetch and cache
-            if self._instruments_cache is None:
-                logger.debug("Zerodha: Fetching and caching instruments data")
-                instruments = await loop.run_in_executor(None, lambda: pd.DataFrame(self.kite.instruments()))
-                self._instruments_cache = instruments
-            else:
-                logger.debug("Zerodha: Using cached instruments data")
-            
-            token = await loop.run_in_executor(None, get_token, self.kite, symbol, self._instruments_cache)
+            table = await self.get_instrument_table()
+            token = get_token(table, symbol)
             # Calculate interval in minutes for to_date adjustment
             interval_minutes_map = {
                 "minute": 1, "3minute": 3, "5minute": 5, "10minute": 10, "15minute": 15, "30minute": 30, "60minute": 60, "day": 1440
@@ -378,11 +362,9 @@ class ZerodhaWrapper(BrokerInterface):
             if await self.login(force_reauth=True):
                 # Clear cache after reauth and refetch instruments
                 logger.debug("Zerodha: Clearing instruments cache after reauth")
-                self._instruments_cache = None
-                instruments = await loop.run_in_executor(None, lambda: pd.DataFrame(self.kite.instruments()))
-                self._instruments_cache = instruments
+                table = await self.get_instrument_table(refresh=True)
                 
-                token = await loop.run_in_executor(None, get_token, self.kite, symbol, self._instruments_cache)
+                token = get_token(table, symbol)
                 candles = await loop.run_in_executor(None, self.kite.historical_data, token, from_date_fmt, to_date_fmt, interval)
             else:
                 logger.error("Zerodha: Reauth failed in get_history.")
@@ -19,7 +19,7 @@ import json
 import math
 import os
 import sys
-from datetime import datetime, time, timedelta
+from datetime import datetime, timedelta
 import copy
 
 import pandas as pd
@@ -34,6 +34,7 @@ from sqlalchemy.dialects.postgresql import insert as pg_insert
 from algosat.core.db import AsyncSessionLocal, update_broker
 from algosat.core.dbschema import broker_credentials
 from algosat.core.time_utils import get_ist_now, get_ist_datetime, localize_to_ist
+from algosat.core.trading_calendar import MARKET_CLOSE, MARKET_OPEN, get_trading_calendar
 
 from algosat.common import constants
 from algosat.utils.config_wrapper import get_config, get_trade_config
@@ -67,27 +68,16 @@ def get_trade_day(date_val: datetime):
     Get the nearest valid trading day prior to or on the given date.
 
     This function determines the most recent trading day that is not a weekend (Saturday or Sunday)
-    and not listed as a trading holiday. The holiday list is fetched dynamically from the NSE.
+    and not listed as a trading holiday, using the precomputed trading calendar.
 
     :param date_val: A `datetime` object representing the reference date.
-    :return: A `datetime` object representing the nearest valid trading day.
+    :return: A `datetime` object representing the nearest valid trading day (time of day preserved).
 
     Notes:
-        - If the holiday list is unavailable, the function assumes no holidays (empty list).
-        - The function iterates backwards from the given date to find the nearest trading day.
+        - If the holiday list is unavailable, the calendar assumes no holidays.
     """
-    holiday_list = get_nse_holiday_list()
-    if holiday_list is None:
-        logger.warning("🟡 NSE holiday list unavailable, assuming no holidays.")
-        holiday_list = []  # Default to an empty list if no holidays are provided
-
-    no_of_days = 0
-    while True:
-        current_day = date_val - timedelta(days=no_of_days)
-        if current_day.weekday() < 5 and current_day.date().strftime(
-                "%d-%b-%Y") not in holiday_list:  # Monday-Friday and not a holiday
-            return current_day
-        no_of_days += 1
+    trade_day = get_trading_calendar().trade_day(date_val)
+    return date_val - timedelta(days=(date_val.date() - trade_day).days)
 
 
 def get_nse_holiday_list():
@@ -258,16 +248,13 @@ async def pre_market_check():
     """
     try:
         # Market timings
-        market_open_time = time(9, 15)
-        market_close_time = time(15, 30)
+        market_open_time = MARKET_OPEN
+        market_close_time = MARKET_CLOSE
         now = get_ist_datetime()
         console = Console(width=150)
 
         # Check for NSE holidays
-        nse_holidays = get_nse_holiday_list()
-        is_weekeend = now.weekday() >= 5
-        today_str = now.strftime("%d-%b-%Y")
-        if today_str in nse_holidays or is_weekeend:
+        if not get_trading_calendar().is_trading_day(now):
             # console.print(f"[red bold]Today ({today_str}) is a market holiday. Exiting script.[/]")
             print_signal_message_to_console(message="Market is holiday today", color="cyan", icon="🏝")
             shutdown_gracefully("Marker is holiday")
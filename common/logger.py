@@ -6,10 +6,13 @@ of the application.
 
 Features:
 - Dynamically generates log filenames based on the executed script.
-- Supports rotating file logs by size (2.3 MB max per file) and retaining up to 7 days of logs.
+- Writes one file per day (per strategy inside a strategy context) under a dated directory. Files are
+  not rotated by size; cleanup_logs_and_cache() removes log directories older than 7 days.
 - Includes console logging with colored output for better readability.
 - Allows module-specific log levels configurable via constants.
 - Strategy-aware logging: Automatically routes logs to strategy-specific files based on execution context.
+- Non-blocking: records are put on a bounded queue and formatted/written by a background thread, so
+  disk stalls never block the event loop. Repetitive INFO/DEBUG messages can be rate limited per logger.
 
 Usage:
     from common.logger import get_logger, set_strategy_context
@@ -22,8 +25,11 @@ Usage:
     with set_strategy_context("option_buy"):
         logger.info("This will go to option_buy-YYYY-MM-DD.log")
 """
+import atexit
 import glob
 import logging
+import queue
+import threading
 import os
 import sys
 import time
@@ -33,12 +39,13 @@ import os
 os.environ['TZ'] = 'Asia/Kolkata'
 time.tzset()
 import traceback
+from collections import OrderedDict
 from datetime import datetime, timezone, timedelta
 from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
 from pathlib import Path
 from contextvars import ContextVar
 from contextlib import contextmanager
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 from rich.console import Console
 from rich.logging import RichHandler
@@ -202,9 +209,20 @@ class SafeTimedRotatingFileHandler(TimedRotatingFileHandler):
 MAX_LOG_FILE_SIZE = int(2.3 * 1024 * 1024)  # 2.3 MB
 BACKUP_COUNT = 7
 DEFAULT_LOG_LEVEL = logging.INFO
+# Records waiting for the writer thread; when full, INFO/DEBUG are dropped and WARNING+ wait briefly
+LOG_QUEUE_SIZE = 10000
+LOG_BLOCK_TIMEOUT = 0.5
+# Log files the writer thread keeps open (least recently written are closed first)
+MAX_OPEN_LOG_FILES = 32
+# Per-logger limits for INFO/DEBUG records from the same call site: (max records, per seconds)
+DEFAULT_LOG_RATE_LIMITS = {
+    "OrderMonitor": (20, 1.0),
+}
 
 # Strategy context variable for async-safe strategy tracking
 _strategy_context: ContextVar[Optional[str]] = ContextVar('strategy_context', default=None)
+# Trace id of the sampled strategy cycle / order-monitor tick being logged (see core.tracing)
+_trace_context: ContextVar[Optional[str]] = ContextVar('trace_context', default=None)
 
 # Create a dictionary to store configured loggers (module_name -> logger)
 _LOGGERS = {}
@@ -213,6 +231,244 @@ _LOGGERS = {}
 _ROOT_LOGGER_CONFIGURED = False
 
 
+class _LogPipeline:
+    """
+    Bounded queue between the threads that log and one writer thread.
+
+    Handlers put (handler, record, path) on the queue; the writer formats the record and either
+    appends it to path (file handlers) or calls handler.write(record) (console). Files are kept
+    open and flushed whenever the queue runs empty.
+    """
+
+    def __init__(self, maxsize: int = LOG_QUEUE_SIZE, block_timeout: float = LOG_BLOCK_TIMEOUT):
+        self.maxsize = maxsize
+        self.block_timeout = block_timeout
+        self._queue: queue.Queue = queue.Queue(maxsize)
+        self._thread: Optional[threading.Thread] = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stopped = False
+        self._streams: "OrderedDict[str, object]" = OrderedDict()
+        self._dirty = set()
+        # Stats
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.blocked = 0
+        self.errors = 0
+
+    def _ensure_started(self) -> bool:
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return True
+        with self._lock:
+            if self._stopped:
+                return False
+            if self._thread is None or not self._thread.is_alive() or self._pid != os.getpid():
+                if self._pid is not None and self._pid != os.getpid():
+                    # Forked child: the parent's queue and open files are not ours
+                    self._queue = queue.Queue(self.maxsize)
+                    self._streams = OrderedDict()
+                    self._dirty = set()
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                self._thread.start()
+        return True
+
+    def submit(self, handler: logging.Handler, record: logging.LogRecord, path: Optional[str] = None) -> None:
+        item = (handler, record, path)
+        if not self._ensure_started() or threading.current_thread() is self._thread:
+            self._process(item)  # after shutdown, or logging from inside the writer
+            self._flush()
+            return
+        if record.args:
+            # Merge args now: they may be mutated by the caller before the writer gets to them
+            try:
+                record.msg = record.getMessage()
+            except Exception:
+                # Args that do not fit the format string are reported like any stdlib handler does
+                self.errors += 1
+                handler.handleError(record)
+                return
+            record.args = None
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            if record.levelno < logging.WARNING:
+                self.dropped += 1
+                return
+            self.blocked += 1
+            try:
+                self._queue.put(item, timeout=self.block_timeout)
+            except queue.Full:
+                self.dropped += 1
+                return
+        self.enqueued += 1
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            self._process(item)
+            if self._queue.empty():
+                self._flush()
+        # Stopped: the files are closed here, by the only thread that writes to them
+        self._flush()
+        self._close_streams()
+
+    def _process(self, item) -> None:
+        handler, record, path = item
+        try:
+            if path is None:
+                handler.write(record)
+            else:
+                stream = self._stream(path)
+                stream.write(handler.format(record) + "\n")
+                self._dirty.add(stream)
+            self.written += 1
+        except Exception:
+            self.errors += 1
+            handler.handleError(record)
+
+    def _stream(self, path: str):
+        stream = self._streams.pop(path, None)
+        if stream is None:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            stream = open(path, "a", encoding="utf-8")
+        self._streams[path] = stream  # most recently written last
+        while len(self._streams) > MAX_OPEN_LOG_FILES:
+            _, oldest = self._streams.popitem(last=False)
+            self._dirty.discard(oldest)
+            oldest.close()
+        return stream
+
+    def _flush(self) -> None:
+        for stream in self._dirty:
+            try:
+                stream.flush()
+            except Exception:
+                self.errors += 1
+        self._dirty.clear()
+
+    def _close_streams(self) -> None:
+        for stream in self._streams.values():
+            try:
+                stream.close()
+            except Exception:
+                self.errors += 1
+        self._streams.clear()
+        self._dirty.clear()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Write everything still queued, then close the log files; later records are written inline."""
+        with self._lock:
+            self._stopped = True
+            thread = self._thread
+        if thread is not None and thread.is_alive() and self._pid == os.getpid():
+            # The writer closes its files when it reaches the sentinel. If it is stuck or still
+            # draining after timeout, its files are left to it rather than closed under it.
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                return
+            thread.join(timeout)
+            return
+        self._flush()
+        self._close_streams()
+
+    def get_stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "capacity": self.maxsize,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "blocked": self.blocked,
+            "errors": self.errors,
+            "open_files": len(self._streams),
+        }
+
+
+_pipeline = _LogPipeline()
+atexit.register(_pipeline.stop)
+
+
+class _RateLimitFilter(logging.Filter):
+    """
+    Lets at most max_records INFO/DEBUG records per call site through every per_seconds.
+    The first record after a window with suppressed records says how many were suppressed.
+    """
+
+    def __init__(self, max_records: int, per_seconds: float = 1.0):
+        super().__init__()
+        self.max_records = max_records
+        self.per_seconds = per_seconds
+        self.suppressed = 0
+        self._windows: Dict[Tuple[str, int], list] = {}  # call site -> [window start, count, suppressed]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or record.created - window[0] >= self.per_seconds:
+                skipped = window[2] if window is not None else 0
+                self._windows[key] = [record.created, 1, 0]
+                if skipped:
+                    record.msg = f"{record.msg} [{skipped} similar messages suppressed]"
+                return True
+            if window[1] < self.max_records:
+                window[1] += 1
+                return True
+            window[2] += 1
+            self.suppressed += 1
+            return False
+
+
+# module_name -> rate limit filter attached to that logger
+_RATE_LIMITS: Dict[str, _RateLimitFilter] = {}
+
+
+def set_log_rate_limit(module_name: str, max_records: Optional[int], per_seconds: float = 1.0) -> None:
+    """
+    Limit INFO/DEBUG records of a logger to max_records per call site every per_seconds.
+    WARNING and above are never limited. Pass max_records=None to remove the limit.
+    """
+    logger = logging.getLogger(module_name)
+    old = _RATE_LIMITS.pop(module_name, None)
+    if old is not None:
+        logger.removeFilter(old)
+    if max_records is not None:
+        rate_filter = _RateLimitFilter(max_records, per_seconds)
+        logger.addFilter(rate_filter)
+        _RATE_LIMITS[module_name] = rate_filter
+
+
+def get_logging_stats() -> dict:
+    """Queue depth, dropped/blocked counts and suppressed records of the logging pipeline."""
+    return {
+        **_pipeline.get_stats(),
+        "suppressed": {name: rate_filter.suppressed for name, rate_filter in _RATE_LIMITS.items()},
+    }
+
+
+def flush_logs(timeout: float = 5.0) -> None:
+    """Stop the writer thread after it has written every queued record (e.g. before exiting)."""
+    _pipeline.stop(timeout)
+
+
+_raw_line_handler = logging.Handler()
+_raw_line_handler.setFormatter(logging.Formatter("%(message)s"))
+
+
+def submit_line(path: str, line: str) -> None:
+    """Append line to path from the log writer thread (dropped like INFO records when the queue is full)."""
+    record = logging.LogRecord("algosat.raw", logging.INFO, "", 0, line, None, None)
+    _pipeline.submit(_raw_line_handler, record, path)
+
+
 @contextmanager
 def set_strategy_context(strategy_name: str):
     """
@@ -234,6 +490,30 @@ def get_current_strategy_context() -> Optional[str]:
     return _strategy_context.get(None)
 
 
+@contextmanager
+def set_trace_context(trace_id: str):
+    """Stamp trace_id into the log lines written inside the block."""
+    token = _trace_context.set(trace_id)
+    try:
+        yield
+    finally:
+        _trace_context.reset(token)
+
+
+class _TraceContextFilter(logging.Filter):
+    """Appends [trace_id=...] to records logged inside a traced strategy cycle or order-monitor tick."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        trace_id = _trace_context.get()
+        if trace_id is not None and getattr(record, "trace_id", None) is None:
+            record.trace_id = trace_id
+            record.msg = f"{record.msg} [trace_id={trace_id}]"
+        return True
+
+
+_trace_filter = _TraceContextFilter()
+
+
 # --- Console Handler Improvements: RichHandler with custom colors and minimal output ---
 console = Console()
 
@@ -253,8 +533,18 @@ class ColorfulLogFormatter(logging.Formatter):
         record.levelname = f"[{color}]{levelname}[/{color}]"
         return super().format(record)
 
+class QueuedRichHandler(RichHandler):
+    """RichHandler that renders on the log writer thread instead of the caller's."""
+
+    def emit(self, record):
+        _pipeline.submit(self, record)
+
+    def write(self, record):
+        RichHandler.emit(self, record)
+
+
 # Use RichHandler for pretty, minimal, colored console output
-console_handler = RichHandler(
+console_handler = QueuedRichHandler(
     console=console,
     show_time=True,      # Show HH:MM:SS (local/IST)
     show_level=True,     # Colored log level
@@ -333,8 +623,13 @@ def get_strategy_aware_log_file(module_name: str) -> str:
     5. Default -> algosat-YYYY-MM-DD.log
     """
     today = get_ist_now().strftime('%Y-%m-%d')
+    os.makedirs(os.path.join(constants.LOG_DIR, today), exist_ok=True)
+    return _strategy_aware_log_path(module_name, today)
+
+
+def _strategy_aware_log_path(module_name: str, today: str) -> str:
+    """Log file for module_name on date today (YYYY-MM-DD) in the current strategy context."""
     date_dir = os.path.join(constants.LOG_DIR, today)
-    os.makedirs(date_dir, exist_ok=True)
     
     # API and broker_monitor always get their own files (ignore strategy context)
     if module_name.startswith("api."):
@@ -434,54 +729,33 @@ class StrategyAwareFileHandler(logging.FileHandler):
     """
     Custom FileHandler that dynamically routes logs to strategy-specific files
     based on the current strategy context at the time of logging.
+
+    The target file is resolved in the logging thread (the strategy context is a ContextVar);
+    formatting and writing happen on the log writer thread, which keeps the files open.
     """
     
-    def __init__(self, module_name: str, mode='a', encoding=None, delay=False):
+    def __init__(self, module_name: str, mode='a', encoding=None, delay=True):
         self.module_name = module_name
-        self.current_file = None
-        self.current_stream = None
-        # Initialize with default log file
+        # Initialize with default log file; the stream itself is never opened here
         default_file = get_strategy_aware_log_file(module_name)
-        super().__init__(default_file, mode, encoding, delay)
+        super().__init__(default_file, mode, encoding, delay=True)
     
-    def _get_current_log_file(self):
+    def _get_current_log_file(self, record=None):
         """Get the appropriate log file based on current strategy context."""
-        return get_strategy_aware_log_file(self.module_name)
+        created = record.created if record is not None else time.time()
+        return _strategy_aware_log_path(self.module_name, time.strftime("%Y-%m-%d", time.localtime(created)))
     
     def emit(self, record):
         """
-        Emit a record, dynamically routing to the correct file based on current context.
+        Queue a record for the file of the current context; never blocks on disk.
         """
-        # Get the log file for current context
-        target_file = self._get_current_log_file()
-        
-        # If target file changed, switch the stream
-        if target_file != self.current_file:
-            # Close current stream if it exists
-            if self.current_stream:
-                self.current_stream.close()
-            
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(target_file), exist_ok=True)
-            
-            # Open new stream
-            self.current_file = target_file
-            self.baseFilename = target_file  # Update baseFilename for logging framework
-            self.current_stream = open(target_file, self.mode, encoding=self.encoding)
-            self.stream = self.current_stream
-        
-        # Emit the record using parent class logic
-        super().emit(record)
-        
-        # Ensure immediate write
-        if self.stream:
-            self.stream.flush()
+        target_file = self._get_current_log_file(record)
+        self.baseFilename = target_file  # Keep baseFilename meaningful for the logging framework
+        _pipeline.submit(self, record, target_file)
     
     def close(self):
-        """Close the handler and clean up streams."""
-        if self.current_stream:
-            self.current_stream.close()
-            self.current_stream = None
+        """Close the handler; the files themselves belong to the log writer thread."""
+        self.stream = None
         super().close()
 
 
@@ -521,8 +795,12 @@ def get_logger(module_name: str) -> logging.Logger:
             datefmt="%Y-%m-%d %H:%M:%S"
         )
         strategy_handler.setFormatter(file_formatter)
+        strategy_handler.addFilter(_trace_filter)
         logger.addHandler(strategy_handler)
         logger.setLevel(logging.DEBUG)
+        
+        if module_name in DEFAULT_LOG_RATE_LIMITS and module_name not in _RATE_LIMITS:
+            set_log_rate_limit(module_name, *DEFAULT_LOG_RATE_LIMITS[module_name])
     
     return logger
 
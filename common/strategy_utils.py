@@ -1,6 +1,7 @@
 
 import math
 import os
+import time
 import json
 import asyncio
 import re
@@ -11,10 +12,13 @@ from rich.progress import (
     TimeRemainingColumn, TaskProgressColumn
 )
 from algosat.core.data_manager import DataManager
+from algosat.core.candle_aggregator import bar_end, bar_start, in_session, session_open
+from algosat.core.candle_store import merge_candles, slice_candles, to_naive_ist
 from algosat.core.time_utils import localize_to_ist, get_ist_datetime
 from algosat.common.logger import get_logger
 import logging
 import cachetools
+import pandas as pd
 from typing import TYPE_CHECKING, Optional
 from algosat.utils.indicators import calculate_atr
 from algosat.core.order_request import OrderRequest, Side, OrderType
@@ -548,6 +552,69 @@ async def wait_for_next_candle(interval_minutes: int) -> float:
     await asyncio.sleep(wait_time)
     return wait_time
 
+# Extra wait past a bar boundary before giving up on the aggregator closing the bar
+BAR_CLOSE_GRACE_SECONDS = 5
+
+
+async def wait_for_bar_close(data_manager, symbol: str, interval_minutes: int) -> float:
+    """
+    Wait until the current interval_minutes bar of symbol closes. Returns as soon as the
+    candle aggregator closes the bar when it is building bars for symbol, otherwise sleeps
+    until the next candle boundary like wait_for_next_candle. Returns the wait time in seconds.
+    """
+    aggregator = getattr(data_manager, "candle_aggregator", None)
+    now = to_naive_ist(get_ist_datetime())
+    if (
+        aggregator is None
+        or not aggregator.running
+        or not aggregator.is_tracking(symbol, interval_minutes)
+        or not in_session(now)
+    ):
+        return await wait_for_next_candle(interval_minutes)
+    boundary = bar_end(bar_start(now, interval_minutes), interval_minutes)
+    timeout = (boundary - now).total_seconds() + BAR_CLOSE_GRACE_SECONDS
+    started = time.monotonic()
+    bar = await aggregator.wait_for_close(symbol, interval_minutes, timeout=timeout)
+    waited = time.monotonic() - started
+    if bar is None:
+        logger.warning(f"No {interval_minutes}m bar closed for {symbol} within {timeout:.1f}s, continuing")
+    else:
+        logger.info(f"{symbol} {interval_minutes}m bar {bar.start} closed after {waited:.1f}s")
+    return waited
+
+
+async def fetch_history_with_live_bars(data_manager, symbol: str, from_date, interval_minutes: int):
+    """
+    History of symbol from from_date through the last closed bar, with today's bars taken from
+    the candle aggregator. Only the days before today go through get_history (served from the
+    candle store once cached). Returns None when the aggregator does not have a complete session
+    for symbol, so the caller fetches everything from the broker as before.
+    """
+    aggregator = getattr(data_manager, "candle_aggregator", None)
+    if aggregator is None or not aggregator.running:
+        return None
+    # The bar that just ended may not have been closed by the aggregator's own timer yet
+    aggregator.close_due_bars(aggregator.now())
+    if not aggregator.session_complete(symbol, interval_minutes):
+        return None
+    today = aggregator.get_bars(symbol, interval_minutes, since=session_open(aggregator.now()))
+    if today.empty:
+        return None
+    before_today = session_open(aggregator.now()) - timedelta(minutes=interval_minutes)
+    if to_naive_ist(from_date) > before_today:
+        return today
+    earlier = await data_manager.get_history(
+        symbol,
+        from_date,
+        localize_to_ist(before_today.to_pydatetime()),
+        ohlc_interval=interval_minutes,
+        ins_type="",
+        cache=False,
+    )
+    if not isinstance(earlier, pd.DataFrame) or earlier.empty:
+        return None
+    return merge_candles(slice_candles(earlier, end=before_today), today)
+
 
 def get_max_premium_from_config(trade_config: dict, symbol: str, current_dt: 'datetime') -> Optional[int]:
     """
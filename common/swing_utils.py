@@ -1,11 +1,13 @@
 import numpy as np
 import pandas as pd
 import calendar
+import math
 from datetime import datetime, timedelta
 import pytz
 
 from algosat.common.logger import get_logger
 from algosat.core.time_utils import get_ist_now
+from algosat.core.tracing import traced
 
 logger = get_logger(__name__)
 
@@ -24,6 +26,17 @@ def previous_non_nan(arr: np.ndarray, idx: int):
     return np.nan
 
 # ──────────── 1) Compute “raw” left/right pivots exactly like ta.pivothigh/ta.pivotlow ────────────
+def _window_extreme(values: pd.Series, bars: int, use_max: bool, after: bool) -> np.ndarray:
+    """
+    Max/min of the `bars` values strictly before (after=False) or strictly after (after=True)
+    each bar; NaN where that window runs off the series or contains a NaN, like np.max/np.min
+    on the same slice. pandas' rolling max/min is a monotonic-deque scan, so this is O(n).
+    """
+    rolling = values.rolling(bars, min_periods=bars)
+    extreme = rolling.max() if use_max else rolling.min()
+    return extreme.shift(-bars if after else 1).to_numpy()
+
+
 def compute_raw_pivots(df: pd.DataFrame, left_bars: int, right_bars: int):
     """
     Given df sorted by date, returns two boolean numpy arrays of length N:
@@ -31,32 +44,27 @@ def compute_raw_pivots(df: pd.DataFrame, left_bars: int, right_bars: int):
       - raw_pl[i] = True  if bar i is a left/right pivot low
     Exactly mimics `ta.pivothigh(left_bars, right_bars)` and `ta.pivotlow(left_bars, right_bars)`.
     Includes tie-breaking: if multiple bars have the same extreme value within the window,
-    only the *first* such bar is marked as a pivot.
+    only the *first* such bar is marked as a pivot. That makes bar i a pivot high when it is
+    strictly above the left_bars before it and at least as high as the right_bars after it
+    (and the mirror image for lows); any NaN in the window rules the bar out.
     """
-    highs = df["high"].values
-    lows = df["low"].values
+    highs = df["high"].astype(float)
+    lows = df["low"].astype(float)
     n = len(df)
 
-    raw_ph = np.zeros(n, dtype=bool)
-    raw_pl = np.zeros(n, dtype=bool)
-
-    for i in range(left_bars, n - right_bars):
-        # Check pivot high condition with tie-breaking
-        window_high = highs[i - left_bars : i + right_bars + 1]
-        if highs[i] == np.max(window_high):
-            # Check if current bar 'i' is the first occurrence of this max in the window
-            # Adjusted index relative to original array
-            first_occurrence_in_window_idx = np.argmax(window_high)
-            if (i - left_bars + first_occurrence_in_window_idx) == i:
-                raw_ph[i] = True
-
-        # Check pivot low condition with tie-breaking
-        window_low = lows[i - left_bars : i + right_bars + 1]
-        if lows[i] == np.min(window_low):
-            # Check if current bar 'i' is the first occurrence of this min in the window
-            first_occurrence_in_window_idx = np.argmin(window_low)
-            if (i - left_bars + first_occurrence_in_window_idx) == i:
-                raw_pl[i] = True
+    in_range = np.zeros(n, dtype=bool)
+    in_range[left_bars:max(n - right_bars, left_bars)] = True
+    raw_ph = in_range & ~np.isnan(highs.to_numpy())
+    raw_pl = in_range & ~np.isnan(lows.to_numpy())
+
+    # Comparisons against NaN are False, which drops windows containing a NaN
+    with np.errstate(invalid="ignore"):
+        if left_bars > 0:
+            raw_ph &= highs.to_numpy() > _window_extreme(highs, left_bars, True, after=False)
+            raw_pl &= lows.to_numpy() < _window_extreme(lows, left_bars, False, after=False)
+        if right_bars > 0:
+            raw_ph &= highs.to_numpy() >= _window_extreme(highs, right_bars, True, after=True)
+            raw_pl &= lows.to_numpy() <= _window_extreme(lows, right_bars, False, after=True)
 
     return raw_ph, raw_pl
 
@@ -73,21 +81,11 @@ def build_initial_zigzag(df: pd.DataFrame, raw_ph: np.ndarray, raw_pl: np.ndarra
         zz = bool(ph) ? ph : (bool(pl) ? pl : na)
     in PineScript.
     """
-    highs = df["high"].values
-    lows = df["low"].values
-    n = len(df)
+    highs = df["high"].to_numpy(dtype=float)
+    lows = df["low"].to_numpy(dtype=float)
 
-    hl0 = np.full(n, np.nan, dtype=float)
-    zz0 = np.full(n, np.nan, dtype=float)
-
-    for i in range(n):
-        if raw_ph[i]:
-            hl0[i] = 1.0
-            zz0[i] = highs[i]
-        elif raw_pl[i]:
-            hl0[i] = -1.0
-            zz0[i] = lows[i]
-        # else hl0[i], zz0[i] remain NaN
+    hl0 = np.where(raw_ph, 1.0, np.where(raw_pl, -1.0, np.nan))
+    zz0 = np.where(raw_ph, highs, np.where(raw_pl, lows, np.nan))
     return hl0, zz0
 
 # ──────────── 3) Apply PineScript’s “valuewhen”-based zigzag filters ────────────
@@ -100,65 +98,34 @@ def apply_zigzag_filters(df: pd.DataFrame, raw_ph: np.ndarray, raw_pl: np.ndarra
       4) hl := hl ==  1 and prev_hl == -1 and zz < prev_zz ? na : hl
       zz := na(hl) ? na : zz
 
-    The `previous_non_nan` helper correctly handles the `valuewhen(bool(series), series, 1)` behavior.
-    Crucially, `prev_hl_valX` and `prev_zz_valX` are re-calculated after each potential modification
-    within the loop for the current bar, mimicking Pine's immediate assignment (`:=`).
+    prev_hl / prev_zz are `valuewhen(bool(series), series, 1)`: the last non-NaN value before
+    the current bar. A filter only ever clears the current bar, so those values are the same
+    for all four filters on a bar; they are carried forward as state instead of rescanning
+    the arrays (see previous_non_nan) for every bar.
     """
-    highs = df["high"].values
-    lows = df["low"].values
-    n = len(df)
+    highs = df["high"].to_numpy(dtype=float)
+    lows = df["low"].to_numpy(dtype=float)
 
     # Make working copies that will be modified in place
     hl1 = hl0.copy()
     zz1 = zz0.copy()
-
-    for i in range(n):
-        # PineScript logic for current bar (i) uses previous values *before* current bar's modification.
-        # This is correctly handled by previous_non_nan(arr, i)
-
-        # Filter 1: zz := bool(pl) and hl == -1 and prev_hl == -1 and pl > prev_zz ? na : zz
-        # Note: bool(pl) means raw_pl[i] is True. hl == -1 implies hl1[i] was initially -1.
-        prev_hl_val = previous_non_nan(hl1, i)
-        prev_zz_val = previous_non_nan(zz1, i)
-        if raw_pl[i] and (hl1[i] == -1.0) and (prev_hl_val == -1.0) and (lows[i] > prev_zz_val):
-            hl1[i] = np.nan
-            zz1[i] = np.nan
-
-        # Re-grab prev_hl_val2 / prev_zz_val2 after Filter 1, as Pine does with chained valuewhen calls
-        prev_hl_val2 = previous_non_nan(hl1, i)
-        prev_zz_val2 = previous_non_nan(zz1, i)
-
-        # Filter 2: zz := bool(ph) and hl == 1 and prev_hl == 1 and ph < prev_zz ? na : zz
-        # Note: bool(ph) means raw_ph[i] is True. hl == 1 implies hl1[i] was initially 1.
-        if raw_ph[i] and (hl1[i] == 1.0) and (prev_hl_val2 == 1.0) and (highs[i] < prev_zz_val2):
-            hl1[i] = np.nan
-            zz1[i] = np.nan
-        
-        # Re-grab prev_hl_val3 / prev_zz_val3 after Filter 2
-        prev_hl_val3 = previous_non_nan(hl1, i)
-        prev_zz_val3 = previous_non_nan(zz1, i)
-
-        # Filter 3: hl := hl == -1 and prev_hl == 1 and zz > prev_zz ? na : hl
-        # This filters out a pivot low if the previous pivot was a high AND the current pivot low
-        # is actually higher than that previous high.
-        if raw_pl[i] and (hl1[i] == -1.0) and (prev_hl_val3 == 1.0) and (zz1[i] > prev_zz_val3):
-            hl1[i] = np.nan
-            zz1[i] = np.nan
-
-        # Re-grab prev_hl_val4 / prev_zz_val4 after Filter 3
-        prev_hl_val4 = previous_non_nan(hl1, i)
-        prev_zz_val4 = previous_non_nan(zz1, i)
-
-        # Filter 4: hl := hl == 1 and prev_hl == -1 and zz < prev_zz ? na : hl
-        # This filters out a pivot high if the previous pivot was a low AND the current pivot high
-        # is actually lower than that previous low.
-        if raw_ph[i] and (hl1[i] == 1.0) and (prev_hl_val4 == -1.0) and (zz1[i] < prev_zz_val4):
+    # Final rule for bars that start without a pivot; filters below only add NaNs
+    zz1[np.isnan(hl1)] = np.nan
+
+    prev_hl = np.nan
+    prev_zz = np.nan
+    for i in np.flatnonzero(~np.isnan(hl1)).tolist():
+        hl, zz = float(hl1[i]), float(zz1[i])
+        if ((raw_pl[i] and hl == -1.0 and prev_hl == -1.0 and lows[i] > prev_zz) or        # Filter 1
+                (raw_ph[i] and hl == 1.0 and prev_hl == 1.0 and highs[i] < prev_zz) or     # Filter 2
+                (raw_pl[i] and hl == -1.0 and prev_hl == 1.0 and zz > prev_zz) or          # Filter 3
+                (raw_ph[i] and hl == 1.0 and prev_hl == -1.0 and zz < prev_zz)):           # Filter 4
             hl1[i] = np.nan
             zz1[i] = np.nan
-
-        # Final rule: zz := na(hl) ? na : zz. If hl[i] became NaN, force zz[i] = NaN.
-        if np.isnan(hl1[i]):
-            zz1[i] = np.nan
+            continue
+        prev_hl = hl
+        if not math.isnan(zz):
+            prev_zz = zz
 
     return hl1, zz1
 
@@ -217,13 +184,20 @@ def find_abcd_e(current_hl_val: float, hl_arr: np.ndarray, zz_arr: np.ndarray, c
     return b, c, d, e
 
 # ──────────── 4) Convert filtered zigzag into final HH/LH and HL/LL flags ────────────
+def _previous_pivot(last_index: np.ndarray, before: np.ndarray) -> np.ndarray:
+    """Index of the last pivot tracked by last_index strictly before each position in `before`; -1 if none."""
+    return np.where(before > 0, last_index[np.clip(before - 1, 0, None)], -1)
+
+
 def finalize_hhlh_labels(df: pd.DataFrame, hl1: np.ndarray, zz1: np.ndarray):
     """
     Now that hl1 and zz1 have been filtered exactly how PineScript does,
     this function identifies HH, LH, HL, LL using Pine’s “a, b, c, d, e” logic.
     
     'a' is the current pivot value (zz1[i]).
-    'b, c, d, e' are found using the `find_abcd_e` helper, which respects their type sequence.
+    'b, c, d, e' are the same pivots `find_abcd_e` walks back to (alternating opposite/same
+    type), found here by jumping through running "last high pivot" / "last low pivot"
+    indexes instead of scanning backwards from every pivot.
 
     Returns df with 4 new boolean columns: ‘is_HH’, ‘is_LH’, ‘is_HL’, ‘is_LL’,
     and also 'zz' and 'hl' columns for the final filtered zigzag data.
@@ -234,47 +208,40 @@ def finalize_hhlh_labels(df: pd.DataFrame, hl1: np.ndarray, zz1: np.ndarray):
     hl_flag = np.zeros(n, dtype=bool)
     lh_flag = np.zeros(n, dtype=bool)
 
-    for i in range(n):
-        if not np.isnan(zz1[i]): # Only process if current bar is a confirmed pivot
-            a = zz1[i]
-            current_hl_val = hl1[i] # The type (+1 or -1) of pivot 'a'
-
-            # Get b, c, d, e using the precise Pine Script findprevious() logic
-            b, c, d, e = find_abcd_e(current_hl_val, hl1, zz1, i)
-
-            # HH: a > b and a > c and c > b and c > d
-            # Requires a, b, c, d to be non-NaN.
-            if (not np.isnan(a) and not np.isnan(b) and not np.isnan(c) and not np.isnan(d) and
-                    (a > b and a > c and c > b and c > d)):
-                hh_flag[i] = True
-
-            # LL: a < b and a < c and c < b and c < d
-            # Requires a, b, c, d to be non-NaN.
-            if (not np.isnan(a) and not np.isnan(b) and not np.isnan(c) and not np.isnan(d) and
-                    (a < b and a < c and c < b and c < d)):
-                ll_flag[i] = True
-
-            # HL logic (two patterns from PineScript's `_hl` definition):
-            # _hl = bool(zz) and (a >= c and b > c and b > d and d > c and d > e or a < b and a > c and b < d)
-            cond1_hl = (not np.isnan(a) and not np.isnan(b) and not np.isnan(c) and
-                        not np.isnan(d) and not np.isnan(e) and # All five a-e are required for this sub-condition
-                        (a >= c and b > c and b > d and d > c and d > e))
-            cond2_hl = (not np.isnan(a) and not np.isnan(b) and not np.isnan(c) and
-                        not np.isnan(d) and # 'e' is NOT part of this sub-condition
-                        (a < b and a > c and b < d))
-            if cond1_hl or cond2_hl:
-                hl_flag[i] = True
-
-            # LH logic (two patterns from PineScript's `_lh` definition):
-            # _lh = bool(zz) and (a <= c and b < c and b < d and d < c and d < e or a > b and a < c and b > d)
-            cond1_lh = (not np.isnan(a) and not np.isnan(b) and not np.isnan(c) and
-                        not np.isnan(d) and not np.isnan(e) and # All five a-e are required for this sub-condition
-                        (a <= c and b < c and b < d and d < c and d < e))
-            cond2_lh = (not np.isnan(a) and not np.isnan(b) and not np.isnan(c) and
-                        not np.isnan(d) and # 'e' is NOT part of this sub-condition
-                        (a > b and a < c and b > d))
-            if cond1_lh or cond2_lh:
-                lh_flag[i] = True
+    positions = np.arange(n)
+    last_high = np.maximum.accumulate(np.where(hl1 == 1.0, positions, -1))
+    last_low = np.maximum.accumulate(np.where(hl1 == -1.0, positions, -1))
+
+    # Only confirmed pivots with a known type get labels
+    pivots = np.flatnonzero(~np.isnan(zz1) & ((hl1 == 1.0) | (hl1 == -1.0)))
+    is_high = hl1[pivots] == 1.0
+
+    def prices(idx):
+        return np.where(idx >= 0, zz1[np.clip(idx, 0, None)], np.nan)
+
+    def step(before, same_type):
+        # same_type=False looks for the opposite type of pivot 'a', True for its own type
+        want_high = is_high == same_type
+        return np.where(want_high, _previous_pivot(last_high, before), _previous_pivot(last_low, before))
+
+    b_idx = step(pivots, same_type=False)
+    c_idx = step(b_idx, same_type=True)
+    d_idx = step(c_idx, same_type=False)
+    e_idx = step(d_idx, same_type=True)
+    a, b, c, d, e = zz1[pivots], prices(b_idx), prices(c_idx), prices(d_idx), prices(e_idx)
+
+    # Every condition below compares each of its operands, and comparisons with NaN are
+    # False, so a missing b/c/d/e (NaN) fails the pattern just like the explicit isnan checks did.
+    # HH: a > b and a > c and c > b and c > d
+    hh_flag[pivots] = (a > b) & (a > c) & (c > b) & (c > d)
+    # LL: a < b and a < c and c < b and c < d
+    ll_flag[pivots] = (a < b) & (a < c) & (c < b) & (c < d)
+    # _hl = bool(zz) and (a >= c and b > c and b > d and d > c and d > e or a < b and a > c and b < d)
+    hl_flag[pivots] = (((a >= c) & (b > c) & (b > d) & (d > c) & (d > e)) |
+                       ((a < b) & (a > c) & (b < d)))
+    # _lh = bool(zz) and (a <= c and b < c and b < d and d < c and d < e or a > b and a < c and b > d)
+    lh_flag[pivots] = (((a <= c) & (b < c) & (b < d) & (d < c) & (d < e)) |
+                       ((a > b) & (a < c) & (b > d)))
 
     df["is_HH"] = hh_flag
     df["is_LL"] = ll_flag
@@ -285,6 +252,7 @@ def finalize_hhlh_labels(df: pd.DataFrame, hl1: np.ndarray, zz1: np.ndarray):
     return df
 
 # ──────────── 5) One true “wrapper” to run all steps at once ────────────────
+@traced("indicator.hhlh_pivots")
 def find_hhlh_pivots(df: pd.DataFrame, left_bars: int = 2, right_bars: int = 4):
     """
     Main wrapper function to compute all swing levels, support/resistance, and trend,
@@ -322,9 +290,17 @@ def find_hhlh_pivots(df: pd.DataFrame, left_bars: int = 2, right_bars: int = 4):
     df_processed = finalize_hhlh_labels(df_processed, hl1, zz1) # This populates is_HH, etc., zz, hl
 
     # Step 5: Calculate dynamic support/resistance and trend
-    res_vals = np.full(n, np.nan, dtype=float)
-    sup_vals = np.full(n, np.nan, dtype=float)
-    trend_vals = np.full(n, np.nan, dtype=float)
+    # Plain lists: this loop reads and writes single elements, which is much cheaper than on arrays
+    res_vals = [np.nan] * n
+    sup_vals = [np.nan] * n
+    trend_vals = [np.nan] * n
+
+    close_prices = close_prices.tolist()
+    is_hh = df_processed["is_HH"].tolist()
+    is_ll = df_processed["is_LL"].tolist()
+    is_hl = df_processed["is_HL"].tolist()
+    is_lh = df_processed["is_LH"].tolist()
+    zz = df_processed["zz"].tolist()
 
     for i in range(n):
         # Initialize current bar's S/R with previous values if no update
@@ -333,11 +309,11 @@ def find_hhlh_pivots(df: pd.DataFrame, left_bars: int = 2, right_bars: int = 4):
         current_trend_val = trend_vals[i-1] if i > 0 else np.nan # nz(trend1[1])
 
         # First set of res/sup updates (Pine: res := _lh ? zz : res[1] and sup := _hl ? zz : sup[1])
-        if df_processed["is_LH"].iloc[i]:
-            current_res_val = df_processed["zz"].iloc[i]
+        if is_lh[i]:
+            current_res_val = zz[i]
         
-        if df_processed["is_HL"].iloc[i]:
-            current_sup_val = df_processed["zz"].iloc[i]
+        if is_hl[i]:
+            current_sup_val = zz[i]
         
         res_vals[i] = current_res_val
         sup_vals[i] = current_sup_val
@@ -352,18 +328,18 @@ def find_hhlh_pivots(df: pd.DataFrame, left_bars: int = 2, right_bars: int = 4):
 
         # Second set of res/sup updates (Pine: res := trend1 == 1 and _hh or trend1 == -1 and _lh ? zz : res)
         # Apply these on the *current bar's* already updated res/sup values.
-        if (not np.isnan(trend_vals[i])):
-            if (trend_vals[i] == 1.0 and df_processed["is_HH"].iloc[i]) or \
-               (trend_vals[i] == -1.0 and df_processed["is_LH"].iloc[i]):
-                res_vals[i] = df_processed["zz"].iloc[i]
-            
-            if (trend_vals[i] == 1.0 and df_processed["is_HL"].iloc[i]) or \
-               (trend_vals[i] == -1.0 and df_processed["is_LL"].iloc[i]):
-                sup_vals[i] = df_processed["zz"].iloc[i]
+        # A NaN trend equals neither 1 nor -1, so no update happens before the trend is known.
+        if (current_trend_val == 1.0 and is_hh[i]) or \
+           (current_trend_val == -1.0 and is_lh[i]):
+            res_vals[i] = zz[i]
+        
+        if (current_trend_val == 1.0 and is_hl[i]) or \
+           (current_trend_val == -1.0 and is_ll[i]):
+            sup_vals[i] = zz[i]
 
-    df_processed["resistance"] = res_vals
-    df_processed["support"] = sup_vals
-    df_processed["trend"] = trend_vals
+    df_processed["resistance"] = np.array(res_vals, dtype=float)
+    df_processed["support"] = np.array(sup_vals, dtype=float)
+    df_processed["trend"] = np.array(trend_vals, dtype=float)
 
     return df_processed
 
@@ -445,6 +421,176 @@ def get_latest_confirmed_high_low(df: pd.DataFrame):
 
 
 # ──────────── Utility: Symbol sanitization for database lookup ────────────────
+
+
+# ──────────── 7) Incremental pivot tracking for candles that arrive one at a time ────────────────
+class SwingPivotTracker:
+    """
+    Streaming version of find_hhlh_pivots() for a candle frame that only grows at the end.
+
+    Every appended candle confirms at most one raw pivot (the bar `right_bars` back), which
+    then goes through the same zigzag filters and a, b, c, d, e labelling as the batch code.
+    All state needed for that (last hl/zz, last high/low pivot and back-pointers to the pivots
+    before it) is carried forward, so an append costs O(left_bars + right_bars) regardless of
+    history length. HH/LL/HL/LH labels are identical to find_hhlh_pivots() on the same frame;
+    support/resistance/trend are not tracked.
+
+    update(df) syncs with a candle frame: only rows past the ones already seen are appended.
+    If the frame no longer extends what was seen (a different first candle, fewer rows, or a
+    candle revised anywhere in the overlap) the state is rebuilt from the frame.
+    """
+
+    LABELS = ("is_HH", "is_LL", "is_HL", "is_LH")
+
+    def __init__(self, left_bars: int = 2, right_bars: int = 4):
+        self.left_bars = left_bars
+        self.right_bars = right_bars
+        self.rebuilds = 0
+        self.reset()
+
+    def reset(self) -> None:
+        self._timestamps = []
+        self._highs = []
+        self._lows = []
+        self._prev_hl = np.nan  # valuewhen(hl, hl, 1)
+        self._prev_zz = np.nan  # valuewhen(zz, zz, 1)
+        # Surviving pivots: dicts with index, timestamp, hl, zz, labels and the positions (in
+        # this list) of the last high/low pivot before them
+        self.pivots = []
+        self._last_high = -1
+        self._last_low = -1
+        self._last_labelled = dict.fromkeys(self.LABELS)
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def update(self, df: pd.DataFrame) -> int:
+        """Append the rows of df not seen yet; returns how many candles were processed."""
+        n = len(df)
+        seen = len(self._timestamps)
+        if seen and not self._extends(df, seen):
+            logger.debug(f"SwingPivotTracker: candle history changed, rebuilding from {n} candles")
+            self.reset()
+            self.rebuilds += 1
+            seen = 0
+        if n <= seen:
+            return 0
+        timestamps = df["timestamp"].iloc[seen:].tolist()
+        highs = df["high"].iloc[seen:].to_numpy(dtype=float).tolist()
+        lows = df["low"].iloc[seen:].to_numpy(dtype=float).tolist()
+        for timestamp, high, low in zip(timestamps, highs, lows):
+            self.append(timestamp, high, low)
+        return n - seen
+
+    def _extends(self, df: pd.DataFrame, seen: int) -> bool:
+        """Whether df starts with exactly the candles seen so far (a bar revised anywhere is a change)."""
+        if len(df) < seen or df["timestamp"].iat[0] != self._timestamps[0]:
+            return False
+        head = df.iloc[:seen]
+        return (np.array_equal(head["high"].to_numpy(dtype=float), self._highs, equal_nan=True)
+                and np.array_equal(head["low"].to_numpy(dtype=float), self._lows, equal_nan=True)
+                and head["timestamp"].tolist() == self._timestamps)
+
+    def append(self, timestamp, high: float, low: float) -> None:
+        self._timestamps.append(timestamp)
+        self._highs.append(float(high))
+        self._lows.append(float(low))
+        candidate = len(self._timestamps) - 1 - self.right_bars
+        if candidate >= self.left_bars:
+            self._confirm(candidate)
+
+    def _confirm(self, i: int) -> None:
+        """Bar i now has right_bars candles after it: run it through pivot detection and the filters."""
+        if _is_window_extreme(self._highs, i, self.left_bars, self.right_bars, use_max=True):
+            hl, zz = 1.0, self._highs[i]
+        elif _is_window_extreme(self._lows, i, self.left_bars, self.right_bars, use_max=False):
+            hl, zz = -1.0, self._lows[i]
+        else:
+            return
+        prev_hl, prev_zz = self._prev_hl, self._prev_zz
+        # Same four filters as apply_zigzag_filters; for a surviving candidate raw_ph/raw_pl
+        # match hl, and ph/pl equal zz, so each pair of filters collapses into one test.
+        if hl == -1.0 and ((prev_hl == -1.0 and zz > prev_zz) or (prev_hl == 1.0 and zz > prev_zz)):
+            return
+        if hl == 1.0 and ((prev_hl == 1.0 and zz < prev_zz) or (prev_hl == -1.0 and zz < prev_zz)):
+            return
+        self._prev_hl, self._prev_zz = hl, zz
+        self._label(i, hl, zz)
+
+    def _label(self, i: int, hl: float, zz: float) -> None:
+        is_high = hl == 1.0
+        b = self._last_low if is_high else self._last_high
+        c = self._before(b, want_high=is_high)
+        d = self._before(c, want_high=not is_high)
+        e = self._before(d, want_high=is_high)
+        a = zz
+        b, c, d, e = (self.pivots[k]["zz"] if k >= 0 else np.nan for k in (b, c, d, e))
+
+        pivot = {
+            "index": i,
+            "timestamp": self._timestamps[i],
+            "hl": hl,
+            "zz": zz,
+            "prev_high": self._last_high,
+            "prev_low": self._last_low,
+            # Comparisons with NaN are False, so missing b/c/d/e fail a pattern as in the batch code
+            "is_HH": a > b and a > c and c > b and c > d,
+            "is_LL": a < b and a < c and c < b and c < d,
+            "is_HL": (a >= c and b > c and b > d and d > c and d > e) or (a < b and a > c and b < d),
+            "is_LH": (a <= c and b < c and b < d and d < c and d < e) or (a > b and a < c and b > d),
+        }
+        position = len(self.pivots)
+        self.pivots.append(pivot)
+        if is_high:
+            self._last_high = position
+        else:
+            self._last_low = position
+        for label in self.LABELS:
+            if pivot[label]:
+                self._last_labelled[label] = pivot
+
+    def _before(self, position: int, want_high: bool) -> int:
+        """Position of the last high (or low) pivot before the pivot at `position`; -1 if none."""
+        if position < 0:
+            return -1
+        return self.pivots[position]["prev_high" if want_high else "prev_low"]
+
+    def _point(self, label: str):
+        pivot = self._last_labelled[label]
+        return {'timestamp': pivot['timestamp'], 'price': pivot['zz']} if pivot is not None else None
+
+    def get_last_swing_points(self):
+        """Same as get_last_swing_points(find_hhlh_pivots(df)): (HH, LL, HL, LH) dicts or None."""
+        return self._point("is_HH"), self._point("is_LL"), self._point("is_HL"), self._point("is_LH")
+
+    def get_latest_confirmed_high_low(self):
+        """Same as get_latest_confirmed_high_low(find_hhlh_pivots(df)): (latest_high, latest_low)."""
+        hh, ll, hl, lh = self.get_last_swing_points()
+        if hh is not None and lh is not None:
+            latest_high = hh if hh['timestamp'] > lh['timestamp'] else lh
+        else:
+            latest_high = hh or lh
+        if ll is not None and hl is not None:
+            latest_low = ll if ll['timestamp'] > hl['timestamp'] else hl
+        else:
+            latest_low = ll or hl
+        return latest_high, latest_low
+
+
+def _is_window_extreme(values: list, i: int, left_bars: int, right_bars: int, use_max: bool) -> bool:
+    """compute_raw_pivots' test for one bar: strictly beyond the left window, at least equal to the right one."""
+    value = values[i]
+    if math.isnan(value):
+        return False
+    for other in values[i - left_bars:i]:
+        if math.isnan(other) or (other >= value if use_max else other <= value):
+            return False
+    for other in values[i + 1:i + right_bars + 1]:
+        if math.isnan(other) or (other > value if use_max else other < value):
+            return False
+    return True
+
+
 def sanitize_symbol_for_db(symbol):
     """
     Sanitize symbol for database lookup by removing NSE: prefix and -INDEX suffix.
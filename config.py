@@ -23,6 +23,13 @@ class Settings(BaseSettings):
     # This will be constructed by the validator below
     database_url: Optional[PostgresDsn] = None
     poll_interval: int = 10
+    # Prometheus /metrics port of the trading process (main.py); 0 disables it
+    metrics_port: int = 9101
+    # Fraction of strategy cycles / order-monitor ticks traced (0 disables tracing) and where spans go
+    trace_sample_ratio: float = 0.0
+    trace_exporter: str = "file"  # "file" (Files/traces/spans-YYYY-MM-DD.jsonl) or "stdout"
+    # Days of closed candles the local candle store keeps; raise it to hold backtest history
+    candle_store_retention_days: int = 60
 
     @model_validator(mode='after')
     def assemble_db_connection(self) -> 'Settings':
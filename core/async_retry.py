@@ -5,12 +5,13 @@ automatic rate limiting coordination.
 """
 
 import asyncio
+import copy
 import random
 import time
 from typing import Any, Callable, Optional, Union, Tuple, Dict
 from functools import wraps
 from algosat.common.logger import get_logger
-from algosat.core.rate_limiter import rate_limited_call
+from algosat.core.rate_limiter import Lane, rate_limited_call
 
 logger = get_logger("async_retry")
 
@@ -26,7 +27,9 @@ class RetryConfig:
         jitter: bool = True,
         exceptions: Tuple = (Exception,),
         rate_limit_broker: Optional[str] = None,
-        rate_limit_tokens: int = 1
+        rate_limit_tokens: int = 1,
+        rate_limit_lane: Optional[Lane] = None,
+        rate_limit_endpoint: Optional[str] = None
     ):
         self.max_attempts = max_attempts
         self.initial_delay = initial_delay
@@ -36,6 +39,8 @@ class RetryConfig:
         self.exceptions = exceptions
         self.rate_limit_broker = rate_limit_broker
         self.rate_limit_tokens = rate_limit_tokens
+        self.rate_limit_lane = rate_limit_lane
+        self.rate_limit_endpoint = rate_limit_endpoint
 
 async def async_retry_with_rate_limit(
     coro_func: Callable,
@@ -69,7 +74,8 @@ async def async_retry_with_rate_limit(
         try:
             # Apply rate limiting if configured
             if config.rate_limit_broker:
-                async with rate_limited_call(config.rate_limit_broker, config.rate_limit_tokens):
+                async with rate_limited_call(config.rate_limit_broker, config.rate_limit_tokens,
+                                             lane=config.rate_limit_lane, endpoint=config.rate_limit_endpoint):
                     result = await coro_func(*args, **kwargs)
             else:
                 result = await coro_func(*args, **kwargs)
@@ -109,7 +115,8 @@ def broker_retry(
     initial_delay: float = 1.0,
     backoff: float = 2.0,
     tokens: int = 1,
-    exceptions: Tuple = (Exception,)
+    exceptions: Tuple = (Exception,),
+    endpoint: Optional[str] = None
 ):
     """
     Decorator for broker API methods that adds retry logic and rate limiting.
@@ -121,6 +128,7 @@ def broker_retry(
         backoff: Backoff multiplier for delay
         tokens: Number of rate limit tokens to acquire
         exceptions: Tuple of exceptions to catch and retry
+        endpoint: Endpoint group for per-endpoint limits and the priority lane
     """
     def decorator(func):
         @wraps(func)
@@ -131,7 +139,8 @@ def broker_retry(
                 backoff=backoff,
                 exceptions=exceptions,
                 rate_limit_broker=broker_name,
-                rate_limit_tokens=tokens
+                rate_limit_tokens=tokens,
+                rate_limit_endpoint=endpoint
             )
             return await async_retry_with_rate_limit(func, *args, config=config, **kwargs)
         return wrapper
@@ -174,8 +183,8 @@ BROKER_RETRY_CONFIGS = {
 }
 
 def get_retry_config(name: str) -> RetryConfig:
-    """Get a predefined retry configuration by name."""
-    return BROKER_RETRY_CONFIGS.get(name, BROKER_RETRY_CONFIGS["default"])
+    """Get a copy of a predefined retry configuration by name (callers set the broker/endpoint on it)."""
+    return copy.copy(BROKER_RETRY_CONFIGS.get(name, BROKER_RETRY_CONFIGS["default"]))
 
 class RetryStats:
     """Track retry statistics for monitoring."""
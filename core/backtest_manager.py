@@ -1 +1,905 @@
-"""Backtest execution via Backtrader."""
+"""
+Event-driven backtest engine.
+
+Stored 1-minute candles are replayed bar by bar through the existing strategy classes.
+The strategies run against a SimulatedDataManager (history and LTP cut off at the
+simulated clock, closed candles only) and a SimulatedOrderManager whose broker fills
+orders from the following bars with slippage, stop-loss/target handling and an intraday
+square-off. The output is one record per trade plus equity-curve statistics.
+
+The live process_cycle() methods need the database, the wall clock and the broker for
+strike selection, trade limits and position sync, so each strategy family has an adapter
+that drives the strategy's own signal and order methods (evaluate_signal /
+evaluate_trade_signal, process_order) at the cadence process_cycle would run them.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field, is_dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from algosat.common import constants
+from algosat.common.logger import get_logger
+from algosat.core.candle_store import CandleStore, candle_times, to_naive_ist
+from algosat.core.signal import TradeSignal
+
+logger = get_logger("backtest_manager")
+
+IST = pytz.timezone("Asia/Kolkata")
+MARKET_OPEN = "09:15"
+
+ORDER_MARKET = "MARKET"
+ORDER_STOP = "STOP"
+
+EXIT_STOPLOSS = "STOPLOSS"
+EXIT_TARGET = "TARGET"
+EXIT_SQUARE_OFF = "SQUARE_OFF"
+EXIT_END_OF_DATA = "END_OF_DATA"
+
+# Modules that bind get_ist_datetime by name and must see the simulated clock.
+CLOCK_PATCH_MODULES = (
+    "algosat.core.time_utils",
+    "algosat.common.strategy_utils",
+    "algosat.common.swing_utils",
+    "algosat.strategies.option_buy",
+    "algosat.strategies.option_sell",
+    "algosat.strategies.swing_highlow_buy",
+    "algosat.strategies.swing_highlow_sell",
+)
+
+
+@dataclass
+class BacktestConfig:
+    """Run settings that are not part of the strategy's own trade config."""
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    initial_capital: float = 100000.0
+    slippage: float = 0.0                 # price points per fill, always against the trade
+    commission_per_order: float = 20.0    # flat charge per filled order (entry and exit)
+    lot_size: int = 75                    # used when the trade config has no lot_size
+    square_off_time: Optional[str] = "15:15"
+    entry_timeout_minutes: Optional[int] = None  # pending stop entries; defaults to the strategy interval
+    lookback_bars: int = 300              # trailing window handed to the strategy per evaluation
+    quiet: bool = True                    # silence strategy INFO/DEBUG logging during the replay
+
+
+# --- candles ---
+
+def resample_candles(frame: pd.DataFrame, interval: Any, first_candle_time: str = MARKET_OPEN) -> pd.DataFrame:
+    """
+    Aggregate 1-minute candles to `interval` minutes (anchored at the session open) or "day".
+    The result has naive IST 'timestamp' (candle start) and 'close_time' columns.
+    """
+    times = candle_times(frame).to_numpy()
+    base = pd.DataFrame({
+        "open": frame["open"].to_numpy(dtype=float),
+        "high": frame["high"].to_numpy(dtype=float),
+        "low": frame["low"].to_numpy(dtype=float),
+        "close": frame["close"].to_numpy(dtype=float),
+        "volume": frame["volume"].to_numpy(dtype=float) if "volume" in frame.columns else np.zeros(len(frame)),
+    })
+    days = times.astype("datetime64[D]")
+    if interval == "day":
+        bucket = days.astype("datetime64[m]")
+    else:
+        interval = int(interval)
+        open_hour, open_minute = (int(part) for part in first_candle_time.split(":"))
+        session_open = days.astype("datetime64[m]") + np.timedelta64(open_hour * 60 + open_minute, "m")
+        offset = (times.astype("datetime64[m]") - session_open).astype(np.int64)
+        bucket = session_open + (np.floor_divide(offset, interval) * interval).astype("timedelta64[m]")
+    base["timestamp"] = bucket
+    base["last"] = times.astype("datetime64[m]")
+    grouped = base.groupby("timestamp", sort=True).agg(
+        open=("open", "first"), high=("high", "max"), low=("low", "min"),
+        close=("close", "last"), volume=("volume", "sum"), last=("last", "max"),
+    ).reset_index()
+    grouped["close_time"] = grouped["last"] + pd.Timedelta(minutes=1)
+    return grouped.drop(columns=["last"])
+
+
+class SimulatedClock:
+    """Replay clock; patch() rebinds get_ist_datetime in the strategy modules to it."""
+
+    def __init__(self):
+        self.now: Optional[datetime] = None
+        self.now_ns: int = 0  # naive IST epoch nanoseconds, for searchsorted lookups
+
+    def set(self, naive_ist) -> None:
+        naive_ist = pd.Timestamp(naive_ist)
+        self.now = IST.localize(naive_ist.to_pydatetime())
+        self.now_ns = naive_ist.value
+
+    def __call__(self):
+        return self.now
+
+    def patch(self, module_names: Iterable[str] = CLOCK_PATCH_MODULES):
+        return _ClockPatch(self, module_names)
+
+
+class _ClockPatch:
+    def __init__(self, clock: SimulatedClock, module_names: Iterable[str]):
+        self.clock = clock
+        self.module_names = module_names
+        self._saved = []
+
+    def __enter__(self):
+        import importlib
+        for name in self.module_names:
+            try:
+                module = importlib.import_module(name)
+            except Exception as e:
+                logger.debug(f"Clock patch skipped for {name}: {e}")
+                continue
+            for attr in ("get_ist_datetime", "get_ist_now"):
+                if hasattr(module, attr):
+                    self._saved.append((module, attr, getattr(module, attr)))
+                    setattr(module, attr, self.clock)
+        return self.clock
+
+    def __exit__(self, *exc):
+        for module, attr, original in reversed(self._saved):
+            setattr(module, attr, original)
+        self._saved.clear()
+        return False
+
+
+class SimulatedDataManager:
+    """
+    DataManager stand-in serving preloaded candles. History requests only ever see candles
+    that have closed at the simulated clock; resampled intervals are built once and cached.
+    """
+
+    def __init__(self, candles: Dict[str, pd.DataFrame], clock: SimulatedClock, first_candle_time: str = MARKET_OPEN):
+        self.clock = clock
+        self.first_candle_time = first_candle_time
+        self._minute: Dict[str, pd.DataFrame] = {}
+        self._frames: Dict[tuple, pd.DataFrame] = {}
+        self._close_ns: Dict[tuple, np.ndarray] = {}
+        self._start_ns: Dict[tuple, np.ndarray] = {}
+        for symbol, frame in candles.items():
+            frame = frame.copy()
+            frame["timestamp"] = candle_times(frame).to_numpy()
+            frame = frame.sort_values("timestamp").drop_duplicates("timestamp", keep="last").reset_index(drop=True)
+            self._minute[symbol] = frame
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._minute)
+
+    def minute_frame(self, symbol: str) -> pd.DataFrame:
+        return self._minute[symbol]
+
+    def interval_frame(self, symbol: str, interval: Any) -> pd.DataFrame:
+        """Full resampled series for symbol (including candles after the clock)."""
+        key = (symbol, interval)
+        if key not in self._frames:
+            minute = self._minute[symbol]
+            frame = minute.assign(close_time=minute["timestamp"] + pd.Timedelta(minutes=1)) if interval == 1 \
+                else resample_candles(minute, interval, self.first_candle_time)
+            frame.attrs[constants.COLUMN_SYMBOL] = symbol
+            self._frames[key] = frame
+            self._close_ns[key] = frame["close_time"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+            self._start_ns[key] = frame["timestamp"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+        return self._frames[key]
+
+    def closed_count(self, symbol: str, interval: Any) -> int:
+        """Number of candles of this interval that have closed at the simulated clock."""
+        self.interval_frame(symbol, interval)
+        return int(np.searchsorted(self._close_ns[(symbol, interval)], self.clock.now_ns, side="right"))
+
+    def window(self, symbol: str, interval: Any, bars: Optional[int] = None) -> pd.DataFrame:
+        """The last `bars` closed candles at the simulated clock."""
+        frame = self.interval_frame(symbol, interval)
+        end = self.closed_count(symbol, interval)
+        start = 0 if bars is None else max(0, end - bars)
+        window = frame.iloc[start:end].drop(columns=["close_time"]).reset_index(drop=True)
+        window.attrs = dict(frame.attrs)
+        return window
+
+    # --- DataManager interface used by strategies and strategy_utils ---
+
+    async def get_history(self, symbol, from_date, to_date, ohlc_interval=None, ins_type="", cache=True, use_store=True):
+        if symbol not in self._minute:
+            logger.warning(f"No backtest candles loaded for {symbol}")
+            return None
+        interval = "day" if ohlc_interval in ("day", "D", "1D", 1440) else int(ohlc_interval)
+        frame = self.interval_frame(symbol, interval)
+        key = (symbol, interval)
+        start_ns = self._start_ns[key]
+        lo = int(np.searchsorted(start_ns, to_naive_ist(from_date).value, side="left")) if from_date is not None else 0
+        hi = int(np.searchsorted(start_ns, to_naive_ist(to_date).value, side="right")) if to_date is not None else len(frame)
+        hi = min(hi, self.closed_count(symbol, interval))
+        history = frame.iloc[lo:hi].drop(columns=["close_time"]).reset_index(drop=True)
+        history.attrs = dict(frame.attrs)
+        return history
+
+    async def get_ltp(self, symbol):
+        if isinstance(symbol, (list, tuple)):
+            return {s: self.last_price(s) for s in symbol}
+        return {symbol: self.last_price(symbol)}
+
+    def last_price(self, symbol: str) -> Optional[float]:
+        if symbol not in self._minute:
+            return None
+        count = self.closed_count(symbol, 1)
+        if count == 0:
+            return None
+        return float(self._minute[symbol]["close"].iat[count - 1])
+
+    def regime_reference(self, symbol: str, first_candle_time: str, first_candle_interval: int) -> Optional[dict]:
+        """Same shape as strategy_utils.get_regime_reference_points, built from loaded candles."""
+        if symbol not in self._minute:
+            return None
+        today = to_naive_ist(self.clock()).normalize()
+        daily = self.interval_frame(symbol, "day")
+        previous = daily[daily["timestamp"] < today]
+        if previous.empty:
+            return None
+        intraday = self.interval_frame(symbol, first_candle_interval)
+        first_start = today + pd.Timedelta(first_candle_time + ":00")
+        first = intraday[intraday["timestamp"] == first_start]
+        if first.empty or first["close_time"].iat[0] > to_naive_ist(self.clock()):
+            return None
+        return {
+            "prev_day_high": float(previous["high"].iat[-1]),
+            "prev_day_low": float(previous["low"].iat[-1]),
+            "first_candle_high": float(first["high"].iat[0]),
+            "first_candle_low": float(first["low"].iat[0]),
+            "first_candle_time": first_candle_time,
+            "first_candle_interval": first_candle_interval,
+            "trade_day": IST.localize(today.to_pydatetime()),
+        }
+
+    def get_current_broker_name(self) -> str:
+        return "backtest"
+
+    async def ensure_broker(self):
+        return None
+
+    async def _ensure_broker(self):
+        return None
+
+
+# --- orders and fills ---
+
+@dataclass
+class SimulatedOrder:
+    order_id: int
+    symbol: str
+    side: str                        # "BUY" or "SELL"
+    qty: int
+    order_type: str = ORDER_MARKET   # MARKET fills at the next bar open, STOP at the trigger
+    trigger_price: Optional[float] = None
+    stop_loss: Optional[float] = None
+    target_price: Optional[float] = None
+    signal_time: Any = None
+    placed_at: Any = None
+    expires_at: Any = None
+    key: Optional[str] = None        # adapter position key (strike) notified on close
+    meta: Dict[str, Any] = field(default_factory=dict)
+    status: str = "AWAITING_ENTRY"
+    entry_time: Any = None
+    entry_price: Optional[float] = None
+    entry_bar: Optional[int] = None
+
+
+class SimulatedBroker:
+    """
+    Fills orders against 1-minute bars. Orders placed at a bar close are first eligible on
+    the next bar. When a bar touches both stop-loss and target the stop-loss is assumed to
+    have been hit first; gaps through a level fill at the bar open.
+    """
+
+    def __init__(self, settings: BacktestConfig, data_manager: SimulatedDataManager):
+        self.settings = settings
+        self.dm = data_manager
+        self.pending: Dict[int, SimulatedOrder] = {}
+        self.open: Dict[int, SimulatedOrder] = {}
+        self.trades: List[dict] = []
+        self.realized = 0.0
+        self.on_close: Optional[Callable[[SimulatedOrder, dict], None]] = None
+        self._next_id = 1
+        self._arrays: Dict[str, dict] = {}
+
+    def attach(self, master_ns: np.ndarray) -> None:
+        """Align each symbol's minute bars with the replay timeline."""
+        for symbol in self.dm.symbols:
+            frame = self.dm.minute_frame(symbol)
+            ts = frame["timestamp"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+            pos = np.searchsorted(ts, master_ns)
+            clipped = np.minimum(pos, len(ts) - 1)
+            self._arrays[symbol] = {
+                "row": np.where(ts[clipped] == master_ns, clipped, -1),
+                "open": frame["open"].to_numpy(dtype=float),
+                "high": frame["high"].to_numpy(dtype=float),
+                "low": frame["low"].to_numpy(dtype=float),
+                "close": frame["close"].to_numpy(dtype=float),
+            }
+
+    def submit(self, order: SimulatedOrder) -> SimulatedOrder:
+        order.order_id = self._next_id
+        self._next_id += 1
+        self.pending[order.order_id] = order
+        return order
+
+    def has_exposure(self, key: str) -> bool:
+        return any(o.key == key for o in self.pending.values()) or any(o.key == key for o in self.open.values())
+
+    def _bar(self, symbol: str, i: int):
+        arrays = self._arrays.get(symbol)
+        if arrays is None:
+            return None
+        row = arrays["row"][i]
+        if row < 0:
+            return None
+        return arrays["open"][row], arrays["high"][row], arrays["low"][row], arrays["close"][row]
+
+    def process_bar(self, i: int, bar_time: pd.Timestamp, square_off: bool) -> None:
+        slip = self.settings.slippage
+        for order in list(self.pending.values()):
+            if square_off or (order.expires_at is not None and bar_time >= order.expires_at):
+                order.status = "CANCELLED"
+                del self.pending[order.order_id]
+                if self.on_close:
+                    self.on_close(order, None)
+                continue
+            bar = self._bar(order.symbol, i)
+            if bar is None:
+                continue
+            o, h, l, _ = bar
+            buy = order.side == "BUY"
+            if order.order_type == ORDER_MARKET:
+                price = o + slip if buy else o - slip
+            elif buy and h >= order.trigger_price:
+                price = max(o, order.trigger_price) + slip
+            elif not buy and l <= order.trigger_price:
+                price = min(o, order.trigger_price) - slip
+            else:
+                continue
+            order.status = "OPEN"
+            order.entry_time, order.entry_price, order.entry_bar = bar_time, float(price), i
+            del self.pending[order.order_id]
+            self.open[order.order_id] = order
+            # Inside the fill bar only the stop-loss is checked (pessimistic ordering)
+            if order.stop_loss is not None and ((buy and l <= order.stop_loss) or (not buy and h >= order.stop_loss)):
+                self._close(order, order.stop_loss - slip if buy else order.stop_loss + slip, bar_time, EXIT_STOPLOSS, i)
+
+        for order in list(self.open.values()):
+            if order.entry_bar == i:
+                continue
+            bar = self._bar(order.symbol, i)
+            if bar is None:
+                continue
+            o, h, l, _ = bar
+            buy = order.side == "BUY"
+            if square_off:
+                self._close(order, o - slip if buy else o + slip, bar_time, EXIT_SQUARE_OFF, i)
+                continue
+            sl, target = order.stop_loss, order.target_price
+            if sl is not None and ((buy and l <= sl) or (not buy and h >= sl)):
+                price = (min(o, sl) - slip) if buy else (max(o, sl) + slip)
+                self._close(order, price, bar_time, EXIT_STOPLOSS, i)
+            elif target is not None and ((buy and h >= target) or (not buy and l <= target)):
+                price = max(o, target) if buy else min(o, target)
+                self._close(order, price, bar_time, EXIT_TARGET, i)
+
+    def exit(self, order_id: int, reason: str, bar_time, i: int) -> bool:
+        """Market exit at the close of the bar that just finished."""
+        order = self.open.get(order_id)
+        if order is None:
+            pending = self.pending.pop(order_id, None)
+            if pending and self.on_close:
+                pending.status = "CANCELLED"
+                self.on_close(pending, None)
+            return pending is not None
+        price = self.dm.last_price(order.symbol)
+        if price is None:
+            return False
+        slip = self.settings.slippage
+        self._close(order, price - slip if order.side == "BUY" else price + slip, bar_time, reason, i)
+        return True
+
+    def close_all(self, bar_time, i: int) -> None:
+        for order_id in list(self.open):
+            self.exit(order_id, EXIT_END_OF_DATA, bar_time, i)
+        for order_id in list(self.pending):
+            self.exit(order_id, EXIT_END_OF_DATA, bar_time, i)
+
+    def _close(self, order: SimulatedOrder, price: float, bar_time, reason: str, i: int) -> None:
+        direction = 1 if order.side == "BUY" else -1
+        gross = round(direction * (price - order.entry_price) * order.qty, 2)
+        charges = 2 * self.settings.commission_per_order
+        record = {
+            "trade_id": order.order_id,
+            "symbol": order.symbol,
+            "side": order.side,
+            "qty": order.qty,
+            "signal_time": order.signal_time,
+            "entry_time": order.entry_time,
+            "entry_price": round(order.entry_price, 2),
+            "exit_time": bar_time,
+            "exit_price": round(float(price), 2),
+            "stop_loss": order.stop_loss,
+            "target_price": order.target_price,
+            "exit_reason": reason,
+            "bars_held": i - order.entry_bar,
+            "gross_pnl": gross,
+            "charges": charges,
+            "pnl": round(gross - charges, 2),
+            **order.meta,
+        }
+        order.status = "CLOSED"
+        self.open.pop(order.order_id, None)
+        self.realized += record["pnl"]
+        self.trades.append(record)
+        if self.on_close:
+            self.on_close(order, record)
+
+    def unrealized(self, i: int) -> float:
+        total = 0.0
+        for order in self.open.values():
+            bar = self._bar(order.symbol, i)
+            if bar is None:
+                continue
+            direction = 1 if order.side == "BUY" else -1
+            total += direction * (bar[3] - order.entry_price) * order.qty - self.settings.commission_per_order
+        return total
+
+
+@dataclass
+class SimulatedOrderRequest:
+    """What build_order_request_for_strategy returns in a replay: the signal, dict()-able like OrderRequest."""
+    signal: TradeSignal
+
+    def dict(self) -> dict:
+        return asdict(self.signal) if is_dataclass(self.signal) else dict(self.signal)
+
+
+class SimulatedOrderManager:
+    """
+    OrderManager stand-in for strategies' process_order(): the strategy adapter turns the
+    signal into a SimulatedOrder and the SimulatedBroker fills it.
+    """
+
+    def __init__(self, broker: SimulatedBroker, engine: "BacktestEngine"):
+        self.broker = broker
+        self.engine = engine
+        self.broker_manager = self
+        self.order_factory: Optional[Callable[[TradeSignal], Optional[SimulatedOrder]]] = None
+
+    async def build_order_request_for_strategy(self, signal, config):
+        return SimulatedOrderRequest(signal=signal)
+
+    async def place_order(self, config, order_request, strategy_name=None):
+        signal = order_request.signal if isinstance(order_request, SimulatedOrderRequest) else order_request
+        order = self.order_factory(signal) if self.order_factory else None
+        if order is None:
+            return None
+        order.placed_at = self.engine.now
+        self.broker.submit(order)
+        return {"order_id": order.order_id, "status": order.status, "broker_responses": {}}
+
+    async def exit_order(self, order_id, exit_reason=None, check_live_status=False, **kwargs):
+        return self.broker.exit(order_id, exit_reason or "EXIT", self.engine.now, self.engine.bar_index)
+
+    async def update_order_status_in_db(self, order_id, status, **kwargs):
+        return None
+
+
+# --- strategy adapters ---
+
+def _side(value) -> str:
+    value = getattr(value, "value", value)
+    return "SELL" if str(value).upper() in ("SELL", "-1") else "BUY"
+
+
+class StrategyAdapter:
+    """Drives one strategy instance through a replay. Subclasses implement on_bar_close()."""
+
+    #: Minutes between strategy evaluations (process_cycle cadence).
+    interval_minutes: int = 1
+
+    def __init__(self, strategy, engine: "BacktestEngine"):
+        self.strategy = strategy
+        self.engine = engine
+        self.settings = engine.settings
+        self.dm = engine.data_manager
+        self._regime_day = None
+
+    @property
+    def lot_size(self) -> int:
+        trade = getattr(self.strategy, "trade", None) or {}
+        return int(trade.get("lot_size", self.settings.lot_size))
+
+    def prepare(self) -> None:
+        """Called once before the replay starts (precompute indicator frames here)."""
+
+    def make_order(self, signal: TradeSignal) -> Optional[SimulatedOrder]:
+        raise NotImplementedError
+
+    def on_position_closed(self, order: SimulatedOrder, record: Optional[dict]) -> None:
+        positions = getattr(self.strategy, "_positions", None)
+        if isinstance(positions, dict) and order.key is not None:
+            positions.pop(order.key, None)
+
+    async def on_bar_close(self, now: pd.Timestamp) -> None:
+        raise NotImplementedError
+
+    def refresh_regime_reference(self, now: pd.Timestamp, first_candle_interval: int) -> bool:
+        """Set strategy.regime_reference once per day; False until today's first candle has closed."""
+        day = now.normalize()
+        if self._regime_day == day:
+            return self.strategy.regime_reference is not None
+        first_candle_time = self.strategy.trade.get("first_candle_time", MARKET_OPEN)
+        reference = self.dm.regime_reference(self.strategy.symbol, first_candle_time, first_candle_interval)
+        if reference is None:
+            return False
+        self.strategy.regime_reference = reference
+        self._regime_day = day
+        return True
+
+
+class OptionStrategyAdapter(StrategyAdapter):
+    """
+    OptionBuy / OptionSell: each strike's candles are evaluated with evaluate_trade_signal()
+    on every interval close and entries go through process_order() as stop orders at the
+    signal's entry price (the live OPTION_STRATEGY order type is stop-loss-limit).
+    Strikes are the option symbols whose candles were loaded; strike selection from the
+    option chain is not replayed.
+    """
+
+    def __init__(self, strategy, engine: "BacktestEngine"):
+        super().__init__(strategy, engine)
+        self.interval_minutes = int(strategy.trade.get("interval_minutes", 5))
+        self.strikes = [s for s in self.dm.symbols if s != strategy.symbol]
+        self._indicators: Dict[str, pd.DataFrame] = {}
+
+    def prepare(self) -> None:
+        # Supertrend/ATR/SMA/VWAP are causal, so they are computed once over the whole series
+        for strike in self.strikes:
+            frame = self.dm.interval_frame(strike, self.interval_minutes)
+            data = frame.drop(columns=["close_time"]).copy()
+            self._indicators[strike] = self.strategy.compute_entry_indicators(data, strike).reset_index(drop=True)
+
+    def make_order(self, signal: TradeSignal) -> Optional[SimulatedOrder]:
+        entry = signal.entry_price if signal.entry_price is not None else signal.price
+        if entry is None:
+            return None
+        timeout = self.settings.entry_timeout_minutes or self.interval_minutes
+        return SimulatedOrder(
+            order_id=0,
+            symbol=signal.symbol,
+            side=_side(signal.side),
+            qty=int(signal.lot_qty or 1) * self.lot_size,
+            order_type=ORDER_STOP,
+            trigger_price=float(entry),
+            stop_loss=signal.stop_loss,
+            target_price=signal.target_price,
+            signal_time=signal.signal_time,
+            expires_at=self.engine.now + pd.Timedelta(minutes=timeout),
+            key=signal.symbol,
+            meta={"strike": signal.symbol},
+        )
+
+    async def on_bar_close(self, now: pd.Timestamp) -> None:
+        if not self.refresh_regime_reference(now, self.interval_minutes):
+            return
+        for strike in self.strikes:
+            if self.engine.broker.has_exposure(strike):
+                continue
+            end = self.dm.closed_count(strike, self.interval_minutes)
+            if end < 2:
+                continue
+            data = self._indicators[strike]
+            window = data.iloc[max(0, end - self.settings.lookback_bars):end].copy()
+            signal = await self.strategy.evaluate_trade_signal(window, self.strategy.trade, strike)
+            if signal:
+                await self.strategy.process_order(signal, window, strike)
+
+
+class SwingStrategyAdapter(StrategyAdapter):
+    """
+    SwingHighLowBuy / SwingHighLowSell: runs on every confirm-timeframe close like
+    process_cycle, passes the entry and confirm windows to evaluate_signal() and trades
+    the breakout on the underlying (stop-loss / target at the signal's spot levels).
+    The option strike the live strategy would buy is kept on each trade record. Smart
+    levels need the database and are disabled for the replay.
+
+    Swing levels only change when an entry candle closes, so they are computed once per
+    entry candle and evaluate_signal() is skipped on confirm closes where its breakout
+    check cannot pass.
+    """
+
+    def __init__(self, strategy, engine: "BacktestEngine"):
+        super().__init__(strategy, engine)
+        self.interval_minutes = int(strategy.confirm_minutes)
+        self.entry_minutes = int(strategy.entry_minutes)
+        self._confirmation: Optional[dict] = None
+        self._levels_at: Optional[int] = None
+        self._levels: Optional[tuple] = None
+        strategy._smart_levels_enabled = False
+        strategy.fetch_history_data = self.fetch_history_data
+
+    async def fetch_history_data(self, broker, symbols, interval_minutes):
+        return {symbol: self.dm.window(symbol, int(interval_minutes), self.settings.lookback_bars) for symbol in symbols}
+
+    def make_order(self, signal: TradeSignal) -> Optional[SimulatedOrder]:
+        symbol = self.strategy.symbol
+        direction = signal.signal_direction
+        if direction not in ("UP", "DOWN"):
+            return None
+        return SimulatedOrder(
+            order_id=0,
+            symbol=symbol,
+            side="BUY" if direction == "UP" else "SELL",
+            qty=int(signal.lot_qty or 1) * self.lot_size,
+            stop_loss=signal.stoploss_spot_level,
+            target_price=signal.target_spot_level,
+            signal_time=signal.signal_time,
+            key=symbol,
+            meta={"strike": signal.symbol, "signal_direction": direction},
+        )
+
+    async def on_bar_close(self, now: pd.Timestamp) -> None:
+        symbol = self.strategy.symbol
+        if self._confirmation is not None:
+            await self._check_atomic_confirmation()
+            return
+        if self.engine.broker.has_exposure(symbol):
+            return
+        if not self.refresh_regime_reference(now, self.entry_minutes):
+            return
+        if not self._breakout_possible():
+            return
+        confirm_df = self.dm.window(symbol, self.interval_minutes, self.settings.lookback_bars)
+        entry_df = self.dm.window(symbol, self.entry_minutes, self.settings.lookback_bars)
+        if len(confirm_df) < 2 or len(entry_df) < 10:
+            return
+        confirm_df["timestamp"] = confirm_df["timestamp"].dt.tz_localize(IST)
+        signal = await self.strategy.evaluate_signal(entry_df, confirm_df, self.strategy.trade)
+        if not signal:
+            return
+        order_info = await self.strategy.process_order(signal, confirm_df, signal.symbol)
+        if order_info and self.strategy.confirm_atomic:
+            self._confirmation = {
+                "order_id": order_info.get("order_id"),
+                "direction": signal.signal_direction,
+                "confirm_close": float(confirm_df["close"].iat[-1]),
+                "after": self.dm.closed_count(symbol, self.entry_minutes),
+            }
+
+    def _breakout_possible(self) -> bool:
+        """Same breakout test as evaluate_signal, against levels cached per entry candle."""
+        from algosat.common import swing_utils
+        symbol = self.strategy.symbol
+        entry_count = self.dm.closed_count(symbol, self.entry_minutes)
+        if entry_count != self._levels_at:
+            self._levels_at = entry_count
+            self._levels = None
+            entry_df = self.dm.window(symbol, self.entry_minutes, self.settings.lookback_bars)
+            if len(entry_df) >= 10:
+                swing_df = swing_utils.find_hhlh_pivots(
+                    entry_df,
+                    left_bars=self.strategy.entry_swing_left_bars,
+                    right_bars=self.strategy.entry_swing_right_bars,
+                )
+                last_high, last_low = swing_utils.get_latest_confirmed_high_low(swing_df)
+                if last_high and last_low:
+                    buffer = self.strategy.entry_buffer
+                    self._levels = (last_high["price"] + buffer, last_low["price"] - buffer)
+        if self._levels is None:
+            return False
+        closes = self.dm.window(symbol, self.interval_minutes, 2)["close"].to_numpy()
+        if len(closes) < 2:
+            return False
+        high_level, low_level = self._levels
+        prev_close, last_close = closes
+        return (prev_close > high_level and last_close > prev_close) or (prev_close < low_level and last_close < prev_close)
+
+    async def _check_atomic_confirmation(self) -> None:
+        """Mirror of process_cycle's atomic check: the next entry candle must close beyond the breakout candle."""
+        pending = self._confirmation
+        symbol = self.strategy.symbol
+        if self.dm.closed_count(symbol, self.entry_minutes) <= pending["after"]:
+            return
+        self._confirmation = None
+        latest_close = float(self.dm.window(symbol, self.entry_minutes, 1)["close"].iat[-1])
+        confirmed = (pending["direction"] == "UP" and latest_close > pending["confirm_close"]) or \
+                    (pending["direction"] == "DOWN" and latest_close < pending["confirm_close"])
+        if not confirmed:
+            await self.engine.order_manager.exit_order(pending["order_id"], exit_reason="ATOMIC_CONFIRMATION_FAILED")
+
+
+ADAPTERS: Dict[str, type] = {
+    "OptionBuyStrategy": OptionStrategyAdapter,
+    "OptionSellStrategy": OptionStrategyAdapter,
+    "SwingHighLowBuyStrategy": SwingStrategyAdapter,
+    "SwingHighLowSellStrategy": SwingStrategyAdapter,
+}
+
+
+# --- results ---
+
+def equity_statistics(equity: pd.Series, trades: List[dict], initial_capital: float) -> Dict[str, Any]:
+    """Summary statistics for an equity curve (indexed by bar time) and its closed trades."""
+    pnls = np.array([t["pnl"] for t in trades], dtype=float)
+    wins, losses = pnls[pnls > 0], pnls[pnls <= 0]
+    values = equity.to_numpy(dtype=float) if len(equity) else np.array([initial_capital])
+    peaks = np.maximum.accumulate(values)
+    drawdowns = peaks - values
+    worst = int(drawdowns.argmax()) if len(drawdowns) else 0
+    daily = equity.groupby(equity.index.normalize()).last() if len(equity) else equity
+    daily_returns = daily.pct_change().dropna() if len(daily) > 1 else pd.Series(dtype=float)
+    std = float(daily_returns.std()) if len(daily_returns) > 1 else 0.0
+    return {
+        "initial_capital": initial_capital,
+        "final_equity": round(float(values[-1]), 2),
+        "net_pnl": round(float(values[-1] - initial_capital), 2),
+        "return_pct": round(float(values[-1] / initial_capital - 1) * 100, 2),
+        "trades": int(len(pnls)),
+        "wins": int(len(wins)),
+        "losses": int(len(losses)),
+        "win_rate": round(len(wins) / len(pnls) * 100, 2) if len(pnls) else 0.0,
+        "avg_win": round(float(wins.mean()), 2) if len(wins) else 0.0,
+        "avg_loss": round(float(losses.mean()), 2) if len(losses) else 0.0,
+        "profit_factor": round(float(wins.sum() / -losses.sum()), 2) if losses.sum() < 0 else None,
+        "max_drawdown": round(float(drawdowns.max()), 2) if len(drawdowns) else 0.0,
+        "max_drawdown_pct": round(float(drawdowns[worst] / peaks[worst]) * 100, 2) if len(drawdowns) and peaks[worst] else 0.0,
+        "sharpe": round(float(daily_returns.mean() / std * np.sqrt(252)), 2) if std > 0 else None,
+    }
+
+
+@dataclass
+class BacktestResult:
+    trades: List[dict]
+    equity: pd.Series
+    stats: Dict[str, Any]
+
+    def trades_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.trades)
+
+    def save(self, name: str, directory: str = constants.BACKTEST_RESULTS_DIR) -> str:
+        """Write <name>_trades.csv, <name>_equity.csv and <name>_stats.json; returns the stats path."""
+        os.makedirs(directory, exist_ok=True)
+        self.trades_frame().to_csv(os.path.join(directory, f"{name}_trades.csv"), index=False)
+        self.equity.rename("equity").to_csv(os.path.join(directory, f"{name}_equity.csv"))
+        stats_path = os.path.join(directory, f"{name}_stats.json")
+        with open(stats_path, "w") as f:
+            json.dump(self.stats, f, indent=2, default=str)
+        return stats_path
+
+
+# --- engine ---
+
+class BacktestEngine:
+    """
+    Replays 1-minute candles through one strategy.
+
+    candles maps symbol -> 1-minute OHLCV frame ('timestamp' column, naive or tz-aware IST).
+    It must contain the strategy's underlying (config.symbol), which drives the replay clock,
+    plus any option strikes the strategy trades.
+    """
+
+    def __init__(self, strategy_cls, config, candles: Dict[str, pd.DataFrame],
+                 settings: Optional[BacktestConfig] = None, adapter_cls: Optional[type] = None):
+        self.settings = settings or BacktestConfig()
+        self.config = config
+        if config.symbol not in candles:
+            raise ValueError(f"Candles for the underlying {config.symbol} are required")
+        first_candle_time = (config.trade or {}).get("first_candle_time", MARKET_OPEN)
+        self.clock = SimulatedClock()
+        self.data_manager = SimulatedDataManager(self._clip(candles), self.clock, first_candle_time)
+        self.broker = SimulatedBroker(self.settings, self.data_manager)
+        self.order_manager = SimulatedOrderManager(self.broker, self)
+        self.strategy = strategy_cls(config, self.data_manager, self.order_manager)
+        adapter_cls = adapter_cls or ADAPTERS.get(type(self.strategy).__name__)
+        if adapter_cls is None:
+            raise ValueError(f"No backtest adapter for {type(self.strategy).__name__}")
+        self.adapter = adapter_cls(self.strategy, self)
+        self.order_manager.order_factory = self.adapter.make_order
+        self.broker.on_close = self.adapter.on_position_closed
+        self.now: Optional[pd.Timestamp] = None
+        self.bar_index = 0
+
+    @classmethod
+    async def from_store(cls, strategy_cls, config, symbols: Iterable[str], store: Optional[CandleStore] = None,
+                         settings: Optional[BacktestConfig] = None, adapter_cls: Optional[type] = None):
+        """Build an engine from the 1-minute series in the local candle store."""
+        store = store or CandleStore()
+        candles = {}
+        for symbol in symbols:
+            series = await store.load(symbol, 1)
+            if series is None:
+                raise ValueError(f"No stored 1-minute candles for {symbol}")
+            candles[symbol] = series.frame
+        return cls(strategy_cls, config, candles, settings=settings, adapter_cls=adapter_cls)
+
+    def _clip(self, candles: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        start = to_naive_ist(self.settings.start) if self.settings.start is not None else None
+        end = to_naive_ist(self.settings.end) if self.settings.end is not None else None
+        if start is None and end is None:
+            return candles
+        clipped = {}
+        for symbol, frame in candles.items():
+            times = candle_times(frame)
+            mask = pd.Series(True, index=times.index)
+            # Keep a few days before start so indicators and the previous-day regime reference are warm
+            if start is not None:
+                mask &= times >= start - pd.Timedelta(days=7)
+            if end is not None:
+                mask &= times <= end
+            clipped[symbol] = frame[mask.to_numpy()]
+        return clipped
+
+    async def run(self) -> BacktestResult:
+        settings = self.settings
+        master = self.data_manager.minute_frame(self.config.symbol)["timestamp"]
+        master_ns = master.to_numpy(dtype="datetime64[ns]").view(np.int64)
+        trade_from = int(np.searchsorted(master_ns, to_naive_ist(settings.start).value)) if settings.start is not None else 0
+        self.broker.attach(master_ns)
+        self.adapter.prepare()
+
+        interval_ns = self.adapter.interval_minutes * 60 * 10**9
+        open_hour, open_minute = (int(part) for part in (self.config.trade or {}).get("first_candle_time", MARKET_OPEN).split(":"))
+        open_offset_ns = (open_hour * 60 + open_minute) * 60 * 10**9
+        day_ns = 86400 * 10**9
+        square_off_ns = None
+        if settings.square_off_time:
+            hour, minute = (int(part) for part in settings.square_off_time.split(":"))
+            square_off_ns = (hour * 60 + minute) * 60 * 10**9
+
+        equity = np.full(len(master_ns), settings.initial_capital, dtype=float)
+        previous_level = logging.root.manager.disable
+        if settings.quiet:
+            logging.disable(logging.INFO)
+        started = time.perf_counter()
+        try:
+            with self.clock.patch():
+                for i in range(len(master_ns)):
+                    bar_ns = master_ns[i]
+                    time_of_day = bar_ns % day_ns
+                    bar_time = pd.Timestamp(bar_ns)
+                    self.bar_index = i
+                    self.now = bar_time
+                    square_off = square_off_ns is not None and time_of_day >= square_off_ns
+                    self.broker.process_bar(i, bar_time, square_off)
+
+                    close_ns = bar_ns + 60 * 10**9
+                    self.now = pd.Timestamp(close_ns)
+                    self.clock.set(self.now)
+                    if i >= trade_from and not square_off and (close_ns % day_ns - open_offset_ns) % interval_ns == 0:
+                        await self.adapter.on_bar_close(self.now)
+                    equity[i] = settings.initial_capital + self.broker.realized + self.broker.unrealized(i)
+                if len(master_ns):
+                    self.broker.close_all(self.now, len(master_ns) - 1)
+                    equity[-1] = settings.initial_capital + self.broker.realized
+        finally:
+            logging.disable(previous_level)
+        elapsed = time.perf_counter() - started
+
+        curve = pd.Series(equity[trade_from:], index=pd.DatetimeIndex(master.iloc[trade_from:]), name="equity")
+        stats = equity_statistics(curve, self.broker.trades, settings.initial_capital)
+        replayed = len(master_ns) - trade_from
+        stats.update({
+            "strategy": type(self.strategy).__name__,
+            "symbol": self.config.symbol,
+            "bars": replayed,
+            "elapsed_seconds": round(elapsed, 3),
+            "bars_per_second": round(replayed / elapsed, 1) if elapsed > 0 else None,
+        })
+        logger.info(f"Backtest finished for {stats['strategy']} on {self.config.symbol}: {stats}")
+        return BacktestResult(trades=self.broker.trades, equity=curve, stats=stats)
+
+
+def run_backtest(strategy_cls, config, candles: Dict[str, pd.DataFrame], settings: Optional[BacktestConfig] = None,
+                 adapter_cls: Optional[type] = None) -> BacktestResult:
+    """Synchronous wrapper around BacktestEngine.run()."""
+    return asyncio.run(BacktestEngine(strategy_cls, config, candles, settings, adapter_cls).run())
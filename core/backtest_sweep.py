@@ -0,0 +1,254 @@
+"""
+Parameter sweeps over the backtest engine.
+
+Every combination of a parameter grid is replayed by BacktestEngine in a pool of worker
+processes. Candles are packed once into shared-memory arrays that every worker attaches
+to, so a worker rebuilds its frames from memory instead of reloading or unpickling them
+per combination. Finished combinations are appended to a JSONL checkpoint, so an
+interrupted sweep resumes where it stopped. The sweep writes a results table ranked by one
+statistic and reports throughput (bars/sec) per worker process.
+
+Grid keys are dotted paths into the strategy's trade config, e.g. "atr_target_multiplier",
+"entry.swing_left_bars" or "max_premium_selection.weekly.tuesday"; "entry_minutes" and
+"confirm_minutes" are shorthands for the swing entry/confirmation timeframes.
+"""
+
+import asyncio
+import copy
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from algosat.common.logger import get_logger
+from algosat.core.backtest_manager import BacktestConfig, BacktestEngine
+from algosat.core.candle_store import candle_times
+
+logger = get_logger("backtest_sweep")
+
+CANDLE_FIELDS = ("timestamp", "open", "high", "low", "close", "volume")
+
+PARAMETER_ALIASES = {
+    "entry_minutes": ("entry.timeframe", "{}m"),
+    "confirm_minutes": ("entry.confirmation_candle_timeframe", "{}m"),
+}
+
+
+def parameter_grid(grid: Dict[str, Iterable[Any]]) -> List[Dict[str, Any]]:
+    """Cartesian product of the grid as a list of {path: value} dicts, in a stable order."""
+    keys = sorted(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(list(grid[key]) for key in keys))]
+
+
+def combination_id(params: Dict[str, Any]) -> str:
+    """Stable id for a parameter combination (used as the checkpoint key)."""
+    return hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def apply_params(config, params: Dict[str, Any]):
+    """Copy of config (StrategyConfig) with params written into its trade dict."""
+    trade = copy.deepcopy(config.trade or {})
+    for path, value in params.items():
+        if path in PARAMETER_ALIASES:
+            path, template = PARAMETER_ALIASES[path]
+            value = template.format(value)
+        node = trade
+        parts = path.split(".")
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+            if not isinstance(node, dict):
+                raise ValueError(f"Cannot set {path}: {part} is not a mapping in the trade config")
+        node[parts[-1]] = value
+    return config.model_copy(update={"trade": trade})
+
+
+# --- shared candles ---
+
+@dataclass
+class SharedCandles:
+    """Handle to one symbol's candles in shared memory: a (rows, 6) float64 array, timestamps as ns."""
+    symbol: str
+    shm_name: str
+    rows: int
+
+
+def share_candles(candles: Dict[str, pd.DataFrame]):
+    """Pack candles into shared memory; returns (handles, blocks). The caller unlinks the blocks."""
+    handles, blocks = [], []
+    for symbol, frame in candles.items():
+        array = np.empty((len(frame), len(CANDLE_FIELDS)), dtype=np.float64)
+        array[:, 0] = candle_times(frame).to_numpy(dtype="datetime64[ns]").view(np.int64)
+        for column, name in enumerate(CANDLE_FIELDS[1:], start=1):
+            array[:, column] = frame[name].to_numpy(dtype=float) if name in frame.columns else 0.0
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=np.float64, buffer=block.buf)[:] = array
+        blocks.append(block)
+        handles.append(SharedCandles(symbol=symbol, shm_name=block.name, rows=len(frame)))
+    return handles, blocks
+
+
+def load_shared_candles(handles: List[SharedCandles]) -> Dict[str, pd.DataFrame]:
+    candles = {}
+    for handle in handles:
+        block = shared_memory.SharedMemory(name=handle.shm_name)
+        try:
+            array = np.ndarray((handle.rows, len(CANDLE_FIELDS)), dtype=np.float64, buffer=block.buf).copy()
+        finally:
+            block.close()
+        frame = pd.DataFrame(array[:, 1:], columns=list(CANDLE_FIELDS[1:]))
+        frame.insert(0, "timestamp", pd.to_datetime(array[:, 0].astype(np.int64)))
+        candles[handle.symbol] = frame
+    return candles
+
+
+# --- worker side ---
+
+_worker_candles: Optional[Dict[str, pd.DataFrame]] = None
+
+
+def _init_worker(handles: List[SharedCandles]) -> None:
+    global _worker_candles
+    _worker_candles = load_shared_candles(handles)
+
+
+def _run_combination(strategy_cls, config, settings: BacktestConfig, params: Dict[str, Any],
+                     adapter_cls: Optional[type] = None) -> Dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        engine = BacktestEngine(strategy_cls, apply_params(config, params), _worker_candles, settings, adapter_cls)
+        stats = asyncio.run(engine.run()).stats
+        error = None
+    except Exception as e:
+        stats, error = {}, f"{type(e).__name__}: {e}"
+    return {
+        "id": combination_id(params),
+        "params": params,
+        "stats": stats,
+        "error": error,
+        "worker": os.getpid(),
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+# --- driver ---
+
+@dataclass
+class SweepResult:
+    results: List[Dict[str, Any]]
+    ranking: pd.DataFrame
+    workers: Dict[int, Dict[str, float]]
+    elapsed_seconds: float
+
+
+def _load_checkpoint(path: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    done = {}
+    if not path or not os.path.exists(path):
+        return done
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping unreadable checkpoint line in {path}")
+                continue
+            if not record.get("error"):
+                done[record["id"]] = record
+    return done
+
+
+def rank_results(results: List[Dict[str, Any]], rank_by: str = "net_pnl", ascending: bool = False) -> pd.DataFrame:
+    """One row per combination (params then stats), best first."""
+    rows = []
+    for record in results:
+        if record.get("error"):
+            continue
+        row = {"id": record["id"]}
+        row.update(record["params"])
+        row.update({k: v for k, v in record["stats"].items() if k not in ("strategy", "symbol")})
+        rows.append(row)
+    table = pd.DataFrame(rows)
+    if table.empty or rank_by not in table.columns:
+        return table
+    table = table.sort_values(rank_by, ascending=ascending, na_position="last").reset_index(drop=True)
+    table.insert(0, "rank", range(1, len(table) + 1))
+    return table
+
+
+def worker_throughput(results: List[Dict[str, Any]]) -> Dict[int, Dict[str, float]]:
+    """Bars replayed and bars/sec per worker process."""
+    workers: Dict[int, Dict[str, float]] = {}
+    for record in results:
+        entry = workers.setdefault(record["worker"], {"combinations": 0, "bars": 0, "seconds": 0.0})
+        entry["combinations"] += 1
+        entry["bars"] += record["stats"].get("bars", 0)
+        entry["seconds"] += record["elapsed_seconds"]
+    for entry in workers.values():
+        entry["seconds"] = round(entry["seconds"], 3)
+        entry["bars_per_second"] = round(entry["bars"] / entry["seconds"], 1) if entry["seconds"] else 0.0
+    return workers
+
+
+def run_sweep(strategy_cls, config, candles: Dict[str, pd.DataFrame], grid: Dict[str, Iterable[Any]],
+              settings: Optional[BacktestConfig] = None, max_workers: Optional[int] = None,
+              checkpoint_path: Optional[str] = None, output_path: Optional[str] = None,
+              rank_by: str = "net_pnl", ascending: bool = False, adapter_cls: Optional[type] = None,
+              start_method: str = "fork") -> SweepResult:
+    """
+    Backtest every grid combination across a process pool.
+    Combinations already in the checkpoint are not rerun; results are appended to it as they finish.
+    Workers are forked by default: common.constants locates config.cfg from __main__.__file__ at
+    import time, which a spawned worker's bootstrap __main__ does not have.
+    """
+    settings = settings or BacktestConfig()
+    combinations = parameter_grid(grid)
+    done = _load_checkpoint(checkpoint_path)
+    todo = [params for params in combinations if combination_id(params) not in done]
+    logger.info(f"Backtest sweep: {len(combinations)} combinations, {len(done)} from checkpoint, {len(todo)} to run")
+
+    results = [done[combination_id(params)] for params in combinations if combination_id(params) in done]
+    started = time.perf_counter()
+    if todo:
+        handles, blocks = share_candles(candles)
+        checkpoint = open(checkpoint_path, "a") if checkpoint_path else None
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(start_method),
+                                     initializer=_init_worker, initargs=(handles,)) as pool:
+                futures = [pool.submit(_run_combination, strategy_cls, config, settings, params, adapter_cls)
+                           for params in todo]
+                for count, future in enumerate(as_completed(futures), start=1):
+                    record = future.result()
+                    results.append(record)
+                    if record["error"]:
+                        logger.error(f"Sweep combination {record['params']} failed: {record['error']}")
+                    if checkpoint:
+                        checkpoint.write(json.dumps(record, default=str) + "\n")
+                        checkpoint.flush()
+                    logger.info(f"Sweep progress {count}/{len(todo)}: {record['params']} -> "
+                                f"{rank_by}={record['stats'].get(rank_by)} ({record['stats'].get('bars_per_second')} bars/s)")
+        finally:
+            if checkpoint:
+                checkpoint.close()
+            for block in blocks:
+                block.close()
+                block.unlink()
+    elapsed = time.perf_counter() - started
+
+    ranking = rank_results(results, rank_by=rank_by, ascending=ascending)
+    if output_path:
+        ranking.to_csv(output_path, index=False)
+    workers = worker_throughput([r for r in results if not r.get("error") and combination_id(r["params"]) not in done])
+    for pid, entry in workers.items():
+        logger.info(f"Sweep worker {pid}: {entry['combinations']} combinations, {entry['bars_per_second']} bars/s")
+    return SweepResult(results=results, ranking=ranking, workers=workers, elapsed_seconds=round(elapsed, 3))
@@ -2,6 +2,7 @@ import asyncio
 from datetime import datetime, timezone
 from algosat.core.db import AsyncSessionLocal, upsert_broker_balance_summary, get_all_brokers
 from algosat.core.broker_manager import BrokerManager
+from algosat.core.rate_limiter import rate_limited_call
 from algosat.brokers.models import BalanceSummary
 from algosat.common.logger import get_logger
 
@@ -23,7 +24,8 @@ class BalanceSummaryMonitor:
                 try:
                     broker_obj = self.broker_manager.brokers.get(broker_name)
                     if broker_obj and hasattr(broker_obj, "get_balance_summary"):
-                        summary = await broker_obj.get_balance_summary()
+                        async with rate_limited_call(broker_name, endpoint="funds"):
+                            summary = await broker_obj.get_balance_summary()
                         # Convert BalanceSummary model to dict for storage
                         summary_dict = summary.model_dump() if hasattr(summary, 'model_dump') else summary.to_dict()
                         await upsert_broker_balance_summary(session, broker_id, summary_dict)
@@ -1,6 +1,7 @@
 # core/broker_manager.py
 
 import asyncio
+import time
 from typing import Dict, Optional, List, Callable
 from algosat.brokers.factory import get_broker
 from algosat.common.broker_utils import get_broker_credentials, upsert_broker_credentials, update_broker_status
@@ -8,16 +9,22 @@ from algosat.common.default_broker_configs import DEFAULT_BROKER_CONFIGS
 from algosat.common.logger import get_logger
 from algosat.core.time_utils import get_ist_now
 from algosat.core.rate_limiter import get_rate_limiter, RateConfig
+from algosat.core.instrument_master import get_instrument_master
 from algosat.core.async_retry import async_retry_with_rate_limit, RetryConfig, get_retry_config, broker_retry
 from algosat.core.db import AsyncSessionLocal, get_strategy_by_id, get_trade_enabled_brokers as db_get_trade_enabled_brokers
 from datetime import datetime, time as dt_time
-from algosat.core.order_request import OrderRequest, OrderType, Side
+from algosat.core.order_request import OrderRequest, OrderStatus, OrderType, Side
 from algosat.core.signal import TradeSignal, SignalType
 from algosat.core.order_defaults import ORDER_DEFAULTS
+from algosat.core.monitoring import trading_metrics
+from algosat.core.tracing import span, traced
 from algosat.models.strategy_config import StrategyConfig
 
 logger = get_logger("BrokerManager")
 
+# Upper bound for one broker's part of a place_order fan-out (margin check + order call with retries)
+DEFAULT_ORDER_TIMEOUT_SECONDS = 30
+
 # Broker-specific rate limits moved to algosat.core.rate_limiter.py
 # Use GlobalRateLimiter.DEFAULT_RATE_CONFIGS for all rate limiting configuration
 
@@ -99,9 +106,15 @@ async def is_token_stale(broker_key: str) -> bool:
 class BrokerManager:
     def __init__(self):
         self.brokers: Dict[str, object] = {}
-        # --- Symbol/Instrument resolution for all brokers ---
-        self._instrument_cache = {}
         self._rate_limiter = None  # Will be initialized async
+        # --- Order routing: resolved ahead of signals, and placement latency per broker ---
+        self._symbol_info_cache: Dict[tuple, dict] = {}
+        self._broker_ids: Dict[str, int] = {}
+        self.order_timeouts: Dict[str, float] = {}  # per-broker override of DEFAULT_ORDER_TIMEOUT_SECONDS
+        self._placement_stats: Dict[str, dict] = {}
+        self._last_fanout: Optional[dict] = None
+        # --- Order-book fetches in flight, shared by concurrent callers ---
+        self._order_book_fetches: Dict[str, asyncio.Future] = {}
 
     async def _ensure_rate_limiter(self):
         """Initialize rate limiter if not already done."""
@@ -180,15 +193,11 @@ class BrokerManager:
         self.brokers[broker_key] = broker if success else None
         if success:
             logger.info(f"🟢 Authentication successful for {broker_key}")
-            # For Zerodha, fetch and cache instruments as DataFrame after login/profile
+            # For Zerodha, load today's instruments into the instrument master after login/profile
             if broker_key == 'zerodha' and hasattr(broker, 'kite') and broker.kite:
                 try:
-                    import pandas as pd
-                    loop = asyncio.get_event_loop()
-                    # Fetch instruments as DataFrame asynchronously
-                    instruments = await loop.run_in_executor(None, lambda: pd.DataFrame(broker.kite.instruments()))
-                    self._instrument_cache['zerodha'] = instruments
-                    logger.info("Zerodha instruments cached as DataFrame after auth.")
+                    await broker.get_instrument_table()
+                    logger.info("Zerodha instruments loaded into the instrument master after auth.")
                 except Exception as e:
                     logger.warning(f"Failed to fetch Zerodha instruments after auth: {e}")
         else:
@@ -208,6 +217,8 @@ class BrokerManager:
                 async with AsyncSessionLocal() as session:
                     broker_row = await get_broker_by_name(session, broker_key)
                     status = broker_row["status"] if broker_row else None
+                if broker_row:
+                    self._broker_ids[broker_key] = broker_row["id"]
                 if status == "AUTHENTICATING":
                     if wait_time >= max_wait:
                         logger.warning(f"Timeout waiting for {broker_key} to finish authenticating. Proceeding to authenticate.")
@@ -329,119 +340,235 @@ class BrokerManager:
         strategy_name: Optional[str] = None,
         retries: int = 3,
         delay: int = 1,
-        check_margin: bool = False
+        check_margin: bool = False,
+        timeout: Optional[float] = None
     ) -> dict:
         """
         Place order in all trade-enabled brokers (even if not authenticated), with retry on retryable errors.
         Accepts an OrderRequest object and passes it to each broker's place_order.
-        Returns a dict of broker_name -> order result, with broker_id included.
+        Brokers are placed concurrently, each bounded by its own timeout (order_timeouts, else
+        DEFAULT_ORDER_TIMEOUT_SECONDS, or the timeout argument), so a slow broker does not delay the others.
+        Returns a dict of broker_name -> order result, with broker_id and placement_latency_ms included.
         """
         if not isinstance(order_payload, OrderRequest):
             raise ValueError("order_payload must be an OrderRequest instance")
-        results = {}
         all_brokers = await self.get_all_trade_enabled_brokers()
-        from algosat.core.db import AsyncSessionLocal, get_broker_by_name
-        async with AsyncSessionLocal() as session:
-            for broker_name, broker in all_brokers.items():
-                if not broker:
-                    results[broker_name] = {"status": False, "message": "Broker not initialized or not authenticated"}
-                    continue
-                if not hasattr(broker, "place_order") or not callable(getattr(broker, "place_order", None)):
-                    results[broker_name] = {"status": False, "message": "place_order not implemented"}
-                    continue
-                try:
-                    # Resolve symbol for this broker
-                    symbol_info = await self.get_symbol_info(broker_name, order_payload.symbol, instrument_type='NFO')
-                    
-                    # Prepare extra field with instrument_token if available
-                    extra_data = order_payload.extra.copy() if order_payload.extra else {}
-                    if symbol_info.get("instrument_token"):
-                        extra_data["instrument_token"] = symbol_info["instrument_token"]
-                    
-                    # Ensure side is always the correct Enum, not a string
-                    broker_order_payload = order_payload.copy(update={
-                        "symbol": symbol_info["symbol"],
-                        "side": order_payload.side if isinstance(order_payload.side, Side) else Side(order_payload.side),
-                        "extra": extra_data
-                    })
+        started = time.perf_counter()
+        extra = order_payload.extra or {}
+        generated_at = extra.get("signal_generated_at")
+        if generated_at is not None:
+            trading_metrics.signal_to_order_seconds.labels(
+                strategy=extra.get("strategy_name") or strategy_name or "unknown"
+            ).observe(time.monotonic() - generated_at)
 
-                    # Margin check logic
-                    if check_margin:
-                        from algosat.core.order_request import OrderResponse, OrderStatus
-                        if not hasattr(broker, "check_margin_availability") or not callable(getattr(broker, "check_margin_availability", None)):
-                            results[broker_name] = OrderResponse(
-                                status=OrderStatus.FAILED,
-                                order_id="",
-                                order_message="Margin check not implemented for this broker",
-                                broker=broker_name,
-                                raw_response=None,
-                                symbol=getattr(order_payload, 'symbol', None),
-                                side=getattr(order_payload, 'side', None),
-                                quantity=getattr(order_payload, 'quantity', None),
-                                order_type=getattr(order_payload, 'order_type', None)
-                            ).dict()
-                            continue
-                        try:
-                            # Use enhanced retry with rate limiting for margin check
-                            await self._ensure_rate_limiter()
-                            retry_config = get_retry_config("default")
-                            retry_config.rate_limit_broker = broker_name
-                            retry_config.rate_limit_tokens = 1
-                            retry_config.max_attempts = retries
-                            retry_config.initial_delay = delay
-                            
-                            async def _check_margin():
-                                return await broker.check_margin_availability(broker_order_payload)
-                            
-                            margin_ok = await async_retry_with_rate_limit(_check_margin, config=retry_config)
-                        except Exception as e:
-                            logger.error(f"Error checking margin: {e}")
-                            results[broker_name] = OrderResponse(
-                                status=OrderStatus.FAILED,
-                                order_id="",
-                                order_message=f"Margin check error: {e}",
-                                broker=broker_name,
-                                raw_response=None,
-                                symbol=getattr(order_payload, 'symbol', None),
-                                side=getattr(order_payload, 'side', None),
-                                quantity=getattr(order_payload, 'quantity', None),
-                                order_type=getattr(order_payload, 'order_type', None)
-                            ).dict()
-                            continue
-                        if not margin_ok:
-                            logger.warning(f"Insufficient margin for {broker_name} on {order_payload.symbol}")
-                            results[broker_name] = OrderResponse(
-                                status=OrderStatus.FAILED,
-                                order_id="",
-                                order_message="Insufficient margin",
-                                broker=broker_name,
-                                raw_response=None,
-                                symbol=getattr(order_payload, 'symbol', None),
-                                side=getattr(order_payload, 'side', None),
-                                quantity=getattr(order_payload, 'quantity', None),
-                                order_type=getattr(order_payload, 'order_type', None)
-                            ).dict()
-                            continue
+        async def _place(broker_name, broker):
+            broker_timeout = timeout if timeout is not None else self.order_timeouts.get(broker_name, DEFAULT_ORDER_TIMEOUT_SECONDS)
+            try:
+                with span("broker.place_order", broker=broker_name, symbol=order_payload.symbol) as broker_span:
+                    result = await asyncio.wait_for(
+                        self._place_order_with_broker(broker_name, broker, order_payload, retries, delay, check_margin),
+                        timeout=broker_timeout
+                    )
+                    if broker_span is not None and isinstance(result, dict):
+                        broker_span.set_attribute("status", str(result.get("status")))
+            except asyncio.TimeoutError:
+                logger.error(f"Order placement on {broker_name} for {order_payload.symbol} timed out after {broker_timeout}s; broker order state is unknown")
+                result = {"status": False, "message": f"Order placement timed out after {broker_timeout}s"}
+                self._record_placement(broker_name, None, timed_out=True)
+                trading_metrics.order_ack_seconds.labels(broker=broker_name, outcome="timeout").observe(time.perf_counter() - started)
+                return result
+            elapsed = time.perf_counter() - started
+            latency_ms = round(elapsed * 1000, 1)
+            if isinstance(result, dict):
+                result["placement_latency_ms"] = latency_ms
+            failed = isinstance(result, dict) and result.get("status") in (False, OrderStatus.FAILED, "FAILED", "REJECTED")
+            self._record_placement(broker_name, latency_ms, failed=failed)
+            trading_metrics.order_ack_seconds.labels(broker=broker_name, outcome="failed" if failed else "ok").observe(elapsed)
+            return result
 
-                    # Place order with enhanced retry and rate limiting
+        names = list(all_brokers)
+        with span("broker_manager.place_order", symbol=order_payload.symbol, brokers=len(names)):
+            responses = await asyncio.gather(*(_place(name, all_brokers[name]) for name in names))
+        results = dict(zip(names, responses))
+        self._record_fanout(order_payload.symbol, results)
+        return results
+
+    async def _place_order_with_broker(self, broker_name, broker, order_payload: OrderRequest, retries, delay, check_margin) -> dict:
+        """Margin check (optional) and order placement on one broker; errors are returned as a failed result."""
+        if not broker:
+            return {"status": False, "message": "Broker not initialized or not authenticated"}
+        if not hasattr(broker, "place_order") or not callable(getattr(broker, "place_order", None)):
+            return {"status": False, "message": "place_order not implemented"}
+        try:
+            # Resolve symbol for this broker (normally already cached by prepare_order_routing)
+            symbol_info = await self.resolve_symbol_info(broker_name, order_payload.symbol, instrument_type='NFO')
+            
+            # Prepare extra field with instrument_token if available
+            extra_data = order_payload.extra.copy() if order_payload.extra else {}
+            if symbol_info.get("instrument_token"):
+                extra_data["instrument_token"] = symbol_info["instrument_token"]
+            
+            # Ensure side is always the correct Enum, not a string
+            broker_order_payload = order_payload.copy(update={
+                "symbol": symbol_info["symbol"],
+                "side": order_payload.side if isinstance(order_payload.side, Side) else Side(order_payload.side),
+                "extra": extra_data
+            })
+
+            # Margin check logic
+            if check_margin:
+                from algosat.core.order_request import OrderResponse, OrderStatus
+                if not hasattr(broker, "check_margin_availability") or not callable(getattr(broker, "check_margin_availability", None)):
+                    return OrderResponse(
+                        status=OrderStatus.FAILED,
+                        order_id="",
+                        order_message="Margin check not implemented for this broker",
+                        broker=broker_name,
+                        raw_response=None,
+                        symbol=getattr(order_payload, 'symbol', None),
+                        side=getattr(order_payload, 'side', None),
+                        quantity=getattr(order_payload, 'quantity', None),
+                        order_type=getattr(order_payload, 'order_type', None)
+                    ).dict()
+                try:
+                    # Use enhanced retry with rate limiting for margin check
                     await self._ensure_rate_limiter()
-                    retry_config = get_retry_config("order_critical")  # Use critical config for orders
+                    retry_config = get_retry_config("default")
                     retry_config.rate_limit_broker = broker_name
                     retry_config.rate_limit_tokens = 1
+                    retry_config.rate_limit_endpoint = "margin"
                     retry_config.max_attempts = retries
                     retry_config.initial_delay = delay
                     
-                    async def _place_order():
-                        return await broker.place_order(broker_order_payload)
+                    async def _check_margin():
+                        return await broker.check_margin_availability(broker_order_payload)
                     
-                    result = await async_retry_with_rate_limit(_place_order, config=retry_config)
-                    broker_row = await get_broker_by_name(session, broker_name)
-                    broker_id = broker_row["id"] if broker_row else None
-                    result["broker_id"] = broker_id
-                    results[broker_name] = result
+                    margin_ok = await async_retry_with_rate_limit(_check_margin, config=retry_config)
                 except Exception as e:
-                    results[broker_name] = {"status": False, "message": str(e)}
-        return results
+                    logger.error(f"Error checking margin: {e}")
+                    return OrderResponse(
+                        status=OrderStatus.FAILED,
+                        order_id="",
+                        order_message=f"Margin check error: {e}",
+                        broker=broker_name,
+                        raw_response=None,
+                        symbol=getattr(order_payload, 'symbol', None),
+                        side=getattr(order_payload, 'side', None),
+                        quantity=getattr(order_payload, 'quantity', None),
+                        order_type=getattr(order_payload, 'order_type', None)
+                    ).dict()
+                if not margin_ok:
+                    logger.warning(f"Insufficient margin for {broker_name} on {order_payload.symbol}")
+                    return OrderResponse(
+                        status=OrderStatus.FAILED,
+                        order_id="",
+                        order_message="Insufficient margin",
+                        broker=broker_name,
+                        raw_response=None,
+                        symbol=getattr(order_payload, 'symbol', None),
+                        side=getattr(order_payload, 'side', None),
+                        quantity=getattr(order_payload, 'quantity', None),
+                        order_type=getattr(order_payload, 'order_type', None)
+                    ).dict()
+
+            # Place order with enhanced retry and rate limiting
+            await self._ensure_rate_limiter()
+            retry_config = get_retry_config("order_critical")  # Use critical config for orders
+            retry_config.rate_limit_broker = broker_name
+            retry_config.rate_limit_tokens = 1
+            retry_config.rate_limit_endpoint = "orders"
+            retry_config.max_attempts = retries
+            retry_config.initial_delay = delay
+            
+            async def _place_order():
+                # One span per attempt, so retries show up in the trace
+                with span("broker.api.place_order", broker=broker_name):
+                    return await broker.place_order(broker_order_payload)
+            
+            result = await async_retry_with_rate_limit(_place_order, config=retry_config)
+            result["broker_id"] = await self.get_broker_id(broker_name)
+            return result
+        except Exception as e:
+            return {"status": False, "message": str(e)}
+
+    async def resolve_symbol_info(self, broker_name: str, symbol: str, instrument_type: str = None) -> dict:
+        """get_symbol_info with the result cached per (broker, symbol, instrument_type); failures are not cached."""
+        key = (broker_name.lower(), symbol, instrument_type)
+        info = self._symbol_info_cache.get(key)
+        if info is None:
+            info = await self.get_symbol_info(broker_name, symbol, instrument_type=instrument_type)
+            self._symbol_info_cache[key] = info
+        return info
+
+    async def get_broker_id(self, broker_name: str) -> Optional[int]:
+        """brokers.id for a broker name, cached after the first lookup (setup() fills it for enabled brokers)."""
+        if broker_name in self._broker_ids:
+            return self._broker_ids[broker_name]
+        from algosat.core.db import AsyncSessionLocal, get_broker_by_name
+        async with AsyncSessionLocal() as session:
+            broker_row = await get_broker_by_name(session, broker_name)
+        broker_id = broker_row["id"] if broker_row else None
+        if broker_id is not None:
+            self._broker_ids[broker_name] = broker_id
+        return broker_id
+
+    async def prepare_order_routing(self, symbols: List[str], instrument_type: str = 'NFO') -> None:
+        """
+        Resolve broker symbols and broker ids for symbols that are likely to be traded (e.g. the strikes a
+        strategy selected in setup), so place_order does not pay for the lookups when the signal fires.
+        """
+        brokers = await self.get_active_trade_brokers()
+        lookups = [(broker_name, symbol) for broker_name in brokers for symbol in symbols]
+        outcomes = await asyncio.gather(
+            *(self.resolve_symbol_info(broker_name, symbol, instrument_type=instrument_type) for broker_name, symbol in lookups),
+            *(self.get_broker_id(broker_name) for broker_name in brokers),
+            return_exceptions=True
+        )
+        for (broker_name, symbol), outcome in zip(lookups, outcomes):
+            if isinstance(outcome, Exception):
+                logger.warning(f"Could not pre-resolve {symbol} for {broker_name}: {outcome}")
+        logger.info(f"Order routing prepared for {symbols} on {list(brokers)}")
+
+    def _record_placement(self, broker_name: str, latency_ms: Optional[float], failed: bool = False, timed_out: bool = False) -> None:
+        stats = self._placement_stats.setdefault(broker_name, {
+            "orders": 0, "failed": 0, "timeouts": 0, "last_ms": None, "max_ms": 0.0, "total_ms": 0.0
+        })
+        stats["orders"] += 1
+        if timed_out:
+            stats["timeouts"] += 1
+            return
+        if failed:
+            stats["failed"] += 1
+        stats["last_ms"] = latency_ms
+        stats["max_ms"] = max(stats["max_ms"], latency_ms)
+        stats["total_ms"] += latency_ms
+
+    def _record_fanout(self, symbol: str, results: dict) -> None:
+        latencies = {
+            name: result["placement_latency_ms"]
+            for name, result in results.items()
+            if isinstance(result, dict) and result.get("placement_latency_ms") is not None
+        }
+        skew_ms = round(max(latencies.values()) - min(latencies.values()), 1) if latencies else None
+        self._last_fanout = {"symbol": symbol, "latencies_ms": latencies, "skew_ms": skew_ms}
+        if latencies:
+            per_broker = ", ".join(f"{name} {ms}ms" for name, ms in latencies.items())
+            logger.info(f"Order fan-out for {symbol}: {per_broker} (first-to-last skew {skew_ms}ms)")
+
+    def get_placement_stats(self) -> dict:
+        """Per-broker order placement latency (from fan-out start to broker response) and the last fan-out's skew."""
+        brokers = {}
+        for broker_name, stats in self._placement_stats.items():
+            timed = stats["orders"] - stats["timeouts"]
+            brokers[broker_name] = {
+                "orders": stats["orders"],
+                "failed": stats["failed"],
+                "timeouts": stats["timeouts"],
+                "last_ms": stats["last_ms"],
+                "avg_ms": round(stats["total_ms"] / timed, 1) if timed else None,
+                "max_ms": stats["max_ms"],
+            }
+        return {"brokers": brokers, "last_fanout": self._last_fanout}
 
     async def get_profile(self, broker_name, retries=3, delay=1):
         broker = self.brokers.get(broker_name)
@@ -557,39 +684,33 @@ class BrokerManager:
                 fyers_symbol = f"{exchange}:{sanitized_symbol}"
             return {'symbol': fyers_symbol}
         elif broker_name == 'zerodha':
-            import pandas as pd
             sanitized_symbol = symbol
             if ':' in symbol:
                 sanitized_symbol = symbol.split(':', 1)[1]
             sanitized_symbol = sanitized_symbol.split('-')[0] if '-' in sanitized_symbol else sanitized_symbol
-            # Use cached DataFrame if available, else fetch and cache
-            if 'zerodha' not in self._instrument_cache:
+            # Today's instruments from the instrument master; downloaded only if not loaded yet
+            table = get_instrument_master().get('zerodha')
+            if table is None:
                 broker = self.brokers.get('zerodha')
                 if not broker or not broker.kite:
                     raise Exception("Zerodha broker not initialized or not logged in.")
-                loop = asyncio.get_event_loop()
-                instruments = await loop.run_in_executor(None, lambda: pd.DataFrame(broker.kite.instruments()))
-                self._instrument_cache['zerodha'] = instruments
-            else:
-                instruments = self._instrument_cache['zerodha']
-            df = instruments
-            match = None
+                table = await broker.get_instrument_table()
+            instrument_type = instrument_type.upper() if instrument_type else None
             # For index (e.g., NIFTY, BANKNIFTY)
-            if instrument_type and instrument_type.upper() == 'INDEX':
+            if instrument_type == 'INDEX':
                 # Zerodha uses 'INDICES' for index segment, match by name (ignoring spaces)
-                match = df[(df['segment'] == 'INDICES') & (df['name'].str.replace(' ', '').str.upper() == sanitized_symbol.replace(' ', '').upper())]
+                row = table.find_name(sanitized_symbol, segment='INDICES', ignore_spaces=True)
             # For equity
-            elif instrument_type and instrument_type.upper() == 'EQ':
-                match = df[(df['segment'] == 'NSE') & (df['name'].str.upper() == sanitized_symbol.upper())]
+            elif instrument_type == 'EQ':
+                row = table.find_name(sanitized_symbol, segment='NSE')
             # For options (NFO-OPT)
-            elif instrument_type and instrument_type.upper() == 'NFO':
-                match = df[(df['segment'] == 'NFO-OPT') & (df['tradingsymbol'].str.upper() == sanitized_symbol.upper())]
+            elif instrument_type == 'NFO':
+                row = table.find_symbol(sanitized_symbol, segment='NFO-OPT')
             # Fallback: just match tradingsymbol
             else:
-                match = df[df['tradingsymbol'].str.upper() == sanitized_symbol.upper()]
-            if match is not None and not match.empty:
-                row = match.iloc[0]
-                return {'symbol': row['tradingsymbol'], 'instrument_token': row['instrument_token']}
+                row = table.find_symbol(sanitized_symbol)
+            if row is not None:
+                return {'symbol': table.symbol(row), 'instrument_token': table.token(row)}
             raise Exception(f"Instrument token not found for {sanitized_symbol} {instrument_type}")
         elif broker_name == 'angel':
             # Angel One broker symbol conversion
@@ -600,6 +721,7 @@ class BrokerManager:
 
     import asyncio
     from algosat.core.db import AsyncSessionLocal, get_strategy_by_id
+    @traced("broker_manager.build_order_request")
     async def build_order_request_for_strategy(self, signal: TradeSignal, config: StrategyConfig) -> OrderRequest:
         """
         Build a broker-agnostic OrderRequest from a TradeSignal and StrategyConfig.
@@ -701,44 +823,68 @@ class BrokerManager:
             extra.update({k: v for k, v in config.extra.items() if v is not None})
         # Pass strategy_name for downstream mapping if needed
         extra['strategy_name'] = strategy_name
+        # Carried to BrokerManager.place_order for the signal-to-order latency metric
+        if getattr(signal, 'generated_at', None) is not None:
+            extra['signal_generated_at'] = signal.generated_at
         order_kwargs['extra'] = extra
         return OrderRequest(**order_kwargs)
 
     async def get_all_broker_order_details(self, retries=3, delay=1) -> dict:
         """
         Fetch order details from all trade-enabled brokers with rate limiting.
+        The brokers' order books are downloaded concurrently.
         Returns a dict: broker_name -> list of order dicts (empty list if no orders).
         """
         await self._ensure_rate_limiter()
         enabled_brokers = await self.get_all_trade_enabled_brokers()
-        broker_orders = {}
-        
-        for broker_name, broker in enabled_brokers.items():
-            try:
-                if broker is None or not hasattr(broker, "get_order_details"):
-                    broker_orders[broker_name] = []
-                    continue
-                
-                # Create retry config with rate limiting
-                retry_config = get_retry_config("default")
-                retry_config.rate_limit_broker = broker_name
-                retry_config.rate_limit_tokens = 1
-                retry_config.max_attempts = retries
-                retry_config.initial_delay = delay
-                
-                async def _fetch_orders():
-                    return await broker.get_order_details()
-                
-                orders = await async_retry_with_rate_limit(_fetch_orders, config=retry_config)
-                if not isinstance(orders, list):
-                    orders = []
-                broker_orders[broker_name] = orders
-                
-            except Exception as e:
-                logger.error(f"BrokerManager: Failed to fetch orders for {broker_name}: {e}")
-                broker_orders[broker_name] = []
-        
-        return broker_orders
+        names = list(enabled_brokers)
+        results = await asyncio.gather(*(
+            self._shared_order_book_fetch(name, enabled_brokers[name], retries, delay) for name in names
+        ))
+        return dict(zip(names, results))
+
+    async def get_broker_order_details(self, broker_name: str, retries=3, delay=1) -> list:
+        """
+        Fetch one broker's order book with rate limiting (empty list if none or on error).
+        """
+        await self._ensure_rate_limiter()
+        return await self._shared_order_book_fetch(broker_name, self.brokers.get(broker_name), retries, delay)
+
+    async def _shared_order_book_fetch(self, broker_name: str, broker, retries, delay) -> list:
+        """
+        Concurrent requests for the same broker's order book share one download: while a
+        fetch is in flight, later callers await it instead of starting another.
+        """
+        fetch = self._order_book_fetches.get(broker_name)
+        if fetch is None:
+            fetch = asyncio.ensure_future(self._fetch_broker_order_book(broker_name, broker, retries, delay))
+            self._order_book_fetches[broker_name] = fetch
+            fetch.add_done_callback(lambda _: self._order_book_fetches.pop(broker_name, None))
+        # Shielded so a cancelled caller does not cancel the download for the others
+        return await asyncio.shield(fetch)
+
+    async def _fetch_broker_order_book(self, broker_name: str, broker, retries, delay) -> list:
+        try:
+            if broker is None or not hasattr(broker, "get_order_details"):
+                return []
+            
+            # Create retry config with rate limiting
+            retry_config = get_retry_config("default")
+            retry_config.rate_limit_broker = broker_name
+            retry_config.rate_limit_tokens = 1
+            retry_config.rate_limit_endpoint = "order_book"
+            retry_config.max_attempts = retries
+            retry_config.initial_delay = delay
+            
+            async def _fetch_orders():
+                return await broker.get_order_details()
+            
+            orders = await async_retry_with_rate_limit(_fetch_orders, config=retry_config)
+            return orders if isinstance(orders, list) else []
+            
+        except Exception as e:
+            logger.error(f"BrokerManager: Failed to fetch orders for {broker_name}: {e}")
+            return []
 
     async def get_all_broker_positions(self, retries=3, delay=1) -> dict:
         """
@@ -759,6 +905,7 @@ class BrokerManager:
                 retry_config = get_retry_config("default")
                 retry_config.rate_limit_broker = broker_name
                 retry_config.rate_limit_tokens = 1
+                retry_config.rate_limit_endpoint = "positions"
                 retry_config.max_attempts = retries
                 retry_config.initial_delay = delay
                 
@@ -835,6 +982,7 @@ class BrokerManager:
         retry_config = get_retry_config("order_critical")
         retry_config.rate_limit_broker = broker_name
         retry_config.rate_limit_tokens = 1
+        retry_config.rate_limit_endpoint = "orders"
         retry_config.max_attempts = retries
         retry_config.initial_delay = delay
         
@@ -874,6 +1022,7 @@ class BrokerManager:
         retry_config = get_retry_config("order_critical")
         retry_config.rate_limit_broker = broker_name
         retry_config.rate_limit_tokens = 1
+        retry_config.rate_limit_endpoint = "orders"
         retry_config.max_attempts = retries
         retry_config.initial_delay = delay
         
@@ -0,0 +1,370 @@
+"""
+Bulk exit engine: flattens every open order at once for exit_all_orders(bulk=True) and
+the RiskManager emergency stops.
+
+OrderManager.exit_order handles one logical order per call. Each call opens its own
+session, reads that order's executions, can download every broker's order book again,
+and exits the order's hedges. Looping it over 40 legs flattens the last leg tens of
+seconds after the first. This engine instead:
+
+- loads the open orders, their open hedge (child) orders and all of their broker
+  executions in one session with three queries,
+- takes one live order-book snapshot (only when check_live_status is set),
+- exits the main orders first and their hedges after them. In each phase, broker calls
+  run concurrently, capped per broker at its rate limiter's requests per second (the
+  limiter itself still paces the calls),
+- writes every EXIT execution, cancellation and order status change in one transaction.
+  A hedge is set to EXIT_CLOSED only when all of its legs are flat, so legs outside
+  broker_ids_filter or a failed exit leave its status as it was,
+- reports the time from the start until the last broker call returned (time to flat).
+
+The exit/cancel decision for each execution is the one exit_order makes: FILLED ->
+exit, PARTIALLY_FILLED -> exit then cancel, AWAITING_ENTRY/PENDING -> cancel,
+REJECTED/FAILED/CANCELLED -> nothing.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from algosat.common.constants import TRADE_STATUS_EXIT_CLOSED, TRADE_STATUS_EXIT_MANUAL_PENDING
+from algosat.common.logger import get_logger
+from algosat.core.rate_limiter import get_rate_limiter
+
+logger = get_logger("bulk_exit")
+
+OPEN_ORDER_STATUSES = ("OPEN", "AWAITING_ENTRY", "PENDING")
+CLOSED_HEDGE_STATUSES = ("FILLED", "CANCELLED", "REJECTED", "FAILED")
+SKIP_STATUSES = ("REJECTED", "FAILED", "CANCELLED")
+CANCEL_STATUSES = ("AWAITING_ENTRY", "PENDING", "TRIGGER_PENDING")
+PARTIAL_STATUSES = ("PARTIALLY_FILLED", "PARTIAL")
+
+
+@dataclass
+class ExitLeg:
+    """One broker execution of an open order that has to be exited or cancelled."""
+    order: Dict[str, Any]
+    execution: Dict[str, Any]
+    broker_name: Optional[str]
+    status: str
+    broker_order_id: Any
+    hedge: bool = False
+
+
+@dataclass
+class ExitBatch:
+    """Everything the bulk exit writes, applied in one transaction."""
+    exit_executions: List[Dict[str, Any]] = field(default_factory=list)
+    execution_updates: List[tuple] = field(default_factory=list)  # (broker_executions.id, {column: value})
+    order_statuses: Dict[int, str] = field(default_factory=dict)
+
+
+@dataclass
+class BulkExitReport:
+    orders: int = 0
+    hedges: int = 0
+    legs: int = 0
+    exits: int = 0
+    cancels: int = 0
+    skipped: int = 0
+    failed: int = 0
+    brokers: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    time_to_flat_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+
+class BulkExitEngine:
+    def __init__(self, order_manager, concurrency_per_broker: Optional[Dict[str, int]] = None):
+        self.order_manager = order_manager
+        self.broker_manager = order_manager.broker_manager
+        self.concurrency_per_broker = dict(concurrency_per_broker or {})
+        self._budgets: Dict[str, asyncio.Semaphore] = {}
+
+    async def run(self, exit_reason: str = None, strategy_id: int = None, check_live_status: bool = False,
+                  broker_ids_filter: List[int] = None) -> BulkExitReport:
+        started = time.perf_counter()
+        exit_reason = exit_reason or "Exit all orders requested"
+        report = BulkExitReport()
+
+        mains, hedges, executions, broker_names = await self._load(strategy_id)
+        report.orders, report.hedges = len(mains), len(hedges)
+        if not mains:
+            logger.info("BulkExit: No open orders found to exit.")
+            return report
+
+        live_orders = {}
+        if check_live_status:
+            try:
+                live_orders = await self._live_order_index()
+            except Exception as e:
+                logger.error(f"BulkExit: Error fetching live broker orders, using DB status: {e}")
+
+        batch = ExitBatch()
+        main_legs = self._plan(mains, executions, broker_names, live_orders, broker_ids_filter, batch, hedge=False)
+        hedge_legs = self._plan(hedges, executions, broker_names, live_orders, broker_ids_filter, batch, hedge=True)
+        report.legs = len(main_legs) + len(hedge_legs)
+        logger.info(f"BulkExit: Exiting {len(mains)} orders and {len(hedges)} hedges ({report.legs} broker legs). Reason: {exit_reason}")
+
+        existing_exits = {
+            (ex.get("parent_order_id"), ex.get("broker_id"), ex.get("broker_order_id"))
+            for rows in executions.values() for ex in rows if ex.get("side") == "EXIT"
+        }
+        settled = set()  # broker_executions ids that are flat after this run
+        # Hedges after their mains: a short main is bought back before its long hedge is sold
+        for legs in (main_legs, hedge_legs):
+            outcomes = await asyncio.gather(*(self._flatten(leg, exit_reason) for leg in legs))
+            for leg, outcome in zip(legs, outcomes):
+                self._record(leg, outcome, exit_reason, existing_exits, batch, report)
+                if self._is_settled(leg, outcome):
+                    settled.add(leg.execution["id"])
+        report.time_to_flat_seconds = round(time.perf_counter() - started, 3)
+
+        # A hedge is closed only when none of its legs is left open: not on a broker outside
+        # broker_ids_filter, and not after a failed exit or cancel
+        for order in hedges:
+            if all(be["id"] in settled or (be.get("status") or "").upper() in SKIP_STATUSES
+                   for be in executions.get(order["id"], []) if be.get("side") != "EXIT"):
+                batch.order_statuses[order["id"]] = TRADE_STATUS_EXIT_CLOSED
+        if exit_reason.lower() == "manual":
+            for order in mains:
+                batch.order_statuses[order["id"]] = TRADE_STATUS_EXIT_MANUAL_PENDING
+        await self._persist(batch)
+
+        report.elapsed_seconds = round(time.perf_counter() - started, 3)
+        logger.info(f"BulkExit: Flat in {report.time_to_flat_seconds}s ({report.exits} exits, {report.cancels} cancels, "
+                    f"{report.failed} failed, {report.skipped} skipped); total {report.elapsed_seconds}s")
+        return report
+
+    # --- loading ---
+
+    async def _load(self, strategy_id: Optional[int]):
+        """Open orders, their open hedges, executions per order id and broker names, in one session."""
+        from sqlalchemy import select
+        from algosat.core.db import AsyncSessionLocal, get_all_brokers
+        from algosat.core.dbschema import broker_executions, orders, strategy_symbols
+
+        async with AsyncSessionLocal() as session:
+            stmt = select(orders).where(orders.c.status.in_(OPEN_ORDER_STATUSES))
+            if strategy_id:
+                symbol_ids = select(strategy_symbols.c.id).where(strategy_symbols.c.strategy_id == strategy_id)
+                stmt = stmt.where(orders.c.strategy_symbol_id.in_(symbol_ids))
+            open_orders = [dict(row._mapping) for row in (await session.execute(stmt)).fetchall()]
+
+            # Hedges are child orders of an exited order, at any depth
+            known = {order["id"] for order in open_orders}
+            hedges, frontier = [], list(known)
+            while frontier:
+                stmt = select(orders).where(orders.c.parent_order_id.in_(frontier))
+                children = [dict(row._mapping) for row in (await session.execute(stmt)).fetchall()]
+                frontier = []
+                for child in children:
+                    if child["id"] in known:
+                        continue
+                    known.add(child["id"])
+                    frontier.append(child["id"])
+                    if child.get("status") not in CLOSED_HEDGE_STATUSES:
+                        hedges.append(child)
+            hedge_ids = {hedge["id"] for hedge in hedges}
+            # An open order whose parent is also being exited is handled as that parent's hedge
+            parents = {order["id"] for order in open_orders}
+            for order in open_orders:
+                if order.get("parent_order_id") in parents and order["id"] not in hedge_ids:
+                    hedges.append(order)
+                    hedge_ids.add(order["id"])
+            mains = [order for order in open_orders if order["id"] not in hedge_ids]
+
+            order_ids = [order["id"] for order in mains + hedges]
+            stmt = (select(broker_executions).where(broker_executions.c.parent_order_id.in_(order_ids))
+                    .order_by(broker_executions.c.execution_time, broker_executions.c.id))
+            executions: Dict[int, List[dict]] = {}
+            for row in (await session.execute(stmt)).fetchall():
+                execution = dict(row._mapping)
+                executions.setdefault(execution["parent_order_id"], []).append(execution)
+
+            broker_names = {row["id"]: row["broker_name"] for row in await get_all_brokers(session)}
+        return mains, hedges, executions, broker_names
+
+    async def _live_order_index(self) -> Dict[str, Dict[Any, dict]]:
+        """One snapshot of every broker's order book, indexed by broker order id."""
+        all_broker_orders = await self.order_manager.get_all_broker_order_details()
+        index = {}
+        for broker_name, broker_orders in all_broker_orders.items():
+            index[broker_name] = {}
+            for order in broker_orders:
+                index[broker_name].setdefault(order.get("order_id"), order)
+        return index
+
+    # --- planning ---
+
+    def _plan(self, orders, executions, broker_names, live_orders, broker_ids_filter, batch: ExitBatch, hedge: bool) -> List[ExitLeg]:
+        legs = []
+        for order in orders:
+            for be in executions.get(order["id"], []):
+                if be.get("side") == "EXIT":
+                    continue
+                broker_id, broker_order_id = be.get("broker_id"), be.get("broker_order_id")
+                if broker_ids_filter is not None and broker_id not in broker_ids_filter:
+                    continue
+                if broker_id is None or broker_order_id is None:
+                    logger.error(f"BulkExit: Missing broker_id or broker_order_id in broker_execution id={be.get('id')} for order {order['id']}")
+                    continue
+                broker_name = broker_names.get(broker_id)
+                lookup_id = self.order_manager._get_cache_lookup_order_id(broker_order_id, broker_name, be.get("product_type"))
+                leg = ExitLeg(order=order, execution=be, broker_name=broker_name, broker_order_id=lookup_id,
+                              status=(be.get("status") or "").upper(), hedge=hedge)
+                live = live_orders.get(broker_name, {}).get(lookup_id)
+                if live:
+                    self._sync_live(leg, live, batch)
+                legs.append(leg)
+        return legs
+
+    def _sync_live(self, leg: ExitLeg, live: dict, batch: ExitBatch) -> None:
+        """Use the broker's live status for the exit decision and queue the DB update."""
+        be = leg.execution
+        update = {}
+        live_status = live.get("status")
+        live_status = live_status.value if hasattr(live_status, "value") else live_status
+        if live_status and str(live_status).upper() != leg.status:
+            update["status"] = str(live_status)
+            leg.status = str(live_status).upper()
+        for column, value in (("product_type", live.get("product_type")),
+                              ("executed_quantity", live.get("executed_quantity")),
+                              ("execution_price", live.get("exec_price"))):
+            if value is not None and value != be.get(column):
+                update[column] = value
+        if update:
+            be.update(update)
+            batch.execution_updates.append((be["id"], update))
+
+    # --- broker calls ---
+
+    async def _budget(self, broker_name: Optional[str]) -> asyncio.Semaphore:
+        key = broker_name or "default"
+        if key not in self._budgets:
+            limit = self.concurrency_per_broker.get(key)
+            if limit is None:
+                limiter = await get_rate_limiter()
+                limit = limiter.get_rate_config(key).rps
+            self._budgets[key] = asyncio.Semaphore(max(1, int(limit)))
+        return self._budgets[key]
+
+    async def _flatten(self, leg: ExitLeg, exit_reason: str) -> Dict[str, Any]:
+        """Exit and/or cancel one leg; returns what happened for _record."""
+        if leg.status in SKIP_STATUSES:
+            return {"action": "skipped"}
+        be, bm = leg.execution, self.broker_manager
+        symbol = be.get("symbol") or leg.order.get("strike_symbol")
+        budget = await self._budget(leg.broker_name)
+        started = time.perf_counter()
+        try:
+            async with budget:
+                if leg.status == "FILLED":
+                    exit_resp, ok = None, True
+                    try:
+                        exit_resp = await bm.exit_order(be["broker_id"], leg.broker_order_id, symbol=symbol,
+                                                        product_type=be.get("product_type"), exit_reason=exit_reason,
+                                                        side=leg.order.get("side"))
+                    except Exception as e:
+                        # The EXIT row is still written, as exit_order does
+                        ok = False
+                        logger.error(f"BulkExit: Broker exit call failed for broker_id={be['broker_id']}, broker_order_id={leg.broker_order_id}: {e}")
+                    return {"action": "exit", "ok": ok, "response": exit_resp, "latency": time.perf_counter() - started}
+                if leg.status in PARTIAL_STATUSES:
+                    exit_resp = await bm.exit_order(be["broker_id"], leg.broker_order_id, symbol=symbol,
+                                                    product_type=be.get("product_type"), exit_reason=exit_reason)
+                    cancel_resp = await bm.cancel_order(be["broker_id"], leg.broker_order_id, symbol=symbol,
+                                                        product_type=be.get("product_type"),
+                                                        exit_reason="Exit requested for PARTIALLY_FILLED order")
+                    if not self.order_manager._is_cancel_response_successful(cancel_resp):
+                        logger.warning(f"BulkExit: Cancel failed for PARTIALLY_FILLED broker_exec_id={be['id']}: {cancel_resp}")
+                    return {"action": "exit", "response": exit_resp, "partial": True, "latency": time.perf_counter() - started}
+                if leg.status in CANCEL_STATUSES:
+                    cancel_resp = await bm.cancel_order(be["broker_id"], leg.broker_order_id, symbol=symbol,
+                                                        product_type=be.get("product_type"),
+                                                        cancel_reason=f"Exit requested but status was {leg.status}")
+                    return {"action": "cancel", "ok": self.order_manager._is_cancel_response_successful(cancel_resp),
+                            "response": cancel_resp, "latency": time.perf_counter() - started}
+            logger.warning(f"BulkExit: Unhandled status '{leg.status}' for broker_execution id={be['id']}. No action taken.")
+            return {"action": "skipped"}
+        except Exception as e:
+            logger.error(f"BulkExit: Error exiting/cancelling broker_exec_id={be['id']} (broker_order_id={leg.broker_order_id}): {e}")
+            return {"action": "failed", "error": str(e), "latency": time.perf_counter() - started}
+
+    @staticmethod
+    def _is_settled(leg: ExitLeg, outcome: dict) -> bool:
+        """Whether the leg is flat after its broker call: exited, cancelled or already terminal."""
+        action = outcome["action"]
+        if action in ("exit", "cancel"):
+            return outcome.get("ok", True)
+        return action == "skipped" and leg.status in SKIP_STATUSES
+
+    def _record(self, leg: ExitLeg, outcome: dict, exit_reason: str, existing_exits: set, batch: ExitBatch,
+                report: BulkExitReport) -> None:
+        be, action = leg.execution, outcome["action"]
+        broker = report.brokers.setdefault(leg.broker_name or str(be.get("broker_id")),
+                                           {"exits": 0, "cancels": 0, "failed": 0, "max_latency_ms": 0.0})
+        if "latency" in outcome:
+            broker["max_latency_ms"] = max(broker["max_latency_ms"], round(outcome["latency"] * 1000, 1))
+        if action == "skipped":
+            report.skipped += 1
+        elif action == "failed":
+            report.failed += 1
+            broker["failed"] += 1
+        elif action == "cancel":
+            if outcome["ok"]:
+                report.cancels += 1
+                broker["cancels"] += 1
+                batch.execution_updates.append((be["id"], {"status": "CANCELLED"}))
+            else:
+                report.failed += 1
+                broker["failed"] += 1
+                logger.warning(f"BulkExit: Cancel failed for broker_exec_id={be['id']}: {outcome.get('response')}. Status will remain {leg.status}.")
+        elif action == "exit":
+            report.exits += 1
+            broker["exits"] += 1
+            key = (leg.order["id"], be["broker_id"], leg.broker_order_id)
+            if key in existing_exits:
+                return
+            existing_exits.add(key)
+            response = outcome.get("response")
+            partial = outcome.get("partial", False)
+            orig_side = self.order_manager.normalize_action_field(be.get("action") or "")
+            batch.exit_executions.append(self.order_manager.build_broker_exec_data(
+                parent_order_id=leg.order["id"],
+                broker_id=be["broker_id"],
+                broker_order_id=leg.broker_order_id,
+                side="EXIT",
+                status="PENDING",
+                action={"BUY": "SELL", "SELL": "BUY"}.get(orig_side, "EXIT"),
+                executed_quantity=be.get("executed_quantity", 0),
+                quantity=be.get("quantity", be.get("executed_quantity", 0)),
+                product_type=be.get("product_type"),
+                order_type="MARKET",
+                order_messages=(f"Exit and cancel placed for PARTIALLY_FILLED. Reason: {exit_reason}" if partial
+                                else f"Exit order placed. Reason: {exit_reason}"),
+                symbol=be.get("symbol") or leg.order.get("strike_symbol"),
+                notes=f"Bulk exit via OrderManager. Reason: {exit_reason}",
+                exit_broker_order_id=response.get("order_id") if isinstance(response, dict) else None,
+            ))
+
+    # --- writing ---
+
+    async def _persist(self, batch: ExitBatch) -> None:
+        """Write the batch in one transaction."""
+        from algosat.core.db import AsyncSessionLocal
+        from algosat.core.dbschema import broker_executions, orders
+
+        async with AsyncSessionLocal() as session:
+            if batch.exit_executions:
+                await session.execute(broker_executions.insert(), batch.exit_executions)
+            for execution_id, values in batch.execution_updates:
+                await session.execute(broker_executions.update().where(broker_executions.c.id == execution_id).values(**values))
+            for order_id, status in batch.order_statuses.items():
+                await session.execute(orders.update().where(orders.c.id == order_id).values(status=status))
+            await session.commit()
+        logger.info(f"BulkExit: Wrote {len(batch.exit_executions)} EXIT executions, {len(batch.execution_updates)} execution "
+                    f"updates and {len(batch.order_statuses)} order statuses in one transaction")
@@ -0,0 +1,450 @@
+"""
+Streaming OHLCV bars built locally from the tick bus.
+
+CandleAggregator keeps one series per (symbol, interval) for every tracked symbol and builds
+all of them from the same tick stream. Bars are aligned to the 09:15 IST session open (a
+15-minute bar starts at 09:15, 09:30, ...; a 60-minute bar at 09:15, 10:15, ...) and the last
+bar of the day ends at the 15:30 close. A bar is closed by the clock at its boundary, not by
+the next tick, so wait_for_close() returns exactly at the boundary even on a quiet symbol.
+
+Bars built from ticks can differ slightly from the broker's (missed ticks, a bar that was
+already in progress when tracking started). Shortly after bars close, the series is
+reconciled against broker history for the session: differing bars are replaced by the
+broker's and bars from before tracking started are filled in. Once a series is contiguous
+from 09:15, session_complete() is True and strategies can read today's bars from
+get_bars() instead of fetching them from the broker every cycle.
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from algosat.common.logger import get_logger
+from algosat.core.candle_store import TIMESTAMP_COLUMN, candle_times, to_naive_ist
+from algosat.core.tick_bus import TickBus, parse_tick
+from algosat.core.time_utils import get_ist_datetime
+from algosat.core.trading_calendar import MARKET_CLOSE, MARKET_OPEN
+
+logger = get_logger("CandleAggregator")
+
+SESSION_OPEN = timedelta(hours=MARKET_OPEN.hour, minutes=MARKET_OPEN.minute)
+SESSION_CLOSE = timedelta(hours=MARKET_CLOSE.hour, minutes=MARKET_CLOSE.minute)
+# Closed bars kept per series (a 1-minute series holds two sessions)
+DEFAULT_MAX_BARS = 750
+# Wait after a bar closes before asking the broker for it, so the broker has published it
+DEFAULT_RECONCILE_DELAY = 10.0
+DEFAULT_RECONCILE_INTERVAL = 300.0
+# Price difference below which a local bar is considered equal to the broker's
+PRICE_TOLERANCE = 1e-6
+# Interest owner name of the tracked symbols on the tick bus
+TICK_BUS_OWNER = "candles"
+
+
+def feed_symbol(symbol: str) -> str:
+    """Symbol as it appears on the tick feed; bare symbols are NSE, as in FyersWrapper.get_history."""
+    return symbol if ":" in symbol else f"NSE:{symbol}"
+
+
+def session_open(ts: pd.Timestamp) -> pd.Timestamp:
+    return ts.normalize() + SESSION_OPEN
+
+
+def bar_start(ts, interval_minutes: int) -> pd.Timestamp:
+    """Start of the interval_minutes bar containing ts (naive IST), aligned to 09:15."""
+    ts = to_naive_ist(ts)
+    opened = session_open(ts)
+    minutes = int((ts - opened).total_seconds() // 60)
+    return opened + timedelta(minutes=(minutes // interval_minutes) * interval_minutes)
+
+
+def bar_end(start: pd.Timestamp, interval_minutes: int) -> pd.Timestamp:
+    """End of the bar starting at start; the last bar of the session ends at 15:30."""
+    return min(start + timedelta(minutes=interval_minutes), start.normalize() + SESSION_CLOSE)
+
+
+def in_session(ts: pd.Timestamp) -> bool:
+    return session_open(ts) <= ts < ts.normalize() + SESSION_CLOSE
+
+
+@dataclass
+class Bar:
+    symbol: str
+    interval: int
+    start: pd.Timestamp
+    end: pd.Timestamp
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float = 0.0
+    ticks: int = 0
+    complete: bool = True  # False when the bar was in progress before ticks were received
+    source: str = "ticks"  # "ticks" or "broker" once reconciled
+
+    def update(self, price: float, volume: float = 0.0) -> None:
+        self.high = max(self.high, price)
+        self.low = min(self.low, price)
+        self.close = price
+        self.volume += volume
+        self.ticks += 1
+
+
+@dataclass
+class _Series:
+    symbol: str
+    interval: int
+    bars: Deque[Bar] = field(default_factory=lambda: deque(maxlen=DEFAULT_MAX_BARS))
+    current: Optional[Bar] = None
+    local_from: Optional[pd.Timestamp] = None  # start of the first bar built entirely from ticks
+    reconciled_through: Optional[pd.Timestamp] = None  # last bar start confirmed by broker history
+    closed: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class CandleAggregator:
+    """Builds 1/3/5/15-minute (or any intraday) bars per symbol from one tick stream."""
+
+    def __init__(
+        self,
+        tick_bus: Optional[TickBus] = None,
+        data_manager=None,  # Optional DataManager used to reconcile against broker history
+        max_bars: int = DEFAULT_MAX_BARS,
+        reconcile_delay: float = DEFAULT_RECONCILE_DELAY,
+        reconcile_interval: float = DEFAULT_RECONCILE_INTERVAL,
+        clock=None,  # Optional callable returning the current IST datetime (tests, replay)
+    ):
+        self.tick_bus = tick_bus
+        self.data_manager = data_manager
+        self.max_bars = max_bars
+        self.reconcile_delay = reconcile_delay
+        self.reconcile_interval = reconcile_interval
+        self._clock = clock or get_ist_datetime
+        self._series: Dict[Tuple[str, int], _Series] = {}
+        self._by_symbol: Dict[str, List[_Series]] = {}
+        self._last_volume: Dict[str, float] = {}  # symbol -> last cumulative day volume
+        self._tracking_since: Dict[str, pd.Timestamp] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._queue: Optional[asyncio.Queue] = None
+        self._running = False
+        # Stats
+        self._ticks = 0
+        self._bars_closed = 0
+        self._corrections = 0
+        self._reconciles = 0
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def now(self) -> pd.Timestamp:
+        return to_naive_ist(self._clock())
+
+    # --- Tracking ---
+
+    def track(self, symbol: str, intervals: Iterable[int]) -> None:
+        """Build bars for symbol at each interval (minutes); already tracked intervals are kept."""
+        symbol = feed_symbol(symbol)
+        added = False
+        for interval in sorted({int(i) for i in intervals if i}):
+            key = (symbol, interval)
+            if key in self._series:
+                continue
+            series = _Series(symbol, interval, bars=deque(maxlen=self.max_bars))
+            self._series[key] = series
+            self._by_symbol.setdefault(symbol, []).append(series)
+            added = True
+        if added:
+            self._tracking_since.setdefault(symbol, self.now())
+            self._update_interest()
+            logger.info(f"CandleAggregator: Tracking {symbol} at {[s.interval for s in self._by_symbol[symbol]]} minutes")
+
+    def untrack(self, symbol: str) -> None:
+        symbol = feed_symbol(symbol)
+        for series in self._by_symbol.pop(symbol, []):
+            self._series.pop((symbol, series.interval), None)
+        self._last_volume.pop(symbol, None)
+        self._tracking_since.pop(symbol, None)
+        self._update_interest()
+
+    def is_tracking(self, symbol: str, interval: Optional[int] = None) -> bool:
+        if interval is None:
+            return feed_symbol(symbol) in self._by_symbol
+        return (feed_symbol(symbol), int(interval)) in self._series
+
+    def _update_interest(self) -> None:
+        if self.tick_bus is not None:
+            self.tick_bus.set_interest(TICK_BUS_OWNER, self._by_symbol.keys())
+
+    # --- Lifecycle ---
+
+    async def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        if self.tick_bus is not None:
+            self._queue = self.tick_bus.listen()
+            self._tasks.append(asyncio.create_task(self._consume_ticks()))
+        self._tasks.append(asyncio.create_task(self._boundary_loop()))
+        if self.data_manager is not None:
+            self._tasks.append(asyncio.create_task(self._reconcile_loop()))
+        logger.info("CandleAggregator: Started")
+
+    async def stop(self) -> None:
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks.clear()
+        if self.tick_bus is not None and self._queue is not None:
+            self.tick_bus.unlisten(self._queue)
+            self._queue = None
+
+    async def _consume_ticks(self) -> None:
+        while self._running:
+            message = await self._queue.get()
+            tick = parse_tick(message, time.monotonic())
+            if tick is None or tick.symbol not in self._by_symbol:
+                continue
+            if tick.exchange_time:
+                ts = to_naive_ist(pd.Timestamp(tick.exchange_time, unit="s", tz="UTC"))
+            else:
+                ts = self.now()
+            try:
+                self.on_tick(tick.symbol, tick.ltp, ts, tick.volume)
+            except Exception as e:
+                logger.error(f"CandleAggregator: Tick for {tick.symbol} failed: {e}")
+
+    async def _boundary_loop(self) -> None:
+        # Every bar boundary falls on a whole minute, so waking each minute closes bars on time
+        while self._running:
+            now = self.now()
+            next_minute = now.floor("min") + timedelta(minutes=1)
+            await asyncio.sleep(max(0.0, (next_minute - now).total_seconds()))
+            self.close_due_bars(self.now())
+
+    # --- Bar building ---
+
+    def on_tick(self, symbol: str, price: float, ts, cumulative_volume: Optional[float] = None) -> None:
+        """Apply one trade at ts (naive IST) to every tracked interval of symbol."""
+        symbol = feed_symbol(symbol)
+        series_list = self._by_symbol.get(symbol)
+        if not series_list:
+            return
+        ts = to_naive_ist(ts)
+        volume = 0.0
+        if cumulative_volume is not None:
+            previous = self._last_volume.get(symbol)
+            self._last_volume[symbol] = cumulative_volume
+            if previous is not None and cumulative_volume >= previous:
+                volume = float(cumulative_volume - previous)
+        if not in_session(ts):
+            return
+        self._ticks += 1
+        tracking_since = self._tracking_since.get(symbol, ts)
+        if tracking_since.normalize() < ts.normalize():
+            # A new session: the aggregator has been running since before the open
+            tracking_since = self._tracking_since[symbol] = ts.normalize()
+        for series in series_list:
+            if series.local_from is not None and series.local_from.normalize() != ts.normalize():
+                series.local_from = None
+                series.reconciled_through = None
+            current = series.current
+            if current is not None and ts >= current.end:
+                self._close(series)
+                current = None
+            if current is None:
+                start = bar_start(ts, series.interval)
+                if series.bars and start <= series.bars[-1].start:
+                    continue  # late tick for a bar that has already closed
+                complete = start >= tracking_since
+                series.current = Bar(
+                    symbol=symbol, interval=series.interval, start=start, end=bar_end(start, series.interval),
+                    open=price, high=price, low=price, close=price, volume=volume, ticks=1, complete=complete,
+                )
+                if complete and series.local_from is None:
+                    series.local_from = start
+            else:
+                current.update(price, volume)
+
+    def close_due_bars(self, now) -> List[Bar]:
+        """Close every in-progress bar whose end is at or before now; returns the closed bars."""
+        now = to_naive_ist(now)
+        closed = []
+        for series in self._series.values():
+            if series.current is not None and series.current.end <= now:
+                closed.append(self._close(series))
+        return closed
+
+    def _close(self, series: _Series) -> Bar:
+        bar = series.current
+        series.current = None
+        series.bars.append(bar)
+        self._bars_closed += 1
+        # Wake everyone waiting for this series, then arm a fresh event for the next bar
+        event, series.closed = series.closed, asyncio.Event()
+        event.set()
+        logger.debug(f"CandleAggregator: Closed {series.symbol} {series.interval}m bar {bar.start} O={bar.open} H={bar.high} L={bar.low} C={bar.close}")
+        return bar
+
+    # --- Readers ---
+
+    async def wait_for_close(self, symbol: str, interval: int, timeout: Optional[float] = None) -> Optional[Bar]:
+        """Wait for the next bar of symbol/interval to close and return it (None on timeout)."""
+        series = self._series.get((feed_symbol(symbol), int(interval)))
+        if series is None:
+            raise KeyError(f"CandleAggregator is not tracking {symbol} at {interval} minutes")
+        event = series.closed
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        return series.bars[-1] if series.bars else None
+
+    def last_bar(self, symbol: str, interval: int) -> Optional[Bar]:
+        series = self._series.get((feed_symbol(symbol), int(interval)))
+        return series.bars[-1] if series is not None and series.bars else None
+
+    def get_bars(self, symbol: str, interval: int, since=None) -> pd.DataFrame:
+        """Closed bars (oldest first) in the broker history layout: timestamp, open, high, low, close, volume."""
+        series = self._series.get((feed_symbol(symbol), int(interval)))
+        bars = list(series.bars) if series is not None else []
+        if since is not None:
+            since = to_naive_ist(since)
+            bars = [bar for bar in bars if bar.start >= since]
+        return pd.DataFrame(
+            [(bar.start, bar.open, bar.high, bar.low, bar.close, bar.volume) for bar in bars],
+            columns=[TIMESTAMP_COLUMN, "open", "high", "low", "close", "volume"],
+        )
+
+    def session_complete(self, symbol: str, interval: int) -> bool:
+        """True if today's closed bars from 09:15 are all present (built locally or reconciled)."""
+        series = self._series.get((feed_symbol(symbol), int(interval)))
+        if series is None or series.local_from is None or series.local_from.normalize() != self.now().normalize():
+            return False
+        opened = session_open(series.local_from)
+        if series.local_from <= opened:
+            return True
+        return (
+            series.reconciled_through is not None
+            and series.reconciled_through >= series.local_from - timedelta(minutes=series.interval)
+        )
+
+    # --- Reconciliation ---
+
+    def reconcile(self, symbol: str, interval: int, history: Optional[pd.DataFrame]) -> int:
+        """
+        Replace today's closed bars with the broker's where they differ and fill in bars the
+        aggregator never saw. Returns the number of bars corrected or added.
+        """
+        series = self._series.get((feed_symbol(symbol), int(interval)))
+        if series is None or history is None or history.empty or TIMESTAMP_COLUMN not in history.columns:
+            return 0
+        last_closed = series.bars[-1].start if series.bars else None
+        if last_closed is None:
+            return 0
+        today_open = session_open(last_closed)
+        times = candle_times(history)
+        local = {bar.start: bar for bar in series.bars}
+        corrections = 0
+        reconciled_through = series.reconciled_through
+        for ts, row in zip(times, history.itertuples(index=False)):
+            if ts < today_open or ts > last_closed:
+                continue
+            broker_bar = Bar(
+                symbol=series.symbol, interval=series.interval, start=ts, end=bar_end(ts, series.interval),
+                open=float(row.open), high=float(row.high), low=float(row.low), close=float(row.close),
+                volume=float(getattr(row, "volume", 0) or 0), complete=True, source="broker",
+            )
+            bar = local.get(ts)
+            if bar is None or not _same_prices(bar, broker_bar):
+                local[ts] = broker_bar
+                corrections += 1
+            reconciled_through = ts if reconciled_through is None else max(reconciled_through, ts)
+        if corrections:
+            series.bars = deque(sorted(local.values(), key=lambda b: b.start), maxlen=self.max_bars)
+            self._corrections += corrections
+            logger.info(f"CandleAggregator: Reconciled {series.symbol} {series.interval}m, {corrections} bars corrected from broker history")
+        series.reconciled_through = reconciled_through
+        self._reconciles += 1
+        return corrections
+
+    async def reconcile_with_history(self, symbol: str, interval: int) -> int:
+        """Fetch today's history for symbol/interval from the broker and reconcile with it."""
+        from algosat.core.time_utils import localize_to_ist
+        series = self._series.get((feed_symbol(symbol), int(interval)))
+        if series is None or not series.bars or self.data_manager is None:
+            return 0
+        last_closed = series.bars[-1].start
+        history = await self.data_manager.get_history(
+            series.symbol,
+            localize_to_ist(session_open(last_closed).to_pydatetime()),
+            localize_to_ist(last_closed.to_pydatetime()),
+            ohlc_interval=series.interval,
+            cache=False,
+        )
+        return self.reconcile(series.symbol, series.interval, history)
+
+    def _needs_reconcile(self, series: _Series) -> bool:
+        if not series.bars:
+            return False
+        last = series.bars[-1]
+        if series.reconciled_through is not None and series.reconciled_through >= last.start:
+            return False
+        # Let the broker publish the bar first
+        return (self.now() - last.end).total_seconds() >= self.reconcile_delay
+
+    async def _reconcile_loop(self) -> None:
+        await asyncio.sleep(self.reconcile_delay)
+        while self._running:
+            for series in list(self._series.values()):
+                if not self._needs_reconcile(series):
+                    continue
+                try:
+                    await self.reconcile_with_history(series.symbol, series.interval)
+                except Exception as e:
+                    logger.error(f"CandleAggregator: Reconcile failed for {series.symbol} {series.interval}m: {e}")
+            # Series still missing the start of the session are retried soon; the rest every interval
+            await asyncio.sleep(self.reconcile_delay if self._pending_backfill() else self.reconcile_interval)
+
+    def _pending_backfill(self) -> bool:
+        return any(
+            series.bars and not self.session_complete(series.symbol, series.interval)
+            for series in self._series.values()
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "symbols": len(self._by_symbol),
+            "series": len(self._series),
+            "ticks": self._ticks,
+            "bars_closed": self._bars_closed,
+            "reconciles": self._reconciles,
+            "corrections": self._corrections,
+        }
+
+
+def _same_prices(a: Bar, b: Bar) -> bool:
+    return all(
+        abs(getattr(a, name) - getattr(b, name)) <= PRICE_TOLERANCE
+        for name in ("open", "high", "low", "close")
+    )
+
+
+_candle_aggregator: Optional[CandleAggregator] = None
+
+
+def get_candle_aggregator() -> CandleAggregator:
+    """The process-wide CandleAggregator fed by the process-wide TickBus."""
+    global _candle_aggregator
+    if _candle_aggregator is None:
+        from algosat.core.tick_bus import get_tick_bus
+        _candle_aggregator = CandleAggregator(tick_bus=get_tick_bus())
+    return _candle_aggregator
@@ -0,0 +1,247 @@
+"""
+Persistent per-(symbol, interval) store of closed candles.
+
+DataManager.get_history serves the closed-candle prefix of a request from here and only
+asks the broker for the tail since the last stored bar. Each series is one file (Parquet
+when pyarrow is installed, pickle otherwise) plus a small JSON sidecar recording the
+window the series is known to be complete for (covered_from .. covered_to). Coverage is
+tracked explicitly because a gap in timestamps (nights, weekends, holidays) does not by
+itself tell whether candles are missing.
+
+All timestamps are compared as naive IST; frames are stored in the layout the broker
+returned them in (Fyers: naive IST column, Zerodha: tz-aware column plus 'date' index).
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import pickle
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from algosat.common import constants
+from algosat.common.logger import get_logger
+from algosat.core.market_data_cache import PARQUET_AVAILABLE
+
+logger = get_logger("candle_store")
+
+DEFAULT_CANDLE_STORE_PATH = os.path.join(constants.CACHE_DIR, "candles")
+DEFAULT_RETENTION_DAYS = 60
+TIMESTAMP_COLUMN = "timestamp"
+IST = "Asia/Kolkata"
+
+
+def candle_interval_minutes(ohlc_interval: Any) -> Optional[int]:
+    """Intraday interval in minutes for 1, "5", "15" ...; None for daily or unknown intervals."""
+    if isinstance(ohlc_interval, bool):
+        return None
+    if isinstance(ohlc_interval, int):
+        return ohlc_interval if 0 < ohlc_interval < 1440 else None
+    if isinstance(ohlc_interval, str) and ohlc_interval.strip().isdigit():
+        return candle_interval_minutes(int(ohlc_interval.strip()))
+    return None
+
+
+def to_naive_ist(value) -> pd.Timestamp:
+    """Convert a datetime/Timestamp to a naive IST Timestamp (naive input is assumed to be IST)."""
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert(IST).tz_localize(None)
+    return ts
+
+
+def candle_times(frame: pd.DataFrame) -> pd.Series:
+    """The frame's timestamp column as naive IST, aligned with the frame's rows."""
+    times = pd.to_datetime(frame[TIMESTAMP_COLUMN])
+    if times.dt.tz is not None:
+        times = times.dt.tz_convert(IST).dt.tz_localize(None)
+    return times
+
+
+def last_closed_candle_start(now, interval_minutes: int) -> pd.Timestamp:
+    """Start time of the most recent candle that has fully closed at `now` (naive IST)."""
+    now = to_naive_ist(now)
+    midnight = now.normalize()
+    minutes = int((now - midnight).total_seconds() // 60)
+    return midnight + timedelta(minutes=(minutes // interval_minutes) * interval_minutes - interval_minutes)
+
+
+def merge_candles(*frames: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """Concatenate candle frames, keep the last row per timestamp and sort by time."""
+    frames = [frame for frame in frames if frame is not None and not frame.empty]
+    if not frames:
+        return None
+    if len(frames) == 1:
+        merged = frames[0]
+    else:
+        merged = pd.concat(frames)
+    times = candle_times(merged)
+    keep = ~times.duplicated(keep="last").to_numpy()
+    merged = merged[keep]
+    order = candle_times(merged).to_numpy().argsort(kind="stable")
+    merged = merged.iloc[order]
+    if isinstance(frames[-1].index, pd.RangeIndex):
+        merged = merged.reset_index(drop=True)
+    merged.attrs = dict(frames[-1].attrs)
+    return merged
+
+
+def slice_candles(frame: Optional[pd.DataFrame], start=None, end=None) -> Optional[pd.DataFrame]:
+    """Rows with start <= timestamp <= end (naive IST bounds, either may be None)."""
+    if frame is None or frame.empty:
+        return frame
+    times = candle_times(frame)
+    mask = pd.Series(True, index=times.index)
+    if start is not None:
+        mask &= times >= start
+    if end is not None:
+        mask &= times <= end
+    sliced = frame[mask.to_numpy()]
+    if isinstance(frame.index, pd.RangeIndex):
+        sliced = sliced.reset_index(drop=True)
+    sliced.attrs = dict(frame.attrs)
+    return sliced
+
+
+@dataclass
+class CandleSeries:
+    frame: pd.DataFrame
+    covered_from: pd.Timestamp
+    covered_to: pd.Timestamp
+
+
+class CandleStore:
+    """
+    Closed candles per (symbol, interval), kept in memory after first use and persisted to disk.
+    Callers hold lock(symbol, interval) around a load -> fetch tail -> save sequence.
+    """
+
+    def __init__(self, path: str = DEFAULT_CANDLE_STORE_PATH, retention_days: Optional[int] = DEFAULT_RETENTION_DAYS):
+        self.path = path
+        self.retention_days = retention_days
+        self._series: Dict[Tuple[str, int], Optional[CandleSeries]] = {}
+        self._locks: Dict[Tuple[str, int], asyncio.Lock] = {}
+        self._stats = {
+            "requests": 0,
+            "store_only": 0,
+            "tail_fetches": 0,
+            "full_fetches": 0,
+            "fetch_failures": 0,
+            "candles_from_store": 0,
+            "candles_fetched": 0,
+        }
+
+    def lock(self, symbol: str, interval: int) -> asyncio.Lock:
+        key = (symbol, interval)
+        if key not in self._locks:
+            self._locks[key] = asyncio.Lock()
+        return self._locks[key]
+
+    async def load(self, symbol: str, interval: int) -> Optional[CandleSeries]:
+        key = (symbol, interval)
+        if key not in self._series:
+            self._series[key] = await asyncio.to_thread(self._read, symbol, interval)
+        return self._series[key]
+
+    async def save(self, symbol: str, interval: int, frame: Optional[pd.DataFrame], covered_from, covered_to) -> Optional[CandleSeries]:
+        """
+        Merge closed candles covering [covered_from, covered_to] into the stored series.
+        If the new window does not overlap or touch the stored one, it replaces it.
+        """
+        covered_from, covered_to = to_naive_ist(covered_from), to_naive_ist(covered_to)
+        if covered_to < covered_from:
+            return await self.load(symbol, interval)
+        existing = await self.load(symbol, interval)
+        step = timedelta(minutes=interval)
+        if existing is not None and covered_from <= existing.covered_to + step and covered_to >= existing.covered_from - step:
+            merged = merge_candles(existing.frame, frame)
+            covered_from = min(covered_from, existing.covered_from)
+            covered_to = max(covered_to, existing.covered_to)
+        else:
+            merged = merge_candles(frame)
+        if merged is None:
+            return existing
+        # retention_days=None keeps everything (backtest stores)
+        cutoff = covered_to.normalize() - timedelta(days=self.retention_days) if self.retention_days is not None else None
+        if cutoff is not None and covered_from < cutoff:
+            merged = slice_candles(merged, start=cutoff)
+            covered_from = cutoff
+        series = CandleSeries(frame=merged, covered_from=covered_from, covered_to=covered_to)
+        self._series[(symbol, interval)] = series
+        try:
+            await asyncio.to_thread(self._write, symbol, interval, series)
+        except Exception as e:
+            logger.error(f"Failed to persist candles for {symbol} {interval}m: {e}", exc_info=True)
+        return series
+
+    def record(self, **counts: int) -> None:
+        for name, count in counts.items():
+            self._stats[name] += count
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request and candle counters (served from the store vs fetched from the broker)."""
+        stats = dict(self._stats)
+        total = stats["candles_from_store"] + stats["candles_fetched"]
+        stats["store_ratio"] = round(stats["candles_from_store"] / total, 4) if total else 0.0
+        stats["series"] = sum(1 for series in self._series.values() if series is not None)
+        return stats
+
+    # --- persistence ---
+
+    def _base_name(self, symbol: str, interval: int) -> str:
+        return hashlib.sha1(f"{symbol}|{interval}".encode()).hexdigest()
+
+    def _read(self, symbol: str, interval: int) -> Optional[CandleSeries]:
+        meta_path = os.path.join(self.path, self._base_name(symbol, interval) + ".json")
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+            data_path = os.path.join(self.path, meta["file"])
+            if meta["format"] == "parquet":
+                frame = pd.read_parquet(data_path)
+            else:
+                with open(data_path, "rb") as f:
+                    frame = pickle.load(f)
+            frame.attrs = meta.get("attrs", {})
+            return CandleSeries(
+                frame=frame,
+                covered_from=pd.Timestamp(meta["covered_from"]),
+                covered_to=pd.Timestamp(meta["covered_to"]),
+            )
+        except Exception as e:
+            logger.error(f"Failed to load stored candles for {symbol} {interval}m, refetching: {e}")
+            return None
+
+    def _write(self, symbol: str, interval: int, series: CandleSeries) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        base = self._base_name(symbol, interval)
+        fmt = "parquet" if PARQUET_AVAILABLE else "pickle"
+        data_file = f"{base}.{fmt}"
+        data_path = os.path.join(self.path, data_file)
+        if fmt == "parquet":
+            series.frame.to_parquet(data_path + ".tmp")
+        else:
+            with open(data_path + ".tmp", "wb") as f:
+                pickle.dump(series.frame, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(data_path + ".tmp", data_path)
+        attrs = {k: v for k, v in series.frame.attrs.items() if isinstance(v, (str, int, float, bool))}
+        meta = {
+            "symbol": symbol,
+            "interval": interval,
+            "file": data_file,
+            "format": fmt,
+            "covered_from": series.covered_from.isoformat(),
+            "covered_to": series.covered_to.isoformat(),
+            "rows": len(series.frame),
+            "attrs": attrs,
+        }
+        meta_path = os.path.join(self.path, base + ".json")
+        with open(meta_path + ".tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + ".tmp", meta_path)
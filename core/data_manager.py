@@ -1,16 +1,41 @@
 """Market data caching and rate-limiting utilities."""
 
 import asyncio
-import shelve
+import time
 from datetime import datetime, timedelta
 from cachetools import TTLCache
 import inspect
+from functools import partial
 import pandas as pd
 from algosat.common.logger import get_logger
 from algosat.models.order_aggregate import OrderAggregate, BrokerOrder
 from typing import List, Dict, Any, Optional, Union
 from algosat.core.db import get_broker_executions_for_order, get_order_by_id
 from algosat.core.async_retry import async_retry_with_rate_limit, RetryConfig, get_retry_config
+from algosat.core.candle_store import (
+    CandleStore,
+    TIMESTAMP_COLUMN,
+    candle_interval_minutes,
+    candle_times,
+    last_closed_candle_start,
+    merge_candles,
+    slice_candles,
+    to_naive_ist,
+)
+from algosat.core.tick_bus import TickBus
+from algosat.core.monitoring import observe_latency, trading_metrics
+from algosat.core.tracing import span
+from algosat.core.candle_aggregator import CandleAggregator
+from algosat.core.market_data_cache import (
+    CacheEntry,
+    CacheStats,
+    DiskCacheTier,
+    MemoryCacheTier,
+    cache_namespace,
+    estimate_size,
+    DEFAULT_DISK_CACHE_PATH,
+    DEFAULT_MEMORY_CACHE_BYTES,
+)
 
 logger = get_logger("data_manager")
 
@@ -19,32 +44,90 @@ logger = get_logger("data_manager")
 
 class _CacheManager:
     """
-    A hybrid in-memory + persistent disk cache manager.
-    """
-    def __init__(self, maxsize: int = 512, shelve_path: str = "/tmp/algosat_cache.db"):
-        self.caches: Dict[int, TTLCache] = {}
-        self.maxsize = maxsize
-        self.shelve_path = shelve_path
+    A tiered cache manager: a bounded in-memory LRU tier in front of an optional
+    persistent disk tier (see algosat.core.market_data_cache).
 
-    def get_cache(self, ttl: int) -> TTLCache:
-        if ttl not in self.caches:
-            self.caches[ttl] = TTLCache(maxsize=self.maxsize, ttl=ttl)
-        return self.caches[ttl]
+    Every entry carries its own expiry, in memory and on disk, so nothing stale is
+    served after a restart. Memory misses only touch the disk when the key is in the
+    disk index, and disk writes are batched off the event loop.
+    """
+    def __init__(self,
+                 maxsize: int = 512,
+                 max_bytes: int = DEFAULT_MEMORY_CACHE_BYTES,
+                 disk_path: Optional[str] = DEFAULT_DISK_CACHE_PATH,
+                 flush_interval: float = 1.0):
+        self.stats = CacheStats()
+        self.memory = MemoryCacheTier(max_entries=maxsize, max_bytes=max_bytes, stats=self.stats)
+        self.disk = DiskCacheTier(disk_path, stats=self.stats, flush_interval=flush_interval) if disk_path else None
 
     def get(self, key: str, ttl: int = 60) -> Any:
-        # Check in-memory
-        cache = self.get_cache(ttl)
-        if key in cache:
-            return cache[key]
-        # Check shelve
-        with shelve.open(self.shelve_path) as db:
-            return db.get(key)
+        """Synchronous lookup; a disk hit reads the file on the calling thread."""
+        entry = self.memory.get(key, max_age=ttl)
+        if entry is not None:
+            self._record_lookup(cache_namespace(key), "hits")
+            return entry.value
+        entry = self.disk.get(key, max_age=ttl) if self.disk is not None else None
+        return self._disk_result(key, entry)
+
+    async def aget(self, key: str, ttl: int = 60) -> Any:
+        """Like get(), but a disk hit is read in a worker thread instead of on the event loop."""
+        entry = self.memory.get(key, max_age=ttl)
+        if entry is not None:
+            self._record_lookup(cache_namespace(key), "hits")
+            return entry.value
+        entry = None
+        if self.disk is not None and self.disk.contains(key):
+            entry = await asyncio.to_thread(self.disk.get, key, ttl)
+        return self._disk_result(key, entry)
+
+    def _disk_result(self, key: str, entry: Optional[CacheEntry]) -> Any:
+        namespace = cache_namespace(key)
+        if entry is not None:
+            entry.nbytes = estimate_size(entry.value)
+            self.memory.put(key, entry)
+            self._record_lookup(namespace, "disk_hits")
+            return entry.value
+        self._record_lookup(namespace, "misses")
+        return None
+
+    def _record_lookup(self, namespace: str, event: str) -> None:
+        self.stats.record(namespace, event)
+        trading_metrics.data_cache_requests.labels(namespace=namespace, result=event).inc()
 
     def set(self, key: str, value: Any, ttl: int = 60) -> None:
-        cache = self.get_cache(ttl)
-        cache[key] = value
-        with shelve.open(self.shelve_path) as db:
-            db[key] = value
+        now = time.time()
+        entry = CacheEntry(value=value, stored_at=now, expires_at=now + ttl, nbytes=estimate_size(value))
+        self.memory.put(key, entry)
+        if self.disk is not None:
+            self.disk.put(key, entry)
+        self.stats.record(cache_namespace(key), "sets")
+
+    def delete(self, key: str) -> None:
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def flush(self) -> None:
+        """Write pending disk entries now (normally done by the background writer)."""
+        if self.disk is not None:
+            self.disk.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-namespace hit/miss/eviction counters and memory usage."""
+        namespaces = self.stats.snapshot()
+        for namespace, usage in self.memory.usage().items():
+            namespaces.setdefault(namespace, dict.fromkeys(CacheStats.EVENTS, 0)).update(usage)
+        for counters in namespaces.values():
+            lookups = counters["hits"] + counters["disk_hits"] + counters["misses"]
+            counters["hit_rate"] = round((counters["hits"] + counters["disk_hits"]) / lookups, 4) if lookups else 0.0
+        return {
+            "memory_entries": len(self.memory._entries),
+            "memory_bytes": self.memory.total_bytes,
+            "memory_max_bytes": self.memory.max_bytes,
+            "disk_enabled": self.disk is not None,
+            "disk_entries": self.disk.entry_count() if self.disk is not None else 0,
+            "namespaces": namespaces,
+        }
 
     @staticmethod
     def seconds_until_midnight_ist() -> int:
@@ -65,6 +148,63 @@ class _RateLimiter:
         self.semaphore.release()
 
 
+class _SingleFlight:
+    """
+    Coalesces concurrent identical requests: while a call for a key is in flight, further
+    callers with the same key wait for it and get its result (or exception) instead of
+    making their own broker call. Nothing is kept once the call finishes; caching is the
+    cache manager's job.
+    """
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    async def do(self, key: str, fn) -> Any:
+        counters = self._stats.setdefault(cache_namespace(key), {"calls": 0, "coalesced": 0})
+        counters["calls"] += 1
+        future = self._inflight.get(key)
+        if future is not None:
+            counters["coalesced"] += 1
+            # Shielded so a cancelled waiter does not cancel the call for everyone else
+            return _share(await asyncio.shield(future))
+        future = asyncio.ensure_future(fn())
+        self._inflight[key] = future
+        future.add_done_callback(partial(self._finished, key))
+        # The leader gets a copy too: followers copy the shared result only when they resume
+        return _share(await asyncio.shield(future))
+
+    def _finished(self, key: str, future: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if not future.cancelled():
+            future.exception()  # retrieved here in case every caller was cancelled
+
+    def get_stats(self) -> Dict[str, Any]:
+        namespaces = {}
+        for namespace, counters in self._stats.items():
+            calls = counters["calls"]
+            namespaces[namespace] = {
+                **counters,
+                "broker_calls": calls - counters["coalesced"],
+                "hit_rate": round(counters["coalesced"] / calls, 4) if calls else 0.0,
+            }
+        return {"inflight": len(self._inflight), "namespaces": namespaces}
+
+
+def _share(result: Any) -> Any:
+    """
+    A caller's copy of a shared result, so callers that modify it do not affect each other.
+    DataFrames are copied; dicts and lists are rebuilt level by level (their scalar values
+    and other objects are shared).
+    """
+    if isinstance(result, pd.DataFrame):
+        return result.copy()
+    if isinstance(result, dict):
+        return {key: _share(value) for key, value in result.items()}
+    if isinstance(result, list):
+        return [_share(value) for value in result]
+    return result
+
+
 # Legacy per-broker rate limiter map - DEPRECATED
 # Now using GlobalRateLimiter through broker_manager coordination
 # The rate_limiter_map parameter is maintained for backward compatibility
@@ -173,13 +313,26 @@ class DataManager:
                  cache: Optional[_CacheManager] = None, 
                  rate_limiter: Optional[_RateLimiter] = None, 
                  rate_limiter_map: Optional[Dict[str, _RateLimiter]] = None, 
-                 broker_manager: Optional[Any] = None):
+                 broker_manager: Optional[Any] = None,
+                 candle_store: Optional[CandleStore] = None,
+                 tick_bus: Optional[TickBus] = None,
+                 candle_aggregator: Optional[CandleAggregator] = None):
         self.broker = broker
         self.broker_name = broker_name
         self.broker_manager = broker_manager
         self.cache = cache or _CacheManager()
         self.rate_limiter = rate_limiter or _RateLimiter(max_calls=10, interval_sec=1)
         self.rate_limiter_map = rate_limiter_map or {}
+        # Optional persistent store of closed candles used by get_history for incremental fetches
+        self.candle_store = candle_store
+        # Optional live tick table that answers get_ltp for subscribed symbols without a REST call
+        self.tick_bus = tick_bus
+        # Concurrent identical history/option chain/LTP requests share one broker call
+        self.single_flight = _SingleFlight()
+        # Optional bars built from the tick bus; strategies wait on its bar closes and read today's bars
+        self.candle_aggregator = candle_aggregator
+        if candle_aggregator is not None and candle_aggregator.data_manager is None:
+            candle_aggregator.data_manager = self
         # Broker name cache with 24-hour TTL (broker names rarely change)
         self._broker_name_cache = TTLCache(maxsize=100, ttl=24 * 60 * 60)
 
@@ -202,13 +355,14 @@ class DataManager:
         if self.broker_manager and hasattr(self.broker_manager, '_ensure_rate_limiter'):
             await self.broker_manager._ensure_rate_limiter()
 
-    def _get_data_retry_config(self, operation_type: str = "data_fetch") -> RetryConfig:
-        """Get retry configuration for data operations with global rate limiting."""
+    def _get_data_retry_config(self, operation_type: str = "data_fetch", endpoint: Optional[str] = None) -> RetryConfig:
+        """Get retry configuration for data operations with global rate limiting on the given endpoint."""
         config = get_retry_config(operation_type)
         broker_name = self.get_current_broker_name()
         if broker_name:
             config.rate_limit_broker = broker_name
             config.rate_limit_tokens = 1
+            config.rate_limit_endpoint = endpoint
         return config
 
     async def ensure_broker(self) -> None:
@@ -244,13 +398,13 @@ class DataManager:
             if not self.broker:
                 raise RuntimeError("Broker not set in DataManager. Call ensure_broker() first.")
             cache_key = f"option_chain:{symbol}:{expiry}"
-            cached = self.cache.get(cache_key, ttl=ttl)
+            cached = await self.cache.aget(cache_key, ttl=ttl)
             if cached is not None:
                 return cached
 
             # Ensure global rate limiter is available
             await self._ensure_rate_limiter()
-            retry_config = self._get_data_retry_config("data_fetch")
+            retry_config = self._get_data_retry_config("data_fetch", endpoint="option_chain")
 
             async def _fetch():
                 result = self.broker.get_option_chain(symbol, expiry)
@@ -261,7 +415,9 @@ class DataManager:
                 self.cache.set(cache_key, option_chain, ttl=ttl)
                 return option_chain
 
-            return await async_retry_with_rate_limit(_fetch, config=retry_config)
+            return await self.single_flight.do(
+                cache_key, lambda: async_retry_with_rate_limit(_fetch, config=retry_config)
+            )
         except Exception as e:
             logger.error(f"Error in get_option_chain for symbol={symbol}, expiry={expiry}: {e}", exc_info=True)
             raise
@@ -273,7 +429,8 @@ class DataManager:
                           ohlc_interval: Union[int, str], 
                           ins_type: str = "", 
                           ttl: int = 600, 
-                          cache: bool = True) -> pd.DataFrame:
+                          cache: bool = True,
+                          use_store: bool = True) -> pd.DataFrame:
         try:
             if not self.broker:
                 raise RuntimeError("Broker not set in DataManager. Call ensure_broker() first.")
@@ -302,42 +459,167 @@ class DataManager:
                 logger.debug(f"Adjusted to_date to previous trade day (IST): {to_dt} for symbol {symbol}")
             cache_key = f"history:{symbol}:{from_dt}:{to_dt}:{ohlc_interval}:{ins_type}"
             if cache:
-                cached = self.cache.get(cache_key, ttl=ttl)
+                lookup_started = time.perf_counter()
+                cached = await self.cache.aget(cache_key, ttl=ttl)
                 if cached is not None:
+                    trading_metrics.history_fetch_seconds.labels(source="cache").observe(time.perf_counter() - lookup_started)
                     logger.debug(f"Cache hit for history: {cache_key}") 
                     return cached
 
-            # Ensure global rate limiter is available
-            await self._ensure_rate_limiter()
-            retry_config = self._get_data_retry_config("data_fetch")
-
-            async def _fetch():
-                result = self.broker.get_history(symbol, from_dt, to_dt, ohlc_interval, ins_type)
-                history = await result if inspect.isawaitable(result) else result
-                if not validate_broker_response(history, expected_type="history", symbol=symbol):
-                    logger.debug(f"Invalid history data received for '{symbol}' (after all retries). Response: {history}")
-                    # Don't raise exception for history validation failures - just return None
-                if cache and history is not None:
-                    self.cache.set(cache_key, history, ttl=ttl)
-                return history
-
-            return await async_retry_with_rate_limit(_fetch, config=retry_config)
+            interval_minutes = candle_interval_minutes(ohlc_interval)
+            if self.candle_store is not None and use_store and interval_minutes:
+                source = "store"
+                load = partial(
+                    self._get_history_from_store, symbol, from_dt, to_dt, ohlc_interval, interval_minutes, ins_type
+                )
+            else:
+                source = "broker"
+                load = partial(self._fetch_history, symbol, from_dt, to_dt, ohlc_interval, ins_type)
+            # Keyed on the normalized range so aware/naive callers asking for the same bars coalesce
+            flight_key = f"history:{symbol}:{to_naive_ist(from_dt)}:{to_naive_ist(to_dt)}:{ohlc_interval}:{ins_type}"
+            with span("data.get_history", symbol=symbol, interval=str(ohlc_interval), source=source), \
+                    observe_latency(trading_metrics.history_fetch_seconds, source=source):
+                history = await self.single_flight.do(flight_key, load)
+            if cache and history is not None:
+                self.cache.set(cache_key, history, ttl=ttl)
+            return history
         except Exception as e:
             logger.error(f"Error in get_history for symbol={symbol}: {e}", exc_info=True)
             return None  # Return None instead of raising for history errors
 
+    async def _fetch_history(self, symbol: str, from_dt, to_dt, ohlc_interval, ins_type: str = ""):
+        """Fetch history from the broker with retries and global rate limiting."""
+        # Ensure global rate limiter is available
+        await self._ensure_rate_limiter()
+        retry_config = self._get_data_retry_config("data_fetch", endpoint="history")
+
+        async def _fetch():
+            result = self.broker.get_history(symbol, from_dt, to_dt, ohlc_interval, ins_type)
+            history = await result if inspect.isawaitable(result) else result
+            if not validate_broker_response(history, expected_type="history", symbol=symbol):
+                logger.debug(f"Invalid history data received for '{symbol}' (after all retries). Response: {history}")
+                # Don't raise exception for history validation failures - just return None
+            return history
+
+        with span("broker.get_history", broker=self.get_current_broker_name(), symbol=symbol):
+            return await async_retry_with_rate_limit(_fetch, config=retry_config)
+
+    async def _get_history_from_store(self, symbol: str, from_dt, to_dt, ohlc_interval, interval_minutes: int, ins_type: str = ""):
+        """
+        Serve history from the candle store: the closed-candle prefix comes from the store and
+        only the tail since the last stored bar is fetched from the broker. Falls back to a full
+        fetch when the store does not cover from_dt.
+        """
+        from algosat.core.time_utils import get_ist_datetime, localize_to_ist
+        store = self.candle_store
+        start = to_naive_ist(from_dt)
+        end = to_naive_ist(to_dt)
+        closed_until = last_closed_candle_start(get_ist_datetime(), interval_minutes)
+        step = timedelta(minutes=interval_minutes)
+
+        async with store.lock(symbol, interval_minutes):
+            stored = await store.load(symbol, interval_minutes)
+            covered = stored is not None and stored.covered_from <= start <= stored.covered_to + step
+            store.record(requests=1)
+
+            if covered and end <= stored.covered_to:
+                history = slice_candles(stored.frame, start, end)
+                store.record(store_only=1, candles_from_store=len(history) if history is not None else 0)
+                return history
+
+            fetch_from = stored.covered_to if covered else start
+            fetched = await self._fetch_history(
+                symbol, localize_to_ist(fetch_from.to_pydatetime()), to_dt, ohlc_interval, ins_type
+            )
+            if not isinstance(fetched, pd.DataFrame) or fetched.empty or TIMESTAMP_COLUMN not in fetched.columns:
+                store.record(fetch_failures=1)
+                if not covered:
+                    return fetched
+                # Broker hiccup: serve what the store has rather than nothing
+                logger.debug(f"Tail fetch for {symbol} {interval_minutes}m returned no data, serving stored candles only")
+                return slice_candles(stored.frame, start, end)
+
+            if covered:
+                store.record(tail_fetches=1)
+            else:
+                store.record(full_fetches=1)
+            closed = slice_candles(fetched, end=closed_until)
+            # Only mark the window complete up to the last bar actually received; a candle the
+            # broker has not published yet must be fetched again next time, not assumed absent.
+            last_bar = candle_times(closed).max() if closed is not None and not closed.empty else None
+            if last_bar is not None:
+                stored = await store.save(
+                    symbol, interval_minutes, closed, covered_from=fetch_from, covered_to=min(end, last_bar)
+                ) or stored
+
+            history = slice_candles(merge_candles(stored.frame if stored else None, fetched), start, end)
+            fetched_in_range = slice_candles(fetched, start, end)
+            fetched_count = len(fetched_in_range) if fetched_in_range is not None else 0
+            store.record(
+                candles_fetched=fetched_count,
+                candles_from_store=max(0, len(history) - fetched_count) if history is not None else 0,
+            )
+            return history
+
+    async def backfill_candles(self, symbol: str, interval_minutes: int, days: int, chunk_days: int = 20) -> int:
+        """
+        Fill the candle store for symbol/interval with the last `days` days of closed candles,
+        fetching oldest to newest in chunks of `chunk_days`. Returns the number of candles stored.
+        """
+        from algosat.core.time_utils import get_ist_datetime, localize_to_ist
+        if self.candle_store is None:
+            raise RuntimeError("DataManager has no candle store configured")
+        await self.ensure_broker()
+        closed_until = last_closed_candle_start(get_ist_datetime(), interval_minutes)
+        chunk_start = (closed_until - timedelta(days=days)).normalize()
+        stored = 0
+        async with self.candle_store.lock(symbol, interval_minutes):
+            while chunk_start <= closed_until:
+                chunk_end = min(chunk_start + timedelta(days=chunk_days) - timedelta(minutes=interval_minutes), closed_until)
+                fetched = await self._fetch_history(
+                    symbol,
+                    localize_to_ist(chunk_start.to_pydatetime()),
+                    localize_to_ist(chunk_end.to_pydatetime()),
+                    interval_minutes,
+                )
+                closed = None
+                if isinstance(fetched, pd.DataFrame) and not fetched.empty and TIMESTAMP_COLUMN in fetched.columns:
+                    closed = slice_candles(fetched, end=closed_until)
+                    stored += len(closed)
+                    self.candle_store.record(candles_fetched=len(closed))
+                covered_to = chunk_end
+                if chunk_end >= closed_until.normalize():
+                    # Today's candles may still be in flight at the broker; cover only what was received
+                    covered_to = candle_times(closed).max() if closed is not None and not closed.empty else chunk_start - timedelta(minutes=interval_minutes)
+                # Earlier chunks record coverage even when empty (holidays) so they are not refetched
+                await self.candle_store.save(symbol, interval_minutes, closed, chunk_start, covered_to)
+                chunk_start = chunk_end + timedelta(minutes=interval_minutes)
+        logger.info(f"Backfilled {stored} candles for {symbol} {interval_minutes}m ({days} days)")
+        return stored
+
     async def get_ltp(self, symbol: str, ttl: int = 5) -> Any:
         """
-        Get the last traded price (LTP) for the given symbol.
-        Always fetch fresh data from the broker, do not use cache.
+        Get the last traded price (LTP) for the given symbol (or comma-separated symbols).
+        Symbols with a tick on the tick bus from the last max_tick_age seconds are answered
+        from it as {symbol: ltp}; only the rest are fetched fresh from the broker.
         """
         try:
             if not self.broker:
                 raise RuntimeError("Broker not set in DataManager. Call ensure_broker() first.")
 
+            streamed = {}
+            tick_bus = self.tick_bus
+            if tick_bus is not None and tick_bus.running and tick_bus.broker_name == self.get_current_broker_name():
+                lookup_started = time.perf_counter()
+                streamed, missing = tick_bus.get_ltps([s.strip() for s in symbol.split(",") if s.strip()])
+                if not missing:
+                    trading_metrics.ltp_fetch_seconds.labels(source="tick_bus").observe(time.perf_counter() - lookup_started)
+                    return streamed
+                symbol = ",".join(missing)
+
             # Ensure global rate limiter is available
             await self._ensure_rate_limiter()
-            retry_config = self._get_data_retry_config("data_fetch")
+            retry_config = self._get_data_retry_config("data_fetch", endpoint="ltp")
 
             async def _fetch():
                 result = self.broker.get_ltp(symbol)
@@ -345,7 +627,14 @@ class DataManager:
                 validate_broker_response(ltp, expected_type="ltp", symbol=symbol)
                 return ltp
 
-            return await async_retry_with_rate_limit(_fetch, config=retry_config)
+            with span("data.get_ltp", symbol=symbol, source="broker"), \
+                    observe_latency(trading_metrics.ltp_fetch_seconds, source="broker"):
+                ltp = await self.single_flight.do(
+                    f"ltp:{symbol}", lambda: async_retry_with_rate_limit(_fetch, config=retry_config)
+                )
+            if streamed and isinstance(ltp, dict):
+                return {**streamed, **ltp}
+            return ltp
         except Exception as e:
             logger.error(f"Error in get_ltp for symbol={symbol}: {e}", exc_info=True)
             raise
@@ -416,6 +705,30 @@ class DataManager:
             logger.error(f"Error in get_broker_symbol for symbol={symbol}, instrument_type={instrument_type}: {e}", exc_info=True)
             raise
 
+    async def get_ltp_batch(self, symbols: List[str], chunk_size: int = 50) -> Dict[str, float]:
+        """
+        Fetch LTPs for many symbols using one comma-separated broker call per chunk
+        (Fyers quotes and Kite ltp both accept multiple symbols per request).
+        Returns a dict of symbol -> last price; symbols the broker did not return are omitted.
+        """
+        ltp_map: Dict[str, float] = {}
+        unique_symbols = list(dict.fromkeys(s for s in symbols if s))
+        for i in range(0, len(unique_symbols), chunk_size):
+            chunk = unique_symbols[i:i + chunk_size]
+            try:
+                ltp_data = await self.get_ltp(",".join(chunk))
+            except Exception as e:
+                logger.error(f"Error in get_ltp_batch for chunk of {len(chunk)} symbols: {e}")
+                continue
+            if not isinstance(ltp_data, dict):
+                continue
+            for sym, value in ltp_data.items():
+                try:
+                    ltp_map[sym] = float(value)
+                except (TypeError, ValueError):
+                    continue
+        return ltp_map
+
     async def get_order_aggregate(self, parent_order_id: int) -> Optional[OrderAggregate]:
         from algosat.core.db import AsyncSessionLocal
         async with AsyncSessionLocal() as session:
@@ -426,34 +739,40 @@ class DataManager:
             
             # Get broker executions for main order
             broker_execs = await get_broker_executions_for_order(session, parent_order_id)
-            
-            symbol = order_row.get("strike_symbol", "Unknown")
-            broker_orders: List[BrokerOrder] = []
-            for be in broker_execs:
-                broker_name = await self.get_broker_name_by_id(be.get("broker_id"))
-                std_status = standardize_order_status(
-                    broker_name,
-                    be.get("status"),
-                    be.get("raw_response")
-                )
-                broker_orders.append(BrokerOrder(
-                    id=be.get("id"),  # Pass the broker_executions table id
-                    broker_id=be.get("broker_id"),
-                    order_id=be.get("broker_order_id"),
-                    status=std_status,
-                    broker_name=broker_name,
-                    side=be.get("side"),
-                    symbol=be.get("symbol"),  # Use order symbol if available
-                    raw_response=be.get("raw_response")
-                ))
-            return OrderAggregate(
-                strategy_config_id=order_row.get("strategy_symbol_id"),
-                parent_order_id=parent_order_id,
-                symbol=symbol,
-                entry_price=order_row.get("entry_price"),
-                side=order_row.get("side"),
-                broker_orders=broker_orders
+        return await self.build_order_aggregate(order_row, broker_execs, parent_order_id)
+
+    async def build_order_aggregate(self, order_row: dict, broker_execs: List[dict], parent_order_id: Optional[int] = None) -> OrderAggregate:
+        """
+        Build an OrderAggregate from an already-loaded order row and its broker_executions rows.
+        Lets callers that bulk-load orders (e.g. OrderMonitorScheduler) skip the per-order DB round trip.
+        """
+        symbol = order_row.get("strike_symbol", "Unknown")
+        broker_orders: List[BrokerOrder] = []
+        for be in broker_execs:
+            broker_name = await self.get_broker_name_by_id(be.get("broker_id"))
+            std_status = standardize_order_status(
+                broker_name,
+                be.get("status"),
+                be.get("raw_response")
             )
+            broker_orders.append(BrokerOrder(
+                id=be.get("id"),  # Pass the broker_executions table id
+                broker_id=be.get("broker_id"),
+                order_id=be.get("broker_order_id"),
+                status=std_status,
+                broker_name=broker_name,
+                side=be.get("side"),
+                symbol=be.get("symbol"),  # Use order symbol if available
+                raw_response=be.get("raw_response")
+            ))
+        return OrderAggregate(
+            strategy_config_id=order_row.get("strategy_symbol_id"),
+            parent_order_id=parent_order_id if parent_order_id is not None else order_row.get("id"),
+            symbol=symbol,
+            entry_price=order_row.get("entry_price"),
+            side=order_row.get("side"),
+            broker_orders=broker_orders
+        )
 
     async def get_broker_name_by_id(self, broker_id: int) -> str:
         """
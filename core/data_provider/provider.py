@@ -114,7 +114,7 @@ class DataProvider:
         broker_name = self._broker.name
         
         async def _fetch():
-            async with self._rate_limiter.acquire(broker_name, tokens=1):
+            async with self._rate_limiter.acquire(broker_name, tokens=1, endpoint="option_chain"):
                 result = self._broker.get_option_chain(symbol, strike_count)
                 option_chain = await result if inspect.isawaitable(result) else result
                 validate_broker_response(option_chain, expected_type="option_chain", symbol=symbol)
@@ -124,6 +124,7 @@ class DataProvider:
         retry_config = get_retry_config("data_fetch")
         retry_config.rate_limit_broker = broker_name
         retry_config.rate_limit_tokens = 1
+        retry_config.rate_limit_endpoint = "option_chain"
         
         try:
             return await async_retry_with_rate_limit(_fetch, config=retry_config)
@@ -137,7 +138,7 @@ class DataProvider:
         broker_name = self._broker.name
         
         async def _fetch():
-            async with self._rate_limiter.acquire(broker_name, tokens=1):
+            async with self._rate_limiter.acquire(broker_name, tokens=1, endpoint="history"):
                 result = self._broker.get_history(
                     symbol,
                     from_date,
@@ -153,6 +154,7 @@ class DataProvider:
         retry_config = get_retry_config("data_fetch")
         retry_config.rate_limit_broker = broker_name
         retry_config.rate_limit_tokens = 1
+        retry_config.rate_limit_endpoint = "history"
         
         try:
             return await async_retry_with_rate_limit(_fetch, config=retry_config)
@@ -15,14 +15,21 @@ except ModuleNotFoundError as e:
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import inspect, Table, MetaData, update, select, delete, insert, func, text, and_, case # Modified import
+from sqlalchemy import event
 
 import os
+import sys
+import json
+import base64
+import time as time_module
 from datetime import datetime, timezone  # moved to top
 from algosat.common.logger import get_logger
 
 logger = get_logger(__name__)
 from algosat.common.default_strategy_configs import DEFAULT_STRATEGY_CONFIGS
 from algosat.core.time_utils import get_ist_now
+from algosat.core.monitoring import trading_metrics
+from algosat.core.tracing import get_tracer, span
 
 from algosat.core.dbschema import metadata, orders, broker_credentials, strategies, strategy_configs, strategy_symbols, users, broker_balance_summaries, smart_levels, re_entry_tracking # Added users, broker_balance_summaries, smart_levels, re_entry_tracking
 
@@ -40,10 +47,56 @@ engine = create_async_engine(
 logger.debug(f"🔌 Database connection pool configured: "
            f"pool_size=10, max_overflow=20, total_max=30, timeout=60s")
 
+# Traced statements: a db.statement span per cursor execute inside a sampled trace
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _start_statement_span(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._trace_span = get_tracer().start_span("db.statement", **{"db.statement": statement})
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _end_statement_span(conn, cursor, statement, parameters, context, executemany):
+    statement_span = getattr(context, "_trace_span", None)
+    if statement_span is not None:
+        get_tracer().end(statement_span)
+
+
+@event.listens_for(engine.sync_engine, "handle_error")
+def _fail_statement_span(exception_context):
+    statement_span = getattr(exception_context.execution_context, "_trace_span", None)
+    if statement_span is not None:
+        statement_span.record_exception(exception_context.original_exception)
+        get_tracer().end(statement_span)
+
+
+class TimedAsyncSession(AsyncSession):
+    """
+    AsyncSession that records how long it is held open (async with ... as session) to the
+    db_session_seconds metric, labelled by the calling module and function, and as a
+    db.session span when the caller is being traced.
+    """
+
+    async def __aenter__(self):
+        caller = sys._getframe(1)
+        self._call_site = f"{caller.f_globals.get('__name__', '?')}.{caller.f_code.co_name}"
+        self._opened_at = time_module.perf_counter()
+        self._trace_scope = span("db.session", call_site=self._call_site)
+        self._trace_scope.__enter__()
+        return await super().__aenter__()
+
+    async def __aexit__(self, type_, value, traceback):
+        try:
+            await super().__aexit__(type_, value, traceback)
+        finally:
+            self._trace_scope.__exit__(type_, value, traceback)
+            trading_metrics.db_session_seconds.labels(call_site=self._call_site).observe(
+                time_module.perf_counter() - self._opened_at
+            )
+
 # 2) Create a session factory
 AsyncSessionLocal = sessionmaker(
     bind=engine,
-    class_=AsyncSession,
+    class_=TimedAsyncSession,
     expire_on_commit=False,  # keep objects alive after commit
 )
 
@@ -780,55 +833,137 @@ async def insert_order(session, order_data):
 
 # --- Order CRUD Operations ---
 
-async def get_all_orders(session: AsyncSession):
+def _order_list_columns() -> dict:
     """
-    Retrieve all orders with broker execution details.
+    Columns available to the order listing loader, keyed by the name they are returned under.
     Includes all spot-level and swing tracking fields required for exit evaluation.
     """
-    from algosat.core.dbschema import broker_executions, broker_credentials, strategies
+    return {
+        # Core order fields
+        'id': orders.c.id,
+        'strategy_symbol_id': orders.c.strategy_symbol_id,
+        'strike_symbol': orders.c.strike_symbol,
+        'pnl': orders.c.pnl,
+        'candle_range': orders.c.candle_range,
+        'entry_price': orders.c.entry_price,
+        'stop_loss': orders.c.stop_loss,
+        'target_price': orders.c.target_price,
+        'current_price': orders.c.current_price,
+        'price_last_updated': orders.c.price_last_updated,
+        'orig_target': orders.c.orig_target,
+        'signal_time': orders.c.signal_time,
+        'entry_time': orders.c.entry_time,
+        'exit_time': orders.c.exit_time,
+        'exit_price': orders.c.exit_price,
+        'status': orders.c.status,
+        'reason': orders.c.reason,
+        'atr': orders.c.atr,
+        'supertrend_signal': orders.c.supertrend_signal,
+        'lot_qty': orders.c.lot_qty,
+        'side': orders.c.side,
+        'signal_direction': orders.c.signal_direction,
+        'qty': orders.c.qty,
+        'executed_quantity': orders.c.executed_quantity,
+        'parent_order_id': orders.c.parent_order_id,  # For hedge detection
+        # Spot and swing/level tracking fields - CRITICAL for exit evaluation
+        'entry_spot_price': orders.c.entry_spot_price,
+        'entry_spot_swing_high': orders.c.entry_spot_swing_high,
+        'entry_spot_swing_low': orders.c.entry_spot_swing_low,
+        'stoploss_spot_level': orders.c.stoploss_spot_level,
+        'target_spot_level': orders.c.target_spot_level,
+        'entry_rsi': orders.c.entry_rsi,
+        'expiry_date': orders.c.expiry_date,
+        'created_at': orders.c.created_at,
+        'updated_at': orders.c.updated_at,
+        # Strategy and symbol relationship fields
+        'symbol': strategy_symbols.c.symbol.label('symbol'),
+        'strategy_name': strategies.c.name.label('strategy_name'),
+        'smart_level_enabled': strategy_symbols.c.enable_smart_levels.label('smart_level_enabled'),
+    }
+
+# Always selected, whatever projection is requested: the keyset cursor needs signal_time/id
+# and the listing APIs need status and parent_order_id (hedge detection).
+ORDER_LIST_REQUIRED_COLUMNS = ('id', 'status', 'signal_time', 'parent_order_id')
+
+def encode_order_cursor(order: dict) -> str:
+    """Encode the (signal_time, id) keyset position of an order row into an opaque cursor."""
+    signal_time = order.get('signal_time')
+    payload = json.dumps([signal_time.isoformat() if signal_time else None, order['id']])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_order_cursor(cursor: str):
+    """Decode a cursor produced by encode_order_cursor into (signal_time, id). Raises ValueError if invalid."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        signal_time, order_id = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        return (datetime.fromisoformat(signal_time) if signal_time else None), int(order_id)
+    except Exception as e:
+        raise ValueError(f"Invalid order cursor: {cursor}") from e
+
+def _order_keyset_condition(signal_time, order_id):
+    """
+    Rows strictly after (signal_time, order_id) in the listing order
+    signal_time DESC NULLS LAST, id DESC.
+    """
+    from sqlalchemy import or_
+    if signal_time is None:
+        return and_(orders.c.signal_time.is_(None), orders.c.id < order_id)
+    return or_(
+        orders.c.signal_time < signal_time,
+        and_(orders.c.signal_time == signal_time, orders.c.id < order_id),
+        orders.c.signal_time.is_(None),
+    )
+
+def _ist_day_start(day) -> datetime:
+    from algosat.core.time_utils import localize_to_ist
+    return localize_to_ist(datetime.combine(day, time.min))
+
+async def get_orders_with_broker_executions(
+    session: AsyncSession,
+    broker_name: Optional[str] = None,
+    strategy_config_id: Optional[int] = None,
+    strategy_symbol_id: Optional[int] = None,
+    statuses: Optional[list] = None,
+    start_date=None,
+    end_date=None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    columns: Optional[list] = None,
+    include_executions: bool = True,
+):
+    """
+    Shared loader behind the order listing APIs.
+
+    Loads the matching orders in one query and, if include_executions is set, all of their
+    broker_executions in a second query grouped by parent_order_id in Python - never one
+    query per order.
+
+    Args:
+        broker_name: Only orders with at least one execution on this broker.
+        strategy_config_id: Only orders of this strategy config.
+        strategy_symbol_id: Only orders of this strategy symbol.
+        statuses: Only orders whose status is in this list.
+        start_date / end_date: Inclusive IST trade-day bounds on signal_time.
+        cursor: Opaque keyset cursor (see encode_order_cursor); returns rows after it.
+        limit: Maximum number of orders to return.
+        columns: Subset of _order_list_columns() to select; ORDER_LIST_REQUIRED_COLUMNS are always included.
+        include_executions: Attach 'broker_executions' (newest first) to each order.
+
+    Returns:
+        List of order dicts ordered by signal_time DESC NULLS LAST, id DESC.
+    """
+    from algosat.core.dbschema import broker_executions
+    available = _order_list_columns()
+    if columns:
+        unknown = [name for name in columns if name not in available]
+        if unknown:
+            raise ValueError(f"Unknown order columns: {', '.join(unknown)}")
+        selected = list(ORDER_LIST_REQUIRED_COLUMNS) + [name for name in columns if name not in ORDER_LIST_REQUIRED_COLUMNS]
+    else:
+        selected = list(available)
+
     stmt = (
-        select(
-            # Core order fields
-            orders.c.id,
-            orders.c.strategy_symbol_id,
-            orders.c.strike_symbol,
-            orders.c.pnl,
-            orders.c.candle_range,
-            orders.c.entry_price,
-            orders.c.stop_loss,
-            orders.c.target_price,
-            orders.c.current_price,  # Add current_price field
-            orders.c.price_last_updated,  # Add price_last_updated field
-            orders.c.orig_target,
-            orders.c.signal_time,
-            orders.c.entry_time,
-            orders.c.exit_time,
-            orders.c.exit_price,
-            orders.c.status,
-            orders.c.reason,
-            orders.c.atr,
-            orders.c.supertrend_signal,
-            orders.c.lot_qty,
-            orders.c.side,
-            orders.c.signal_direction,
-            orders.c.qty,
-            orders.c.executed_quantity,  # Add this line to select executed_quantity
-            orders.c.parent_order_id,  # Add parent_order_id for hedge detection
-            # Spot and swing/level tracking fields - CRITICAL for exit evaluation
-            orders.c.entry_spot_price,
-            orders.c.entry_spot_swing_high,
-            orders.c.entry_spot_swing_low,
-            orders.c.stoploss_spot_level,
-            orders.c.target_spot_level,
-            orders.c.entry_rsi,
-            orders.c.expiry_date,
-            orders.c.created_at,
-            orders.c.updated_at,
-            # Strategy and symbol relationship fields
-            strategy_symbols.c.symbol.label('symbol'),  # Join to get the symbol name
-            strategies.c.name.label('strategy_name'),  # Join to get the strategy name
-            strategy_symbols.c.enable_smart_levels.label('smart_level_enabled'),  # Add smart level enabled flag
-        )
+        select(*(available[name] for name in selected))
         .select_from(
             orders
             .outerjoin(strategy_symbols, orders.c.strategy_symbol_id == strategy_symbols.c.id)
@@ -836,23 +971,43 @@ async def get_all_orders(session: AsyncSession):
         )
         .order_by(orders.c.signal_time.desc().nullslast(), orders.c.id.desc())
     )
+    if broker_name:
+        # Orders have no broker_id of their own; filter through broker_executions in the same query
+        stmt = stmt.where(orders.c.id.in_(
+            select(broker_executions.c.parent_order_id)
+            .select_from(
+                broker_executions.join(broker_credentials, broker_executions.c.broker_id == broker_credentials.c.id)
+            )
+            .where(broker_credentials.c.broker_name == broker_name)
+        ))
+    if strategy_config_id is not None:
+        stmt = stmt.where(strategy_symbols.c.config_id == strategy_config_id)
+    if strategy_symbol_id is not None:
+        stmt = stmt.where(orders.c.strategy_symbol_id == strategy_symbol_id)
+    if statuses:
+        stmt = stmt.where(orders.c.status.in_(list(statuses)))
+    if start_date is not None:
+        stmt = stmt.where(orders.c.signal_time >= _ist_day_start(start_date))
+    if end_date is not None:
+        stmt = stmt.where(orders.c.signal_time < _ist_day_start(end_date + timedelta(days=1)))
+    if cursor:
+        stmt = stmt.where(_order_keyset_condition(*decode_order_cursor(cursor)))
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
     result = await session.execute(stmt)
-    rows = result.fetchall()
-    print(f"DEBUG DB: get_all_orders fetched {len(rows)} rows")
-    if rows:
-        print(f"DEBUG DB: first row raw: {rows[0]}")
-    orders_data = [dict(row._mapping) for row in rows]
-    # Ensure executed_quantity is present in each order dict (default to 0 if missing)
-    for order in orders_data:
-        if 'executed_quantity' not in order:
-            order['executed_quantity'] = 0
-    
-    # For each order, get broker execution details
-    for order in orders_data:
-        order_id = order['id']
-        
-        # Get broker executions for this order
-        executions_stmt = select(
+    orders_data = [dict(row._mapping) for row in result.fetchall()]
+    if 'executed_quantity' in selected:
+        for order in orders_data:
+            if order.get('executed_quantity') is None:
+                order['executed_quantity'] = 0
+
+    if not include_executions or not orders_data:
+        return orders_data
+
+    executions_stmt = (
+        select(
+            broker_executions.c.parent_order_id,
             broker_executions.c.id,
             broker_executions.c.broker_order_id,
             broker_executions.c.side,
@@ -863,32 +1018,36 @@ async def get_all_orders(session: AsyncSession):
             broker_executions.c.product_type,
             broker_executions.c.status,
             broker_credentials.c.broker_name
-        ).select_from(
-            broker_executions.join(
-                broker_credentials,
-                broker_executions.c.broker_id == broker_credentials.c.id
-            )
-        ).where(
-            broker_executions.c.parent_order_id == order_id
-        ).order_by(
-            broker_executions.c.execution_time.desc()
         )
-        
-        executions_result = await session.execute(executions_stmt)
-        executions_data = [dict(row._mapping) for row in executions_result.fetchall()]
-        
-        # Add broker execution details to the order
-        order['broker_executions'] = executions_data
-    
+        .select_from(
+            broker_executions.join(broker_credentials, broker_executions.c.broker_id == broker_credentials.c.id)
+        )
+        .where(broker_executions.c.parent_order_id.in_([order['id'] for order in orders_data]))
+        .order_by(broker_executions.c.parent_order_id, broker_executions.c.execution_time.desc())
+    )
+    executions_result = await session.execute(executions_stmt)
+    executions_by_order_id = {order['id']: [] for order in orders_data}
+    for row in executions_result.fetchall():
+        execution = dict(row._mapping)
+        executions_by_order_id[execution.pop('parent_order_id')].append(execution)
+    for order in orders_data:
+        order['broker_executions'] = executions_by_order_id[order['id']]
     return orders_data
 
-async def get_order_by_id(session: AsyncSession, order_id: int):
+async def get_all_orders(session: AsyncSession):
     """
-    Retrieve a specific order by its ID with strategy and symbol information.
+    Retrieve all orders with broker execution details.
     Includes all spot-level and swing tracking fields required for exit evaluation.
     """
+    return await get_orders_with_broker_executions(session)
+
+def _order_detail_select():
+    """
+    Build the order select used for monitoring/exit evaluation: all core order fields,
+    spot-level and swing tracking fields, plus strategy and symbol information.
+    """
     from algosat.core.dbschema import strategies
-    stmt = (
+    return (
         select(
             # Core order fields
             orders.c.id,
@@ -936,212 +1095,66 @@ async def get_order_by_id(session: AsyncSession, order_id: int):
             .outerjoin(strategy_symbols, orders.c.strategy_symbol_id == strategy_symbols.c.id)
             .outerjoin(strategies, strategy_symbols.c.strategy_id == strategies.c.id)
         )
-        .where(orders.c.id == order_id)
     )
+
+async def get_order_by_id(session: AsyncSession, order_id: int):
+    """
+    Retrieve a specific order by its ID with strategy and symbol information.
+    Includes all spot-level and swing tracking fields required for exit evaluation.
+    """
+    stmt = _order_detail_select().where(orders.c.id == order_id)
     result = await session.execute(stmt)
     row = result.first()
     return dict(row._mapping) if row else None
 
-async def get_orders_by_broker(session: AsyncSession, broker_name: str):
+async def get_orders_with_executions_by_ids(session: AsyncSession, order_ids: list):
     """
-    Retrieve orders filtered by broker_name with broker execution details.
-    Since orders don't have a direct broker_id, we need to filter through broker_executions.
+    Bulk-load orders and their broker_executions for a set of order IDs in two queries.
+    Used by the batched order monitor scheduler instead of one get_order_by_id +
+    get_broker_executions_for_order round trip per order per tick.
+
+    Returns:
+        (orders_by_id, executions_by_order_id) where orders_by_id maps order_id -> order dict
+        (same shape as get_order_by_id) and executions_by_order_id maps order_id -> list of
+        broker_executions dicts ordered by execution_time, id.
     """
-    from algosat.core.dbschema import broker_executions, strategies
-    
-    # First, get order IDs that have executions from the specified broker
-    broker_orders_stmt = (
-        select(broker_executions.c.parent_order_id.distinct())
-        .select_from(
-            broker_executions.join(broker_credentials, broker_executions.c.broker_id == broker_credentials.c.id)
-        )
-        .where(broker_credentials.c.broker_name == broker_name)
-    )
-    
-    result = await session.execute(broker_orders_stmt)
-    order_ids = [row[0] for row in result.fetchall()]
-    
+    from algosat.core.dbschema import broker_executions
     if not order_ids:
-        return []
-    
-    # Now get the full order details for these order IDs
-    stmt = (
-        select(
-            orders.c.id,
-            orders.c.strategy_symbol_id,
-            orders.c.strike_symbol,
-            orders.c.pnl,
-            orders.c.candle_range,
-            orders.c.entry_price,
-            orders.c.stop_loss,
-            orders.c.target_price,
-            orders.c.current_price,  # Add current_price field
-            orders.c.price_last_updated,  # Add price_last_updated field
-            orders.c.signal_time,
-            orders.c.entry_time,
-            orders.c.exit_time,
-            orders.c.exit_price,
-            orders.c.status,
-            orders.c.reason,
-            orders.c.atr,
-            orders.c.supertrend_signal,
-            orders.c.lot_qty,
-            orders.c.side,
-            orders.c.qty,
-            orders.c.created_at,
-            orders.c.updated_at,
-            orders.c.executed_quantity,  # Add this field
-            orders.c.parent_order_id,  # Add parent_order_id field for hedge detection
-            strategy_symbols.c.symbol.label('symbol'),  # Join to get the symbol name
-            strategies.c.name.label('strategy_name'),  # Join to get the strategy name
-            strategy_symbols.c.enable_smart_levels.label('smart_level_enabled'),  # Add smart level enabled flag
-        )
-        .select_from(
-            orders
-            .outerjoin(strategy_symbols, orders.c.strategy_symbol_id == strategy_symbols.c.id)
-            .outerjoin(strategies, strategy_symbols.c.strategy_id == strategies.c.id)
-        )
-        .where(orders.c.id.in_(order_ids))
-        .order_by(orders.c.signal_time.desc().nullslast(), orders.c.id.desc())
-    )
-    result = await session.execute(stmt)
-    orders_data = [dict(row._mapping) for row in result.fetchall()]
-    
-    # For each order, get broker execution details
-    for order in orders_data:
-        order_id = order['id']
-        
-        # Get broker executions for this order
-        executions_stmt = select(
-            broker_executions.c.id,
-            broker_executions.c.broker_order_id,
-            broker_executions.c.side,
-            broker_executions.c.execution_price,
-            broker_executions.c.executed_quantity,
-            broker_executions.c.execution_time,
-            broker_executions.c.order_type,
-            broker_executions.c.product_type,
-            broker_executions.c.status,
-            broker_credentials.c.broker_name
-        ).select_from(
-            broker_executions.join(
-                broker_credentials,
-                broker_executions.c.broker_id == broker_credentials.c.id
+        return {}, {}
+    order_result = await session.execute(_order_detail_select().where(orders.c.id.in_(order_ids)))
+    orders_by_id = {row.id: dict(row._mapping) for row in order_result.fetchall()}
+
+    executions_by_order_id = {order_id: [] for order_id in orders_by_id}
+    if orders_by_id:
+        exec_stmt = (
+            select(broker_executions)
+            .where(broker_executions.c.parent_order_id.in_(list(orders_by_id.keys())))
+            .order_by(
+                broker_executions.c.parent_order_id,
+                broker_executions.c.execution_time,
+                broker_executions.c.id
             )
-        ).where(
-            broker_executions.c.parent_order_id == order_id
-        ).order_by(
-            broker_executions.c.execution_time.desc()
         )
-        
-        executions_result = await session.execute(executions_stmt)
-        executions_data = [dict(row._mapping) for row in executions_result.fetchall()]
-        
-        # Add broker execution details to the order
-        order['broker_executions'] = executions_data
-    
-    return orders_data
+        exec_result = await session.execute(exec_stmt)
+        for row in exec_result.fetchall():
+            executions_by_order_id[row.parent_order_id].append(dict(row._mapping))
+    return orders_by_id, executions_by_order_id
+
+async def get_orders_by_broker(session: AsyncSession, broker_name: str):
+    """
+    Retrieve orders filtered by broker_name with broker execution details.
+    Since orders don't have a direct broker_id, we need to filter through broker_executions.
+    """
+    return await get_orders_with_broker_executions(session, broker_name=broker_name)
 
 async def get_orders_by_broker_and_strategy(session: AsyncSession, broker_name: str, strategy_config_id: int):
     """
     Retrieve orders filtered by both broker_name and strategy_config_id with broker execution details.
     Since orders don't have a direct broker_id, we need to filter through broker_executions.
     """
-    from algosat.core.dbschema import broker_executions, strategies
-    
-    # First, get order IDs that have executions from the specified broker
-    broker_orders_stmt = (
-        select(broker_executions.c.parent_order_id.distinct())
-        .select_from(
-            broker_executions.join(broker_credentials, broker_executions.c.broker_id == broker_credentials.c.id)
-        )
-        .where(broker_credentials.c.broker_name == broker_name)
-    )
-    
-    result = await session.execute(broker_orders_stmt)
-    order_ids = [row[0] for row in result.fetchall()]
-    
-    if not order_ids:
-        return []
-    
-    # Now get the full order details for these order IDs, filtered by strategy_config_id
-    stmt = (
-        select(
-            orders.c.id,
-            orders.c.strategy_symbol_id,
-            orders.c.strike_symbol,
-            orders.c.pnl,
-            orders.c.candle_range,
-            orders.c.entry_price,
-            orders.c.stop_loss,
-            orders.c.target_price,
-            orders.c.current_price,  # Add current_price field
-            orders.c.price_last_updated,  # Add price_last_updated field
-            orders.c.signal_time,
-            orders.c.entry_time,
-            orders.c.exit_time,
-            orders.c.exit_price,
-            orders.c.status,
-            orders.c.reason,
-            orders.c.atr,
-            orders.c.supertrend_signal,
-            orders.c.lot_qty,
-            orders.c.side,
-            orders.c.qty,
-            orders.c.created_at,
-            orders.c.updated_at,
-            orders.c.executed_quantity,  # Add this field
-            orders.c.parent_order_id,  # Add parent_order_id field for hedge detection
-            strategy_symbols.c.symbol.label('symbol'),  # Join to get the symbol name
-            strategies.c.name.label('strategy_name'),  # Join to get the strategy name
-            strategy_symbols.c.enable_smart_levels.label('smart_level_enabled'),  # Add smart level enabled flag
-        )
-        .select_from(
-            orders
-            .outerjoin(strategy_symbols, orders.c.strategy_symbol_id == strategy_symbols.c.id)
-            .outerjoin(strategies, strategy_symbols.c.strategy_id == strategies.c.id)
-        )
-        .where(orders.c.id.in_(order_ids))
-        .where(strategy_symbols.c.config_id == strategy_config_id)
-        .order_by(orders.c.signal_time.desc().nullslast(), orders.c.id.desc())
+    return await get_orders_with_broker_executions(
+        session, broker_name=broker_name, strategy_config_id=strategy_config_id
     )
-    result = await session.execute(stmt)
-    orders_data = [dict(row._mapping) for row in result.fetchall()]
-    
-    # For each order, get broker execution details
-    for order in orders_data:
-        order_id = order['id']
-        
-        # Get broker executions for this order
-        executions_stmt = select(
-            broker_executions.c.id,
-            broker_executions.c.broker_order_id,
-            broker_executions.c.side,
-            broker_executions.c.execution_price,
-            broker_executions.c.executed_quantity,
-            broker_executions.c.execution_time,
-            broker_executions.c.order_type,
-            broker_executions.c.product_type,
-            broker_executions.c.status,
-            broker_credentials.c.broker_name
-        ).select_from(
-            broker_executions.join(
-                broker_credentials,
-                broker_executions.c.broker_id == broker_credentials.c.id
-            )
-        ).where(
-            broker_executions.c.parent_order_id == order_id
-        ).order_by(
-            broker_executions.c.execution_time.desc()
-        )
-        
-        executions_result = await session.execute(executions_stmt)
-        executions_data = [dict(row._mapping) for row in executions_result.fetchall()]
-        
-        # Add broker execution details to the order
-        order['broker_executions'] = executions_data
-    
-    return orders_data
 
 async def get_orders_by_symbol(session: AsyncSession, symbol: str):
     """
@@ -1835,91 +1848,7 @@ async def get_orders_by_strategy_symbol_id(session: AsyncSession, strategy_symbo
     Retrieve all orders for a specific strategy_symbol_id with broker execution details.
     Uses the same logic as get_all_orders but filters by strategy_symbol_id.
     """
-    from algosat.core.dbschema import broker_executions, broker_credentials, strategies
-    stmt = (
-        select(
-            orders.c.id,
-            orders.c.strategy_symbol_id,
-            orders.c.strike_symbol,
-            orders.c.pnl,
-            orders.c.candle_range,
-            orders.c.entry_price,
-            orders.c.stop_loss,
-            orders.c.target_price,
-            orders.c.current_price,  # Add current_price field
-            orders.c.price_last_updated,  # Add price_last_updated field
-            orders.c.signal_time,
-            orders.c.entry_time,
-            orders.c.exit_time,
-            orders.c.exit_price,
-            orders.c.status,
-            orders.c.reason,
-            orders.c.atr,
-            orders.c.supertrend_signal,
-            orders.c.lot_qty,
-            orders.c.side,
-            orders.c.qty,
-            orders.c.created_at,
-            orders.c.updated_at,
-            orders.c.executed_quantity,  # Add this line to select executed_quantity
-            orders.c.parent_order_id,  # Add parent_order_id field for hedge detection
-            strategy_symbols.c.symbol.label('symbol'),  # Join to get the symbol name
-            strategies.c.name.label('strategy_name'),  # Join to get the strategy name
-            strategy_symbols.c.enable_smart_levels.label('smart_level_enabled'),  # Add smart level enabled flag
-        )
-        .select_from(
-            orders
-            .outerjoin(strategy_symbols, orders.c.strategy_symbol_id == strategy_symbols.c.id)
-            .outerjoin(strategies, strategy_symbols.c.strategy_id == strategies.c.id)
-        )
-        .where(orders.c.strategy_symbol_id == strategy_symbol_id)
-        .order_by(orders.c.signal_time.desc().nullslast(), orders.c.id.desc())
-    )
-    result = await session.execute(stmt)
-    rows = result.fetchall()
-    print(f"DEBUG DB: get_orders_by_strategy_symbol_id({strategy_symbol_id}) fetched {len(rows)} rows")
-    if rows:
-        print(f"DEBUG DB: first row raw: {rows[0]}")
-    orders_data = [dict(row._mapping) for row in rows]
-    # Ensure executed_quantity is present in each order dict (default to 0 if missing)
-    for order in orders_data:
-        if 'executed_quantity' not in order:
-            order['executed_quantity'] = 0
-    
-    # For each order, get broker execution details
-    for order in orders_data:
-        order_id = order['id']
-        
-        # Get broker executions for this order
-        executions_stmt = select(
-            broker_executions.c.id,
-            broker_executions.c.broker_order_id,
-            broker_executions.c.side,
-            broker_executions.c.execution_price,
-            broker_executions.c.executed_quantity,
-            broker_executions.c.execution_time,
-            broker_executions.c.order_type,
-            broker_executions.c.product_type,
-            broker_executions.c.status,
-            broker_credentials.c.broker_name
-        ).select_from(
-            broker_executions.join(
-                broker_credentials,
-                broker_executions.c.broker_id == broker_credentials.c.id
-            )
-        ).where(
-            broker_executions.c.parent_order_id == order_id
-        ).order_by(
-            broker_executions.c.execution_time.desc()
-        )
-        
-        executions_result = await session.execute(executions_stmt)
-        executions_data = [dict(row._mapping) for row in executions_result.fetchall()]
-        
-        # Add broker execution details to the order
-        order['broker_executions'] = executions_data
-    
-    return orders_data
+    return await get_orders_with_broker_executions(session, strategy_symbol_id=strategy_symbol_id)
 
 async def get_strategy_symbol_by_name(session: AsyncSession, symbol_name: str):
     """
@@ -226,6 +226,14 @@ orders = Table(
     Column("updated_at", DateTime(timezone=True), nullable=False, server_default=text("now()")),
 )
 
+# Matches the order listing sort (signal_time DESC NULLS LAST, id DESC) for keyset pagination.
+# Existing databases get it from migrations/003_add_orders_signal_time_index.sql
+Index(
+    "ix_orders_signal_time_id",
+    orders.c.signal_time.desc().nullslast(),
+    orders.c.id.desc(),
+)
+
 # Broker executions table: one row per actual execution (ENTRY/EXIT)
 # Each actual fill/execution from broker gets a separate row
 broker_executions = Table(
@@ -0,0 +1,351 @@
+"""
+In-memory instrument master shared by symbol resolution for every broker.
+
+Each broker's instrument dump (Zerodha kite.instruments(), the Angel ScripMaster JSON) is
+loaded once per trading day into an InstrumentTable: the identifying fields are held as
+NumPy columns and looked up through dict indexes, so resolving a symbol or token is a
+dict lookup instead of an upper-casing scan over ~100k DataFrame rows. Indexes cover
+(segment, tradingsymbol), (segment, name), (name, expiry, strike, option_type) and
+token -> row; each is built on first use, so a broker that only ever resolves by
+tradingsymbol never pays for the others.
+
+The raw dump is also written to a daily snapshot under CACHE_DIR/instruments, so a restart
+on the same trading day rebuilds the table from disk instead of downloading the dump again.
+Snapshots from earlier days are deleted when a new one is written.
+
+Fyers needs no dump: its symbols are formatted directly from the logical symbol.
+"""
+
+import asyncio
+import glob
+import os
+import pickle
+import re
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from algosat.common import constants
+from algosat.common.logger import get_logger
+from algosat.core.time_utils import get_ist_today
+
+logger = get_logger("instrument_master")
+
+DEFAULT_INSTRUMENT_MASTER_PATH = os.path.join(constants.CACHE_DIR, "instruments")
+
+
+@dataclass(frozen=True)
+class InstrumentSchema:
+    """Which dump columns hold each field, and how the broker encodes strikes and expiries."""
+    token: str
+    symbol: str
+    segment: str
+    name: str
+    expiry: str
+    strike: str
+    option_type: Optional[str] = None  # None: taken from the CE/PE suffix of the symbol
+    instrument_type: Optional[str] = None
+    strike_divisor: float = 1.0
+    expiry_format: Optional[str] = None
+
+
+BROKER_SCHEMAS: Dict[str, InstrumentSchema] = {
+    "zerodha": InstrumentSchema(
+        token="instrument_token", symbol="tradingsymbol", segment="segment", name="name",
+        expiry="expiry", strike="strike", option_type="instrument_type", instrument_type="instrument_type",
+    ),
+    # ScripMaster strikes are in paise and expiries look like 16SEP2025
+    "angel": InstrumentSchema(
+        token="token", symbol="symbol", segment="exch_seg", name="name",
+        expiry="expiry", strike="strike", instrument_type="instrumenttype",
+        strike_divisor=100.0, expiry_format="%d%b%Y",
+    ),
+}
+
+
+def _text_column(frame: pd.DataFrame, column: Optional[str]) -> np.ndarray:
+    """Column as an object array of upper-cased strings ('' for missing values)."""
+    if not column or column not in frame.columns:
+        return np.full(len(frame), "", dtype=object)
+    return frame[column].fillna("").astype(str).str.upper().to_numpy(dtype=object)
+
+
+def _expiry_column(frame: pd.DataFrame, schema: InstrumentSchema) -> np.ndarray:
+    if schema.expiry not in frame.columns:
+        return np.full(len(frame), None, dtype=object)
+    raw = frame[schema.expiry]
+    expiries = pd.to_datetime(raw.where(raw != ""), format=schema.expiry_format, errors="coerce")
+    return np.array([None if pd.isna(ts) else ts.date() for ts in expiries], dtype=object)
+
+
+def _option_type_column(frame: pd.DataFrame, schema: InstrumentSchema, symbols: np.ndarray) -> np.ndarray:
+    if schema.option_type:
+        return _text_column(frame, schema.option_type)
+    instrument_types = _text_column(frame, schema.instrument_type)
+    option_types = instrument_types.copy()
+    for suffix in ("CE", "PE"):
+        option_types[np.char.endswith(symbols.astype(str), suffix)] = suffix
+    option_types[np.char.startswith(instrument_types.astype(str), "FUT")] = "FUT"
+    return option_types
+
+
+def _compact(text: str) -> str:
+    return text.replace(" ", "").upper()
+
+
+def _strike_key(strike) -> float:
+    return round(float(strike), 2)
+
+
+def _expiry_key(expiry) -> Optional[date]:
+    if expiry is None or expiry == "":
+        return None
+    if isinstance(expiry, datetime):
+        return expiry.date()
+    if isinstance(expiry, date):
+        return expiry
+    return pd.Timestamp(expiry).date()
+
+
+class InstrumentTable:
+    """
+    One broker's instruments for one trading day.
+
+    `frame` is the dump as the broker returned it (callers that expose the raw rows, like
+    AngelWrapper.get_instruments, keep returning it); lookups return row positions into it
+    through the dict indexes. Every lookup returns the first row in dump order that matches,
+    the same row the pandas filters it replaces picked with .iloc[0].
+    """
+
+    def __init__(self, broker: str, frame: pd.DataFrame, trade_date: date, schema: Optional[InstrumentSchema] = None):
+        self.broker = broker
+        self.frame = frame.reset_index(drop=True)
+        self.trade_date = trade_date
+        self.schema = schema or BROKER_SCHEMAS[broker]
+        frame = self.frame
+        self.tokens = frame[self.schema.token].to_numpy() if self.schema.token in frame.columns else np.array([], dtype=object)
+        self.symbols = _text_column(frame, self.schema.symbol)
+        self.segments = _text_column(frame, self.schema.segment)
+        self.names = _text_column(frame, self.schema.name)
+        self.instrument_types = _text_column(frame, self.schema.instrument_type)
+        self.expiries = _expiry_column(frame, self.schema)
+        strikes = pd.to_numeric(frame[self.schema.strike], errors="coerce") if self.schema.strike in frame.columns else pd.Series(np.nan, index=frame.index)
+        self.strikes = strikes.to_numpy(dtype=np.float64) / self.schema.strike_divisor
+        self.option_types = _option_type_column(frame, self.schema, self.symbols)
+        self._indexes: Dict[str, Dict[Any, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    # --- indexes ---
+
+    def _index(self, name: str) -> Dict[Any, int]:
+        index = self._indexes.get(name)
+        if index is None:
+            keys = self._index_keys(name)
+            # Built back to front so the first row in dump order wins for duplicate keys
+            index = dict(zip(reversed(keys), range(len(keys) - 1, -1, -1)))
+            self._indexes[name] = index
+        return index
+
+    def _index_keys(self, name: str) -> List[Any]:
+        if name == "segment_symbol":
+            return list(zip(self.segments, self.symbols))
+        if name == "symbol":
+            return self.symbols.tolist()
+        if name == "segment_name":
+            return list(zip(self.segments, self.names))
+        if name == "name":
+            return self.names.tolist()
+        if name == "segment_compact_name":
+            return list(zip(self.segments, (_compact(n) for n in self.names)))
+        if name == "contract":
+            # Futures and cash rows carry 0 or -1 as their strike; they are keyed with strike None
+            strikes = [_strike_key(s) if s > 0 else None for s in self.strikes.tolist()]
+            return list(zip(self.names, self.expiries, strikes, self.option_types))
+        if name == "token":
+            return [str(token) for token in self.tokens.tolist()]
+        raise ValueError(f"Unknown instrument index {name!r}")
+
+    def build_indexes(self) -> "InstrumentTable":
+        """Build every index now instead of on first use."""
+        for name in ("segment_symbol", "symbol", "segment_name", "name", "segment_compact_name", "contract", "token"):
+            self._index(name)
+        return self
+
+    # --- lookups (row positions) ---
+
+    def find_symbol(self, symbol: str, segment: str = None) -> Optional[int]:
+        if segment:
+            return self._index("segment_symbol").get((segment.upper(), symbol.upper()))
+        return self._index("symbol").get(symbol.upper())
+
+    def find_name(self, name: str, segment: str = None, ignore_spaces: bool = False) -> Optional[int]:
+        if ignore_spaces:
+            return self._index("segment_compact_name").get(((segment or "").upper(), _compact(name)))
+        if segment:
+            return self._index("segment_name").get((segment.upper(), name.upper()))
+        return self._index("name").get(name.upper())
+
+    def find_contract(self, name: str, expiry, strike, option_type: str) -> Optional[int]:
+        """Row of the (underlying, expiry, strike, CE/PE/FUT) contract; strike in rupees, None for futures."""
+        key = (name.upper(), _expiry_key(expiry), None if strike is None else _strike_key(strike), option_type.upper())
+        return self._index("contract").get(key)
+
+    def find_token(self, token) -> Optional[int]:
+        return self._index("token").get(str(token))
+
+    # --- row access ---
+
+    def token(self, row: int):
+        return self.tokens[row]
+
+    def symbol(self, row: int) -> str:
+        """Tradingsymbol as the broker spells it (not upper-cased)."""
+        return self.frame.at[row, self.schema.symbol]
+
+    def symbol_for_token(self, token) -> Optional[str]:
+        row = self.find_token(token)
+        return None if row is None else self.symbol(row)
+
+    def search(self, pattern: str = None, segment: str = None, instrument_type: str = None, limit: int = None) -> pd.DataFrame:
+        """
+        Rows whose symbol or name matches `pattern` (case-insensitive regex), optionally
+        restricted to a segment and instrument type, in dump order.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if segment:
+            mask &= self.segments == segment.upper()
+        if instrument_type:
+            mask &= self.instrument_types == instrument_type.upper()
+        rows = np.flatnonzero(mask)
+        if pattern:
+            regex = re.compile(pattern, re.IGNORECASE)
+            symbols, names = self.symbols, self.names
+            rows = np.array([i for i in rows.tolist() if regex.search(symbols[i]) or regex.search(names[i])], dtype=np.int64)
+        if limit and limit > 0:
+            rows = rows[:limit]
+        return self.frame.iloc[rows]
+
+
+class InstrumentMaster:
+    """Today's InstrumentTable per broker, with a daily on-disk snapshot of each dump."""
+
+    def __init__(self, path: str = DEFAULT_INSTRUMENT_MASTER_PATH):
+        self.path = path
+        self._tables: Dict[str, InstrumentTable] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._stats = {"memory_hits": 0, "snapshot_loads": 0, "downloads": 0}
+
+    def get(self, broker: str) -> Optional[InstrumentTable]:
+        """Today's table for the broker if it is already loaded, else None."""
+        table = self._tables.get(broker)
+        if table is not None and table.trade_date == get_ist_today():
+            return table
+        return None
+
+    async def load(self, broker: str, fetch: Callable[[], Awaitable[pd.DataFrame]]) -> InstrumentTable:
+        """
+        Today's table for the broker: from memory, else from today's snapshot, else by
+        awaiting fetch() for the dump. Concurrent callers share a single fetch.
+        """
+        table = self.get(broker)
+        if table is not None:
+            self._stats["memory_hits"] += 1
+            return table
+        lock = self._locks.setdefault(broker, asyncio.Lock())
+        async with lock:
+            table = self.get(broker)
+            if table is not None:
+                self._stats["memory_hits"] += 1
+                return table
+            trade_date = get_ist_today()
+            loop = asyncio.get_running_loop()
+            frame = await loop.run_in_executor(None, self._read_snapshot, broker, trade_date)
+            if frame is not None:
+                self._stats["snapshot_loads"] += 1
+            else:
+                frame = await fetch()
+                if frame is None or frame.empty:
+                    raise ValueError(f"Empty instrument dump for {broker}")
+                self._stats["downloads"] += 1
+                await loop.run_in_executor(None, self._write_snapshot, broker, trade_date, frame)
+            return self._install(broker, frame, trade_date)
+
+    def set_frame(self, broker: str, frame: pd.DataFrame, trade_date: date = None, persist: bool = True) -> InstrumentTable:
+        """Install a dump fetched elsewhere (e.g. right after login) as today's table."""
+        trade_date = trade_date or get_ist_today()
+        if persist:
+            self._write_snapshot(broker, trade_date, frame)
+        return self._install(broker, frame, trade_date)
+
+    def invalidate(self, broker: str) -> None:
+        """Drop the broker's table and today's snapshot so the next load downloads the dump."""
+        self._tables.pop(broker, None)
+        try:
+            os.remove(self._snapshot_path(broker, get_ist_today()))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not remove instrument snapshot for {broker}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats["tables"] = {
+            broker: {"rows": len(table), "trade_date": str(table.trade_date), "indexes": sorted(table._indexes)}
+            for broker, table in self._tables.items()
+        }
+        return stats
+
+    def _install(self, broker: str, frame: pd.DataFrame, trade_date: date) -> InstrumentTable:
+        started = time.perf_counter()
+        table = InstrumentTable(broker, frame, trade_date)
+        self._tables[broker] = table
+        logger.info(f"Instrument master: {broker} {len(table)} instruments for {trade_date} "
+                    f"loaded in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return table
+
+    # --- snapshots ---
+
+    def _snapshot_path(self, broker: str, trade_date: date) -> str:
+        return os.path.join(self.path, f"{broker}_{trade_date.isoformat()}.pkl")
+
+    def _read_snapshot(self, broker: str, trade_date: date) -> Optional[pd.DataFrame]:
+        snapshot = self._snapshot_path(broker, trade_date)
+        if not os.path.exists(snapshot):
+            return None
+        try:
+            with open(snapshot, "rb") as f:
+                return pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable instrument snapshot {snapshot}: {e}")
+            return None
+
+    def _write_snapshot(self, broker: str, trade_date: date, frame: pd.DataFrame) -> None:
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            snapshot = self._snapshot_path(broker, trade_date)
+            tmp = f"{snapshot}.tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump(frame, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, snapshot)
+            for stale in glob.glob(os.path.join(self.path, f"{broker}_*.pkl")):
+                if stale != snapshot:
+                    os.remove(stale)
+        except Exception as e:
+            logger.warning(f"Could not write instrument snapshot for {broker}: {e}")
+
+
+_instrument_master: Optional[InstrumentMaster] = None
+
+
+def get_instrument_master() -> InstrumentMaster:
+    """The process-wide InstrumentMaster shared by BrokerManager and the broker wrappers."""
+    global _instrument_master
+    if _instrument_master is None:
+        _instrument_master = InstrumentMaster()
+    return _instrument_master
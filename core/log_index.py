@@ -0,0 +1,404 @@
+"""
+Seekable, indexed queries over the text log files served by the /logs API.
+
+Each log file gets a sidecar index (JSON lines, kept under index_dir rather than next to the
+logs so the log file scanners never pick it up) that splits the file into one-minute buckets.
+A bucket records its byte range, the number of lines per level and the set of lowercase
+word tokens in its messages. The index is extended from the last indexed byte when the file
+grows and rebuilt when the file is rotated or truncated. Only the last bucket of a file can
+change once written, so saving a growing index rewrites that bucket's line and appends the
+new ones instead of rewriting the whole sidecar.
+
+A query walks the buckets of all requested files newest minute first. Whole minutes are
+skipped using the level counts (or, with a search term, the token sets) and only the byte
+ranges of the minutes that end up on the requested page are read and parsed, so a page
+costs the same on a quiet day and on a day with hundreds of MB of logs. The token sets are
+only a prefilter: the records read are still matched against the whole search term.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from algosat.common.logger import get_logger
+
+logger = get_logger("log_index")
+
+INDEX_VERSION = 2
+# Pattern: 2025-06-06 05:04:43 - api.app - enhanced_app.py:64 - INFO - Starting Algosat API consumer service
+LOG_LINE_PATTERN = re.compile(r"(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) - ([^-]+) - ([^:]+):(\d+) - (\w+) - (.+)")
+TOKEN_PATTERN = re.compile(r"[a-z0-9_]+")
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+# Bytes read per chunk while indexing
+READ_CHUNK = 1 << 20
+# File indexes kept in memory (least recently queried are dropped first)
+DEFAULT_MAX_CACHED = 64
+# Minimum seconds between sidecar writes for a file that keeps growing
+DEFAULT_SAVE_INTERVAL = 30.0
+
+LogRecord = namedtuple("LogRecord", "timestamp level logger module line message raw")
+
+
+def parse_record(line: str) -> Optional[LogRecord]:
+    match = LOG_LINE_PATTERN.match(line.strip())
+    if not match:
+        return None
+    timestamp_str, logger_name, module, line_num, level, message = match.groups()
+    return LogRecord(
+        timestamp=datetime.strptime(timestamp_str, TIMESTAMP_FORMAT),
+        level=level,
+        logger=logger_name.strip(),
+        module=module.strip(),
+        line=int(line_num),
+        message=message.strip(),
+        raw=line.strip(),
+    )
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _json_line(data) -> bytes:
+    return json.dumps(data, separators=(",", ":")).encode() + b"\n"
+
+
+def _bucket_line(bucket: list) -> bytes:
+    minute, start, end, levels, tokens = bucket
+    return _json_line([minute, start, end, levels, sorted(tokens)])
+
+
+class FileIndex:
+    """
+    Minute buckets of one log file: [minute, start, end, {level: count}, tokens].
+
+    The sidecar holds a header line (version, path, inode), one line per bucket and a footer
+    line with indexed_to. saved_buckets and saved_tail (the sidecar offset of the last saved
+    bucket's line) let a save rewrite from the last saved bucket on.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.inode = None
+        self.indexed_to = 0
+        self.buckets: List[list] = []
+        self.saved_at = float("-inf")
+        self.saved_buckets = 0
+        self.saved_tail = 0
+
+    def header(self) -> bytes:
+        return _json_line({"version": INDEX_VERSION, "path": str(self.path), "inode": self.inode})
+
+    def footer(self) -> bytes:
+        return _json_line({"indexed_to": self.indexed_to})
+
+    @classmethod
+    def from_lines(cls, path: Path, lines: List[bytes]) -> Optional["FileIndex"]:
+        """The index saved as lines, or None if it is from another version or cut short."""
+        if len(lines) < 2 or not lines[-1].endswith(b"\n"):
+            return None
+        header, footer = json.loads(lines[0]), json.loads(lines[-1])
+        if header.get("version") != INDEX_VERSION or "indexed_to" not in footer:
+            return None
+        index = cls(path)
+        index.inode = header["inode"]
+        index.indexed_to = footer["indexed_to"]
+        index.buckets = [[m, s, e, levels, set(tokens)] for m, s, e, levels, tokens in map(json.loads, lines[1:-1])]
+        index.saved_buckets = len(index.buckets)
+        index.saved_tail = sum(len(line) for line in lines[:-2])
+        return index
+
+    def update(self) -> bool:
+        """Index anything appended since the last update; returns True if the index changed."""
+        stat = os.stat(self.path)
+        if self.inode != stat.st_ino or stat.st_size < self.indexed_to:
+            # Rotated or truncated: start over
+            self.inode = stat.st_ino
+            self.indexed_to = 0
+            self.buckets = []
+            self.saved_buckets = 0
+        if stat.st_size == self.indexed_to:
+            return False
+        with open(self.path, "rb") as f:
+            f.seek(self.indexed_to)
+            offset = self.indexed_to
+            pending = b""
+            while True:
+                chunk = f.read(READ_CHUNK)
+                if not chunk:
+                    break
+                data = pending + chunk
+                # Only complete lines are indexed; a partly written last line waits for the next update
+                cut = data.rfind(b"\n") + 1
+                pending = data[cut:]
+                for raw in data[:cut].splitlines(keepends=True):
+                    self._add_line(raw, offset)
+                    offset += len(raw)
+        changed = offset != self.indexed_to
+        self.indexed_to = offset
+        return changed
+
+    def _add_line(self, raw: bytes, offset: int) -> None:
+        end = offset + len(raw)
+        match = LOG_LINE_PATTERN.match(raw.decode("utf-8", errors="replace").strip())
+        if match is None:
+            # Continuation lines (tracebacks) stay inside the current bucket's byte range
+            if self.buckets:
+                self.buckets[-1][2] = end
+            return
+        minute = match.group(1)[:16]
+        level = match.group(5)
+        if not self.buckets or self.buckets[-1][0] != minute:
+            self.buckets.append([minute, offset, end, {}, set()])
+        bucket = self.buckets[-1]
+        bucket[2] = end
+        bucket[3][level] = bucket[3].get(level, 0) + 1
+        bucket[4].update(tokenize(match.group(6)))
+
+
+def search_terms(needle: str) -> List[Tuple[str, bool, bool]]:
+    """
+    The words of a lowercase search term as (token, open_start, open_end). A message that
+    contains the term has every word as a token of its own, except that the first word may
+    be the end of a longer token (open_start) and the last word the start of one (open_end)
+    when the term begins or ends mid-word.
+    """
+    return [(match.group(), match.start() == 0, match.end() == len(needle))
+            for match in TOKEN_PATTERN.finditer(needle)]
+
+
+def _bucket_may_match(bucket: list, level: Optional[str], terms: Sequence[Tuple[str, bool, bool]]) -> bool:
+    """Prefilter: False only if no line in the bucket can match; candidates are checked when read."""
+    if level is not None and not bucket[3].get(level):
+        return False
+    tokens = bucket[4]
+    words = None
+    for token, open_start, open_end in terms:
+        if token in tokens:
+            continue
+        if not (open_start or open_end):
+            return False
+        # One substring search over the bucket's tokens, each wrapped in spaces
+        if words is None:
+            words = " " + "  ".join(tokens) + " "
+        if (("" if open_start else " ") + token + ("" if open_end else " ")) not in words:
+            return False
+    return True
+
+
+def _bucket_count(bucket: list, level: Optional[str]) -> int:
+    return bucket[3].get(level, 0) if level is not None else sum(bucket[3].values())
+
+
+class LogIndex:
+    """Sidecar indexes for a set of log files and paginated, newest-first queries over them."""
+
+    def __init__(
+        self,
+        index_dir: Path,
+        logs_dir: Optional[Path] = None,
+        max_cached: int = DEFAULT_MAX_CACHED,
+        save_interval: float = DEFAULT_SAVE_INTERVAL,
+    ):
+        self.index_dir = Path(index_dir)
+        self.logs_dir = Path(logs_dir) if logs_dir is not None else None
+        self.max_cached = max_cached
+        self.save_interval = save_interval
+        self._indexes: "OrderedDict[str, FileIndex]" = OrderedDict()
+        # Queries run in worker threads; one at a time keeps the indexes consistent while they grow
+        self._lock = threading.Lock()
+
+    def _sidecar(self, path: Path) -> Path:
+        if self.logs_dir is not None:
+            try:
+                return self.index_dir / path.relative_to(self.logs_dir).with_name(path.name + ".idx")
+            except ValueError:
+                pass
+        return self.index_dir / "_other" / (str(path).lstrip(os.sep).replace(os.sep, "__") + ".idx")
+
+    def file_index(self, path) -> FileIndex:
+        """The up-to-date index of path, loaded from its sidecar and extended as needed."""
+        path = Path(path)
+        key = str(path)
+        index = self._indexes.pop(key, None)
+        sidecar = self._sidecar(path)
+        if index is None:
+            index = self._load(path, sidecar)
+        self._indexes[key] = index  # most recently used last
+        while len(self._indexes) > self.max_cached:
+            self._indexes.popitem(last=False)
+        if index.update() and time.monotonic() - index.saved_at >= self.save_interval:
+            self._save(index, sidecar)
+        return index
+
+    def _adopt_rotated(self, path: Path) -> Optional[FileIndex]:
+        """A rotated file keeps its inode under a new name: reuse the index built under the old name."""
+        try:
+            inode = os.stat(path).st_ino
+        except OSError:
+            return None
+        for old_key, old in list(self._indexes.items()):
+            if old_key == str(path) or old.inode != inode:
+                continue
+            try:
+                moved = os.stat(old_key).st_ino != inode
+            except OSError:
+                moved = True
+            if moved:
+                del self._indexes[old_key]
+                index = FileIndex(path)
+                index.inode, index.indexed_to, index.buckets = old.inode, old.indexed_to, old.buckets
+                return index
+        return None
+
+    def prune(self) -> int:
+        """Delete sidecars whose log file no longer exists; returns the number removed."""
+        removed = 0
+        if self.logs_dir is None or not self.index_dir.exists():
+            return removed
+        for sidecar in self.index_dir.rglob("*.idx"):
+            relative = sidecar.relative_to(self.index_dir)
+            if relative.parts[0] == "_other":
+                continue
+            log_path = self.logs_dir / relative.with_name(relative.name[:-len(".idx")])
+            if not log_path.exists():
+                sidecar.unlink(missing_ok=True)
+                with self._lock:
+                    self._indexes.pop(str(log_path), None)
+                removed += 1
+        return removed
+
+    def _load(self, path: Path, sidecar: Path) -> FileIndex:
+        try:
+            with open(sidecar, "rb") as f:
+                index = FileIndex.from_lines(path, f.readlines())
+            if index is not None:
+                return index
+        except FileNotFoundError:
+            return self._adopt_rotated(path) or FileIndex(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable log index {sidecar}: {e}")
+        return FileIndex(path)
+
+    def _save(self, index: FileIndex, sidecar: Path) -> None:
+        """Write the buckets changed since the last save, or the whole sidecar the first time."""
+        try:
+            if index.saved_buckets and sidecar.exists():
+                # The last saved bucket may have grown; everything before it is unchanged
+                with open(sidecar, "r+b") as f:
+                    f.seek(index.saved_tail)
+                    f.truncate()
+                    tail = self._write_buckets(f, index, index.saved_buckets - 1, index.saved_tail)
+            else:
+                sidecar.parent.mkdir(parents=True, exist_ok=True)
+                tmp = sidecar.with_name(sidecar.name + ".tmp")
+                with open(tmp, "wb") as f:
+                    header = index.header()
+                    f.write(header)
+                    tail = self._write_buckets(f, index, 0, len(header))
+                os.replace(tmp, sidecar)
+            index.saved_at = time.monotonic()
+            index.saved_buckets = len(index.buckets)
+            index.saved_tail = tail
+        except OSError as e:
+            index.saved_buckets = 0  # the sidecar may be cut short: rewrite it next time
+            logger.warning(f"Could not write log index {sidecar}: {e}")
+
+    @staticmethod
+    def _write_buckets(f, index: FileIndex, first: int, offset: int) -> int:
+        """Write buckets[first:] and the footer at offset; returns the last bucket line's offset."""
+        tail = offset
+        for bucket in index.buckets[first:]:
+            line = _bucket_line(bucket)
+            tail = offset
+            f.write(line)
+            offset += len(line)
+        f.write(index.footer())
+        return tail
+
+    def query(
+        self,
+        paths: Iterable,
+        offset: int = 0,
+        limit: int = 1000,
+        level: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> Tuple[List[LogRecord], int]:
+        """
+        Matching records newest first, skipping offset and returning at most limit, plus the
+        total number of matches. Lines within the same second keep file-name then line order.
+        """
+        with self._lock:
+            return self._query(paths, offset, limit, level, search)
+
+    def _query(self, paths, offset, limit, level, search) -> Tuple[List[LogRecord], int]:
+        level = level.upper() if level else None
+        needle = search.lower() if search else None
+        terms = search_terms(needle) if needle else []
+        paths = sorted((Path(p) for p in paths), key=lambda p: p.name)
+
+        # minute -> [(file order, path, bucket)] for the buckets that can hold matches
+        minutes: Dict[str, List[Tuple[int, Path, list]]] = {}
+        for order, path in enumerate(paths):
+            try:
+                index = self.file_index(path)
+            except OSError as e:
+                logger.error(f"Error indexing log file {path}: {e}")
+                continue
+            for bucket in index.buckets:
+                if _bucket_may_match(bucket, level, terms):
+                    minutes.setdefault(bucket[0], []).append((order, path, bucket))
+
+        page: List[LogRecord] = []
+        total = 0
+        for minute in sorted(minutes, reverse=True):
+            group = minutes[minute]
+            if needle is None:
+                count = sum(_bucket_count(bucket, level) for _, _, bucket in group)
+                if total + count <= offset or len(page) >= limit:
+                    total += count  # entirely before the page, or after it: counted, never read
+                    continue
+                records = self._read_group(group, level, needle)
+            else:
+                # With a search term the count is only known after reading the candidates
+                records = self._read_group(group, level, needle)
+                count = len(records)
+                if total + count <= offset or len(page) >= limit:
+                    total += count
+                    continue
+            start = max(0, offset - total)
+            page.extend(records[start:start + limit - len(page)])
+            total += count
+        return page, total
+
+    def _read_group(self, group, level: Optional[str], needle: Optional[str]) -> List[LogRecord]:
+        records = []
+        for _, path, bucket in sorted(group, key=lambda item: (item[0], item[2][1])):
+            for record in self._read_bucket(path, bucket):
+                if level is not None and record.level != level:
+                    continue
+                if needle is not None and needle not in record.message.lower():
+                    continue
+                records.append(record)
+        # Stable: equal timestamps keep file-name then line order
+        records.sort(key=lambda r: r.timestamp, reverse=True)
+        return records
+
+    @staticmethod
+    def _read_bucket(path: Path, bucket: list) -> List[LogRecord]:
+        start, end = bucket[1], bucket[2]
+        with open(path, "rb") as f:
+            f.seek(start)
+            data = f.read(end - start)
+        records = []
+        for line in data.decode("utf-8", errors="replace").splitlines():
+            record = parse_record(line)
+            if record is not None:
+                records.append(record)
+        return records
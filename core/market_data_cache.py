@@ -0,0 +1,368 @@
+"""
+Tiered cache used by DataManager for option chains and history.
+
+- MemoryCacheTier: bounded LRU with per-entry expiry and byte-size accounting.
+- DiskCacheTier: optional persistent tier. Entries carry their expiry on disk, writes are
+  batched and done by a background thread so the event loop never blocks on pickling or I/O;
+  async callers read through a worker thread too (_CacheManager.aget).
+  DataFrames are stored as Parquet and dicts/lists as msgpack when pyarrow/msgpack are
+  installed; anything else (or when they are not installed) falls back to pickle.
+- CacheStats: hit/miss/eviction counters per key namespace ("option_chain", "history", ...).
+"""
+
+import atexit
+import hashlib
+import importlib.util
+import json
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from algosat.common.logger import get_logger
+
+# pyarrow is only used through DataFrame.to_parquet/read_parquet
+PARQUET_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = get_logger("market_data_cache")
+
+DEFAULT_DISK_CACHE_PATH = "/tmp/algosat_cache"
+DEFAULT_MEMORY_CACHE_BYTES = 256 * 1024 * 1024
+
+
+def cache_namespace(key: str) -> str:
+    """Namespace of a cache key: the part before the first ':' ("option_chain:NIFTY:..." -> "option_chain")."""
+    return key.split(":", 1)[0] if ":" in key else "default"
+
+
+def estimate_size(value: Any, _seen: Optional[set] = None) -> int:
+    """Approximate in-memory size of a cached value in bytes."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _seen) for item in value)
+    return size
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    stored_at: float
+    expires_at: float
+    nbytes: int = 0
+
+    def is_fresh(self, now: float, max_age: Optional[float] = None) -> bool:
+        if now >= self.expires_at:
+            return False
+        return max_age is None or now - self.stored_at < max_age
+
+
+class CacheStats:
+    """Thread-safe event counters per key namespace."""
+
+    EVENTS = ("hits", "disk_hits", "misses", "sets", "evictions", "expirations", "disk_writes", "disk_errors")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(self.EVENTS, 0))
+
+    def record(self, namespace: str, event: str, count: int = 1) -> None:
+        with self._lock:
+            self._counters[namespace][event] += count
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {namespace: dict(counters) for namespace, counters in self._counters.items()}
+
+
+class MemoryCacheTier:
+    """LRU cache bounded by both entry count and total estimated bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int, stats: CacheStats):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = stats
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes_by_namespace: Dict[str, int] = defaultdict(int)
+        self.total_bytes = 0
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if not entry.is_fresh(time.time(), max_age):
+            self._remove(key)
+            self.stats.record(cache_namespace(key), "expirations")
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        if key in self._entries:
+            self._remove(key)
+        if entry.nbytes > self.max_bytes:
+            # Larger than the whole tier; keep it on disk only
+            logger.debug(f"Cache entry {key} ({entry.nbytes} bytes) exceeds memory tier limit, not kept in memory")
+            return
+        self._entries[key] = entry
+        self._bytes_by_namespace[cache_namespace(key)] += entry.nbytes
+        self.total_bytes += entry.nbytes
+        self._evict()
+
+    def delete(self, key: str) -> None:
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes_by_namespace.clear()
+        self.total_bytes = 0
+
+    def _remove(self, key: str) -> CacheEntry:
+        entry = self._entries.pop(key)
+        self._bytes_by_namespace[cache_namespace(key)] -= entry.nbytes
+        self.total_bytes -= entry.nbytes
+        return entry
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.stats.record(cache_namespace(key), "evictions")
+
+    def usage(self) -> Dict[str, Dict[str, int]]:
+        entries_by_namespace: Dict[str, int] = defaultdict(int)
+        for key in self._entries:
+            entries_by_namespace[cache_namespace(key)] += 1
+        return {
+            namespace: {"entries": entries_by_namespace.get(namespace, 0), "bytes": nbytes}
+            for namespace, nbytes in self._bytes_by_namespace.items()
+        }
+
+
+class DiskCacheTier:
+    """
+    Persistent cache directory: one file per key plus an index.json holding each key's
+    file, format and expiry. Writes are queued and flushed in batches by a background thread.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, path: str, stats: CacheStats, flush_interval: float = 1.0):
+        self.path = path
+        self.stats = stats
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._pending: Dict[str, CacheEntry] = {}
+        self._pending_deletes: set = set()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._writer: Optional[threading.Thread] = None
+        self._load_index()
+        atexit.register(self.close)
+
+    # --- public API (called from the event loop; never does file writes) ---
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._pending[key] = entry
+            self._pending_deletes.discard(key)
+            self._ensure_writer()
+        self._wakeup.set()
+
+    def contains(self, key: str) -> bool:
+        """Whether key is pending or indexed (no file I/O)."""
+        with self._lock:
+            return key in self._pending or key in self._index
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Optional[CacheEntry]:
+        """Reads the entry's file: from the event loop, call it in a worker thread."""
+        now = time.time()
+        with self._lock:
+            entry = self._pending.get(key)
+            meta = None if entry is not None else self._index.get(key)
+        if entry is None and meta is None:
+            return None
+        if entry is None:
+            entry = CacheEntry(value=None, stored_at=meta["stored_at"], expires_at=meta["expires_at"])
+        if not entry.is_fresh(now, max_age):
+            self.delete(key)
+            self.stats.record(cache_namespace(key), "expirations")
+            return None
+        if meta is not None:
+            try:
+                entry.value = self._read(meta)
+            except Exception as e:
+                logger.error(f"Failed to read disk cache entry {key}: {e}")
+                self.stats.record(cache_namespace(key), "disk_errors")
+                self.delete(key)
+                return None
+        return entry
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._pending.pop(key, None)
+            if key in self._index:
+                self._pending_deletes.add(key)
+                self._ensure_writer()
+        self._wakeup.set()
+
+    def flush(self) -> None:
+        """Write all pending entries and deletions, then persist the index."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            deletes, self._pending_deletes = self._pending_deletes, set()
+        if not pending and not deletes and not self._purge_expired():
+            return
+        os.makedirs(self.path, exist_ok=True)
+        for key in deletes:
+            with self._lock:
+                meta = self._index.pop(key, None)
+            if meta:
+                self._unlink(meta["file"])
+        for key, entry in pending.items():
+            try:
+                meta = self._write(key, entry)
+            except Exception as e:
+                logger.error(f"Failed to write disk cache entry {key}: {e}")
+                self.stats.record(cache_namespace(key), "disk_errors")
+                continue
+            with self._lock:
+                self._index[key] = meta
+            self.stats.record(cache_namespace(key), "disk_writes")
+        self._save_index()
+
+    def close(self) -> None:
+        self._closed = True
+        self._wakeup.set()
+        if self._writer is not None and self._writer.is_alive() and self._writer is not threading.current_thread():
+            self._writer.join(timeout=5)
+        self.flush()
+
+    def entry_count(self) -> int:
+        with self._lock:
+            return len(self._index) + len(self._pending)
+
+    # --- background writer ---
+
+    def _ensure_writer(self) -> None:
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._writer_loop, name="algosat-disk-cache", daemon=True)
+            self._writer.start()
+
+    def _writer_loop(self) -> None:
+        while not self._closed:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if self._closed:
+                break
+            # Let more writes accumulate so they go out as one batch
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Disk cache flush failed: {e}", exc_info=True)
+
+    # --- storage helpers ---
+
+    def _file_for(self, key: str, fmt: str) -> str:
+        return hashlib.sha1(key.encode()).hexdigest() + "." + fmt
+
+    def _write(self, key: str, entry: CacheEntry) -> Dict[str, Any]:
+        value = entry.value
+        payload = None
+        if isinstance(value, pd.DataFrame) and PARQUET_AVAILABLE:
+            fmt = "parquet"
+        elif isinstance(value, (dict, list)) and msgpack is not None:
+            try:
+                payload = msgpack.packb(value, use_bin_type=True)
+                fmt = "msgpack"
+            except (TypeError, ValueError, OverflowError):
+                fmt = "pickle"
+        else:
+            fmt = "pickle"
+        filename = self._file_for(key, fmt)
+        target = os.path.join(self.path, filename)
+        tmp = target + ".tmp"
+        if fmt == "parquet":
+            value.to_parquet(tmp)
+        else:
+            if payload is None:
+                payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            with open(tmp, "wb") as f:
+                f.write(payload)
+        os.replace(tmp, target)
+        return {"file": filename, "format": fmt, "stored_at": entry.stored_at, "expires_at": entry.expires_at}
+
+    def _read(self, meta: Dict[str, Any]) -> Any:
+        target = os.path.join(self.path, meta["file"])
+        if meta["format"] == "parquet":
+            return pd.read_parquet(target)
+        with open(target, "rb") as f:
+            payload = f.read()
+        if meta["format"] == "msgpack":
+            # Non-string keys (strike -> quote maps) pack fine and must unpack too
+            return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+        return pickle.loads(payload)
+
+    def _unlink(self, filename: str) -> None:
+        try:
+            os.remove(os.path.join(self.path, filename))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"Failed to remove disk cache file {filename}: {e}")
+
+    def _purge_expired(self) -> bool:
+        now = time.time()
+        with self._lock:
+            expired = [key for key, meta in self._index.items() if meta["expires_at"] <= now]
+            metas = [self._index.pop(key) for key in expired]
+        for meta in metas:
+            self._unlink(meta["file"])
+        return bool(expired)
+
+    def _load_index(self) -> None:
+        index_path = os.path.join(self.path, self.INDEX_FILE)
+        if not os.path.exists(index_path):
+            return
+        try:
+            with open(index_path, "r") as f:
+                self._index = json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to load disk cache index {index_path}, starting empty: {e}")
+            self._index = {}
+            return
+        if self._purge_expired():
+            self._save_index()
+
+    def _save_index(self) -> None:
+        with self._lock:
+            snapshot = dict(self._index)
+        index_path = os.path.join(self.path, self.INDEX_FILE)
+        tmp = index_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp, index_path)
@@ -9,7 +9,7 @@ import traceback
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 from functools import wraps
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager
 
 import structlog
 from prometheus_client import (
@@ -38,6 +38,11 @@ structlog.configure(
 
 logger = structlog.get_logger(__name__)
 
+# Buckets for the hot-path latency histograms: 1ms (cache and tick-bus hits) up to 30s (retried broker calls)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Fill detection is bounded below by the order-monitor poll interval
+FILL_DETECTION_BUCKETS = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
 class TradingMetrics:
     """Prometheus metrics for trading system monitoring."""
     
@@ -161,6 +166,78 @@ class TradingMetrics:
             registry=self.registry
         )
 
+        # Hot-path latency metrics. Labels are limited to strategy keys, broker names, fixed
+        # sources/outcomes, cache namespaces and code call sites so cardinality stays bounded.
+        self.signal_to_order_seconds = Histogram(
+            'algosat_signal_to_order_seconds',
+            'Time from trade signal creation to the order being sent to the brokers',
+            ['strategy'],
+            buckets=LATENCY_BUCKETS,
+            registry=self.registry
+        )
+
+        self.order_ack_seconds = Histogram(
+            'algosat_order_ack_seconds',
+            'Time from order sent to broker acknowledgement',
+            ['broker', 'outcome'],
+            buckets=LATENCY_BUCKETS,
+            registry=self.registry
+        )
+
+        self.fill_detection_seconds = Histogram(
+            'algosat_fill_detection_seconds',
+            'Delay between the broker execution time and the order monitor seeing the fill',
+            ['broker'],
+            buckets=FILL_DETECTION_BUCKETS,
+            registry=self.registry
+        )
+
+        self.ltp_fetch_seconds = Histogram(
+            'algosat_ltp_fetch_seconds',
+            'LTP lookup latency',
+            ['source'],
+            buckets=LATENCY_BUCKETS,
+            registry=self.registry
+        )
+
+        self.history_fetch_seconds = Histogram(
+            'algosat_history_fetch_seconds',
+            'Historical candle lookup latency',
+            ['source'],
+            buckets=LATENCY_BUCKETS,
+            registry=self.registry
+        )
+
+        self.data_cache_requests = Counter(
+            'algosat_data_cache_requests_total',
+            'Market data cache lookups',
+            ['namespace', 'result'],
+            registry=self.registry
+        )
+
+        self.db_session_seconds = Histogram(
+            'algosat_db_session_seconds',
+            'Time a database session is held open',
+            ['call_site'],
+            buckets=LATENCY_BUCKETS,
+            registry=self.registry
+        )
+
+        self.rate_limiter_wait_seconds = Histogram(
+            'algosat_rate_limiter_wait_seconds',
+            'Time spent waiting for a broker rate-limit token',
+            ['broker', 'lane'],
+            buckets=LATENCY_BUCKETS,
+            registry=self.registry
+        )
+
+        self.rate_limiter_queue_depth = Gauge(
+            'algosat_rate_limiter_queue_depth',
+            'Requests queued for a broker rate-limit token',
+            ['broker', 'lane'],
+            registry=self.registry
+        )
+
 
 class HealthChecker:
     """Health check manager for system components."""
@@ -354,6 +431,29 @@ async def monitor_trade_execution(metrics: TradingMetrics, broker: str, order_ty
         raise
 
 
+@contextmanager
+def observe_latency(histogram, **labels):
+    """Observe the wall time of the with-block (including failures) on histogram."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - started)
+
+
+def start_metrics_server(port: int, metrics: Optional[TradingMetrics] = None) -> bool:
+    """Serve metrics (default: the global trading_metrics) on /metrics from a daemon thread."""
+    from prometheus_client import start_http_server
+    metrics = metrics or trading_metrics
+    try:
+        start_http_server(port, registry=metrics.registry)
+    except OSError as e:
+        logger.error(f"Could not start metrics server on port {port}", error=str(e))
+        return False
+    logger.info(f"Metrics server listening on port {port}")
+    return True
+
+
 # Global monitoring instances
 trading_metrics = TradingMetrics()
 health_checker = HealthChecker()
@@ -1,16 +1,26 @@
 import asyncio
 from typing import Dict, List, Any, Optional
-from collections import defaultdict
 from algosat.common.logger import get_logger
 from algosat.core.order_manager import OrderManager
 
 logger = get_logger("OrderCache")
 
+# Order-book poll interval for brokers whose orders are pushed over an order-update websocket;
+# the poll then only reconciles updates the stream may have missed
+DEFAULT_RECONCILE_INTERVAL = 120.0  # seconds
+
 class OrderCache:
-    def __init__(self, order_manager: OrderManager, refresh_interval: float = 60.0):
+    def __init__(self, order_manager: OrderManager, refresh_interval: float = 60.0, reconcile_interval: float = DEFAULT_RECONCILE_INTERVAL):
         self.order_manager = order_manager
         self.refresh_interval = refresh_interval
+        self.reconcile_interval = reconcile_interval
+        self._push_brokers = set()  # brokers with a live order-update stream
+        self._poll_wakeups: Dict[str, asyncio.Event] = {}  # broker_name -> event that ends the poll wait early
+        self._push_seq = 0
+        self._pushed: Dict[str, Dict[str, int]] = {}  # broker_name -> str(order id) -> push sequence number
         self._cache: Dict[str, List[dict]] = {}  # broker_name -> list of order dicts
+        self._index: Dict[str, Dict[str, dict]] = {}  # broker_name -> str(order id) -> order dict
+        self._positions: Dict[str, Dict[str, int]] = {}  # broker_name -> str(order id) -> position in _cache list
         self._locks: Dict[str, asyncio.Lock] = {}  # broker_name -> lock
         self._update_events: Dict[str, asyncio.Event] = {}  # broker_name -> event
         self._tasks: Dict[str, asyncio.Task] = {}  # broker_name -> background task
@@ -18,17 +28,17 @@ class OrderCache:
 
     async def start(self):
         self._running = True
+        # One concurrent fetch of every broker's order book seeds the cache; after that each
+        # broker's task refreshes only its own order book
         broker_orders = await self.order_manager.get_all_broker_order_details()
-        # broker_orders = defaultdict(list)
-        # for order in broker_orders_list:
-        #     broker_orders[order["broker_name"]].append(order)
         # Always initialize for all enabled brokers, even if no orders yet
-        for broker_name in broker_orders.keys():
+        for broker_name, orders in broker_orders.items():
             if broker_name not in self._locks:
                 self._locks[broker_name] = asyncio.Lock()
             if broker_name not in self._update_events:
                 self._update_events[broker_name] = asyncio.Event()
             if broker_name not in self._tasks:
+                self._store(broker_name, orders)
                 self._tasks[broker_name] = asyncio.create_task(self._refresh_broker_orders(broker_name))
 
     async def stop(self):
@@ -37,50 +47,141 @@ class OrderCache:
             task.cancel()
         self._tasks.clear()
 
+    def set_push_mode(self, broker_name: str, enabled: bool) -> None:
+        """
+        Mark a broker's orders as pushed by an order-update stream (poll only every
+        reconcile_interval) or not (poll every refresh_interval). Leaving push mode triggers
+        an immediate refresh so nothing the stream missed waits a full interval.
+        """
+        if enabled:
+            if broker_name not in self._push_brokers:
+                self._push_brokers.add(broker_name)
+                logger.info(f"OrderCache: {broker_name} orders are pushed; polling every {self.reconcile_interval}s for reconciliation")
+        elif broker_name in self._push_brokers:
+            self._push_brokers.discard(broker_name)
+            logger.info(f"OrderCache: {broker_name} order stream down; polling every {self.refresh_interval}s")
+            wakeup = self._poll_wakeups.get(broker_name)
+            if wakeup is not None:
+                wakeup.set()
+
+    def _poll_interval(self, broker_name: str) -> float:
+        return self.reconcile_interval if broker_name in self._push_brokers else self.refresh_interval
+
     async def _refresh_broker_orders(self, broker_name: str):
+        wakeup = self._poll_wakeups.setdefault(broker_name, asyncio.Event())
         while self._running:
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=self._poll_interval(broker_name))
+            except asyncio.TimeoutError:
+                pass
+            wakeup.clear()
             lock = self._locks[broker_name]
             event = self._update_events[broker_name]
             async with lock:
                 try:
                     logger.debug(f"OrderCache: Starting refresh for {broker_name}")
-                    broker_orders= await self.order_manager.get_all_broker_order_details()
-                    # broker_orders = defaultdict(list)
-                    # for order in broker_orders_list:
-                        # broker_orders[order["broker_name"]].append(order)
-                    orders = broker_orders.get(broker_name, [])
-                    
-                    # Log status changes for active orders
-                    if broker_name in self._cache:
-                        old_orders = {order.get('order_id') or order.get('id'): order for order in self._cache[broker_name]}
-                        new_orders = {order.get('order_id') or order.get('id'): order for order in orders}
-                        
-                        for order_id, new_order in new_orders.items():
-                            if order_id in old_orders:
-                                old_status = old_orders[order_id].get('status')
-                                new_status = new_order.get('status')
-                                if old_status != new_status:
-                                    logger.info(f"OrderCache: Status change detected for {broker_name} order {order_id}: {old_status} → {new_status}")
-                    
-                    self._cache[broker_name] = orders
-                    logger.debug(f"OrderCache: Updated {broker_name} with {len(orders)} orders (refresh_interval={self.refresh_interval}s)")
+                    push_seq = self._push_seq
+                    orders = await self.order_manager.get_broker_order_details(broker_name)
+                    self._store(broker_name, orders, pushed_after=push_seq)
+                    logger.debug(f"OrderCache: Updated {broker_name} with {len(orders)} orders (interval={self._poll_interval(broker_name)}s)")
                 except Exception as e:
                     logger.error(f"OrderCache failed to update for {broker_name}: {e}")
                 finally:
                     event.set()  # Signal update complete
                     event.clear()
-            await asyncio.sleep(self.refresh_interval)
 
-    async def get_orders(self, broker_name: str) -> List[dict]:
+    def _store(self, broker_name: str, orders: List[dict], pushed_after: Optional[int] = None):
+        """
+        Replace a broker's cached orders and their order-id index, logging status changes.
+        Orders pushed after push sequence pushed_after are newer than the fetched order book,
+        so their pushed version is kept.
+        """
+        old_orders = self._index.get(broker_name)
+        pushed = self._pushed.get(broker_name, {})
+        if pushed_after is not None and pushed:
+            pushed = {order_id: seq for order_id, seq in pushed.items() if seq > pushed_after}
+        else:
+            pushed = {}
+        self._pushed[broker_name] = pushed
+        # Merged into a new list: the caller's order list is left as it was
+        merged = []
+        new_orders = {}
+        positions = {}
+        for order in orders:
+            order_id = order.get('order_id') or order.get('id')
+            if order_id is not None:
+                order_id = str(order_id)
+                if order_id in pushed and old_orders and order_id in old_orders:
+                    order = old_orders[order_id]
+                if order_id not in new_orders:
+                    new_orders[order_id] = order
+                    positions[order_id] = len(merged)
+            merged.append(order)
+        for order_id in pushed:
+            if order_id not in new_orders and old_orders and order_id in old_orders:
+                # Pushed after the order book was downloaded
+                positions[order_id] = len(merged)
+                merged.append(old_orders[order_id])
+                new_orders[order_id] = old_orders[order_id]
+
+        # Log status changes for active orders
+        if old_orders is not None:
+            for order_id, new_order in new_orders.items():
+                old_order = old_orders.get(order_id)
+                if old_order is not None:
+                    old_status = old_order.get('status')
+                    new_status = new_order.get('status')
+                    if old_status != new_status:
+                        logger.info(f"OrderCache: Status change detected for {broker_name} order {order_id}: {old_status} → {new_status}")
+
+        self._cache[broker_name] = merged
+        self._index[broker_name] = new_orders
+        self._positions[broker_name] = positions
+
+    def apply_order_update(self, broker_name: str, order: dict) -> bool:
+        """
+        Apply one pushed, normalized order to the cache in place (replacing the cached order
+        with the same order id, or appending it). Returns True if the order is new or its
+        status, executed quantity or execution price changed.
+        """
+        order_id = order.get('order_id') or order.get('id')
+        if order_id is None:
+            return False
+        order_id = str(order_id)
+        orders = self._cache.setdefault(broker_name, [])
+        index = self._index.setdefault(broker_name, {})
+        positions = self._positions.setdefault(broker_name, {})
+        old_order = index.get(order_id)
+        position = positions.get(order_id)
+        if position is not None and position < len(orders) and orders[position] is old_order:
+            orders[position] = order
+        else:
+            positions[order_id] = len(orders)
+            orders.append(order)
+        index[order_id] = order
+        self._push_seq += 1
+        self._pushed.setdefault(broker_name, {})[order_id] = self._push_seq
+
+        if old_order is None:
+            logger.info(f"OrderCache: New {broker_name} order {order_id} pushed with status {order.get('status')}")
+            return True
+        if old_order.get('status') != order.get('status'):
+            logger.info(f"OrderCache: Status change pushed for {broker_name} order {order_id}: {old_order.get('status')} → {order.get('status')}")
+        return any(old_order.get(key) != order.get(key) for key in ('status', 'executed_quantity', 'exec_price'))
+
+    async def _wait_for_refresh(self, broker_name: str):
         lock = self._locks.get(broker_name)
         event = self._update_events.get(broker_name)
         if lock is None or event is None:
             logger.error(f"OrderCache not started or broker {broker_name} not enabled.")
             raise RuntimeError(f"OrderCache not started or broker {broker_name} not enabled.")
+        # Wait if update in progress
+        while lock.locked():
+            await event.wait()
+
+    async def get_orders(self, broker_name: str) -> List[dict]:
+        await self._wait_for_refresh(broker_name)
         try:
-            # Wait if update in progress
-            while lock.locked():
-                await event.wait()
             return self._cache.get(broker_name, [])
         except Exception as e:
             logger.error(f"OrderCache.get_orders failed for {broker_name}: {e}")
@@ -88,13 +189,8 @@ class OrderCache:
 
     async def get_order_by_id(self, broker_name: str, order_id: Any) -> Optional[dict]:
         try:
-            orders = await self.get_orders(broker_name)
-            # For Fyers BO orders, try with '-BO-1' suffix if not found
-            for order in orders:
-                broker_order_id = order.get("order_id") or order.get("id")
-                if broker_order_id is not None and str(broker_order_id) == str(order_id):
-                    return order
-            return None
+            await self._wait_for_refresh(broker_name)
+            return self._index.get(broker_name, {}).get(str(order_id))
         except RuntimeError as re:
             logger.error(f"OrderCache.get_order_by_id RuntimeError for {broker_name}, order_id {order_id}: {re}")
             return None
@@ -0,0 +1,326 @@
+"""
+Push-based order status updates from broker order-update websockets.
+
+Each broker with an order-update channel gets a feed (Fyers through the SDK's order socket,
+Zerodha through the Kite websocket's "order" messages). OrderEventStream consumes the feeds,
+normalizes every update with the same status maps as the order-book poll, applies it to
+OrderCache in place and wakes the OrderMonitorScheduler for the affected orders, so a fill
+or SL hit is acted on immediately. While a broker's feed is connected, OrderCache only polls
+that broker's order book every reconcile_interval to catch anything the stream missed.
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode
+
+import aiohttp
+
+from algosat.common.logger import get_logger
+from algosat.core.order_cache import OrderCache
+from algosat.core.order_manager import OrderManager
+
+logger = get_logger("OrderEventStream")
+
+KITE_WEBSOCKET_URL = "wss://ws.kite.trade"
+
+# Order id field of each broker's raw order dicts (Fyers, Zerodha, Angel)
+ORDER_ID_FIELDS = ("id", "order_id", "orderid")
+
+# Number of recent event latencies kept for average/max stats
+LATENCY_WINDOW = 200
+
+
+def extract_order_updates(message: Any) -> List[dict]:
+    """
+    Raw order dicts in one order-update message. Accepts Fyers order-socket messages
+    ({"s": "ok", "orders": {...}}), Kite websocket messages ({"type": "order", "data": {...}}),
+    a bare order dict or a list of them. Anything else (acks, heartbeats, errors) yields [].
+    """
+    if isinstance(message, (str, bytes)):
+        try:
+            message = json.loads(message)
+        except (ValueError, UnicodeDecodeError):
+            return []
+    if isinstance(message, list):
+        return [order for order in message if isinstance(order, dict)]
+    if not isinstance(message, dict):
+        return []
+    if "orders" in message:
+        orders = message["orders"]
+    elif "data" in message and isinstance(message.get("type"), str):
+        orders = message["data"] if message["type"] == "order" else None
+    elif any(key in message for key in ORDER_ID_FIELDS):
+        orders = message
+    else:
+        orders = None
+    if isinstance(orders, dict):
+        return [orders] if orders else []
+    if isinstance(orders, list):
+        return [order for order in orders if isinstance(order, dict)]
+    return []
+
+
+class OrderUpdateFeed:
+    """A connection to one broker's order-update channel."""
+
+    broker_name: str = ""
+
+    async def connect(self) -> None:
+        raise NotImplementedError
+
+    async def receive(self) -> Optional[Any]:
+        """Next raw message, or None once the connection is closed."""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class WebSocketOrderFeed(OrderUpdateFeed):
+    """
+    Order updates read from a plain websocket that sends JSON text frames. Binary frames
+    (Kite market-data ticks) are skipped.
+    """
+
+    def __init__(self, broker_name: str, url: str, heartbeat: float = 30.0):
+        self.broker_name = broker_name
+        self.url = url
+        self.heartbeat = heartbeat
+        self._session = None
+        self._ws = None
+
+    async def connect(self) -> None:
+        await self.close()
+        self._session = aiohttp.ClientSession()
+        try:
+            self._ws = await self._session.ws_connect(self.url, heartbeat=self.heartbeat)
+        except Exception:
+            await self.close()
+            raise
+
+    async def receive(self) -> Optional[Any]:
+        if self._ws is None:
+            return None
+        while True:
+            msg = await self._ws.receive()
+            if msg.type == aiohttp.WSMsgType.TEXT:
+                return msg.data
+            if msg.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSING, aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                return None
+
+    async def close(self) -> None:
+        if self._ws is not None:
+            await self._ws.close()
+            self._ws = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class FyersOrderFeed(OrderUpdateFeed):
+    """
+    Fyers order updates from FyersWrapper's order socket. The SDK calls back on its own
+    thread, so messages are handed to the event loop through a queue.
+    """
+
+    broker_name = "fyers"
+
+    def __init__(self, fyers_wrapper):
+        self.fyers_wrapper = fyers_wrapper
+        self._queue: Optional[asyncio.Queue] = None
+
+    async def connect(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._queue = asyncio.Queue()
+        connected = asyncio.Event()
+
+        def on_orders(message):
+            loop.call_soon_threadsafe(queue.put_nowait, message)
+
+        def on_error(message):
+            logger.error(f"OrderEventStream: Fyers order socket error: {message}")
+
+        def on_close(message):
+            logger.info(f"OrderEventStream: Fyers order socket closed: {message}")
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+
+        def on_connect():
+            self.fyers_wrapper.subscribe_order_updates()
+            loop.call_soon_threadsafe(connected.set)
+
+        self.fyers_wrapper.init_order_websocket(
+            on_connect=on_connect, on_close=on_close, on_error=on_error, on_orders=on_orders
+        )
+        await loop.run_in_executor(None, self.fyers_wrapper.connect_order_websocket)
+        await asyncio.wait_for(connected.wait(), timeout=30)
+
+    async def receive(self) -> Optional[Any]:
+        if self._queue is None:
+            return None
+        return await self._queue.get()
+
+    async def close(self) -> None:
+        try:
+            self.fyers_wrapper.close_order_websocket()
+        except Exception as e:
+            logger.debug(f"OrderEventStream: Closing Fyers order socket failed: {e}")
+        self._queue = None
+
+
+async def build_order_feeds(broker_manager) -> List[OrderUpdateFeed]:
+    """Order-update feeds for the trade-enabled, authenticated brokers that push order updates."""
+    feeds = []
+    brokers = await broker_manager.get_all_trade_enabled_brokers()
+    for broker_name, broker in brokers.items():
+        if broker is None:
+            continue
+        if broker_name == "fyers" and getattr(broker, "token", None):
+            feeds.append(FyersOrderFeed(broker))
+        elif broker_name == "zerodha" and getattr(broker, "kite", None) and getattr(broker, "access_token", None):
+            query = urlencode({"api_key": broker.kite.api_key, "access_token": broker.access_token})
+            feeds.append(WebSocketOrderFeed(broker_name, f"{KITE_WEBSOCKET_URL}?{query}"))
+    return feeds
+
+
+class OrderEventStream:
+    """Consumes order-update feeds and pushes their updates into OrderCache and the monitors."""
+
+    def __init__(
+        self,
+        order_manager: OrderManager,
+        order_cache: OrderCache,
+        scheduler=None,  # Optional OrderMonitorScheduler whose monitors are woken on updates
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 60.0,
+    ):
+        self.order_manager = order_manager
+        self.order_cache = order_cache
+        self.scheduler = scheduler
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._feeds: Dict[str, OrderUpdateFeed] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._connected = set()
+        self._running = False
+        # Stats
+        self._events = 0
+        self._changed = 0
+        self._woken = 0
+        self._reconnects = 0
+        self._apply_latency = deque(maxlen=LATENCY_WINDOW)
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def add_feed(self, feed: OrderUpdateFeed) -> None:
+        """Add a broker's feed; while stopped, a newer feed replaces the broker's previous one."""
+        if self._running and feed.broker_name in self._feeds:
+            return
+        self._feeds[feed.broker_name] = feed
+        if self._running and feed.broker_name not in self._tasks:
+            self._tasks[feed.broker_name] = asyncio.create_task(self._run_feed(feed))
+
+    def is_connected(self, broker_name: str) -> bool:
+        return broker_name in self._connected
+
+    async def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        for broker_name, feed in self._feeds.items():
+            self._tasks[broker_name] = asyncio.create_task(self._run_feed(feed))
+        logger.info(f"OrderEventStream: Started for {sorted(self._feeds)}")
+
+    async def stop(self) -> None:
+        """
+        Stop every feed and forget them: feeds carry the credentials they were built with,
+        so they are rebuilt (with the day's fresh tokens) before the next start().
+        """
+        self._running = False
+        for task in self._tasks.values():
+            task.cancel()
+        for task in self._tasks.values():
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks.clear()
+        self._feeds.clear()
+
+    async def _run_feed(self, feed: OrderUpdateFeed) -> None:
+        broker_name = feed.broker_name
+        delay = self.reconnect_delay
+        while self._running:
+            try:
+                await feed.connect()
+                self._connected.add(broker_name)
+                self.order_cache.set_push_mode(broker_name, True)
+                logger.info(f"OrderEventStream: {broker_name} order stream connected")
+                delay = self.reconnect_delay
+                while self._running:
+                    message = await feed.receive()
+                    if message is None:
+                        break
+                    await self.handle_message(broker_name, message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"OrderEventStream: {broker_name} order stream failed: {e}")
+            finally:
+                if broker_name in self._connected:
+                    self._connected.discard(broker_name)
+                    # Fall back to regular polling until the stream is back
+                    self.order_cache.set_push_mode(broker_name, False)
+                try:
+                    await feed.close()
+                except Exception as e:
+                    logger.debug(f"OrderEventStream: Closing {broker_name} feed failed: {e}")
+            if not self._running:
+                break
+            self._reconnects += 1
+            logger.info(f"OrderEventStream: Reconnecting {broker_name} order stream in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def handle_message(self, broker_name: str, message: Any) -> int:
+        """
+        Normalize and apply the orders in one message. Returns the number of monitored orders
+        woken because their broker order changed.
+        """
+        started = time.perf_counter()
+        changed_ids = []
+        for raw_order in extract_order_updates(message):
+            self._events += 1
+            try:
+                order = await self.order_manager.normalize_order_update(broker_name, raw_order)
+            except Exception as e:
+                logger.error(f"OrderEventStream: Could not normalize {broker_name} order update {raw_order}: {e}")
+                continue
+            if self.order_cache.apply_order_update(broker_name, order):
+                changed_ids.append(order.get("order_id"))
+        woken = 0
+        if changed_ids:
+            self._changed += len(changed_ids)
+            if self.scheduler is not None:
+                woken = self.scheduler.wake(changed_ids)
+                self._woken += woken
+            self._apply_latency.append((time.perf_counter() - started) * 1000)
+            logger.debug(f"OrderEventStream: {broker_name} orders {changed_ids} changed, woke {woken} monitors")
+        return woken
+
+    def get_stats(self) -> Dict[str, Any]:
+        latencies = list(self._apply_latency)
+        return {
+            "feeds": sorted(self._feeds),
+            "connected": sorted(self._connected),
+            "events": self._events,
+            "changed": self._changed,
+            "woken": self._woken,
+            "reconnects": self._reconnects,
+            "avg_apply_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            "max_apply_ms": round(max(latencies), 2) if latencies else 0.0,
+        }
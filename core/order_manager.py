@@ -114,11 +114,23 @@ ANGEL_STATUS_MAP = {
     "filled": OrderStatus.FILLED
 }
 
+# Raw order-book fields per broker: the order id, and the fields whose change means the
+# order has to be normalized again (status, filled quantity, average price)
+ORDER_BOOK_CHANGE_FIELDS = {
+    "fyers": ("id", ("status", "filledQty", "tradedPrice")),
+    "zerodha": ("order_id", ("status", "filled_quantity", "average_price")),
+    "angel": ("orderid", ("status", "filledshares", "averageprice")),
+}
+
 class OrderManager:
     def __init__(self, broker_manager: BrokerManager):
         self.broker_manager: BrokerManager = broker_manager
         # Initialize data_manager lazily for broker name lookups
         self._data_manager = None
+        # broker_name -> {order_id: (change fingerprint, normalized order)} from the last order-book fetch
+        self._order_book_snapshots: Dict[str, Dict[str, tuple]] = {}
+        self._broker_id_cache: Dict[str, int] = {}
+        self._normalize_stats = {"normalized": 0, "reused": 0}
 
     async def _get_data_manager(self):
         """Get or create DataManager instance for internal operations."""
@@ -761,10 +773,11 @@ class OrderManager:
             logger.info(f"OrderManager: Inserted new EXIT broker_execution for parent_order_id={parent_order_id}, broker_id={broker_id}, broker_order_id={broker_order_id}, exit_broker_order_id={exit_broker_order_id}")
 
 
-    async def exit_all_orders(self, exit_reason: str = None, strategy_id: int = None, check_live_status: bool = False, broker_ids_filter: List[int] = None, broker_names_filter: List[str] = None):
+    async def exit_all_orders(self, exit_reason: str = None, strategy_id: int = None, check_live_status: bool = False, broker_ids_filter: List[int] = None, broker_names_filter: List[str] = None, bulk: bool = False):
         """
         Exit all open orders by querying the orders table for orders with open statuses
-        and calling exit_order for each of them.
+        and calling exit_order for each of them. With bulk=True the orders are flattened
+        together by BulkExitEngine (one snapshot, concurrent broker calls, one batched write).
         
         Args:
             exit_reason: Optional reason for exiting all orders
@@ -775,6 +788,7 @@ class OrderManager:
                              broker executions from these brokers will be exited.
             broker_names_filter: Optional list of broker names to filter by. If provided, only 
                                broker executions from these brokers will be exited.
+            bulk: If True, exit through BulkExitEngine and return its BulkExitReport.
         """
         from algosat.core.db import AsyncSessionLocal, get_orders_by_strategy_id
         from algosat.core.dbschema import orders
@@ -809,6 +823,15 @@ class OrderManager:
             filter_description = f" (filtered to broker_ids: {final_broker_ids_filter})" if final_broker_ids_filter else ""
             logger.info(f"OrderManager: Exit orders with broker filter{filter_description}")
         
+        if bulk:
+            from algosat.core.bulk_exit import BulkExitEngine
+            return await BulkExitEngine(self).run(
+                exit_reason=exit_reason,
+                strategy_id=strategy_id,
+                check_live_status=check_live_status,
+                broker_ids_filter=final_broker_ids_filter
+            )
+        
         # Define open order statuses
         open_statuses = [
             "OPEN",
@@ -1152,143 +1175,196 @@ class OrderManager:
         Returns a dict: broker_name -> list of normalized order dicts (empty list if no orders).
         Assumes broker_manager.get_all_broker_order_details() returns a list of orders per broker.
         """
-        # Mock data for testing (only on Aug 9, 2025) with comprehensive broker order data from logs
-        from datetime import datetime, date
         broker_orders_raw = await self.broker_manager.get_all_broker_order_details()
         normalized_orders_by_broker = {}
-        broker_name_to_id = {}
-        async def get_broker_id_cached(broker_name):
-            if broker_name in broker_name_to_id:
-                return broker_name_to_id[broker_name]
-            broker_id = await self._get_broker_id(broker_name)
-            broker_name_to_id[broker_name] = broker_id
-            return broker_id
         for broker_name, orders in broker_orders_raw.items():
-            broker_id = await get_broker_id_cached(broker_name)
-            normalized_orders = []
             if not isinstance(orders, list):
                 # Defensive: if not a list, skip
                 continue
-            for o in orders:
-                # Fyers normalization
-                if broker_name.lower() == "fyers":
-                    status = FYERS_STATUS_MAP.get(o.get("status"), str(o.get("status")))
-                    order_type = FYERS_ORDER_TYPE_MAP.get(o.get("order_type"), o.get("type"))
-                    
-                    # Extract execution time from Fyers orderDateTime field
+            broker_id = await self._get_broker_id_cached(broker_name)
+            normalized_orders_by_broker[broker_name] = self._normalize_order_book(broker_name, broker_id, orders)
+        return normalized_orders_by_broker
+
+    async def get_broker_order_details(self, broker_name: str) -> List[dict]:
+        """
+        Fetch and normalize one broker's order book (see get_all_broker_order_details).
+        Concurrent callers for the same broker share a single download in BrokerManager.
+        """
+        orders = await self.broker_manager.get_broker_order_details(broker_name)
+        if not isinstance(orders, list):
+            return []
+        broker_id = await self._get_broker_id_cached(broker_name)
+        return self._normalize_order_book(broker_name, broker_id, orders)
+
+    async def _get_broker_id_cached(self, broker_name):
+        if broker_name not in self._broker_id_cache:
+            broker_id = await self._get_broker_id(broker_name)
+            if broker_id is None:
+                return None
+            self._broker_id_cache[broker_name] = broker_id
+        return self._broker_id_cache[broker_name]
+
+    def _normalize_order_book(self, broker_name: str, broker_id, orders: list) -> List[dict]:
+        """
+        Normalize a raw order book. An order whose status, filled quantity and average price
+        are unchanged since the previous fetch reuses its previous normalized dict, so each
+        refresh only parses the orders that moved.
+        """
+        id_field, change_fields = ORDER_BOOK_CHANGE_FIELDS.get(broker_name.lower(), (None, ()))
+        previous = self._order_book_snapshots.get(broker_name, {})
+        snapshot = {}
+        normalized_orders = []
+        for o in orders:
+            order_id = o.get(id_field) if id_field else None
+            if order_id is None:
+                normalized_orders.append(self._normalize_broker_order(broker_name, broker_id, o))
+                self._normalize_stats["normalized"] += 1
+                continue
+            fingerprint = (broker_id,) + tuple(o.get(field) for field in change_fields)
+            cached = previous.get(order_id)
+            if cached is not None and cached[0] == fingerprint:
+                normalized = cached[1]
+                self._normalize_stats["reused"] += 1
+            else:
+                normalized = self._normalize_broker_order(broker_name, broker_id, o)
+                self._normalize_stats["normalized"] += 1
+            snapshot[order_id] = (fingerprint, normalized)
+            normalized_orders.append(normalized)
+        self._order_book_snapshots[broker_name] = snapshot
+        return normalized_orders
+
+    async def normalize_order_update(self, broker_name: str, o: dict) -> dict:
+        """
+        Normalize a single pushed order update (order-update websocket) the same way as an
+        order-book entry, and record it in the order-book snapshot so the next reconciliation
+        poll reuses it instead of normalizing the order again.
+        """
+        broker_id = await self._get_broker_id_cached(broker_name)
+        normalized = self._normalize_broker_order(broker_name, broker_id, o)
+        self._normalize_stats["normalized"] += 1
+        id_field, change_fields = ORDER_BOOK_CHANGE_FIELDS.get(broker_name.lower(), (None, ()))
+        order_id = o.get(id_field) if id_field else None
+        if order_id is not None:
+            fingerprint = (broker_id,) + tuple(o.get(field) for field in change_fields)
+            self._order_book_snapshots.setdefault(broker_name, {})[order_id] = (fingerprint, normalized)
+        return normalized
+
+    def _normalize_broker_order(self, broker_name: str, broker_id, o: dict) -> dict:
+        """Broker-specific order-book entry -> normalized order dict."""
+        broker = broker_name.lower()
+        # Fyers normalization
+        if broker == "fyers":
+            status = FYERS_STATUS_MAP.get(o.get("status"), str(o.get("status")))
+            order_type = FYERS_ORDER_TYPE_MAP.get(o.get("order_type"), o.get("type"))
+
+            # Extract execution time from Fyers orderDateTime field
+            execution_time = None
+            if o.get("orderDateTime"):
+                try:
+                    execution_time = datetime.strptime(o.get("orderDateTime"), "%d-%b-%Y %H:%M:%S")
+                except (ValueError, TypeError):
                     execution_time = None
-                    if o.get("orderDateTime"):
-                        try:
-                            from datetime import datetime
-                            execution_time = datetime.strptime(o.get("orderDateTime"), "%d-%b-%Y %H:%M:%S")
-                        except (ValueError, TypeError):
-                            execution_time = None
-                    
-                    # Extract parent_id for BO orders from the order ID
-                    normalized_orders.append({
-                        "broker_name": broker_name,
-                        "broker_id": broker_id,
-                        "order_id": o.get("id"),  # Fyers uses 'id' field in raw data
-                        "status": status,
-                        "symbol": o.get("symbol"),
-                        "qty": o.get("qty", 0),
-                        "executed_quantity": o.get("filledQty", 0),  # Fyers uses 'filledQty' in raw data
-                        "exec_price": o.get("tradedPrice", 0),  # Fyers uses 'tradedPrice' in raw data
-                        "product_type": o.get("productType"),  # Fyers uses 'productType' in raw data
-                        "order_type": order_type,
-                        "execution_time": execution_time,
-                        "side": "BUY" if o.get("side") ==1 else "SELL",
-                        "parent_id": o.get("parentId"),  # Add parentId for BO order tracking
-                        # "raw": o
-                    })
-                # Zerodha normalization
-                elif broker_name.lower() == "zerodha":
-                    status = ZERODHA_STATUS_MAP.get(o.get("status"), o.get("status"))
-                    
-                    # Extract execution time from Zerodha time fields (prefer exchange_timestamp)
+
+            # Extract parent_id for BO orders from the order ID
+            return {
+                "broker_name": broker_name,
+                "broker_id": broker_id,
+                "order_id": o.get("id"),  # Fyers uses 'id' field in raw data
+                "status": status,
+                "symbol": o.get("symbol"),
+                "qty": o.get("qty", 0),
+                "executed_quantity": o.get("filledQty", 0),  # Fyers uses 'filledQty' in raw data
+                "exec_price": o.get("tradedPrice", 0),  # Fyers uses 'tradedPrice' in raw data
+                "product_type": o.get("productType"),  # Fyers uses 'productType' in raw data
+                "order_type": order_type,
+                "execution_time": execution_time,
+                "side": "BUY" if o.get("side") ==1 else "SELL",
+                "parent_id": o.get("parentId"),  # Add parentId for BO order tracking
+                # "raw": o
+            }
+        # Zerodha normalization
+        elif broker == "zerodha":
+            status = ZERODHA_STATUS_MAP.get(o.get("status"), o.get("status"))
+
+            # Extract execution time from Zerodha time fields (prefer exchange_timestamp)
+            execution_time = None
+            if o.get("exchange_timestamp"):
+                execution_time = o.get("exchange_timestamp")
+            elif o.get("order_timestamp"):
+                execution_time = o.get("order_timestamp")
+            elif o.get("exchange_update_timestamp"):
+                # Convert string timestamp to datetime if needed
+                try:
+                    if isinstance(o.get("exchange_update_timestamp"), str):
+                        execution_time = datetime.strptime(o.get("exchange_update_timestamp"), "%Y-%m-%d %H:%M:%S")
+                    else:
+                        execution_time = o.get("exchange_update_timestamp")
+                except (ValueError, TypeError):
                     execution_time = None
-                    if o.get("exchange_timestamp"):
-                        execution_time = o.get("exchange_timestamp")
-                    elif o.get("order_timestamp"):
-                        execution_time = o.get("order_timestamp")
-                    elif o.get("exchange_update_timestamp"):
-                        # Convert string timestamp to datetime if needed
-                        try:
-                            from datetime import datetime
-                            if isinstance(o.get("exchange_update_timestamp"), str):
-                                execution_time = datetime.strptime(o.get("exchange_update_timestamp"), "%Y-%m-%d %H:%M:%S")
-                            else:
-                                execution_time = o.get("exchange_update_timestamp")
-                        except (ValueError, TypeError):
-                            execution_time = None
-                    
-                    normalized_orders.append({
-                        "broker_name": broker_name,
-                        "broker_id": broker_id,
-                        "order_id": o.get("order_id"),
-                        "status": status,
-                        "symbol": o.get("tradingsymbol"),
-                        "quantity": o.get("quantity", 0),
-                        "executed_quantity": o.get("filled_quantity", 0),
-                        "exec_price": o.get("average_price", 0),
-                        "product_type": o.get("product"),
-                        "order_type": o.get("order_type"),
-                        "execution_time": execution_time,
-                        "side": "BUY" if o.get("transaction_type") == "BUY" else "SELL",
-                        # "raw": o
-                    })
-                # Angel One normalization
-                elif broker_name.lower() == "angel":
-                    status = ANGEL_STATUS_MAP.get(o.get("status", "").lower(), o.get("status"))
-                    order_type = ANGEL_ORDER_TYPE_MAP.get(o.get("ordertype"), o.get("ordertype"))
-                    product_type = ANGEL_PRODUCT_TYPE_MAP.get(o.get("producttype"), o.get("producttype"))
-                    side = ANGEL_TRANSACTION_TYPE_MAP.get(o.get("transactiontype"), o.get("transactiontype"))
-                    
-                    # Extract execution time from Angel time fields
+
+            return {
+                "broker_name": broker_name,
+                "broker_id": broker_id,
+                "order_id": o.get("order_id"),
+                "status": status,
+                "symbol": o.get("tradingsymbol"),
+                "quantity": o.get("quantity", 0),
+                "executed_quantity": o.get("filled_quantity", 0),
+                "exec_price": o.get("average_price", 0),
+                "product_type": o.get("product"),
+                "order_type": o.get("order_type"),
+                "execution_time": execution_time,
+                "side": "BUY" if o.get("transaction_type") == "BUY" else "SELL",
+                # "raw": o
+            }
+        # Angel One normalization
+        elif broker == "angel":
+            status = ANGEL_STATUS_MAP.get(o.get("status", "").lower(), o.get("status"))
+            order_type = ANGEL_ORDER_TYPE_MAP.get(o.get("ordertype"), o.get("ordertype"))
+            product_type = ANGEL_PRODUCT_TYPE_MAP.get(o.get("producttype"), o.get("producttype"))
+            side = ANGEL_TRANSACTION_TYPE_MAP.get(o.get("transactiontype"), o.get("transactiontype"))
+
+            # Extract execution time from Angel time fields
+            execution_time = None
+            if o.get("exchtime"):
+                try:
+                    # Angel time format: "20-Oct-2020 13:10:59"
+                    execution_time = datetime.strptime(o.get("exchtime"), "%d-%b-%Y %H:%M:%S")
+                except (ValueError, TypeError):
                     execution_time = None
-                    if o.get("exchtime"):
-                        try:
-                            from datetime import datetime
-                            # Angel time format: "20-Oct-2020 13:10:59"
-                            execution_time = datetime.strptime(o.get("exchtime"), "%d-%b-%Y %H:%M:%S")
-                        except (ValueError, TypeError):
-                            execution_time = None
-                    elif o.get("updatetime"):
-                        try:
-                            from datetime import datetime
-                            execution_time = datetime.strptime(o.get("updatetime"), "%d-%b-%Y %H:%M:%S")
-                        except (ValueError, TypeError):
-                            execution_time = None
-                    
-                    normalized_orders.append({
-                        "broker_name": broker_name,
-                        "broker_id": broker_id,
-                        "order_id": o.get("orderid"),
-                        "status": status,
-                        "symbol": o.get("tradingsymbol"),
-                        "quantity": int(o.get("quantity", 0)),
-                        "executed_quantity": int(o.get("filledshares", 0)),
-                        "exec_price": float(o.get("averageprice", 0)),
-                        "product_type": product_type,
-                        "order_type": order_type,
-                        "execution_time": execution_time,
-                        "side": side,
-                        "exchange_order_id": o.get("exchangeorderid"),
-                        "unique_order_id": o.get("uniqueorderid"),
-                        # "raw": o
-                    })
-                # Fallback normalization for other brokers
-                else:
-                    normalized_orders.append({
-                        "broker_name": broker_name,
-                        "broker_id": broker_id,
-                        "order_id": o.get("order_id") or o.get("id"),
-                        "status": o.get("status"),
-                        "symbol": o.get("symbol") or o.get("tradingsymbol"),
-                        "raw": o
-                    })
-            normalized_orders_by_broker[broker_name] = normalized_orders
-        return normalized_orders_by_broker
+            elif o.get("updatetime"):
+                try:
+                    execution_time = datetime.strptime(o.get("updatetime"), "%d-%b-%Y %H:%M:%S")
+                except (ValueError, TypeError):
+                    execution_time = None
+
+            return {
+                "broker_name": broker_name,
+                "broker_id": broker_id,
+                "order_id": o.get("orderid"),
+                "status": status,
+                "symbol": o.get("tradingsymbol"),
+                "quantity": int(o.get("quantity", 0)),
+                "executed_quantity": int(o.get("filledshares", 0)),
+                "exec_price": float(o.get("averageprice", 0)),
+                "product_type": product_type,
+                "order_type": order_type,
+                "execution_time": execution_time,
+                "side": side,
+                "exchange_order_id": o.get("exchangeorderid"),
+                "unique_order_id": o.get("uniqueorderid"),
+                # "raw": o
+            }
+        # Fallback normalization for other brokers
+        else:
+            return {
+                "broker_name": broker_name,
+                "broker_id": broker_id,
+                "order_id": o.get("order_id") or o.get("id"),
+                "status": o.get("status"),
+                "symbol": o.get("symbol") or o.get("tradingsymbol"),
+                "raw": o
+            }
     
     async def update_broker_executions_batch(
         self,
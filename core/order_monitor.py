@@ -1,10 +1,13 @@
 from __future__ import annotations
 from algosat.utils.telegram_notify import telegram_bot, send_telegram_async
-from typing import Optional, Any
+from typing import Optional, Any, List
+from dataclasses import dataclass, field
 import asyncio
 import time
 from datetime import datetime, timezone
-from algosat.core.time_utils import localize_to_ist
+from algosat.core.time_utils import localize_to_ist, get_ist_datetime
+from algosat.core.monitoring import trading_metrics
+from algosat.core.tracing import root_span
 from algosat.common.logger import get_logger, set_strategy_context
 from algosat.models.order_aggregate import OrderAggregate
 
@@ -19,6 +22,26 @@ logger = get_logger("OrderMonitor")
 # Order monitoring interval - used by both OrderMonitor and OrderCache for consistency
 DEFAULT_ORDER_MONITOR_INTERVAL = 30.0  # seconds
 
+# How long the static strategy_symbol/strategy_config/strategy rows for an order are reused
+# across order row refreshes before being re-read from the database
+STRATEGY_META_TTL_SECONDS = 300
+
+
+@dataclass
+class OrderTickSnapshot:
+    """
+    Per-order slice of an OrderMonitorScheduler tick: the order row and broker_executions
+    bulk-loaded once for all monitored orders, plus the batch-fetched LTP.
+    The order/executions parts are marked stale as soon as the monitor writes to them.
+    """
+    order: Optional[dict]
+    executions: List[dict] = field(default_factory=list)
+    ltp: Optional[float] = None
+    trade_enabled_brokers: Optional[int] = None
+    order_stale: bool = False
+    executions_stale: bool = False
+
+
 class OrderMonitor:
     def __init__(
         self,
@@ -29,7 +52,8 @@ class OrderMonitor:
         strategy_instance=None,  # strategy instance for shared usage
         strategy_id: int = None,  # Optional: pass strategy_id directly for efficiency
         price_order_monitor_seconds: float = DEFAULT_ORDER_MONITOR_INTERVAL,  # Default 30s interval
-        signal_monitor_seconds: int = None  # will be set from strategy config
+        signal_monitor_seconds: int = None,  # will be set from strategy config
+        scheduler=None  # Optional OrderMonitorScheduler that drives price ticks in batch
     ):
         self.order_id: int = order_id
         self.data_manager: DataManager = data_manager
@@ -51,6 +75,15 @@ class OrderMonitor:
         # Broker name cache: broker_id -> broker_name (long-lived cache since broker names rarely change)
         self._broker_name_cache = {}
         self._broker_name_cache_time = {}
+        # Static (strategy_symbol, strategy_config, strategy) rows, reused across order row refreshes
+        self._strategy_meta = None
+        self._strategy_meta_time = 0.0
+        # Batched price ticks: scheduler, current tick snapshot and re-run request
+        self.scheduler = scheduler
+        self._tick_snapshot: Optional[OrderTickSnapshot] = None
+        self._rerun_immediately: bool = False
+        self._strategy_context: Optional[str] = None
+        self._stopped = asyncio.Event()
         # self._db_session = None  # Will be set when needed
 
     def get_strategy_instance(self):
@@ -101,6 +134,8 @@ class OrderMonitor:
         if self.order_id in self._order_strategy_cache:
             del self._order_strategy_cache[self.order_id]
             logger.debug(f"OrderMonitor: Cleared order cache for order_id={self.order_id}. Reason: {reason}")
+        # The order row may have changed, so the scheduler's copy for this tick is no longer valid
+        self._invalidate_snapshot(order=True)
             
         # Reset hedge detection so it can be re-evaluated with fresh data
         if hasattr(self, '_hedge_detection_done'):
@@ -173,6 +208,19 @@ class OrderMonitor:
                     self.is_hedge = False
                 self._hedge_detection_done = True
             return self._order_strategy_cache[order_id]
+        # Only the order row changes between refreshes; reuse the strategy rows while they are fresh
+        if (
+            order_id == self.order_id
+            and self._strategy_meta is not None
+            and time.time() - self._strategy_meta_time < STRATEGY_META_TTL_SECONDS
+        ):
+            order = await self._load_order_row()
+            if order is not None and order.get('strategy_symbol_id') == self._strategy_meta[0].get('id'):
+                if not hasattr(self, '_hedge_detection_done'):
+                    self.is_hedge = bool(order.get('parent_order_id'))
+                    self._hedge_detection_done = True
+                self._order_strategy_cache[order_id] = (order, *self._strategy_meta)
+                return self._order_strategy_cache[order_id]
         # Lazy-load session if not present
         from algosat.core.db import AsyncSessionLocal, get_order_by_id, get_strategy_symbol_by_id, get_strategy_by_id, get_strategy_config_by_id
         # Fetch order, strategy_symbol, strategy_config, and strategy in one go
@@ -216,769 +264,851 @@ class OrderMonitor:
                 return order, strategy_symbol, strategy_config, None
             strategy = await get_strategy_by_id(session, strategy_id)
             self._order_strategy_cache[order_id] = (order, strategy_symbol, strategy_config, strategy)
+            if order_id == self.order_id and strategy is not None:
+                self._strategy_meta = (strategy_symbol, strategy_config, strategy)
+                self._strategy_meta_time = time.time()
             return order, strategy_symbol, strategy_config, strategy
 
+    def _snapshot_order_row(self) -> Optional[dict]:
+        """Return the order row from the current scheduler tick, or None if absent or stale."""
+        snapshot = self._tick_snapshot
+        if snapshot is None or snapshot.order_stale or snapshot.order is None:
+            return None
+        return snapshot.order
+
+    def _snapshot_executions(self, side: str = None) -> Optional[list]:
+        """
+        Return broker_executions rows from the current scheduler tick, optionally filtered by side,
+        or None if there is no snapshot or this tick has already written to broker_executions.
+        """
+        snapshot = self._tick_snapshot
+        if snapshot is None or snapshot.executions_stale:
+            return None
+        if side:
+            return [be for be in snapshot.executions if be.get('side') == side]
+        return list(snapshot.executions)
+
+    def _invalidate_snapshot(self, order: bool = False, executions: bool = False) -> None:
+        """Mark parts of the current tick snapshot stale after this monitor wrote to them."""
+        snapshot = self._tick_snapshot
+        if snapshot is None:
+            return
+        if order:
+            snapshot.order_stale = True
+        if executions:
+            snapshot.executions_stale = True
+
+    async def _load_order_row(self) -> Optional[dict]:
+        """Fetch the order row, preferring the scheduler snapshot over a DB round trip."""
+        order = self._snapshot_order_row()
+        if order is not None:
+            return order
+        from algosat.core.db import AsyncSessionLocal, get_order_by_id
+        async with AsyncSessionLocal() as session:
+            return await get_order_by_id(session, self.order_id)
+
     async def _price_order_monitor(self) -> None:
         """
         Main loop for price-based monitoring and exit.
         Uses unified order/strategy cache and helper methods for DRYness and efficiency.
+        Only used when no OrderMonitorScheduler drives this monitor; scheduled monitors
+        run _price_order_monitor_tick from the scheduler's batched tick instead.
         """
         await self.data_manager.ensure_broker()
-        last_main_status = self._last_main_status
-        last_broker_statuses = self._last_broker_statuses
 
         while self._running:
-            # --- PRIORITY 1: Check PENDING exits FIRST before any expensive operations ---
-            # Lightweight order status check to handle exits immediately
-            try:
-                from algosat.core.db import AsyncSessionLocal, get_order_by_id
-                async with AsyncSessionLocal() as session:
-                    quick_order_check = await get_order_by_id(session, self.order_id)
-                    if quick_order_check:
-                        quick_status = quick_order_check.get('status')
-                        order_symbol = quick_order_check.get('strike_symbol', 'N/A')
-                        parent_id = quick_order_check.get('parent_order_id')
-                        
-                        # Detect hedge status from database if not already done
-                        if not hasattr(self, '_hedge_detection_done') or not self._hedge_detection_done:
-                            if parent_id:
-                                self.is_hedge = True
-                                logger.info(f"🔍 OrderMonitor: Detected hedge order {self.order_id} with parent {parent_id} (from quick check)")
-                            else:
-                                self.is_hedge = False
-                            self._hedge_detection_done = True
-                        
-                        hedge_indicator = "🛡️[HEDGE]" if self.is_hedge else "📈[MAIN]"
-                        
-                        if quick_status and quick_status.endswith('_PENDING'):
-                            logger.info(f"OrderMonitor: {hedge_indicator} 🚨 PENDING status detected immediately: {quick_status} " +
-                                       f"for order_id={self.order_id}, symbol={order_symbol}" + 
-                                       (f", parent_id={parent_id}" if parent_id else ""))
-                            
-                            # Fetch current LTP for better fallback exit_price calculation
-                            current_ltp = None
-                            try:
-                                current_ltp = await self._update_current_price_for_open_order(quick_order_check)
-                                logger.debug(f"OrderMonitor: {hedge_indicator} Fetched LTP={current_ltp} for PENDING exit processing")
-                            except Exception as e:
-                                logger.warning(f"OrderMonitor: {hedge_indicator} Failed to fetch LTP for PENDING processing: {e}")
-                            
-                            # Process PENDING exit with LTP for better fallback
-                            await self._check_and_complete_pending_exits(quick_order_check, quick_status, current_ltp)
-                            # If monitor stopped during PENDING processing, exit loop
-                            if not self._running:
-                                logger.info(f"OrderMonitor: {hedge_indicator} Monitor stopped after immediate PENDING processing for order_id={self.order_id}")
-                                return
-                            # Clear cache after PENDING processing to get fresh data
-                            await self._clear_order_cache("After immediate PENDING processing")
-            except Exception as e:
-                logger.error(f"OrderMonitor: Error in immediate PENDING check for order_id={self.order_id}: {e}")
-                # Continue with normal flow if PENDING check fails
-            
-            # --- Normal monitoring flow continues if no PENDING exit processed ---
-            try:
-                agg: OrderAggregate = await self.data_manager.get_order_aggregate(self.order_id)
-            except Exception as e:
-                logger.error(f"OrderMonitor: Error in get_order_aggregate for order_id={self.order_id}: {e}")
-                # If order is deleted, stop monitoring this order_id
-                if "not found" in str(e).lower() or "deleted" in str(e).lower():
-                    logger.info(f"OrderMonitor: Stopping monitor for order_id={self.order_id} as order is deleted.")
-                    self.stop()
-                    return
-                await asyncio.sleep(self.price_order_monitor_seconds)
-                continue
-            # Fetch order, strategy_symbol, strategy_config, and strategy in one go (cached)
-            order_row, strategy_symbol, strategy_config, strategy = await self._get_order_and_strategy(self.order_id)
-            if order_row is None:
-                logger.info(f"OrderMonitor: Stopping monitor for order_id={self.order_id} as order_row is None (order deleted).")
-                self.stop()
+            keep_running = await self._price_order_monitor_tick()
+            if not keep_running:
                 return
+            if self._rerun_immediately:
+                self._rerun_immediately = False
+                continue
+            logger.debug(f"Next check in {self.price_order_monitor_seconds} seconds...")
+            await asyncio.sleep(self.price_order_monitor_seconds)
+        hedge_indicator = "🛡️[HEDGE]" if self.is_hedge else "📈[MAIN]"
+        logger.info(f"OrderMonitor: {hedge_indicator} Stopping price monitor for order_id={self.order_id} (last status: {self._last_main_status})")
+
+    async def _price_order_monitor_tick(self, snapshot: Optional[OrderTickSnapshot] = None) -> bool:
+        """
+        Run one pass of the price/PENDING state machine for this order.
+        If a scheduler snapshot is given, the order row, broker_executions and LTP are taken
+        from the tick's bulk load instead of per-order DB queries and broker calls; any write
+        made during the pass invalidates the affected part so later reads go back to the DB.
+        Returns False once the monitor should stop.
+        """
+        self._tick_snapshot = snapshot
+        try:
+            # Scheduler ticks run outside start(), so restore this order's logging context
+            with set_strategy_context(self._strategy_context or "order_monitor"), \
+                    root_span("order_monitor.tick", order_id=self.order_id, scheduled=snapshot is not None):
+                return await self._process_price_tick()
+        finally:
+            self._tick_snapshot = None
+
+    async def _process_price_tick(self) -> bool:
+
+        # --- PRIORITY 1: Check PENDING exits FIRST before any expensive operations ---
+        # Lightweight order status check to handle exits immediately
+        try:
+            quick_order_check = await self._load_order_row()
+            if quick_order_check:
+                quick_status = quick_order_check.get('status')
+                order_symbol = quick_order_check.get('strike_symbol', 'N/A')
+                parent_id = quick_order_check.get('parent_order_id')
+                
+                # Detect hedge status from database if not already done
+                if not hasattr(self, '_hedge_detection_done') or not self._hedge_detection_done:
+                    if parent_id:
+                        self.is_hedge = True
+                        logger.info(f"🔍 OrderMonitor: Detected hedge order {self.order_id} with parent {parent_id} (from quick check)")
+                    else:
+                        self.is_hedge = False
+                    self._hedge_detection_done = True
                 
-            # Initialize last_broker_statuses from agg.broker_orders if empty (first run or after restart)
-            if not last_broker_statuses:
-                current_entry_orders = [bro for bro in agg.broker_orders if getattr(bro, 'side', None) == 'ENTRY']
-                for bro in current_entry_orders:
-                    broker_exec_id = getattr(bro, 'id', None)
-                    status = getattr(bro, 'status', None)
-                    if broker_exec_id is not None and status is not None:
-                        last_broker_statuses[broker_exec_id] = str(status)
-            if last_main_status is None and order_row and order_row.get('status') is not None:
-                last_main_status = str(order_row.get('status'))
-                self._last_main_status = last_main_status
-            # --- Time-based exit/stop logic before processing broker orders ---
-            # Get product_type and trade_config for time-based decisions
-            product_type = None
-            trade_config = None
-            if strategy:
-                product_type = strategy.get('product_type') or strategy.get('producttype')
-            if strategy_config:
-                import json
-                try:
-                    trade_param = strategy_config.get('trade')
-                    if trade_param:
-                        trade_config = json.loads(trade_param) if isinstance(trade_param, str) else trade_param
-                except Exception as e:
-                    logger.error(f"OrderMonitor: Error parsing trade config for time-based exit: {e}")
-            
-            # Time-based logic
-            from datetime import datetime, time as dt_time
-            import pytz
-            current_time = datetime.now(pytz.timezone('Asia/Kolkata'))
-            current_time_only = current_time.time()
-            
-            # HEDGE ORDER PROTECTION: Hedge orders should NOT trigger time-based exits
-            # Only main orders should handle square-off and AWAITING_ENTRY exits
-            if self.is_hedge:
-                logger.info(f"OrderMonitor: {hedge_indicator} Skipping time-based exit logic for hedge order_id={self.order_id}")
-            else:
-                logger.debug(f"OrderMonitor: {hedge_indicator} Checking time-based exit logic for main order_id={self.order_id}")
-            
-                # For non-DELIVERY orders: check square_off_time
-                if product_type and product_type.upper() != 'DELIVERY':
-                    square_off_time_str = None
-                    if trade_config:
-                        square_off_time_str = trade_config.get('square_off_time')
-                    
-                    if square_off_time_str:
-                        try:
-                            # Parse square_off_time (e.g., "15:25" -> time(15, 25))
-                            hour, minute = map(int, square_off_time_str.split(':'))
-                            square_off_time = dt_time(hour, minute)
-                            
-                            if current_time_only >= square_off_time:
-                                logger.info(f"OrderMonitor: {hedge_indicator} Square-off time {square_off_time_str} reached for non-DELIVERY order_id={self.order_id}. Exiting order.")
-                                try:
-                                    msg = f"⏰ <b>Square-off Exit Triggered</b>\n<b>Order ID:</b> <code>{self.order_id}</code>\n<b>Time:</b> <code>{square_off_time_str}</code>"
-                                    send_telegram_async(msg)
-                                except Exception as e:
-                                    logger.error(f"Failed to send Telegram square-off notification: {e}")
-                                try:
-                                    # Square-off time exit handling
-                                    from algosat.common import constants
-                                    await self.order_manager.exit_order(self.order_id, exit_reason=f"Square-off time {square_off_time_str} reached")
-                                    await self.order_manager.update_order_status_in_db(self.order_id, f"{constants.TRADE_STATUS_EXIT_EOD}_PENDING")
-                                    await self._clear_order_cache("Square-off time exit status updated to PENDING")
-                                    logger.info(f"OrderMonitor: {hedge_indicator} EOD exit set to PENDING for order_id={self.order_id}. PENDING processor will complete the exit.")
-                                    # Continue monitoring loop - PENDING check at beginning will handle completion
-                                    continue
-                                except Exception as e:
-                                    logger.error(f"OrderMonitor: {hedge_indicator} Failed to exit order {self.order_id} at square-off time: {e}")
-                        except Exception as e:
-                            logger.error(f"OrderMonitor: {hedge_indicator} Error parsing square_off_time '{square_off_time_str}': {e}")
-                
-                # For DELIVERY orders: stop monitoring at 3:30 PM
-                elif product_type and product_type.upper() == 'DELIVERY':
-                    market_close_time = dt_time(15, 30)  # 3:30 PM
-                    if current_time_only >= market_close_time:
-                        logger.info(f"OrderMonitor: {hedge_indicator} Market close time 15:30 reached for DELIVERY order_id={self.order_id}. Stopping monitoring.")
-                        self.stop()
-                        return
+                hedge_indicator = "🛡️[HEDGE]" if self.is_hedge else "📈[MAIN]"
                 
-                # Exit AWAITING_ENTRY orders at 15:25 (regardless of product type)
-                awaiting_entry_exit_time = dt_time(15, 25)  # 3:25 PM
-                current_status = order_row.get('status') if order_row else None
-                if (current_time_only >= awaiting_entry_exit_time and 
-                    current_status in ('AWAITING_ENTRY', OrderStatus.AWAITING_ENTRY)):
-                    logger.info(f"OrderMonitor: {hedge_indicator} 15:25 reached for AWAITING_ENTRY order_id={self.order_id}. Exiting order.")
-                    try:
-                        msg = f"🚫 <b>AWAITING_ENTRY Cancelled</b>\n<b>Order ID:</b> <code>{self.order_id}</code>\n<b>Reason:</b> <code>15:25 reached, cancelling unfilled order</code>"
-                        send_telegram_async(msg)
-                    except Exception as e:
-                        logger.error(f"Failed to send Telegram awaiting_entry cancel notification: {e}")
+                if quick_status and quick_status.endswith('_PENDING'):
+                    logger.info(f"OrderMonitor: {hedge_indicator} 🚨 PENDING status detected immediately: {quick_status} " +
+                               f"for order_id={self.order_id}, symbol={order_symbol}" + 
+                               (f", parent_id={parent_id}" if parent_id else ""))
+                    
+                    # Fetch current LTP for better fallback exit_price calculation
+                    current_ltp = None
                     try:
-                        await self.order_manager.exit_order(self.order_id, exit_reason="AWAITING_ENTRY order exit at 15:25")
-                        # Update status to CANCELLED
-                        await self.order_manager.update_order_status_in_db(self.order_id, "CANCELLED")
-                        await self._clear_order_cache("AWAITING_ENTRY exit status updated")
-                        self.stop()
-                        return
+                        current_ltp = await self._update_current_price_for_open_order(quick_order_check)
+                        logger.debug(f"OrderMonitor: {hedge_indicator} Fetched LTP={current_ltp} for PENDING exit processing")
                     except Exception as e:
-                        logger.error(f"OrderMonitor: {hedge_indicator} Failed to exit AWAITING_ENTRY order {self.order_id} at 15:25: {e}")
-                        return
-
-            # --- P&L monitoring using DB data and current LTP (simplified approach) ---
-            current_status = order_row.get('status') if order_row and order_row.get('status') else last_main_status
-            order_symbol = order_row.get('strike_symbol') if order_row else 'N/A'
-            hedge_indicator = "🛡️[HEDGE]" if self.is_hedge else "📈[MAIN]"
-            parent_id = order_row.get('parent_order_id') if order_row else None
-            
-            logger.info(f"OrderMonitor: {hedge_indicator} CurrentStatus: {current_status} for order_id={self.order_id}, symbol={order_symbol}" + 
-                       (f", parent_id={parent_id}" if parent_id else ""))
+                        logger.warning(f"OrderMonitor: {hedge_indicator} Failed to fetch LTP for PENDING processing: {e}")
+                    
+                    # Process PENDING exit with LTP for better fallback
+                    await self._check_and_complete_pending_exits(quick_order_check, quick_status, current_ltp)
+                    # If monitor stopped during PENDING processing, exit loop
+                    if not self._running:
+                        logger.info(f"OrderMonitor: {hedge_indicator} Monitor stopped after immediate PENDING processing for order_id={self.order_id}")
+                        return False
+                    # Clear cache after PENDING processing to get fresh data
+                    await self._clear_order_cache("After immediate PENDING processing")
+        except Exception as e:
+            logger.error(f"OrderMonitor: Error in immediate PENDING check for order_id={self.order_id}: {e}")
+            # Continue with normal flow if PENDING check fails
+        
+        # --- Normal monitoring flow continues if no PENDING exit processed ---
+        try:
+            snapshot_order = self._snapshot_order_row()
+            snapshot_execs = self._snapshot_executions()
+            if snapshot_order is not None and snapshot_execs is not None:
+                agg: OrderAggregate = await self.data_manager.build_order_aggregate(snapshot_order, snapshot_execs, self.order_id)
+            else:
+                agg: OrderAggregate = await self.data_manager.get_order_aggregate(self.order_id)
+        except Exception as e:
+            logger.error(f"OrderMonitor: Error in get_order_aggregate for order_id={self.order_id}: {e}")
+            # If order is deleted, stop monitoring this order_id
+            if "not found" in str(e).lower() or "deleted" in str(e).lower():
+                logger.info(f"OrderMonitor: Stopping monitor for order_id={self.order_id} as order is deleted.")
+                self.stop()
+                return False
+            return True
+        # Fetch order, strategy_symbol, strategy_config, and strategy in one go (cached)
+        order_row, strategy_symbol, strategy_config, strategy = await self._get_order_and_strategy(self.order_id)
+        if order_row is None:
+            logger.info(f"OrderMonitor: Stopping monitor for order_id={self.order_id} as order_row is None (order deleted).")
+            self.stop()
+            return False
             
-            # --- Telegram notification for status transition to OPEN ---
+        # Initialize last_broker_statuses from agg.broker_orders if empty (first run or after restart)
+        if not self._last_broker_statuses:
+            current_entry_orders = [bro for bro in agg.broker_orders if getattr(bro, 'side', None) == 'ENTRY']
+            for bro in current_entry_orders:
+                broker_exec_id = getattr(bro, 'id', None)
+                status = getattr(bro, 'status', None)
+                if broker_exec_id is not None and status is not None:
+                    self._last_broker_statuses[broker_exec_id] = str(status)
+        if self._last_main_status is None and order_row and order_row.get('status') is not None:
+            self._last_main_status = str(order_row.get('status'))
+        # --- Time-based exit/stop logic before processing broker orders ---
+        # Get product_type and trade_config for time-based decisions
+        product_type = None
+        trade_config = None
+        if strategy:
+            product_type = strategy.get('product_type') or strategy.get('producttype')
+        if strategy_config:
+            import json
             try:
-                if current_status == 'OPEN' and last_main_status != 'OPEN':
-                    hedge_tag = "🛡️ HEDGE " if self.is_hedge else ""
-                    msg = f"🟢 <b>{hedge_tag}Order OPEN</b>\n<b>Order ID:</b> <code>{self.order_id}</code>" + \
-                          (f"\n<b>Parent ID:</b> <code>{parent_id}</code>" if parent_id else "") + \
-                          f"\n<b>Symbol:</b> <code>{order_symbol}</code>"
-                    send_telegram_async(msg)
+                trade_param = strategy_config.get('trade')
+                if trade_param:
+                    trade_config = json.loads(trade_param) if isinstance(trade_param, str) else trade_param
             except Exception as e:
-                logger.error(f"Failed to send Telegram OPEN notification: {e}")
-
-            # --- Use live broker order data from order_cache for ENTRY side ---
-            entry_broker_db_orders = [bro for bro in agg.broker_orders if getattr(bro, 'side', None) == 'ENTRY']
-            all_statuses = []
-            status_set = set()
-            
-            logger.info(f"OrderMonitor: {hedge_indicator} Processing {len(entry_broker_db_orders)} ENTRY broker executions for order_id={self.order_id}, symbol={order_symbol}")
-            
-            try:
-                for bro in entry_broker_db_orders:
+                logger.error(f"OrderMonitor: Error parsing trade config for time-based exit: {e}")
+        
+        # Time-based logic
+        from datetime import datetime, time as dt_time
+        import pytz
+        current_time = datetime.now(pytz.timezone('Asia/Kolkata'))
+        current_time_only = current_time.time()
+        
+        # HEDGE ORDER PROTECTION: Hedge orders should NOT trigger time-based exits
+        # Only main orders should handle square-off and AWAITING_ENTRY exits
+        if self.is_hedge:
+            logger.info(f"OrderMonitor: {hedge_indicator} Skipping time-based exit logic for hedge order_id={self.order_id}")
+        else:
+            logger.debug(f"OrderMonitor: {hedge_indicator} Checking time-based exit logic for main order_id={self.order_id}")
+        
+            # For non-DELIVERY orders: check square_off_time
+            if product_type and product_type.upper() != 'DELIVERY':
+                square_off_time_str = None
+                if trade_config:
+                    square_off_time_str = trade_config.get('square_off_time')
+                
+                if square_off_time_str:
                     try:
-                        broker_exec_id = getattr(bro, 'id', None)
-                        broker_order_id = getattr(bro, 'order_id', None)
-                        broker_id = getattr(bro, 'broker_id', None)
-                        broker_symbol = getattr(bro, 'symbol', None) or getattr(bro, 'tradingsymbol', None)
-                        
-                        logger.debug(f"OrderMonitor: {hedge_indicator} Processing broker_exec_id={broker_exec_id}, " +
-                                   f"broker_order_id={broker_order_id}, broker_id={broker_id}, symbol={broker_symbol} for order_id={self.order_id}")
+                        # Parse square_off_time (e.g., "15:25" -> time(15, 25))
+                        hour, minute = map(int, square_off_time_str.split(':'))
+                        square_off_time = dt_time(hour, minute)
                         
-                        broker_name = None
-                        if broker_id is not None:
+                        if current_time_only >= square_off_time:
+                            logger.info(f"OrderMonitor: {hedge_indicator} Square-off time {square_off_time_str} reached for non-DELIVERY order_id={self.order_id}. Exiting order.")
                             try:
-                                broker_name = await self._get_broker_name_with_cache(broker_id)
+                                msg = f"⏰ <b>Square-off Exit Triggered</b>\n<b>Order ID:</b> <code>{self.order_id}</code>\n<b>Time:</b> <code>{square_off_time_str}</code>"
+                                send_telegram_async(msg)
                             except Exception as e:
-                                logger.error(f"OrderMonitor: {hedge_indicator} Could not get broker name for broker_id={broker_id}: {e}")
-                        # If broker_order_id is None or empty, order is not placed, set status to FAILED
-                        cache_order = None
-                        if not broker_order_id:
-                            broker_status = "FAILED"
-                            logger.warning(f"OrderMonitor: {hedge_indicator} No broker_order_id for exec_id={broker_exec_id}, setting status to FAILED")
-                        else:
-                            cache_lookup_order_id = self._get_cache_lookup_order_id(
-                                broker_order_id, broker_name, product_type
-                            )
-                            # Fetch live broker order from order_cache
-                            if broker_name and cache_lookup_order_id:
-                                try:
-                                    cache_order = await self.order_cache.get_order_by_id(broker_name, cache_lookup_order_id)
-                                    logger.debug(f"OrderMonitor: {hedge_indicator} Fetched order from cache for order_id={self.order_id}, " +
-                                               f"broker_name={broker_name}, broker_order_id={cache_lookup_order_id}: {cache_order}")  
-                                except Exception as e:
-                                    logger.error(f"OrderMonitor: {hedge_indicator} Error fetching order from cache for order_id={self.order_id}," +
-                                               f"broker_name={broker_name}, order_id={cache_lookup_order_id}: {e}")
-                            # Use status from cache_order if available, else fallback to DB
-                            broker_status = None
-                            if cache_order and 'status' in cache_order:
-                                broker_status = cache_order['status']
-                                logger.debug(f"OrderMonitor: {hedge_indicator} Using cache status '{broker_status}' for broker_exec_id={broker_exec_id}")
-                            else:
-                                logger.info(f"OrderMonitor: {hedge_indicator} Using DB status for broker_order_id={broker_order_id} " +
-                                          f"as cache_order not found or missing status for order_id {self.order_id}")
-                                broker_status = getattr(bro, 'status', None)
-                            if broker_status and isinstance(broker_status, int) and broker_name == "fyers":
-                                broker_status = FYERS_STATUS_MAP.get(broker_status, broker_status)
-                            # Normalize Angel status codes (e.g., "AB01", "AB02", etc.)
-                            elif broker_status and isinstance(broker_status, str) and broker_name == "angel":
-                                from algosat.core.order_manager import ANGEL_STATUS_MAP
-                                broker_status = ANGEL_STATUS_MAP.get(broker_status.lower(), broker_status)
-                            # Normalize broker_status
-                            if broker_status and isinstance(broker_status, str) and broker_status.startswith("OrderStatus."):
-                                broker_status = broker_status.split(".")[-1]
-                            elif broker_status and isinstance(broker_status, OrderStatus):
-                                broker_status = broker_status.value
-                            # broker_status = "FILLED"
-
-                        all_statuses.append(broker_status)
-                        status_set.add(broker_status)
-                        
-                        logger.info(f"OrderMonitor: {hedge_indicator} Broker execution status: exec_id={broker_exec_id}, " +
-                                  f"broker={broker_name}, symbol={broker_symbol}, status={broker_status}")
+                                logger.error(f"Failed to send Telegram square-off notification: {e}")
+                            try:
+                                # Square-off time exit handling
+                                from algosat.common import constants
+                                await self.order_manager.exit_order(self.order_id, exit_reason=f"Square-off time {square_off_time_str} reached")
+                                await self.order_manager.update_order_status_in_db(self.order_id, f"{constants.TRADE_STATUS_EXIT_EOD}_PENDING")
+                                await self._clear_order_cache("Square-off time exit status updated to PENDING")
+                                logger.info(f"OrderMonitor: {hedge_indicator} EOD exit set to PENDING for order_id={self.order_id}. PENDING processor will complete the exit.")
+                                # Re-run immediately - PENDING check at beginning will handle completion
+                                self._rerun_immediately = True
+                                return True
+                            except Exception as e:
+                                logger.error(f"OrderMonitor: {hedge_indicator} Failed to exit order {self.order_id} at square-off time: {e}")
                     except Exception as e:
-                        logger.error(f"OrderMonitor: {hedge_indicator} Unexpected error processing broker order " +
-                                   f"(exec_id={getattr(bro, 'id', None)}): {e}", exc_info=True)
-                        all_statuses.append("FAILED")
-                        status_set.add("FAILED")
-                    last_status = last_broker_statuses.get(broker_exec_id)
-                    # --- Enhancement: Also check executed_quantity for PARTIALLY_FILLED updates ---
-                    # Get executed_quantity from broker (cache or bro)
-                    broker_executed_quantity = None
-                    broker_placed_quantity = None
-                    if cache_order:
-                        broker_executed_quantity = cache_order.get("executed_quantity") or cache_order.get("filled_quantity") or cache_order.get("filledQty")
-                        broker_placed_quantity = cache_order.get("quantity") or cache_order.get("qty") or cache_order.get("filledQty")
-                    # if broker_executed_quantity is None:
-                        # broker_executed_quantity = getattr(bro, "executed_quantity", None) or getattr(bro, "filled_quantity", None) or getattr(bro, "filledQty", None)
-                    # Get DB executed_quantity (from bro)
-                    db_executed_quantity = getattr(bro, "executed_quantity", None) or getattr(bro, "filled_quantity", None) or getattr(bro, "filledQty", None)
-                    # Only update if status changed, or for PARTIALLY_FILLED if executed_quantity increased
-                    should_update = False
-                    if broker_status != last_status:
-                        should_update = True
-                    elif broker_status in ("PARTIALLY_FILLED", "PARTIAL"):
+                        logger.error(f"OrderMonitor: {hedge_indicator} Error parsing square_off_time '{square_off_time_str}': {e}")
+            
+            # For DELIVERY orders: stop monitoring at 3:30 PM
+            elif product_type and product_type.upper() == 'DELIVERY':
+                market_close_time = dt_time(15, 30)  # 3:30 PM
+                if current_time_only >= market_close_time:
+                    logger.info(f"OrderMonitor: {hedge_indicator} Market close time 15:30 reached for DELIVERY order_id={self.order_id}. Stopping monitoring.")
+                    self.stop()
+                    return False
+            
+            # Exit AWAITING_ENTRY orders at 15:25 (regardless of product type)
+            awaiting_entry_exit_time = dt_time(15, 25)  # 3:25 PM
+            current_status = order_row.get('status') if order_row else None
+            if (current_time_only >= awaiting_entry_exit_time and 
+                current_status in ('AWAITING_ENTRY', OrderStatus.AWAITING_ENTRY)):
+                logger.info(f"OrderMonitor: {hedge_indicator} 15:25 reached for AWAITING_ENTRY order_id={self.order_id}. Exiting order.")
+                try:
+                    msg = f"🚫 <b>AWAITING_ENTRY Cancelled</b>\n<b>Order ID:</b> <code>{self.order_id}</code>\n<b>Reason:</b> <code>15:25 reached, cancelling unfilled order</code>"
+                    send_telegram_async(msg)
+                except Exception as e:
+                    logger.error(f"Failed to send Telegram awaiting_entry cancel notification: {e}")
+                try:
+                    await self.order_manager.exit_order(self.order_id, exit_reason="AWAITING_ENTRY order exit at 15:25")
+                    # Update status to CANCELLED
+                    await self.order_manager.update_order_status_in_db(self.order_id, "CANCELLED")
+                    await self._clear_order_cache("AWAITING_ENTRY exit status updated")
+                    self.stop()
+                    return False
+                except Exception as e:
+                    logger.error(f"OrderMonitor: {hedge_indicator} Failed to exit AWAITING_ENTRY order {self.order_id} at 15:25: {e}")
+                    return False
+
+        # --- P&L monitoring using DB data and current LTP (simplified approach) ---
+        current_status = order_row.get('status') if order_row and order_row.get('status') else self._last_main_status
+        order_symbol = order_row.get('strike_symbol') if order_row else 'N/A'
+        hedge_indicator = "🛡️[HEDGE]" if self.is_hedge else "📈[MAIN]"
+        parent_id = order_row.get('parent_order_id') if order_row else None
+        
+        logger.info(f"OrderMonitor: {hedge_indicator} CurrentStatus: {current_status} for order_id={self.order_id}, symbol={order_symbol}" + 
+                   (f", parent_id={parent_id}" if parent_id else ""))
+        
+        # --- Telegram notification for status transition to OPEN ---
+        try:
+            if current_status == 'OPEN' and self._last_main_status != 'OPEN':
+                hedge_tag = "🛡️ HEDGE " if self.is_hedge else ""
+                msg = f"🟢 <b>{hedge_tag}Order OPEN</b>\n<b>Order ID:</b> <code>{self.order_id}</code>" + \
+                      (f"\n<b>Parent ID:</b> <code>{parent_id}</code>" if parent_id else "") + \
+                      f"\n<b>Symbol:</b> <code>{order_symbol}</code>"
+                send_telegram_async(msg)
+        except Exception as e:
+            logger.error(f"Failed to send Telegram OPEN notification: {e}")
+
+        # --- Use live broker order data from order_cache for ENTRY side ---
+        entry_broker_db_orders = [bro for bro in agg.broker_orders if getattr(bro, 'side', None) == 'ENTRY']
+        all_statuses = []
+        status_set = set()
+        
+        logger.info(f"OrderMonitor: {hedge_indicator} Processing {len(entry_broker_db_orders)} ENTRY broker executions for order_id={self.order_id}, symbol={order_symbol}")
+        
+        try:
+            for bro in entry_broker_db_orders:
+                try:
+                    broker_exec_id = getattr(bro, 'id', None)
+                    broker_order_id = getattr(bro, 'order_id', None)
+                    broker_id = getattr(bro, 'broker_id', None)
+                    broker_symbol = getattr(bro, 'symbol', None) or getattr(bro, 'tradingsymbol', None)
+                    
+                    logger.debug(f"OrderMonitor: {hedge_indicator} Processing broker_exec_id={broker_exec_id}, " +
+                               f"broker_order_id={broker_order_id}, broker_id={broker_id}, symbol={broker_symbol} for order_id={self.order_id}")
+                    
+                    broker_name = None
+                    if broker_id is not None:
                         try:
-                            if broker_executed_quantity is not None and db_executed_quantity is not None:
-                                if float(broker_executed_quantity) > float(db_executed_quantity):
-                                    should_update = True
+                            broker_name = await self._get_broker_name_with_cache(broker_id)
                         except Exception as e:
-                            logger.error(f"OrderMonitor: Error comparing executed_quantity for broker_exec_id={broker_exec_id}: {e}")
-                    if should_update:
-                        # If status transitions from PENDING/PARTIAL to FILLED/PARTIAL, update all fields
-                        transition_to_filled = (
-                            (last_status in ("PENDING", "TRIGGER_PENDING", "PARTIAL", "PARTIALLY_FILLED")) and
-                            (broker_status in ("FILLED", "PARTIAL", "PARTIALLY_FILLED"))
+                            logger.error(f"OrderMonitor: {hedge_indicator} Could not get broker name for broker_id={broker_id}: {e}")
+                    # If broker_order_id is None or empty, order is not placed, set status to FAILED
+                    cache_order = None
+                    if not broker_order_id:
+                        broker_status = "FAILED"
+                        logger.warning(f"OrderMonitor: {hedge_indicator} No broker_order_id for exec_id={broker_exec_id}, setting status to FAILED")
+                    else:
+                        cache_lookup_order_id = self._get_cache_lookup_order_id(
+                            broker_order_id, broker_name, product_type
                         )
-                        if transition_to_filled:
-                            from datetime import datetime, timezone
-                            executed_quantity = broker_executed_quantity
-                            quantity = broker_placed_quantity
-                            execution_price = None
-                            symbol_val = None
-                            # Prefer cache_order for execution details, fallback to bro
-                            if cache_order:
-                                execution_price = cache_order.get("exec_price") or cache_order.get("execution_price") or cache_order.get("average_price") or cache_order.get("tradedPrice")
-                                order_type = cache_order.get("order_type")
-                                # Apply Fyers order type mapping if this is a Fyers broker response
-                                if broker_name and broker_name.lower() == "fyers" and order_type is not None:
-                                    from algosat.core.order_manager import FYERS_ORDER_TYPE_MAP
-                                    order_type = FYERS_ORDER_TYPE_MAP.get(order_type, str(order_type))
-                                product_type_val = cache_order.get("product_type")
-                                # Get quantity from cache_order (qty or quantity)
-                                quantity = cache_order.get("qty") or cache_order.get("quantity")
-                                # Get symbol from cache_order (symbol or tradingsymbol)
-                                symbol_val = cache_order.get("symbol") or cache_order.get("tradingsymbol")
-                            if execution_price is None:
-                                execution_price = getattr(bro, "exec_price", None) or getattr(bro, "execution_price", None) or getattr(bro, "average_price", None) or getattr(bro, "tradedPrice", None)
-                            if order_type is None:
-                                order_type = getattr(bro, "order_type", None)
-                                # Apply Fyers order type mapping if this is a Fyers broker response
-                                if broker_name and broker_name.lower() == "fyers" and order_type is not None:
-                                    from algosat.core.order_manager import FYERS_ORDER_TYPE_MAP
-                                    order_type = FYERS_ORDER_TYPE_MAP.get(order_type, str(order_type))
-                            if product_type_val is None:
-                                product_type_val = getattr(bro, "product_type", None)
-                            if quantity is None:
-                                quantity = getattr(bro, "qty", None) or getattr(bro, "quantity", None)
-                            if symbol_val is None:
-                                symbol_val = getattr(bro, "symbol", None) or getattr(bro, "tradingsymbol", None)
-                            
-                            # Note: execution_time is handled by order_manager.py during status transitions
-                            
-                            # Use update_rows_in_table directly for comprehensive broker execution updates
-                            from algosat.core.db import AsyncSessionLocal, update_rows_in_table
-                            from algosat.core.dbschema import broker_executions
-                            
-                            comprehensive_update_fields = {
-                                "status": broker_status.value if hasattr(broker_status, 'value') else str(broker_status),
-                                "executed_quantity": executed_quantity,
-                                "quantity": quantity,
-                                "execution_price": execution_price,
-                                "order_type": order_type,
-                                "product_type": product_type_val,
-                                "symbol": symbol_val,
-                                "raw_execution_data": self.order_manager._serialize_datetime_for_json(cache_order)  # Store complete broker order data
-                                # Note: execution_time is handled by order_manager.py during status transitions
-                            }
-                            
-                            # Remove None values to avoid unnecessary DB updates
-                            comprehensive_update_fields = {k: v for k, v in comprehensive_update_fields.items() if v is not None}
-                            
-                            logger.info(f"OrderMonitor: {hedge_indicator} Comprehensive update for broker_exec_id={broker_exec_id} " +
-                                      f"with fields: {list(comprehensive_update_fields.keys())}")
-                            
-                            async with AsyncSessionLocal() as comp_session:
-                                await update_rows_in_table(
-                                    target_table=broker_executions,
-                                    condition=broker_executions.c.id == broker_exec_id,
-                                    new_values=comprehensive_update_fields
-                                )
-                                logger.debug(f"OrderMonitor: {hedge_indicator} Successfully updated broker_exec_id={broker_exec_id} with comprehensive data")
+                        # Fetch live broker order from order_cache
+                        if broker_name and cache_lookup_order_id:
+                            try:
+                                cache_order = await self.order_cache.get_order_by_id(broker_name, cache_lookup_order_id)
+                                logger.debug(f"OrderMonitor: {hedge_indicator} Fetched order from cache for order_id={self.order_id}, " +
+                                           f"broker_name={broker_name}, broker_order_id={cache_lookup_order_id}: {cache_order}")  
+                            except Exception as e:
+                                logger.error(f"OrderMonitor: {hedge_indicator} Error fetching order from cache for order_id={self.order_id}," +
+                                           f"broker_name={broker_name}, order_id={cache_lookup_order_id}: {e}")
+                        # Use status from cache_order if available, else fallback to DB
+                        broker_status = None
+                        if cache_order and 'status' in cache_order:
+                            broker_status = cache_order['status']
+                            logger.debug(f"OrderMonitor: {hedge_indicator} Using cache status '{broker_status}' for broker_exec_id={broker_exec_id}")
                         else:
-                            # Simple status-only update
-                            logger.info(f"OrderMonitor: {hedge_indicator} Simple status update for broker_exec_id={broker_exec_id}: {broker_status}")
-                            await self.order_manager.update_broker_exec_status_in_db(broker_exec_id, broker_status)
-                        last_broker_statuses[broker_exec_id] = broker_status
-            except Exception as e:
-                logger.error(f"OrderMonitor: {hedge_indicator} Unexpected error in broker order status loop: {e}", exc_info=True)
-               
+                            logger.info(f"OrderMonitor: {hedge_indicator} Using DB status for broker_order_id={broker_order_id} " +
+                                      f"as cache_order not found or missing status for order_id {self.order_id}")
+                            broker_status = getattr(bro, 'status', None)
+                        if broker_status and isinstance(broker_status, int) and broker_name == "fyers":
+                            broker_status = FYERS_STATUS_MAP.get(broker_status, broker_status)
+                        # Normalize Angel status codes (e.g., "AB01", "AB02", etc.)
+                        elif broker_status and isinstance(broker_status, str) and broker_name == "angel":
+                            from algosat.core.order_manager import ANGEL_STATUS_MAP
+                            broker_status = ANGEL_STATUS_MAP.get(broker_status.lower(), broker_status)
+                        # Normalize broker_status
+                        if broker_status and isinstance(broker_status, str) and broker_status.startswith("OrderStatus."):
+                            broker_status = broker_status.split(".")[-1]
+                        elif broker_status and isinstance(broker_status, OrderStatus):
+                            broker_status = broker_status.value
+                        # broker_status = "FILLED"
 
-            # --- Aggregate and update Orders table with sum of broker_execs quantities ---
-            try:
-                from algosat.core.db import AsyncSessionLocal, update_rows_in_table, get_order_by_id
-                from algosat.core.dbschema import orders, broker_executions
+                    all_statuses.append(broker_status)
+                    status_set.add(broker_status)
+                    
+                    logger.info(f"OrderMonitor: {hedge_indicator} Broker execution status: exec_id={broker_exec_id}, " +
+                              f"broker={broker_name}, symbol={broker_symbol}, status={broker_status}")
+                except Exception as e:
+                    logger.error(f"OrderMonitor: {hedge_indicator} Unexpected error processing broker order " +
+                               f"(exec_id={getattr(bro, 'id', None)}): {e}", exc_info=True)
+                    all_statuses.append("FAILED")
+                    status_set.add("FAILED")
+                last_status = self._last_broker_statuses.get(broker_exec_id)
+                # --- Enhancement: Also check executed_quantity for PARTIALLY_FILLED updates ---
+                # Get executed_quantity from broker (cache or bro)
+                broker_executed_quantity = None
+                broker_placed_quantity = None
+                if cache_order:
+                    broker_executed_quantity = cache_order.get("executed_quantity") or cache_order.get("filled_quantity") or cache_order.get("filledQty")
+                    broker_placed_quantity = cache_order.get("quantity") or cache_order.get("qty") or cache_order.get("filledQty")
+                # if broker_executed_quantity is None:
+                    # broker_executed_quantity = getattr(bro, "executed_quantity", None) or getattr(bro, "filled_quantity", None) or getattr(bro, "filledQty", None)
+                # Get DB executed_quantity (from bro)
+                db_executed_quantity = getattr(bro, "executed_quantity", None) or getattr(bro, "filled_quantity", None) or getattr(bro, "filledQty", None)
+                # Only update if status changed, or for PARTIALLY_FILLED if executed_quantity increased
+                should_update = False
+                if broker_status != last_status:
+                    should_update = True
+                elif broker_status in ("PARTIALLY_FILLED", "PARTIAL"):
+                    try:
+                        if broker_executed_quantity is not None and db_executed_quantity is not None:
+                            if float(broker_executed_quantity) > float(db_executed_quantity):
+                                should_update = True
+                    except Exception as e:
+                        logger.error(f"OrderMonitor: Error comparing executed_quantity for broker_exec_id={broker_exec_id}: {e}")
+                if should_update:
+                    # If status transitions from PENDING/PARTIAL to FILLED/PARTIAL, update all fields
+                    transition_to_filled = (
+                        (last_status in ("PENDING", "TRIGGER_PENDING", "PARTIAL", "PARTIALLY_FILLED")) and
+                        (broker_status in ("FILLED", "PARTIAL", "PARTIALLY_FILLED"))
+                    )
+                    if transition_to_filled:
+                        from datetime import datetime, timezone
+                        if broker_status == "FILLED" and cache_order:
+                            self._observe_fill_detection(broker_name, cache_order.get("execution_time"))
+                        executed_quantity = broker_executed_quantity
+                        quantity = broker_placed_quantity
+                        execution_price = None
+                        symbol_val = None
+                        # Prefer cache_order for execution details, fallback to bro
+                        if cache_order:
+                            execution_price = cache_order.get("exec_price") or cache_order.get("execution_price") or cache_order.get("average_price") or cache_order.get("tradedPrice")
+                            order_type = cache_order.get("order_type")
+                            # Apply Fyers order type mapping if this is a Fyers broker response
+                            if broker_name and broker_name.lower() == "fyers" and order_type is not None:
+                                from algosat.core.order_manager import FYERS_ORDER_TYPE_MAP
+                                order_type = FYERS_ORDER_TYPE_MAP.get(order_type, str(order_type))
+                            product_type_val = cache_order.get("product_type")
+                            # Get quantity from cache_order (qty or quantity)
+                            quantity = cache_order.get("qty") or cache_order.get("quantity")
+                            # Get symbol from cache_order (symbol or tradingsymbol)
+                            symbol_val = cache_order.get("symbol") or cache_order.get("tradingsymbol")
+                        if execution_price is None:
+                            execution_price = getattr(bro, "exec_price", None) or getattr(bro, "execution_price", None) or getattr(bro, "average_price", None) or getattr(bro, "tradedPrice", None)
+                        if order_type is None:
+                            order_type = getattr(bro, "order_type", None)
+                            # Apply Fyers order type mapping if this is a Fyers broker response
+                            if broker_name and broker_name.lower() == "fyers" and order_type is not None:
+                                from algosat.core.order_manager import FYERS_ORDER_TYPE_MAP
+                                order_type = FYERS_ORDER_TYPE_MAP.get(order_type, str(order_type))
+                        if product_type_val is None:
+                            product_type_val = getattr(bro, "product_type", None)
+                        if quantity is None:
+                            quantity = getattr(bro, "qty", None) or getattr(bro, "quantity", None)
+                        if symbol_val is None:
+                            symbol_val = getattr(bro, "symbol", None) or getattr(bro, "tradingsymbol", None)
+                        
+                        # Note: execution_time is handled by order_manager.py during status transitions
+                        
+                        # Use update_rows_in_table directly for comprehensive broker execution updates
+                        from algosat.core.db import AsyncSessionLocal, update_rows_in_table
+                        from algosat.core.dbschema import broker_executions
+                        
+                        comprehensive_update_fields = {
+                            "status": broker_status.value if hasattr(broker_status, 'value') else str(broker_status),
+                            "executed_quantity": executed_quantity,
+                            "quantity": quantity,
+                            "execution_price": execution_price,
+                            "order_type": order_type,
+                            "product_type": product_type_val,
+                            "symbol": symbol_val,
+                            "raw_execution_data": self.order_manager._serialize_datetime_for_json(cache_order)  # Store complete broker order data
+                            # Note: execution_time is handled by order_manager.py during status transitions
+                        }
+                        
+                        # Remove None values to avoid unnecessary DB updates
+                        comprehensive_update_fields = {k: v for k, v in comprehensive_update_fields.items() if v is not None}
+                        
+                        logger.info(f"OrderMonitor: {hedge_indicator} Comprehensive update for broker_exec_id={broker_exec_id} " +
+                                  f"with fields: {list(comprehensive_update_fields.keys())}")
+                        
+                        async with AsyncSessionLocal() as comp_session:
+                            await update_rows_in_table(
+                                target_table=broker_executions,
+                                condition=broker_executions.c.id == broker_exec_id,
+                                new_values=comprehensive_update_fields
+                            )
+                            logger.debug(f"OrderMonitor: {hedge_indicator} Successfully updated broker_exec_id={broker_exec_id} with comprehensive data")
+                    else:
+                        # Simple status-only update
+                        logger.info(f"OrderMonitor: {hedge_indicator} Simple status update for broker_exec_id={broker_exec_id}: {broker_status}")
+                        await self.order_manager.update_broker_exec_status_in_db(broker_exec_id, broker_status)
+                    self._last_broker_statuses[broker_exec_id] = broker_status
+                    self._invalidate_snapshot(executions=True)
+        except Exception as e:
+            logger.error(f"OrderMonitor: {hedge_indicator} Unexpected error in broker order status loop: {e}", exc_info=True)
+           
+
+        # --- Aggregate and update Orders table with sum of broker_execs quantities ---
+        try:
+            from algosat.core.db import AsyncSessionLocal, update_rows_in_table, get_order_by_id
+            from algosat.core.dbschema import orders, broker_executions
+            from algosat.core.db import get_broker_executions_for_order
+            # Use the scheduler snapshot unless this tick already wrote to broker_executions/orders
+            broker_exec_rows = self._snapshot_executions(side='ENTRY')
+            current_order = self._snapshot_order_row()
+            if broker_exec_rows is None or current_order is None:
                 async with AsyncSessionLocal() as session:
                     # Fetch all broker_executions for this order with side='ENTRY' (fresh from DB for latest values)
-                    from algosat.core.db import get_broker_executions_for_order
-                    broker_exec_rows = await get_broker_executions_for_order(session, self.order_id, side='ENTRY')
-                    total_quantity = 0
-                    total_executed_quantity = 0
-                    vwap_total_value = 0.0
-                    vwap_total_qty = 0.0
-                    for be in broker_exec_rows:
-                        q = be.get('quantity') or 0
-                        eq = be.get('executed_quantity') or 0
-                        exec_price = be.get('execution_price') or 0
-                        try:
-                            q = float(q) if q is not None else 0
-                        except Exception:
-                            q = 0
-                        try:
-                            eq = float(eq) if eq is not None else 0
-                        except Exception:
-                            eq = 0
-                        try:
-                            exec_price = float(exec_price) if exec_price is not None else 0
-                        except Exception:
-                            exec_price = 0
-                        total_quantity += q
-                        total_executed_quantity += eq
-                        vwap_total_value += eq * exec_price
-                        vwap_total_qty += eq
-                    entry_price = round(vwap_total_value / vwap_total_qty, 2) if vwap_total_qty > 0 else None
+                    if broker_exec_rows is None:
+                        broker_exec_rows = await get_broker_executions_for_order(session, self.order_id, side='ENTRY')
                     # Fetch current order values from DB
-                    current_order = await get_order_by_id(session, self.order_id)
-                    current_qty = current_order.get('qty') if current_order else None
-                    current_executed_quantity = current_order.get('executed_quantity') if current_order else None
-                    current_entry_price = current_order.get('entry_price') if current_order else None
-                    # Only update if any value changed
-                    if (
-                        float(total_quantity) != float(current_qty or 0) or
-                        float(total_executed_quantity) != float(current_executed_quantity or 0) or
-                        (entry_price is not None and float(entry_price) != float(current_entry_price or 0))
-                    ):
-                        update_fields = {"qty": total_quantity, "executed_quantity": total_executed_quantity}
-                        if entry_price is not None:
-                            update_fields["entry_price"] = entry_price
-                        await update_rows_in_table(
-                            target_table=orders,
-                            condition=orders.c.id == self.order_id,
-                            new_values=update_fields
-                        )
-                        logger.info(f"OrderMonitor: {hedge_indicator} Updated Orders table for order_id={self.order_id} " +
-                                  f"with qty={total_quantity}, executed_quantity={total_executed_quantity}, entry_price={entry_price}")
-                    else:
-                        logger.debug(f"OrderMonitor: {hedge_indicator} No change in qty, executed_quantity, entry_price for order_id={self.order_id}. Skipping DB update.")
-            except Exception as e:
-                logger.error(f"OrderMonitor: {hedge_indicator} Error updating aggregated quantity/executed_quantity for order_id={self.order_id}: {e}")
-            logger.info(f"OrderMonitor: {hedge_indicator} Order {self.order_id} ENTRY broker statuses (live): {all_statuses}")
-            # --- Decision logic for main order status ---
-            # PRESERVE EXIT STATUS PRIORITY: Don't overwrite exit statuses with broker-derived OPEN status
-            current_db_status = order_row.get('status') if order_row else None
-            main_status = None
-            
-            logger.info(f"OrderMonitor: {hedge_indicator} Status decision logic: current_db_status={current_db_status}, " +
-                       f"broker_status_set={status_set}")
-            
-            # Check if current order status is an exit status (base or PENDING) - preserve it
-            if current_db_status and (
-                current_db_status.startswith('EXIT_') or 
-                current_db_status.endswith('_PENDING') or
-                current_db_status in ('CLOSED', 'CANCELLED', 'REJECTED', 'FAILED', 'EXIT_ENTRY_FAILED')
+                    if current_order is None:
+                        current_order = await get_order_by_id(session, self.order_id)
+            total_quantity = 0
+            total_executed_quantity = 0
+            vwap_total_value = 0.0
+            vwap_total_qty = 0.0
+            for be in broker_exec_rows:
+                q = be.get('quantity') or 0
+                eq = be.get('executed_quantity') or 0
+                exec_price = be.get('execution_price') or 0
+                try:
+                    q = float(q) if q is not None else 0
+                except Exception:
+                    q = 0
+                try:
+                    eq = float(eq) if eq is not None else 0
+                except Exception:
+                    eq = 0
+                try:
+                    exec_price = float(exec_price) if exec_price is not None else 0
+                except Exception:
+                    exec_price = 0
+                total_quantity += q
+                total_executed_quantity += eq
+                vwap_total_value += eq * exec_price
+                vwap_total_qty += eq
+            entry_price = round(vwap_total_value / vwap_total_qty, 2) if vwap_total_qty > 0 else None
+            current_qty = current_order.get('qty') if current_order else None
+            current_executed_quantity = current_order.get('executed_quantity') if current_order else None
+            current_entry_price = current_order.get('entry_price') if current_order else None
+            # Only update if any value changed
+            if (
+                float(total_quantity) != float(current_qty or 0) or
+                float(total_executed_quantity) != float(current_executed_quantity or 0) or
+                (entry_price is not None and float(entry_price) != float(current_entry_price or 0))
             ):
-                # Preserve the exit/terminal status, don't override with broker status
-                main_status = current_db_status
-                logger.info(f"OrderMonitor: {hedge_indicator} Preserving exit/terminal status '{current_db_status}' " +
-                           f"for order_id={self.order_id} (not overriding with broker status)")
+                update_fields = {"qty": total_quantity, "executed_quantity": total_executed_quantity}
+                if entry_price is not None:
+                    update_fields["entry_price"] = entry_price
+                await update_rows_in_table(
+                    target_table=orders,
+                    condition=orders.c.id == self.order_id,
+                    new_values=update_fields
+                )
+                self._invalidate_snapshot(order=True)
+                logger.info(f"OrderMonitor: {hedge_indicator} Updated Orders table for order_id={self.order_id} " +
+                          f"with qty={total_quantity}, executed_quantity={total_executed_quantity}, entry_price={entry_price}")
             else:
-                # Normal broker-based status logic for non-exit statuses
-                if any(s in ("FILLED", "PARTIALLY_FILLED", "OPEN") for s in status_set):
-                    main_status = OrderStatus.OPEN
-                elif all(s == "PENDING" for s in all_statuses) and all_statuses:
-                    main_status = OrderStatus.AWAITING_ENTRY
-                elif all(s == "CANCELLED" for s in all_statuses) and all_statuses:
-                    main_status = OrderStatus.CANCELLED
-                elif all(s == "REJECTED" for s in all_statuses) and all_statuses:
-                    main_status = OrderStatus.REJECTED
-                elif all(s == "FAILED" for s in all_statuses) and all_statuses:
-                    main_status = OrderStatus.FAILED
-                elif all(s in ("REJECTED", "FAILED") for s in all_statuses) and all_statuses:
-                    main_status = OrderStatus.CANCELLED
-            # Only update Orders table if status changed AND we're not preserving an exit status
-            if main_status is not None and main_status != last_main_status:
-                # Don't update DB if we're preserving an exit status (it's already the correct status)
-                if main_status == current_db_status:
-                    logger.debug(f"OrderMonitor: Status preserved for order_id={self.order_id}: {main_status} (no DB update needed)")
-                    last_main_status = main_status  # Update local tracking
-                elif main_status == OrderStatus.OPEN and any(s in ("FILLED", "PARTIALLY_FILLED") for s in status_set):
-                    from datetime import datetime, timezone
-                    entry_time = datetime.now(timezone.utc)
-                    logger.info(f"OrderMonitor: {hedge_indicator} Updating order_id={self.order_id} to {main_status} with entry_time={entry_time}")
-                    await self.order_manager.update_order_status_in_db(self.order_id, main_status)
-                    await self.order_manager.update_order_stop_loss_in_db(self.order_id, order_row.get('stop_loss'))
-                    from algosat.core.db import AsyncSessionLocal, update_rows_in_table
-                    from algosat.core.dbschema import orders
+                logger.debug(f"OrderMonitor: {hedge_indicator} No change in qty, executed_quantity, entry_price for order_id={self.order_id}. Skipping DB update.")
+        except Exception as e:
+            logger.error(f"OrderMonitor: {hedge_indicator} Error updating aggregated quantity/executed_quantity for order_id={self.order_id}: {e}")
+        logger.info(f"OrderMonitor: {hedge_indicator} Order {self.order_id} ENTRY broker statuses (live): {all_statuses}")
+        # --- Decision logic for main order status ---
+        # PRESERVE EXIT STATUS PRIORITY: Don't overwrite exit statuses with broker-derived OPEN status
+        current_db_status = order_row.get('status') if order_row else None
+        main_status = None
+        
+        logger.info(f"OrderMonitor: {hedge_indicator} Status decision logic: current_db_status={current_db_status}, " +
+                   f"broker_status_set={status_set}")
+        
+        # Check if current order status is an exit status (base or PENDING) - preserve it
+        if current_db_status and (
+            current_db_status.startswith('EXIT_') or 
+            current_db_status.endswith('_PENDING') or
+            current_db_status in ('CLOSED', 'CANCELLED', 'REJECTED', 'FAILED', 'EXIT_ENTRY_FAILED')
+        ):
+            # Preserve the exit/terminal status, don't override with broker status
+            main_status = current_db_status
+            logger.info(f"OrderMonitor: {hedge_indicator} Preserving exit/terminal status '{current_db_status}' " +
+                       f"for order_id={self.order_id} (not overriding with broker status)")
+        else:
+            # Normal broker-based status logic for non-exit statuses
+            if any(s in ("FILLED", "PARTIALLY_FILLED", "OPEN") for s in status_set):
+                main_status = OrderStatus.OPEN
+            elif all(s == "PENDING" for s in all_statuses) and all_statuses:
+                main_status = OrderStatus.AWAITING_ENTRY
+            elif all(s == "CANCELLED" for s in all_statuses) and all_statuses:
+                main_status = OrderStatus.CANCELLED
+            elif all(s == "REJECTED" for s in all_statuses) and all_statuses:
+                main_status = OrderStatus.REJECTED
+            elif all(s == "FAILED" for s in all_statuses) and all_statuses:
+                main_status = OrderStatus.FAILED
+            elif all(s in ("REJECTED", "FAILED") for s in all_statuses) and all_statuses:
+                main_status = OrderStatus.CANCELLED
+        # Only update Orders table if status changed AND we're not preserving an exit status
+        if main_status is not None and main_status != self._last_main_status:
+            # Don't update DB if we're preserving an exit status (it's already the correct status)
+            if main_status == current_db_status:
+                logger.debug(f"OrderMonitor: Status preserved for order_id={self.order_id}: {main_status} (no DB update needed)")
+                self._last_main_status = main_status  # Update local tracking
+            elif main_status == OrderStatus.OPEN and any(s in ("FILLED", "PARTIALLY_FILLED") for s in status_set):
+                from datetime import datetime, timezone
+                entry_time = datetime.now(timezone.utc)
+                logger.info(f"OrderMonitor: {hedge_indicator} Updating order_id={self.order_id} to {main_status} with entry_time={entry_time}")
+                await self.order_manager.update_order_status_in_db(self.order_id, main_status)
+                await self.order_manager.update_order_stop_loss_in_db(self.order_id, order_row.get('stop_loss'))
+                from algosat.core.db import AsyncSessionLocal, update_rows_in_table
+                from algosat.core.dbschema import orders
 
-                    await update_rows_in_table(
-                        target_table=orders,
-                        condition=orders.c.id == self.order_id,
-                        new_values={"entry_time": entry_time}
-                    )
-                    await self._clear_order_cache("Order status updated to OPEN with entry_time")
-                else:
-                    logger.info(f"OrderMonitor: {hedge_indicator} Updating order_id={self.order_id} to {main_status}")
-                    await self.order_manager.update_order_status_in_db(self.order_id, main_status)
-                    await self._clear_order_cache(f"Order status updated to {main_status}")
-                last_main_status = main_status
-                if main_status in (OrderStatus.CANCELLED, OrderStatus.REJECTED, OrderStatus.FAILED, "EXIT_ENTRY_FAILED"):
-                    logger.info(f"OrderMonitor: {hedge_indicator} Order {self.order_id} reached terminal status {main_status}. Checking for child orders to close.")
-                    
-                    # CRITICAL FIX: Close child orders when main order fails
-                    # NOTE: This should only apply to main orders, not hedge orders
-                    if not self.is_hedge:
-                        try:
-                            if await self.order_manager.has_child_orders(self.order_id):
-                                logger.info(f"OrderMonitor: {hedge_indicator} Found child orders for failed main order {self.order_id}. Closing them before stopping monitor.")
-                                await self.order_manager.exit_child_orders(
-                                    parent_order_id=self.order_id,
-                                    exit_reason=f"Parent order {self.order_id} reached terminal status {main_status}",
-                                    check_live_status=True  # Check live status to update hedge orders before exit decisions
-                                )
-                                logger.info(f"OrderMonitor: {hedge_indicator} Successfully closed child orders for failed order {self.order_id}")
-                            else:
-                                logger.debug(f"OrderMonitor: {hedge_indicator} No child orders found for order {self.order_id}")
-                        except Exception as e:
-                            logger.error(f"OrderMonitor: {hedge_indicator} Error closing child orders for failed order {self.order_id}: {e}", exc_info=True)
-                            # Continue to stop monitor even if child order closure fails
-                    else:
-                        logger.info(f"OrderMonitor: {hedge_indicator} Hedge order {self.order_id} reached terminal status {main_status}. Skipping child order closure logic.")
-                    
-                    logger.info(f"OrderMonitor: {hedge_indicator} Order {self.order_id} reached terminal status {main_status}. Stopping monitor.")
+                await update_rows_in_table(
+                    target_table=orders,
+                    condition=orders.c.id == self.order_id,
+                    new_values={"entry_time": entry_time}
+                )
+                await self._clear_order_cache("Order status updated to OPEN with entry_time")
+            else:
+                logger.info(f"OrderMonitor: {hedge_indicator} Updating order_id={self.order_id} to {main_status}")
+                await self.order_manager.update_order_status_in_db(self.order_id, main_status)
+                await self._clear_order_cache(f"Order status updated to {main_status}")
+            self._last_main_status = main_status
+            if main_status in (OrderStatus.CANCELLED, OrderStatus.REJECTED, OrderStatus.FAILED, "EXIT_ENTRY_FAILED"):
+                logger.info(f"OrderMonitor: {hedge_indicator} Order {self.order_id} reached terminal status {main_status}. Checking for child orders to close.")
+                
+                # CRITICAL FIX: Close child orders when main order fails
+                # NOTE: This should only apply to main orders, not hedge orders
+                if not self.is_hedge:
                     try:
-                        hedge_tag = "🛡️ HEDGE " if self.is_hedge else ""
-                        msg = f"❗ <b>{hedge_tag}Order Terminal Status</b>\n<b>Order ID:</b> <code>{self.order_id}</code>" + \
-                              (f"\n<b>Parent ID:</b> <code>{parent_id}</code>" if parent_id else "") + \
-                              f"\n<b>Status:</b> <code>{main_status}</code>\n<b>Symbol:</b> <code>{order_symbol}</code>\nAll brokers reported this status. Stopping monitor."
-                        send_telegram_async(msg)
+                        if await self.order_manager.has_child_orders(self.order_id):
+                            logger.info(f"OrderMonitor: {hedge_indicator} Found child orders for failed main order {self.order_id}. Closing them before stopping monitor.")
+                            await self.order_manager.exit_child_orders(
+                                parent_order_id=self.order_id,
+                                exit_reason=f"Parent order {self.order_id} reached terminal status {main_status}",
+                                check_live_status=True  # Check live status to update hedge orders before exit decisions
+                            )
+                            logger.info(f"OrderMonitor: {hedge_indicator} Successfully closed child orders for failed order {self.order_id}")
+                        else:
+                            logger.debug(f"OrderMonitor: {hedge_indicator} No child orders found for order {self.order_id}")
                     except Exception as e:
-                        logger.error(f"Failed to send Telegram terminal status notification: {e}")
-                    self.stop()
-                    return
+                        logger.error(f"OrderMonitor: {hedge_indicator} Error closing child orders for failed order {self.order_id}: {e}", exc_info=True)
+                        # Continue to stop monitor even if child order closure fails
+                else:
+                    logger.info(f"OrderMonitor: {hedge_indicator} Hedge order {self.order_id} reached terminal status {main_status}. Skipping child order closure logic.")
                 
-                # Refresh order_row after status update to ensure methods get latest data
+                logger.info(f"OrderMonitor: {hedge_indicator} Order {self.order_id} reached terminal status {main_status}. Stopping monitor.")
                 try:
-                    # Clear cache and fetch fresh order data after DB update
-                    await self._clear_order_cache("After status update - refreshing order data for method calls")
-                    order_row, _, _, _ = await self._get_order_and_strategy(self.order_id)
-                    logger.debug(f"OrderMonitor: Refreshed order_row after status update for order_id={self.order_id}")
+                    hedge_tag = "🛡️ HEDGE " if self.is_hedge else ""
+                    msg = f"❗ <b>{hedge_tag}Order Terminal Status</b>\n<b>Order ID:</b> <code>{self.order_id}</code>" + \
+                          (f"\n<b>Parent ID:</b> <code>{parent_id}</code>" if parent_id else "") + \
+                          f"\n<b>Status:</b> <code>{main_status}</code>\n<b>Symbol:</b> <code>{order_symbol}</code>\nAll brokers reported this status. Stopping monitor."
+                    send_telegram_async(msg)
                 except Exception as e:
-                    logger.error(f"OrderMonitor: Error refreshing order_row after status update: {e}")
-                
-            # REFRESH ORDER STATUS: Get fresh order data after broker execution updates
-            # This ensures we have the latest status for position monitoring and price checks
+                    logger.error(f"Failed to send Telegram terminal status notification: {e}")
+                self.stop()
+                return False
+            
+            # Refresh order_row after status update to ensure methods get latest data
             try:
-                await self._clear_order_cache("Before position monitoring - ensuring fresh order data")
+                # Clear cache and fetch fresh order data after DB update
+                await self._clear_order_cache("After status update - refreshing order data for method calls")
                 order_row, _, _, _ = await self._get_order_and_strategy(self.order_id)
-                logger.debug(f"OrderMonitor: Refreshed order_row before position monitoring for order_id={self.order_id}")
+                logger.debug(f"OrderMonitor: Refreshed order_row after status update for order_id={self.order_id}")
             except Exception as e:
-                logger.error(f"OrderMonitor: Error refreshing order_row before position monitoring: {e}")
-                
-            # --- Combined OPEN order processing: Price-based exit logic + Position monitoring ---
-            # Use actual database status as source of truth, not derived broker status
-            actual_order_status = order_row.get('status') if order_row else None
-            if actual_order_status == 'OPEN':
-                # Fetch current LTP once for both exit logic and position monitoring
-                current_ltp = await self._update_current_price_for_open_order(order_row)
-                
-                # HEDGE ORDER PROTECTION: Price-based exits should only apply to main orders
-                if not self.is_hedge:
-                    await self._check_price_based_exit(order_row, strategy, actual_order_status, current_ltp)
-                else:
-                    logger.debug(f"OrderMonitor: {hedge_indicator} Skipping price-based exit check for hedge order {self.order_id}")
-                
-                # P&L calculation using DB data and current LTP (simplified approach)
-                # NOTE: This P&L calculation should apply to both main and hedge orders for monitoring purposes
-                try:
-                    # Get ENTRY broker executions from database
+                logger.error(f"OrderMonitor: Error refreshing order_row after status update: {e}")
+            
+        # REFRESH ORDER STATUS: Get fresh order data after broker execution updates
+        # This ensures we have the latest status for position monitoring and price checks
+        try:
+            # A snapshot row that no write in this tick has invalidated is already fresh
+            if self._snapshot_order_row() is None:
+                await self._clear_order_cache("Before position monitoring - ensuring fresh order data")
+            order_row, _, _, _ = await self._get_order_and_strategy(self.order_id)
+            logger.debug(f"OrderMonitor: Refreshed order_row before position monitoring for order_id={self.order_id}")
+        except Exception as e:
+            logger.error(f"OrderMonitor: Error refreshing order_row before position monitoring: {e}")
+            
+        # --- Combined OPEN order processing: Price-based exit logic + Position monitoring ---
+        # Use actual database status as source of truth, not derived broker status
+        actual_order_status = order_row.get('status') if order_row else None
+        if actual_order_status == 'OPEN':
+            # Fetch current LTP once for both exit logic and position monitoring
+            current_ltp = await self._update_current_price_for_open_order(order_row)
+            
+            # HEDGE ORDER PROTECTION: Price-based exits should only apply to main orders
+            if not self.is_hedge:
+                await self._check_price_based_exit(order_row, strategy, actual_order_status, current_ltp)
+            else:
+                logger.debug(f"OrderMonitor: {hedge_indicator} Skipping price-based exit check for hedge order {self.order_id}")
+            
+            # P&L calculation using DB data and current LTP (simplified approach)
+            # NOTE: This P&L calculation should apply to both main and hedge orders for monitoring purposes
+            try:
+                # Get ENTRY broker executions from database
+                entry_broker_db_orders = self._snapshot_executions(side='ENTRY')
+                if entry_broker_db_orders is None:
                     async with AsyncSessionLocal() as session:
                         entry_broker_db_orders = await get_broker_executions_for_order(session, self.order_id, side='ENTRY') 
+                
+                # Use the LTP already fetched above for PnL calculations
+                if current_ltp is None or current_ltp <= 0:
+                    logger.warning(f"OrderMonitor: {hedge_indicator} Invalid LTP ({current_ltp}) for order_id={self.order_id}, skipping PnL calculation until valid price is available")
+                    # Skip PnL calculation this cycle, continue monitoring on next iteration
+                else:
+                    logger.debug(f"OrderMonitor: {hedge_indicator} Using fetched LTP={current_ltp} for PnL calculation for order_id={self.order_id}")
                     
-                    # Use the LTP already fetched above for PnL calculations
-                    if current_ltp is None or current_ltp <= 0:
-                        logger.warning(f"OrderMonitor: {hedge_indicator} Invalid LTP ({current_ltp}) for order_id={self.order_id}, skipping PnL calculation until valid price is available")
-                        # Skip PnL calculation this cycle, continue monitoring on next iteration
-                    else:
-                        logger.debug(f"OrderMonitor: {hedge_indicator} Using fetched LTP={current_ltp} for PnL calculation for order_id={self.order_id}")
+                    total_pnl = 0.0
+                    valid_executions_count = 0
+                    
+                    for bro in entry_broker_db_orders:
+                        # Skip processing if broker execution is invalid or failed
+                        broker_status = bro.get('status', '').upper()
+                        symbol_val = bro.get('symbol', None) or bro.get('tradingsymbol', None)
+                        executed_quantity = bro.get('executed_quantity', None) or bro.get('quantity', None)
+                        entry_price = bro.get('execution_price', None)
+                        entry_side = bro.get('action', '').upper()
                         
-                        total_pnl = 0.0
-                        valid_executions_count = 0
+                        # Simple validation: skip if essential data is missing or execution failed
+                        if (broker_status != 'FILLED' or 
+                            symbol_val is None or 
+                            executed_quantity is None or 
+                            executed_quantity <= 0 or
+                            entry_price is None or 
+                            entry_price <= 0):
+                            logger.debug(f"OrderMonitor: {hedge_indicator} Skipping P&L calculation for broker execution - "
+                                       f"status={broker_status}, symbol={symbol_val}, qty={executed_quantity}, price={entry_price}")
+                            continue
                         
-                        for bro in entry_broker_db_orders:
-                            # Skip processing if broker execution is invalid or failed
-                            broker_status = bro.get('status', '').upper()
-                            symbol_val = bro.get('symbol', None) or bro.get('tradingsymbol', None)
-                            executed_quantity = bro.get('executed_quantity', None) or bro.get('quantity', None)
-                            entry_price = bro.get('execution_price', None)
-                            entry_side = bro.get('action', '').upper()
-                            
-                            # Simple validation: skip if essential data is missing or execution failed
-                            if (broker_status != 'FILLED' or 
-                                symbol_val is None or 
-                                executed_quantity is None or 
-                                executed_quantity <= 0 or
-                                entry_price is None or 
-                                entry_price <= 0):
-                                logger.debug(f"OrderMonitor: {hedge_indicator} Skipping P&L calculation for broker execution - "
-                                           f"status={broker_status}, symbol={symbol_val}, qty={executed_quantity}, price={entry_price}")
-                                continue
-                            
-                            # Calculate P&L for this execution using DB data + current LTP
-                            execution_pnl = 0.0
-                            if entry_side == 'BUY':
-                                # Long position: profit when current_price > entry_price
-                                execution_pnl = (current_ltp - float(entry_price)) * executed_quantity
-                            elif entry_side == 'SELL':
-                                # Short position: profit when current_price < entry_price
-                                execution_pnl = (float(entry_price) - current_ltp) * executed_quantity
-                            else:
-                                logger.warning(f"OrderMonitor: {hedge_indicator} Unknown entry side '{entry_side}' for P&L calculation")
-                                continue
-                            
-                            total_pnl += execution_pnl
-                            valid_executions_count += 1
-                            
-                            logger.info(f"OrderMonitor: {hedge_indicator} P&L calculation for execution:")
-                            logger.info(f"  Broker ID: {bro.get('broker_id')}")
-                            logger.info(f"  Entry Side: {entry_side}")
-                            logger.info(f"  Entry Price: {entry_price}")
-                            logger.info(f"  Current LTP: {current_ltp}")
-                            logger.info(f"  Executed Quantity: {executed_quantity}")
-                            logger.info(f"  Execution P&L: {execution_pnl}")
+                        # Calculate P&L for this execution using DB data + current LTP
+                        execution_pnl = 0.0
+                        if entry_side == 'BUY':
+                            # Long position: profit when current_price > entry_price
+                            execution_pnl = (current_ltp - float(entry_price)) * executed_quantity
+                        elif entry_side == 'SELL':
+                            # Short position: profit when current_price < entry_price
+                            execution_pnl = (float(entry_price) - current_ltp) * executed_quantity
+                        else:
+                            logger.warning(f"OrderMonitor: {hedge_indicator} Unknown entry side '{entry_side}' for P&L calculation")
+                            continue
                         
-                        logger.info(f"OrderMonitor: {hedge_indicator} Total P&L calculation completed for order_id={self.order_id}:")
-                        logger.info(f"  Valid executions processed: {valid_executions_count}")
-                        logger.info(f"  Total P&L: {total_pnl}")
+                        total_pnl += execution_pnl
+                        valid_executions_count += 1
                         
-                        # Update order PnL field in DB
+                        logger.info(f"OrderMonitor: {hedge_indicator} P&L calculation for execution:")
+                        logger.info(f"  Broker ID: {bro.get('broker_id')}")
+                        logger.info(f"  Entry Side: {entry_side}")
+                        logger.info(f"  Entry Price: {entry_price}")
+                        logger.info(f"  Current LTP: {current_ltp}")
+                        logger.info(f"  Executed Quantity: {executed_quantity}")
+                        logger.info(f"  Execution P&L: {execution_pnl}")
+                    
+                    logger.info(f"OrderMonitor: {hedge_indicator} Total P&L calculation completed for order_id={self.order_id}:")
+                    logger.info(f"  Valid executions processed: {valid_executions_count}")
+                    logger.info(f"  Total P&L: {total_pnl}")
+                    
+                    # Update order PnL field in DB
+                    try:
+                        logger.info(f"OrderMonitor: {hedge_indicator} About to update PnL for order_id={self.order_id} with value={total_pnl}")
+                        await self.order_manager.update_order_pnl_in_db(self.order_id, total_pnl)
+                        logger.info(f"OrderMonitor: {hedge_indicator} Successfully called update_order_pnl_in_db for order_id={self.order_id}: {total_pnl}")
+                    except Exception as e:
+                        logger.error(f"OrderMonitor: {hedge_indicator} Error updating order PnL for order_id={self.order_id}: {e}")
+                    
+                    # � UPDATE BROKER EXECUTIONS PNL: Update P&L for all ENTRY broker executions using current LTP
+                    try:
+                        await self._update_broker_executions_pnl(current_ltp, entry_broker_db_orders)
+                    except Exception as e:
+                        logger.error(f"OrderMonitor: {hedge_indicator} Error updating broker executions P&L for order_id={self.order_id}: {e}")
+                    
+                    # �🚨 PER-TRADE LOSS VALIDATION - ONLY FOR MAIN ORDERS 🚨
+                    # HEDGE ORDER PROTECTION: Hedge orders should NOT trigger loss limit exits
+                    if not self.is_hedge:
                         try:
-                            logger.info(f"OrderMonitor: {hedge_indicator} About to update PnL for order_id={self.order_id} with value={total_pnl}")
-                            await self.order_manager.update_order_pnl_in_db(self.order_id, total_pnl)
-                            logger.info(f"OrderMonitor: {hedge_indicator} Successfully called update_order_pnl_in_db for order_id={self.order_id}: {total_pnl}")
+                            logger.debug(f"OrderMonitor: {hedge_indicator} Starting per-trade loss validation for order_id={self.order_id} with current P&L: {total_pnl}")
                             
-                            # Verify the update by reading back from DB
-                            from algosat.core.db import AsyncSessionLocal, get_order_by_id
-                            async with AsyncSessionLocal() as session:
-                                updated_order = await get_order_by_id(session, self.order_id)
-                                current_pnl_in_db = updated_order.get('pnl') if updated_order else None
-                                logger.info(f"OrderMonitor: {hedge_indicator} PnL verification for order_id={self.order_id} - Expected: {total_pnl}, Actual in DB: {current_pnl_in_db}")
-                        except Exception as e:
-                            logger.error(f"OrderMonitor: {hedge_indicator} Error updating order PnL for order_id={self.order_id}: {e}")
-                        
-                        # � UPDATE BROKER EXECUTIONS PNL: Update P&L for all ENTRY broker executions using current LTP
-                        try:
-                            await self._update_broker_executions_pnl(current_ltp, entry_broker_db_orders)
-                        except Exception as e:
-                            logger.error(f"OrderMonitor: {hedge_indicator} Error updating broker executions P&L for order_id={self.order_id}: {e}")
-                        
-                        # �🚨 PER-TRADE LOSS VALIDATION - ONLY FOR MAIN ORDERS 🚨
-                        # HEDGE ORDER PROTECTION: Hedge orders should NOT trigger loss limit exits
-                        if not self.is_hedge:
-                            try:
-                                logger.debug(f"OrderMonitor: {hedge_indicator} Starting per-trade loss validation for order_id={self.order_id} with current P&L: {total_pnl}")
-                                
-                                # 1. Get trade enabled brokers count from risk summary and current order data
+                            # 1. Get trade enabled brokers count from risk summary and current order data
+                            if self._tick_snapshot is not None and self._tick_snapshot.trade_enabled_brokers is not None:
+                                trade_enabled_brokers = self._tick_snapshot.trade_enabled_brokers
+                            else:
                                 from algosat.core.db import get_broker_risk_summary
                                 async with AsyncSessionLocal() as session:
                                     risk_data = await get_broker_risk_summary(session)
                                     trade_enabled_brokers = risk_data.get('summary', {}).get('trade_enabled_brokers', 0)
-                                    
-                                # 2. Get lot_qty from current order (within same session)
-                                current_order = await get_order_by_id(session, self.order_id)
-                                lot_qty = current_order.get('lot_qty', 0) if current_order else 0
-                                executed_lot_qty = current_order.get('executed_quantity', 0) if current_order else 0
-                                
-                                # 3. Get lot_size from strategy config and calculate actual executed lots
-                                lot_size = None  # Will be fetched from strategy config
-                                actual_executed_lots = executed_lot_qty  # Default to executed_lot_qty
-                                calculation_method = "direct"  # Track how actual_executed_lots was calculated
                                 
-                                if strategy_config and strategy_config.get('trade'):
-                                    import json
-                                    try:
-                                        trade_config = json.loads(strategy_config['trade']) if isinstance(strategy_config['trade'], str) else strategy_config['trade']
-                                        lot_size = trade_config.get('lot_size')
-                                        if lot_size and lot_size > 0:
-                                            actual_executed_lots = executed_lot_qty / lot_size
-                                            calculation_method = "lot_size_division"
-                                            logger.debug(f"OrderMonitor: {hedge_indicator} Using lot_size from strategy config for order_id={self.order_id}: "
-                                                       f"executed_lot_qty={executed_lot_qty} ÷ lot_size={lot_size} = {actual_executed_lots}")
-                                        else:
-                                            # Fallback: use executed_lot_qty / lot_qty when lot_size not available
-                                            if lot_qty > 0:
-                                                actual_executed_lots = executed_lot_qty / lot_qty
-                                                calculation_method = "lot_qty_division"
-                                                logger.debug(f"OrderMonitor: {hedge_indicator} lot_size not available, using lot_qty fallback for order_id={self.order_id}: "
-                                                           f"executed_lot_qty={executed_lot_qty} ÷ lot_qty={lot_qty} = {actual_executed_lots}")
-                                            else:
-                                                logger.warning(f"OrderMonitor: {hedge_indicator} Both lot_size and lot_qty are invalid, using executed_lot_qty as-is: {executed_lot_qty}")
-                                    except Exception as e:
-                                        logger.error(f"OrderMonitor: {hedge_indicator} Error parsing trade config for lot_size: {e}")
-                                        # Fallback to lot_qty division if strategy config parsing fails
+                            # 2. Get lot_qty from current order (refreshed before position monitoring)
+                            current_order = order_row
+                            lot_qty = current_order.get('lot_qty', 0) if current_order else 0
+                            executed_lot_qty = current_order.get('executed_quantity', 0) if current_order else 0
+                            
+                            # 3. Get lot_size from strategy config and calculate actual executed lots
+                            lot_size = None  # Will be fetched from strategy config
+                            actual_executed_lots = executed_lot_qty  # Default to executed_lot_qty
+                            calculation_method = "direct"  # Track how actual_executed_lots was calculated
+                            
+                            if strategy_config and strategy_config.get('trade'):
+                                import json
+                                try:
+                                    trade_config = json.loads(strategy_config['trade']) if isinstance(strategy_config['trade'], str) else strategy_config['trade']
+                                    lot_size = trade_config.get('lot_size')
+                                    if lot_size and lot_size > 0:
+                                        actual_executed_lots = executed_lot_qty / lot_size
+                                        calculation_method = "lot_size_division"
+                                        logger.debug(f"OrderMonitor: {hedge_indicator} Using lot_size from strategy config for order_id={self.order_id}: "
+                                                   f"executed_lot_qty={executed_lot_qty} ÷ lot_size={lot_size} = {actual_executed_lots}")
+                                    else:
+                                        # Fallback: use executed_lot_qty / lot_qty when lot_size not available
                                         if lot_qty > 0:
                                             actual_executed_lots = executed_lot_qty / lot_qty
-                                            calculation_method = "lot_qty_division_fallback"
-                                            logger.debug(f"OrderMonitor: {hedge_indicator} Config parsing failed, using lot_qty fallback for order_id={self.order_id}: "
+                                            calculation_method = "lot_qty_division"
+                                            logger.debug(f"OrderMonitor: {hedge_indicator} lot_size not available, using lot_qty fallback for order_id={self.order_id}: "
                                                        f"executed_lot_qty={executed_lot_qty} ÷ lot_qty={lot_qty} = {actual_executed_lots}")
-                                else:
-                                    # No strategy config available, use lot_qty division
+                                        else:
+                                            logger.warning(f"OrderMonitor: {hedge_indicator} Both lot_size and lot_qty are invalid, using executed_lot_qty as-is: {executed_lot_qty}")
+                                except Exception as e:
+                                    logger.error(f"OrderMonitor: {hedge_indicator} Error parsing trade config for lot_size: {e}")
+                                    # Fallback to lot_qty division if strategy config parsing fails
                                     if lot_qty > 0:
                                         actual_executed_lots = executed_lot_qty / lot_qty
-                                        calculation_method = "lot_qty_division_no_config"
-                                        logger.debug(f"OrderMonitor: {hedge_indicator} No strategy config found, using lot_qty for order_id={self.order_id}: "
+                                        calculation_method = "lot_qty_division_fallback"
+                                        logger.debug(f"OrderMonitor: {hedge_indicator} Config parsing failed, using lot_qty fallback for order_id={self.order_id}: "
                                                    f"executed_lot_qty={executed_lot_qty} ÷ lot_qty={lot_qty} = {actual_executed_lots}")
-                                    else:
-                                        logger.warning(f"OrderMonitor: {hedge_indicator} No strategy config and invalid lot_qty, using executed_lot_qty as-is: {executed_lot_qty}")
-                                
-                                logger.debug(f"OrderMonitor: {hedge_indicator} Per-trade loss validation data for order_id={self.order_id}: "
-                                           f"lot_qty={lot_qty}, executed_lot_qty={executed_lot_qty}, actual_executed_lots={actual_executed_lots}, "
-                                           f"calculation_method={calculation_method}, trade_enabled_brokers={trade_enabled_brokers}")
-                                
-                                # 4. Get max_loss_per_lot from strategy config
-                                max_loss_per_lot = 0
-                                if strategy_config and strategy_config.get('trade'):
-                                    import json
-                                    try:
-                                        trade_config = json.loads(strategy_config['trade']) if isinstance(strategy_config['trade'], str) else strategy_config['trade']
-                                        max_loss_per_lot = trade_config.get('max_loss_per_lot', 0)
-                                        logger.debug(f"OrderMonitor: {hedge_indicator} Strategy config max_loss_per_lot for order_id={self.order_id}: {max_loss_per_lot}")
-                                    except Exception as e:
-                                        logger.error(f"OrderMonitor: {hedge_indicator} Error parsing trade config for max_loss_per_lot: {e}")
+                            else:
+                                # No strategy config available, use lot_qty division
+                                if lot_qty > 0:
+                                    actual_executed_lots = executed_lot_qty / lot_qty
+                                    calculation_method = "lot_qty_division_no_config"
+                                    logger.debug(f"OrderMonitor: {hedge_indicator} No strategy config found, using lot_qty for order_id={self.order_id}: "
+                                               f"executed_lot_qty={executed_lot_qty} ÷ lot_qty={lot_qty} = {actual_executed_lots}")
                                 else:
-                                    logger.debug(f"OrderMonitor: {hedge_indicator} No strategy config or trade config found for order_id={self.order_id}")
-                                
-                                # 5. Calculate total risk exposure using ACTUAL EXECUTED LOTS (executed_lot_qty / lot_size or lot_qty)
-                                # total_risk_exposure = actual_executed_lots * trade_enabled_brokers * max_loss_per_lot
-                                total_risk_exposure = actual_executed_lots * max_loss_per_lot
-                                logger.debug(f"OrderMonitor: {hedge_indicator} Risk calculation for order_id={self.order_id}: "
-                                           f"actual_executed_lots={actual_executed_lots} (via {calculation_method}) × max_loss_per_lot={max_loss_per_lot} = {total_risk_exposure}")
+                                    logger.warning(f"OrderMonitor: {hedge_indicator} No strategy config and invalid lot_qty, using executed_lot_qty as-is: {executed_lot_qty}")
+                            
+                            logger.debug(f"OrderMonitor: {hedge_indicator} Per-trade loss validation data for order_id={self.order_id}: "
+                                       f"lot_qty={lot_qty}, executed_lot_qty={executed_lot_qty}, actual_executed_lots={actual_executed_lots}, "
+                                       f"calculation_method={calculation_method}, trade_enabled_brokers={trade_enabled_brokers}")
+                            
+                            # 4. Get max_loss_per_lot from strategy config
+                            max_loss_per_lot = 0
+                            if strategy_config and strategy_config.get('trade'):
+                                import json
+                                try:
+                                    trade_config = json.loads(strategy_config['trade']) if isinstance(strategy_config['trade'], str) else strategy_config['trade']
+                                    max_loss_per_lot = trade_config.get('max_loss_per_lot', 0)
+                                    logger.debug(f"OrderMonitor: {hedge_indicator} Strategy config max_loss_per_lot for order_id={self.order_id}: {max_loss_per_lot}")
+                                except Exception as e:
+                                    logger.error(f"OrderMonitor: {hedge_indicator} Error parsing trade config for max_loss_per_lot: {e}")
+                            else:
+                                logger.debug(f"OrderMonitor: {hedge_indicator} No strategy config or trade config found for order_id={self.order_id}")
+                            
+                            # 5. Calculate total risk exposure using ACTUAL EXECUTED LOTS (executed_lot_qty / lot_size or lot_qty)
+                            # total_risk_exposure = actual_executed_lots * trade_enabled_brokers * max_loss_per_lot
+                            total_risk_exposure = actual_executed_lots * max_loss_per_lot
+                            logger.debug(f"OrderMonitor: {hedge_indicator} Risk calculation for order_id={self.order_id}: "
+                                       f"actual_executed_lots={actual_executed_lots} (via {calculation_method}) × max_loss_per_lot={max_loss_per_lot} = {total_risk_exposure}")
+                            
+                            # logger.debug(f"OrderMonitor: {hedge_indicator} Risk calculation for order_id={self.order_id}: "
+                            #            f"actual_executed_lots={actual_executed_lots} (via {calculation_method}) × trade_enabled_brokers={trade_enabled_brokers} × max_loss_per_lot={max_loss_per_lot} = {total_risk_exposure}")
+                            
+                            # 6. Check if loss exceeds limit
+                            if total_risk_exposure > 0 and total_pnl < -abs(total_risk_exposure) and actual_executed_lots > 0:
+                                logger.critical(f"🚨 {hedge_indicator} PER-TRADE LOSS LIMIT EXCEEDED for order_id={self.order_id}! "
+                                              f"Current P&L: {total_pnl}, Max Loss Limit: {total_risk_exposure} "
+                                              f"(actual_executed_lots: {actual_executed_lots} × brokers: {trade_enabled_brokers} × max_loss_per_lot: {max_loss_per_lot}) "
+                                              f"[executed_lot_qty: {executed_lot_qty}, calculation_method: {calculation_method}, "
+                                              f"lot_size: {lot_size}, lot_qty: {lot_qty}]")
                                 
-                                # logger.debug(f"OrderMonitor: {hedge_indicator} Risk calculation for order_id={self.order_id}: "
-                                #            f"actual_executed_lots={actual_executed_lots} (via {calculation_method}) × trade_enabled_brokers={trade_enabled_brokers} × max_loss_per_lot={max_loss_per_lot} = {total_risk_exposure}")
+                                # 7. Exit the order immediately
+                                await self.order_manager.exit_order(self.order_id, exit_reason="Per-trade loss limit exceeded")
+                                # Update status to max loss exit PENDING - let check_and_complete_pending_exits handle completion
+                                from algosat.common import constants
+                                await self.order_manager.update_order_status_in_db(self.order_id, f"{constants.TRADE_STATUS_EXIT_MAX_LOSS}_PENDING")
+                                await self._clear_order_cache("Per-trade loss limit exit status updated to PENDING")
+                                logger.critical(f"🚨 {hedge_indicator} Per-trade loss limit exit set to PENDING for order_id={self.order_id}. PENDING processor will complete the exit.")
+                                # Re-run immediately - PENDING check at beginning will handle completion
+                                self._rerun_immediately = True
+                                return True
+                            else:
+                                logger.debug(f"OrderMonitor: {hedge_indicator} Per-trade risk check PASSED for order_id={self.order_id}. "
+                                           f"Current P&L: {total_pnl}, Max Loss Limit: {total_risk_exposure}, actual_executed_lots: {actual_executed_lots} (via {calculation_method}). "
+                                           f"Loss check: {total_pnl} >= -{abs(total_risk_exposure)} ? {total_pnl >= -abs(total_risk_exposure)}")
                                 
-                                # 6. Check if loss exceeds limit
-                                if total_risk_exposure > 0 and total_pnl < -abs(total_risk_exposure) and actual_executed_lots > 0:
-                                    logger.critical(f"🚨 {hedge_indicator} PER-TRADE LOSS LIMIT EXCEEDED for order_id={self.order_id}! "
-                                                  f"Current P&L: {total_pnl}, Max Loss Limit: {total_risk_exposure} "
-                                                  f"(actual_executed_lots: {actual_executed_lots} × brokers: {trade_enabled_brokers} × max_loss_per_lot: {max_loss_per_lot}) "
-                                                  f"[executed_lot_qty: {executed_lot_qty}, calculation_method: {calculation_method}, "
-                                                  f"lot_size: {lot_size}, lot_qty: {lot_qty}]")
-                                    
-                                    # 7. Exit the order immediately
-                                    await self.order_manager.exit_order(self.order_id, exit_reason="Per-trade loss limit exceeded")
-                                    # Update status to max loss exit PENDING - let check_and_complete_pending_exits handle completion
-                                    from algosat.common import constants
-                                    await self.order_manager.update_order_status_in_db(self.order_id, f"{constants.TRADE_STATUS_EXIT_MAX_LOSS}_PENDING")
-                                    await self._clear_order_cache("Per-trade loss limit exit status updated to PENDING")
-                                    logger.critical(f"🚨 {hedge_indicator} Per-trade loss limit exit set to PENDING for order_id={self.order_id}. PENDING processor will complete the exit.")
-                                    # Continue monitoring loop - PENDING check at beginning will handle completion
-                                    continue
-                                else:
-                                    logger.debug(f"OrderMonitor: {hedge_indicator} Per-trade risk check PASSED for order_id={self.order_id}. "
-                                               f"Current P&L: {total_pnl}, Max Loss Limit: {total_risk_exposure}, actual_executed_lots: {actual_executed_lots} (via {calculation_method}). "
-                                               f"Loss check: {total_pnl} >= -{abs(total_risk_exposure)} ? {total_pnl >= -abs(total_risk_exposure)}")
-                                    
-                            except Exception as e:
-                                logger.error(f"OrderMonitor: {hedge_indicator} Error in per-trade loss validation for order_id={self.order_id}: {e}")
-                        else:
-                            logger.debug(f"OrderMonitor: {hedge_indicator} Skipping per-trade loss validation for hedge order {self.order_id}")                    # Note: Position closure detection has been removed since we now rely on 
-                    # exit order status tracking instead of broker position matching
-                    
-                except Exception as e:
-                    logger.error(f"OrderMonitor: {hedge_indicator} Error in P&L monitoring: {e}", exc_info=True)
-            logger.debug(f"OrderMonitor: {hedge_indicator} Broker position monitoring completed for order_id={self.order_id}")
-            logger.debug(f"Next check in {self.price_order_monitor_seconds} seconds...")
-            await asyncio.sleep(self.price_order_monitor_seconds)
-        logger.info(f"OrderMonitor: {hedge_indicator} Stopping price monitor for order_id={self.order_id} (last status: {last_main_status})")
+                        except Exception as e:
+                            logger.error(f"OrderMonitor: {hedge_indicator} Error in per-trade loss validation for order_id={self.order_id}: {e}")
+                    else:
+                        logger.debug(f"OrderMonitor: {hedge_indicator} Skipping per-trade loss validation for hedge order {self.order_id}")                    # Note: Position closure detection has been removed since we now rely on 
+                # exit order status tracking instead of broker position matching
+                
+            except Exception as e:
+                logger.error(f"OrderMonitor: {hedge_indicator} Error in P&L monitoring: {e}", exc_info=True)
+        logger.debug(f"OrderMonitor: {hedge_indicator} Broker position monitoring completed for order_id={self.order_id}")
+        return True
     
     async def _check_price_based_exit(self, order_row, strategy, current_main_status, current_ltp=None):
         """
@@ -1980,6 +2110,18 @@ class OrderMonitor:
         # Append -BO-1 suffix for Fyers BO orders without existing suffix
         return f"{broker_order_id}-BO-1"
 
+    @staticmethod
+    def _observe_fill_detection(broker_name, execution_time) -> None:
+        """
+        Record how long after the broker's execution time the fill was noticed. Normalized
+        orders carry execution_time as a naive IST datetime; anything else is skipped.
+        """
+        if not broker_name or not isinstance(execution_time, datetime):
+            return
+        delay = (get_ist_datetime() - localize_to_ist(execution_time)).total_seconds()
+        if delay >= 0:
+            trading_metrics.fill_detection_seconds.labels(broker=broker_name).observe(delay)
+
     async def _get_broker_name_with_cache(self, broker_id: int) -> str:
         """
         Get broker name by ID with long-lived caching (24 hours).
@@ -2072,9 +2214,14 @@ class OrderMonitor:
                 logger.warning(f"OrderMonitor: No strike_symbol found for order_id={self.order_id}")
                 return None
                 
-            # Fetch LTP directly using data_manager.get_ltp()
-            logger.info(f"OrderMonitor: Fetching current LTP for order_id={self.order_id}, symbol={strike_symbol}")
-            ltp_data = await self.data_manager.get_ltp(strike_symbol)
+            snapshot = self._tick_snapshot
+            if snapshot is not None and snapshot.ltp is not None:
+                # LTP was batch-fetched for all monitored orders by the scheduler this tick
+                ltp_data = {strike_symbol: snapshot.ltp}
+            else:
+                # Fetch LTP directly using data_manager.get_ltp()
+                logger.info(f"OrderMonitor: Fetching current LTP for order_id={self.order_id}, symbol={strike_symbol}")
+                ltp_data = await self.data_manager.get_ltp(strike_symbol)
             logger.debug(f"OrderMonitor: Fetched LTP data for order_id={self.order_id}, symbol={strike_symbol}: {ltp_data}")
             
             if ltp_data and isinstance(ltp_data, dict):
@@ -2380,6 +2527,7 @@ class OrderMonitor:
         except Exception as e:
             logger.error(f"OrderMonitor: Error getting strategy context for order_id={self.order_id}: {e}")
             strategy_context = None
+        self._strategy_context = strategy_context
         
         # Set strategy context for all OrderMonitor operations
         with set_strategy_context(strategy_context) if strategy_context else set_strategy_context("order_monitor"):
@@ -2454,15 +2602,27 @@ class OrderMonitor:
                     self.signal_monitor_seconds = 5 * 60
             logger.info(f"Starting monitors for order_id={self.order_id} (price: {self.price_order_monitor_seconds}s, signal: {self.signal_monitor_seconds}s)")
             
-            # For hedge orders, only run price monitor (skip signal monitor)
-            if self.is_hedge:
-                logger.info(f"OrderMonitor: Running only price monitor for hedge order {self.order_id}")
-                await self._price_order_monitor()
+            # With a scheduler, price ticks are driven in batch; this task only waits for stop()
+            if self.scheduler is not None:
+                await self.data_manager.ensure_broker()
+                self.scheduler.register(self)
+                price_monitor = self._stopped.wait()
             else:
-                await asyncio.gather(self._price_order_monitor(), self._signal_monitor())
+                price_monitor = self._price_order_monitor()
+            try:
+                # For hedge orders, only run price monitor (skip signal monitor)
+                if self.is_hedge:
+                    logger.info(f"OrderMonitor: Running only price monitor for hedge order {self.order_id}")
+                    await price_monitor
+                else:
+                    await asyncio.gather(price_monitor, self._signal_monitor())
+            finally:
+                if self.scheduler is not None:
+                    self.scheduler.unregister(self.order_id)
 
     def stop(self) -> None:
         self._running = False
+        self._stopped.set()
 
     @property
     async def strategy(self):
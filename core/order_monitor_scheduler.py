@@ -0,0 +1,301 @@
+"""
+Batched scheduler for OrderMonitor price ticks.
+
+Instead of every OrderMonitor polling on its own timer (its own DB session, order and
+broker_executions queries and LTP call per order per tick), the scheduler runs one tick for
+all registered monitors: it bulk-loads their orders and broker_executions in two queries,
+batch-fetches LTPs for the symbols that need one, and then runs each monitor's
+price/PENDING state machine against that snapshot.
+
+Between regular ticks, wake() runs an immediate tick for just the orders whose broker
+order ids were reported by a push source (the order-update stream), so a fill or SL hit
+is acted on without waiting for the next interval. An order registered since the last
+snapshot load is not indexed yet; a wake for an unknown broker order id ticks those orders,
+which loads and indexes their executions.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Dict, Iterable, Optional, Set
+
+from algosat.common.logger import get_logger
+from algosat.core.data_manager import DataManager
+from algosat.core.order_monitor import OrderMonitor, OrderTickSnapshot, DEFAULT_ORDER_MONITOR_INTERVAL
+
+logger = get_logger("OrderMonitorScheduler")
+
+# Number of recent ticks kept for average/max latency stats
+LATENCY_WINDOW = 200
+
+
+def _needs_ltp(order_row: Optional[dict]) -> bool:
+    """An order needs a fresh LTP when it is OPEN or waiting for an exit to complete."""
+    status = (order_row or {}).get('status') or ''
+    return status == 'OPEN' or status.endswith('_PENDING')
+
+
+def _base_broker_order_id(broker_order_id) -> str:
+    """Broker order id without the Fyers BO leg suffix ("<id>-BO-1" -> "<id>")."""
+    return str(broker_order_id).split('-BO-')[0]
+
+
+class OrderMonitorScheduler:
+    """
+    Drives the price ticks of all registered OrderMonitors from a single loop.
+    Signal monitors keep their own (much slower) timers inside OrderMonitor.start().
+    """
+
+    def __init__(
+        self,
+        data_manager: DataManager,
+        interval: float = DEFAULT_ORDER_MONITOR_INTERVAL,
+        max_concurrency: int = 10,
+    ):
+        self.data_manager = data_manager
+        self.interval = interval
+        self.max_concurrency = max_concurrency
+        self._monitors: Dict[int, OrderMonitor] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+        # Latency metrics
+        self._tick_count = 0
+        self._tick_durations = deque(maxlen=LATENCY_WINDOW)
+        self._last_tick: Dict[str, float] = {}
+        self._order_latency: Dict[int, Dict[str, float]] = {}
+        # Push wake-ups: broker order id -> monitored order id (updated by every snapshot load),
+        # monitors not loaded since they registered, and pending wakes
+        self._broker_order_index: Dict[str, int] = {}
+        self._unindexed: Set[int] = set()
+        self._wake_event = asyncio.Event()
+        self._woken_orders: Set[int] = set()
+        self._wake_count = 0
+
+    def register(self, monitor: OrderMonitor) -> None:
+        order_id = int(monitor.order_id)
+        self._monitors[order_id] = monitor
+        self._unindexed.add(order_id)
+        self._order_latency.setdefault(order_id, {"ticks": 0, "last_ms": 0.0, "avg_ms": 0.0, "max_ms": 0.0})
+        logger.debug(f"OrderMonitorScheduler: Registered order_id={order_id} ({len(self._monitors)} monitored)")
+
+    def unregister(self, order_id) -> None:
+        order_id = int(order_id)
+        if self._monitors.pop(order_id, None) is not None:
+            logger.debug(f"OrderMonitorScheduler: Unregistered order_id={order_id} ({len(self._monitors)} monitored)")
+        self._order_latency.pop(order_id, None)
+        self._woken_orders.discard(order_id)
+        self._unindexed.discard(order_id)
+        self._broker_order_index = {
+            broker_order_id: owner for broker_order_id, owner in self._broker_order_index.items() if owner != order_id
+        }
+
+    def is_monitoring(self, order_id) -> bool:
+        return int(order_id) in self._monitors
+
+    async def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._running = True
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"OrderMonitorScheduler: Started with {self.interval}s interval, max_concurrency={self.max_concurrency}")
+
+    async def stop(self) -> None:
+        self._running = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for monitor in list(self._monitors.values()):
+            monitor.stop()
+        self._monitors.clear()
+
+    def wake(self, broker_order_ids: Iterable) -> int:
+        """
+        Request an immediate tick for the monitored orders that own any of the given broker
+        order ids. An unknown id also wakes the orders not indexed yet, since it may belong to
+        one of them. Returns the number of orders woken.
+        """
+        woken, unknown = set(), False
+        for broker_order_id in broker_order_ids:
+            order_id = self._broker_order_index.get(_base_broker_order_id(broker_order_id))
+            if order_id is None:
+                unknown = True
+            elif order_id in self._monitors:
+                woken.add(order_id)
+        if unknown:
+            woken.update(self._unindexed)
+        if woken:
+            self._woken_orders.update(woken)
+            self._wake_event.set()
+        return len(woken)
+
+    async def _run(self) -> None:
+        next_tick = time.monotonic()
+        while self._running:
+            try:
+                await asyncio.wait_for(self._wake_event.wait(), timeout=max(0.0, next_tick - time.monotonic()))
+            except asyncio.TimeoutError:
+                pass
+            self._wake_event.clear()
+            woken, self._woken_orders = self._woken_orders, set()
+            if time.monotonic() >= next_tick:
+                # Regular tick covers woken orders too
+                next_tick = time.monotonic() + self.interval
+                order_ids = None
+            elif woken:
+                self._wake_count += 1
+                order_ids = woken
+            else:
+                continue
+            if self._monitors:
+                try:
+                    await self.tick(order_ids)
+                except Exception as e:
+                    logger.error(f"OrderMonitorScheduler: Tick failed: {e}", exc_info=True)
+
+    async def tick(self, order_ids: Optional[Iterable[int]] = None) -> None:
+        """
+        Load one snapshot for the monitored orders (all, or only order_ids) and run their
+        monitors' price ticks on it.
+        """
+        if order_ids is None:
+            monitors = list(self._monitors.values())
+        else:
+            monitors = [self._monitors[order_id] for order_id in order_ids if order_id in self._monitors]
+        if not monitors:
+            return
+        tick_start = time.perf_counter()
+
+        snapshots = await self._load_snapshots([int(m.order_id) for m in monitors])
+        if order_ids is None:
+            self._update_tick_interest(snapshots)
+        load_done = time.perf_counter()
+
+        ltp_symbols = await self._attach_ltps(snapshots)
+        ltp_done = time.perf_counter()
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        await asyncio.gather(*(
+            self._run_monitor(monitor, snapshots.get(int(monitor.order_id)), semaphore)
+            for monitor in monitors
+        ))
+        tick_done = time.perf_counter()
+
+        total_ms = (tick_done - tick_start) * 1000
+        self._tick_count += 1
+        self._tick_durations.append(total_ms)
+        self._last_tick = {
+            "orders": len(monitors),
+            "woken": order_ids is not None,
+            "ltp_symbols": ltp_symbols,
+            "load_ms": round((load_done - tick_start) * 1000, 2),
+            "ltp_ms": round((ltp_done - load_done) * 1000, 2),
+            "process_ms": round((tick_done - ltp_done) * 1000, 2),
+            "total_ms": round(total_ms, 2),
+        }
+        logger.debug(f"OrderMonitorScheduler: Tick #{self._tick_count} {self._last_tick}")
+
+    async def _load_snapshots(self, order_ids: list) -> Dict[int, OrderTickSnapshot]:
+        """Bulk-load order rows and broker_executions for all monitored orders."""
+        from algosat.core.db import AsyncSessionLocal, get_orders_with_executions_by_ids, get_broker_risk_summary
+        try:
+            async with AsyncSessionLocal() as session:
+                orders_by_id, executions_by_order_id = await get_orders_with_executions_by_ids(session, order_ids)
+                # Only needed by the per-trade loss check of OPEN main orders
+                trade_enabled_brokers = None
+                if any(row.get('status') == 'OPEN' for row in orders_by_id.values()):
+                    risk_data = await get_broker_risk_summary(session)
+                    trade_enabled_brokers = risk_data.get('summary', {}).get('trade_enabled_brokers', 0)
+        except Exception as e:
+            # Monitors fall back to their own per-order queries when no snapshot is given
+            logger.error(f"OrderMonitorScheduler: Bulk load failed for {len(order_ids)} orders: {e}", exc_info=True)
+            return {}
+        self._unindexed.difference_update(orders_by_id)
+        for order_id, executions in executions_by_order_id.items():
+            for execution in executions:
+                for key in ('broker_order_id', 'exit_broker_order_id'):
+                    if execution.get(key):
+                        self._broker_order_index[_base_broker_order_id(execution[key])] = order_id
+        return {
+            order_id: OrderTickSnapshot(
+                order=order_row,
+                executions=executions_by_order_id.get(order_id, []),
+                trade_enabled_brokers=trade_enabled_brokers,
+            )
+            for order_id, order_row in orders_by_id.items()
+        }
+
+    def _update_tick_interest(self, snapshots: Dict[int, OrderTickSnapshot]) -> None:
+        """Keep the tick bus subscribed to the symbols of every monitored order."""
+        tick_bus = getattr(self.data_manager, 'tick_bus', None)
+        if tick_bus is None:
+            return
+        tick_bus.set_interest("open_orders", {
+            snapshot.order.get('strike_symbol') for snapshot in snapshots.values() if snapshot.order
+        })
+
+    async def _attach_ltps(self, snapshots: Dict[int, OrderTickSnapshot]) -> int:
+        """Batch-fetch LTPs for the orders that need one and attach them to their snapshots."""
+        symbols = {
+            snapshot.order.get('strike_symbol')
+            for snapshot in snapshots.values()
+            if _needs_ltp(snapshot.order) and snapshot.order.get('strike_symbol')
+        }
+        if not symbols:
+            return 0
+        try:
+            await self.data_manager.ensure_broker()
+            ltp_map = await self.data_manager.get_ltp_batch(sorted(symbols))
+        except Exception as e:
+            logger.error(f"OrderMonitorScheduler: Batch LTP fetch failed for {len(symbols)} symbols: {e}")
+            return len(symbols)
+        for snapshot in snapshots.values():
+            ltp = ltp_map.get(snapshot.order.get('strike_symbol'))
+            if ltp is not None and ltp > 0:
+                snapshot.ltp = ltp
+        return len(symbols)
+
+    async def _run_monitor(self, monitor: OrderMonitor, snapshot: Optional[OrderTickSnapshot], semaphore: asyncio.Semaphore) -> None:
+        order_id = int(monitor.order_id)
+        async with semaphore:
+            started = time.perf_counter()
+            keep_running = True
+            try:
+                keep_running = await monitor._price_order_monitor_tick(snapshot)
+                if keep_running and monitor._rerun_immediately:
+                    # An exit was just set to PENDING; process it now instead of waiting a full interval
+                    monitor._rerun_immediately = False
+                    keep_running = await monitor._price_order_monitor_tick()
+            except Exception as e:
+                logger.error(f"OrderMonitorScheduler: Price tick failed for order_id={order_id}: {e}", exc_info=True)
+            finally:
+                self._record_order_latency(order_id, (time.perf_counter() - started) * 1000)
+        if not keep_running or not monitor._running:
+            monitor.stop()
+            self.unregister(order_id)
+
+    def _record_order_latency(self, order_id: int, elapsed_ms: float) -> None:
+        stats = self._order_latency.get(order_id)
+        if stats is None:
+            return
+        stats["ticks"] += 1
+        stats["last_ms"] = round(elapsed_ms, 2)
+        stats["avg_ms"] = round(stats["avg_ms"] + (elapsed_ms - stats["avg_ms"]) / stats["ticks"], 2)
+        stats["max_ms"] = round(max(stats["max_ms"], elapsed_ms), 2)
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Get tick and per-order latency statistics."""
+        durations = list(self._tick_durations)
+        return {
+            "monitored_orders": len(self._monitors),
+            "tick_count": self._tick_count,
+            "wake_count": self._wake_count,
+            "interval": self.interval,
+            "last_tick": dict(self._last_tick),
+            "avg_tick_ms": round(sum(durations) / len(durations), 2) if durations else 0.0,
+            "max_tick_ms": round(max(durations), 2) if durations else 0.0,
+            "orders": {order_id: dict(stats) for order_id, stats in self._order_latency.items()},
+        }
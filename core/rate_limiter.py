@@ -2,28 +2,83 @@
 Global rate limiter for broker API calls.
 Provides shared rate limiting across BrokerManager and DataProvider to ensure
 we don't exceed broker API limits when both components use the same broker.
+
+Requests are queued per broker in priority lanes (see Lane). Order placement, exits and
+cancels go first and may use a few tokens of the broker bucket that the other lanes must
+leave untouched; order-status, market-data and background lanes share the remaining
+tokens by weight while several of them are waiting. Besides the broker-wide per-second
+(and optional per-minute) bucket, a request for a named endpoint also has to fit that
+endpoint's own buckets, taken from the broker's documented limits.
 """
 
 import asyncio
 import time
-from typing import Dict, Optional
+from collections import deque
+from enum import IntEnum
+from typing import Deque, Dict, List, Optional
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from algosat.common.logger import get_logger
+from algosat.core.monitoring import observe_latency, trading_metrics
+from algosat.core.tracing import span
 
 logger = get_logger("rate_limiter")
 
+class Lane(IntEnum):
+    """Priority lanes of a broker's rate limiter, highest priority first."""
+    CRITICAL = 0      # place / exit / cancel orders and the margin check before placing
+    ORDER_STATUS = 1  # order book and positions polling
+    MARKET_DATA = 2   # history, LTP, quotes, option chains
+    BACKGROUND = 3    # balances, funds, profile
+
+
+# Share of the tokens each non-critical lane gets while several lanes are waiting
+LANE_WEIGHTS = {Lane.ORDER_STATUS: 4, Lane.MARKET_DATA: 3, Lane.BACKGROUND: 1}
+
+# Lane used for an endpoint when the caller does not name one
+ENDPOINT_LANES = {
+    "orders": Lane.CRITICAL,
+    "margin": Lane.CRITICAL,
+    "order_book": Lane.ORDER_STATUS,
+    "positions": Lane.ORDER_STATUS,
+    "history": Lane.MARKET_DATA,
+    "ltp": Lane.MARKET_DATA,
+    "quotes": Lane.MARKET_DATA,
+    "option_chain": Lane.MARKET_DATA,
+    "funds": Lane.BACKGROUND,
+    "profile": Lane.BACKGROUND,
+}
+DEFAULT_LANE = Lane.MARKET_DATA
+
+
 @dataclass
 class RateConfig:
     """Configuration for broker rate limiting."""
     rps: int  # Requests per second
     burst: int = None  # Max burst requests (defaults to rps)
     window: float = 1.0  # Time window in seconds
+    per_minute: Optional[int] = None  # Broker-wide requests per minute, if the broker documents one
+    critical_reserve: int = 0  # Tokens only the CRITICAL lane may take
     
     def __post_init__(self):
         if self.burst is None:
             self.burst = self.rps
 
+
+@dataclass
+class EndpointLimit:
+    """A broker's documented limit for one endpoint group."""
+    per_second: Optional[float] = None
+    per_minute: Optional[int] = None
+
+    def buckets(self) -> List["TokenBucket"]:
+        buckets = []
+        if self.per_second:
+            buckets.append(TokenBucket(RateConfig(rps=self.per_second, burst=max(1, int(self.per_second)))))
+        if self.per_minute:
+            buckets.append(TokenBucket(RateConfig(rps=self.per_minute / 60.0, burst=self.per_minute)))
+        return buckets
+
 class TokenBucket:
     """
     Token bucket implementation for rate limiting.
@@ -88,7 +143,10 @@ class TokenBucket:
     
     async def _refill(self):
         """Refill bucket based on time elapsed."""
-        now = time.time()
+        self.refill()
+
+    def refill(self, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
         elapsed = now - self.last_refill
         
         if elapsed > 0:
@@ -96,41 +154,197 @@ class TokenBucket:
             self.tokens = min(self.capacity, self.tokens + tokens_to_add)
             self.last_refill = now
 
+    def wait_time(self, tokens: float) -> float:
+        """Seconds until tokens are available (call refill() first); 0 if they are now."""
+        tokens = min(tokens, self.capacity)
+        return 0.0 if self.tokens >= tokens else (tokens - self.tokens) / self.refill_rate
+
+
+class _Waiter:
+    __slots__ = ("lane", "endpoint", "tokens", "future", "enqueued_at")
+
+    def __init__(self, lane: Lane, endpoint: Optional[str], tokens: int):
+        self.lane = lane
+        self.endpoint = endpoint
+        self.tokens = tokens
+        self.future: Optional[asyncio.Future] = None
+        self.enqueued_at = time.perf_counter()
+
 class BrokerRateLimiter:
-    """Rate limiter for a specific broker."""
+    """
+    Rate limiter for a specific broker with priority lanes.
+
+    A request is granted at once when no request of the same or a higher-priority lane is
+    waiting and every bucket it draws from has the tokens. Otherwise it is queued in its lane
+    and a dispatcher task hands out tokens as they refill: CRITICAL first, then the other
+    lanes by smooth weighted round robin (LANE_WEIGHTS), skipping requests whose endpoint
+    bucket is still empty. Non-critical requests must leave rate_config.critical_reserve
+    tokens in the broker-wide buckets, so an exit arriving behind a burst of data requests
+    finds tokens waiting for it.
+    """
     
-    def __init__(self, broker_name: str, rate_config: RateConfig):
+    def __init__(self, broker_name: str, rate_config: RateConfig, endpoint_limits: Optional[Dict[str, EndpointLimit]] = None):
         self.broker_name = broker_name
         self.rate_config = rate_config
         self.bucket = TokenBucket(rate_config)
+        self._broker_buckets = [self.bucket]
+        if rate_config.per_minute:
+            self._broker_buckets.append(TokenBucket(RateConfig(rps=rate_config.per_minute / 60.0, burst=rate_config.per_minute)))
+        self._endpoint_buckets: Dict[str, List[TokenBucket]] = {
+            name: limit.buckets() for name, limit in (endpoint_limits or {}).items()
+        }
+        self._queues: Dict[Lane, Deque[_Waiter]] = {lane: deque() for lane in Lane}
+        self._credits: Dict[Lane, float] = {lane: 0.0 for lane in LANE_WEIGHTS}
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
         self.call_count = 0
         self.last_call_time = 0
-    
+        self._lane_stats = {lane: {"granted": 0, "waited": 0, "wait_total": 0.0, "wait_max": 0.0} for lane in Lane}
+
     @asynccontextmanager
-    async def acquire(self, tokens: int = 1):
+    async def acquire(self, tokens: int = 1, lane: Optional[Lane] = None, endpoint: Optional[str] = None):
         """
         Context manager for rate-limited API calls.
-        Waits if necessary to respect rate limits.
+        Waits if necessary to respect rate limits. The lane defaults to the endpoint's lane
+        (ENDPOINT_LANES), else MARKET_DATA.
         """
-        # Use the atomic acquire_with_wait method to prevent race conditions
-        logger.debug(f"Rate limiting {self.broker_name}: requesting {tokens} tokens")
-        await self.bucket.acquire_with_wait(tokens)
+        lane = Lane(lane) if lane is not None else ENDPOINT_LANES.get(endpoint, DEFAULT_LANE)
+        lane_name = lane.name.lower()
+        logger.debug(f"Rate limiting {self.broker_name}: requesting {tokens} tokens ({lane_name}, endpoint={endpoint})")
+        started = time.perf_counter()
+        with span("rate_limiter.wait", broker=self.broker_name, lane=lane_name, endpoint=endpoint), \
+                observe_latency(trading_metrics.rate_limiter_wait_seconds, broker=self.broker_name, lane=lane_name):
+            queued = await self._acquire(_Waiter(lane, endpoint, tokens))
+        self._record_grant(lane, time.perf_counter() - started, queued)
         
         self.call_count += 1
         self.last_call_time = time.time()
         
         logger.debug(f"Rate limiter {self.broker_name}: acquired {tokens} tokens (call #{self.call_count})")
-        
+        yield
+
+    async def _acquire(self, waiter: _Waiter) -> bool:
+        """Take the tokens for waiter, queueing it if needed; returns True if it had to queue."""
+        ahead = any(self._queues[lane] for lane in Lane if lane <= waiter.lane)
+        if not ahead and self._wait_time(waiter) == 0:
+            self._take(waiter)
+            return False
+        waiter.future = asyncio.get_running_loop().create_future()
+        self._queues[waiter.lane].append(waiter)
+        self._update_depth(waiter.lane)
+        self._wake_dispatcher()
         try:
-            yield
-        finally:
-            # Add a small delay to ensure we don't exceed the rate
-            min_interval = 1.0 / self.rate_config.rps
-            elapsed = time.time() - self.last_call_time
-            if elapsed < min_interval:
-                additional_wait = min_interval - elapsed
-                logger.debug(f"Rate limiter {self.broker_name}: additional wait {additional_wait:.3f}s")
-                await asyncio.sleep(additional_wait)
+            await waiter.future
+        except asyncio.CancelledError:
+            self._remove(waiter)
+            raise
+        return True
+
+    def _buckets(self, waiter: _Waiter):
+        """(bucket, tokens needed) pairs the waiter draws from, including the critical reserve."""
+        reserve = 0 if waiter.lane == Lane.CRITICAL else self.rate_config.critical_reserve
+        for bucket in self._broker_buckets:
+            yield bucket, waiter.tokens + reserve
+        for bucket in self._endpoint_buckets.get(waiter.endpoint, ()):
+            yield bucket, waiter.tokens
+
+    def _wait_time(self, waiter: _Waiter) -> float:
+        now = time.time()
+        wait = 0.0
+        for bucket, needed in self._buckets(waiter):
+            bucket.refill(now)
+            wait = max(wait, bucket.wait_time(needed))
+        return wait
+
+    def _take(self, waiter: _Waiter) -> None:
+        for bucket in self._broker_buckets:
+            bucket.tokens -= waiter.tokens
+        for bucket in self._endpoint_buckets.get(waiter.endpoint, ()):
+            bucket.tokens -= waiter.tokens
+
+    def _wake_dispatcher(self) -> None:
+        if self._dispatcher is None or self._dispatcher.done():
+            self._wakeup = asyncio.Event()
+            self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+        else:
+            self._wakeup.set()
+
+    async def _dispatch(self) -> None:
+        while True:
+            waiter, wait = self._next_grantable()
+            if waiter is not None:
+                self._remove(waiter)
+                self._take(waiter)
+                waiter.future.set_result(None)
+                continue
+            if wait is None:
+                return  # every lane is empty
+            # Sleep until the earliest waiter fits, or until a new (maybe critical) request arrives
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(wait, 0.001))
+            except asyncio.TimeoutError:
+                pass
+
+    def _next_grantable(self):
+        """
+        The next waiter to grant, or (None, seconds until one could be granted), or
+        (None, None) when nothing is queued.
+        """
+        min_wait = None
+        active = [lane for lane in LANE_WEIGHTS if self._queues[lane]]
+        # CRITICAL first, then the other lanes in weighted round robin order
+        order = [Lane.CRITICAL] + sorted(active, key=lambda lane: -(self._credits[lane] + LANE_WEIGHTS[lane]))
+        for lane in order:
+            for waiter in self._queues[lane]:
+                if waiter.future.done():
+                    continue
+                wait = self._wait_time(waiter)
+                if wait == 0:
+                    if lane != Lane.CRITICAL:
+                        # Smooth weighted round robin: every waiting lane earns its weight, the chosen one pays the total
+                        for other in active:
+                            self._credits[other] += LANE_WEIGHTS[other]
+                        self._credits[lane] -= sum(LANE_WEIGHTS[other] for other in active)
+                    return waiter, None
+                min_wait = wait if min_wait is None else min(min_wait, wait)
+        if min_wait is None and any(self._queues.values()):
+            min_wait = 0.0  # only cancelled waiters left: let the next pass drop them
+        return None, min_wait
+
+    def _remove(self, waiter: _Waiter) -> None:
+        try:
+            self._queues[waiter.lane].remove(waiter)
+        except ValueError:
+            return
+        if not self._queues[waiter.lane] and waiter.lane in self._credits:
+            self._credits[waiter.lane] = 0.0
+        self._update_depth(waiter.lane)
+
+    def _update_depth(self, lane: Lane) -> None:
+        trading_metrics.rate_limiter_queue_depth.labels(broker=self.broker_name, lane=lane.name.lower()).set(len(self._queues[lane]))
+
+    def _record_grant(self, lane: Lane, waited: float, queued: bool) -> None:
+        stats = self._lane_stats[lane]
+        stats["granted"] += 1
+        if queued:
+            stats["waited"] += 1
+            stats["wait_total"] += waited
+            stats["wait_max"] = max(stats["wait_max"], waited)
+
+    def get_lane_stats(self) -> Dict[str, Dict]:
+        """Per-lane queue depth, grants and wait times (of the requests that had to queue)."""
+        lanes = {}
+        for lane in Lane:
+            stats = self._lane_stats[lane]
+            lanes[lane.name.lower()] = {
+                "queued": len(self._queues[lane]),
+                "granted": stats["granted"],
+                "waited": stats["waited"],
+                "avg_wait_ms": round(stats["wait_total"] / stats["waited"] * 1000, 1) if stats["waited"] else 0.0,
+                "max_wait_ms": round(stats["wait_max"] * 1000, 1),
+            }
+        return lanes
 
 class GlobalRateLimiter:
     """
@@ -144,22 +358,42 @@ class GlobalRateLimiter:
     # Centralized rate configurations per broker
     # This is the SINGLE SOURCE OF TRUTH for all rate limiting across the application
     DEFAULT_RATE_CONFIGS = {
-        # Fyers: Official limit ~10-15 rps, we use 10 rps with burst allowance
-        "fyers": RateConfig(rps=10, burst=15, window=1.0),
+        # Fyers: Official limit ~10-15 rps and 200 per minute, we use 10 rps with burst allowance
+        "fyers": RateConfig(rps=10, burst=15, window=1.0, per_minute=200, critical_reserve=3),
         
         # Angel One: Conservative limit for stability
-        "angel": RateConfig(rps=5, burst=8, window=1.0),
+        "angel": RateConfig(rps=5, burst=8, window=1.0, critical_reserve=2),
         
         # Zerodha: Very conservative due to strict rate limiting
-        "zerodha": RateConfig(rps=5, burst=5, window=1.0),
+        "zerodha": RateConfig(rps=5, burst=5, window=1.0, critical_reserve=1),
         
         # Default fallback for unknown brokers
-        "default": RateConfig(rps=3, burst=5, window=1.0),
+        "default": RateConfig(rps=3, burst=5, window=1.0, critical_reserve=1),
+    }
+
+    # Documented per-endpoint limits, enforced on top of the broker-wide bucket
+    DEFAULT_ENDPOINT_LIMITS = {
+        "zerodha": {
+            "ltp": EndpointLimit(per_second=1),
+            "quotes": EndpointLimit(per_second=1),
+            "history": EndpointLimit(per_second=3),
+            "orders": EndpointLimit(per_second=10, per_minute=200),
+        },
+        "angel": {
+            "orders": EndpointLimit(per_second=20),
+            "history": EndpointLimit(per_second=3, per_minute=180),
+            "ltp": EndpointLimit(per_second=10),
+            "order_book": EndpointLimit(per_second=1),
+            "positions": EndpointLimit(per_second=1),
+            "funds": EndpointLimit(per_second=2),
+            "profile": EndpointLimit(per_second=3),
+        },
     }
     
     def __init__(self):
         self._limiters: Dict[str, BrokerRateLimiter] = {}
         self._rate_configs: Dict[str, RateConfig] = self.DEFAULT_RATE_CONFIGS.copy()
+        self._endpoint_limits: Dict[str, Dict[str, EndpointLimit]] = dict(self.DEFAULT_ENDPOINT_LIMITS)
     
     @classmethod
     async def get_instance(cls) -> 'GlobalRateLimiter':
@@ -172,9 +406,11 @@ class GlobalRateLimiter:
                     cls._instance = cls()
         return cls._instance
     
-    def configure_broker(self, broker_name: str, rate_config: RateConfig):
-        """Configure or update rate limits for a broker."""
+    def configure_broker(self, broker_name: str, rate_config: RateConfig, endpoint_limits: Optional[Dict[str, EndpointLimit]] = None):
+        """Configure or update rate limits (and optionally per-endpoint limits) for a broker."""
         self._rate_configs[broker_name] = rate_config
+        if endpoint_limits is not None:
+            self._endpoint_limits[broker_name] = endpoint_limits
         # Remove existing limiter so it gets recreated with new config
         if broker_name in self._limiters:
             del self._limiters[broker_name]
@@ -187,7 +423,7 @@ class GlobalRateLimiter:
                 broker_name, 
                 self._rate_configs.get("default", RateConfig(rps=1, burst=1))  # Use default config
             )
-            self._limiters[broker_name] = BrokerRateLimiter(broker_name, rate_config)
+            self._limiters[broker_name] = BrokerRateLimiter(broker_name, rate_config, self._endpoint_limits.get(broker_name))
             logger.info(f"Created rate limiter for {broker_name}: {rate_config.rps} rps")
         
         return self._limiters[broker_name]
@@ -208,10 +444,10 @@ class GlobalRateLimiter:
         )
     
     @asynccontextmanager
-    async def acquire(self, broker_name: str, tokens: int = 1):
-        """Acquire rate limit tokens for a broker."""
+    async def acquire(self, broker_name: str, tokens: int = 1, lane: Optional[Lane] = None, endpoint: Optional[str] = None):
+        """Acquire rate limit tokens for a broker in the given lane (default: the endpoint's lane)."""
         limiter = self.get_limiter(broker_name)
-        async with limiter.acquire(tokens):
+        async with limiter.acquire(tokens, lane=lane, endpoint=endpoint):
             yield
     
     def get_stats(self) -> Dict[str, Dict]:
@@ -224,6 +460,7 @@ class GlobalRateLimiter:
                 "current_tokens": limiter.bucket.tokens,
                 "capacity": limiter.bucket.capacity,
                 "refill_rate": limiter.bucket.refill_rate,
+                "lanes": limiter.get_lane_stats(),
             }
         return stats
 
@@ -233,8 +470,8 @@ async def get_rate_limiter() -> GlobalRateLimiter:
     return await GlobalRateLimiter.get_instance()
 
 @asynccontextmanager
-async def rate_limited_call(broker_name: str, tokens: int = 1):
+async def rate_limited_call(broker_name: str, tokens: int = 1, lane: Optional[Lane] = None, endpoint: Optional[str] = None):
     """Context manager for rate-limited broker API calls."""
     limiter = await get_rate_limiter()
-    async with limiter.acquire(broker_name, tokens):
+    async with limiter.acquire(broker_name, tokens, lane=lane, endpoint=endpoint):
         yield
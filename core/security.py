@@ -15,7 +15,7 @@ import ipaddress
 import sqlite3
 import time
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List, Set
+from typing import Optional, Dict, Any, List, Set, Tuple
 from pathlib import Path
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
@@ -25,7 +25,7 @@ import jwt
 from functools import wraps
 import aiofiles
 import re
-from collections import defaultdict
+from collections import OrderedDict, defaultdict, deque
 import json
 from pydantic import BaseModel, EmailStr # Add EmailStr
 from passlib.context import CryptContext
@@ -179,6 +179,112 @@ class EnhancedInputValidator:
             raise InvalidInputError(f"{field_name} must be <= {max_value}")
         return value
 
+class SlidingWindowRateLimiter:
+    """
+    In-memory sliding-window rate limiter keyed by (ip, endpoint).
+
+    Uses the sliding-window counter approximation: each key keeps only the request counts
+    of the current and previous fixed windows, and the previous count is weighted by how
+    much of it still overlaps the sliding window. Memory is O(1) per key and the number of
+    keys is bounded; the least recently seen keys are evicted first.
+    """
+
+    def __init__(self, max_keys: int = 10000, clock=time.monotonic):
+        self.max_keys = max_keys
+        self._clock = clock
+        # key -> [window index, count in that window, count in the window before]
+        self._windows: "OrderedDict[tuple, list]" = OrderedDict()
+        self.evictions = 0
+
+    def hit(self, key: tuple, max_requests: int, window_seconds: int) -> Tuple[bool, float]:
+        """Count one request for key if allowed. Returns (allowed, estimated requests in the window)."""
+        now = self._clock()
+        index, offset = divmod(now, window_seconds)
+        index = int(index)
+        state = self._windows.get(key)
+        if state is None:
+            state = self._windows[key] = [index, 0, 0]
+            if len(self._windows) > self.max_keys:
+                self._windows.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._windows.move_to_end(key)
+            if index != state[0]:
+                # Roll forward; anything older than the previous window has no weight left
+                state[2] = state[1] if index == state[0] + 1 else 0
+                state[1] = 0
+                state[0] = index
+        estimate = state[2] * (1 - offset / window_seconds) + state[1]
+        if estimate >= max_requests:
+            return False, estimate
+        state[1] += 1
+        return True, estimate + 1
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+
+class _AccessLogWriter:
+    """
+    Batches api_access_logs rows in memory and writes them to the security database every
+    flush_interval seconds in one transaction, off the event loop. When writes fall behind,
+    the oldest pending rows are dropped rather than growing memory without bound.
+    """
+
+    def __init__(self, db_path: Path, flush_interval: float = 0.25, max_pending: int = 10000):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self._pending: deque = deque(maxlen=max_pending)
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.dropped = 0
+
+    def add(self, row: tuple) -> None:
+        if len(self._pending) == self._pending.maxlen:
+            self.dropped += 1
+        self._pending.append(row)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        batch = list(self._pending)
+        self._pending.clear()
+        try:
+            await asyncio.to_thread(self._write, batch)
+            self.written += len(batch)
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} API access log rows: {e}")
+
+    def _write(self, batch: List[tuple]) -> None:
+        conn = sqlite3.connect(str(self.db_path))
+        try:
+            conn.executemany("""
+                INSERT INTO api_access_logs
+                (ip_address, endpoint, method, user_id, api_key_hash, success, response_time_ms)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, batch)
+            conn.commit()
+        finally:
+            conn.close()
+
+    async def close(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        await self.flush()
+
+
 class SecurityManager:
     """Centralized security management for the trading system."""
     
@@ -206,6 +312,9 @@ class SecurityManager:
         
         # Initialize security databases
         self._init_security_db()
+        self.rate_limiter = SlidingWindowRateLimiter()
+        self._rate_limit_logged: Dict[tuple, int] = {}
+        self.access_log = _AccessLogWriter(self.security_db_path)
         self.failed_attempts = defaultdict(list)
         self.blocked_ips = set()
         
@@ -288,50 +397,23 @@ class SecurityManager:
                         max_requests: int = 100, window_seconds: int = 60) -> bool:
         """Check if request is within rate limits."""
         try:
-            conn = sqlite3.connect(str(self.security_db_path))
-            cursor = conn.cursor()
-            
-            current_time = datetime.utcnow()
-            window_start = current_time - timedelta(seconds=window_seconds)
-            
-            # Clean old entries
-            cursor.execute("""
-                DELETE FROM rate_limits 
-                WHERE window_start < ?
-            """, (window_start,))
-            
-            # Count current requests
-            cursor.execute("""
-                SELECT SUM(request_count) FROM rate_limits
-                WHERE ip_address = ? AND endpoint = ? AND window_start >= ?
-            """, (ip_address, endpoint, window_start))
-            
-            result = cursor.fetchone()
-            current_count = result[0] if result[0] else 0
-            
-            if current_count >= max_requests:
-                conn.close()
+            key = (ip_address, endpoint, window_seconds)
+            allowed, current_count = self.rate_limiter.hit(key, max_requests, window_seconds)
+            if allowed:
+                return True
+            # Record the first rejection per key and window, not every rejected request
+            window = int(time.monotonic() // window_seconds)
+            if self._rate_limit_logged.get(key) != window:
+                if len(self._rate_limit_logged) >= self.rate_limiter.max_keys:
+                    self._rate_limit_logged.clear()
+                self._rate_limit_logged[key] = window
                 self.log_security_event(
                     "RATE_LIMIT_EXCEEDED", 
                     ip_address=ip_address,
-                    details=f"Endpoint: {endpoint}, Count: {current_count}",
+                    details=f"Endpoint: {endpoint}, Count: {int(current_count)}",
                     severity="WARNING"
                 )
-                return False
-            
-            # Increment counter
-            cursor.execute("""
-                INSERT OR REPLACE INTO rate_limits 
-                (ip_address, endpoint, request_count, window_start)
-                VALUES (?, ?, COALESCE((
-                    SELECT request_count FROM rate_limits 
-                    WHERE ip_address = ? AND endpoint = ? AND window_start >= ?
-                ), 0) + 1, ?)
-            """, (ip_address, endpoint, ip_address, endpoint, window_start, current_time))
-            
-            conn.commit()
-            conn.close()
-            return True
+            return False
             
         except Exception as e:
             logger.error(f"Rate limiting check failed: {e}")
@@ -500,20 +582,16 @@ class SecurityManager:
     async def log_api_access(self, ip_address: str, endpoint: str, method: str,
                            user_id: str = None, api_key_hash: str = None,
                            success: bool = True, response_time_ms: int = None):
-        """Log API access for audit trail."""
+        """Log API access for audit trail (written in batches by the access log writer)."""
         try:
-            conn = sqlite3.connect(str(self.security_db_path))
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO api_access_logs 
-                (ip_address, endpoint, method, user_id, api_key_hash, success, response_time_ms)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (ip_address, endpoint, method, user_id, api_key_hash, success, response_time_ms))
-            conn.commit()
-            conn.close()
+            self.access_log.add((ip_address, endpoint, method, user_id, api_key_hash, success, response_time_ms))
         except Exception as e:
             logger.error(f"Failed to log API access: {e}")
     
+    async def close(self) -> None:
+        """Flush pending API access log rows."""
+        await self.access_log.close()
+    
     def get_security_summary(self, hours: int = 24) -> Dict[str, Any]:
         """Get security summary for the last N hours."""
         try:
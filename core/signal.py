@@ -1,5 +1,6 @@
+import time
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from algosat.core.order_request import Side
 
 class SignalType(Enum):
@@ -35,3 +36,5 @@ class TradeSignal:
     target_spot_level: float = None
     entry_rsi: float = None
     expiry_date: str = None
+    # time.monotonic() when the signal was created, for signal-to-order latency
+    generated_at: float = field(default_factory=time.monotonic, repr=False, compare=False)
@@ -12,9 +12,14 @@ from algosat.core.strategy_runner import run_strategy_config
 from algosat.core.data_manager import DataManager
 from algosat.core.order_manager import OrderManager
 from algosat.core.order_monitor import OrderMonitor
+from algosat.core.order_monitor_scheduler import OrderMonitorScheduler
 from algosat.core.time_utils import get_ist_datetime
 from algosat.models.strategy_config import StrategyConfig
 from algosat.core.order_cache import OrderCache
+from algosat.core.order_event_stream import OrderEventStream, build_order_feeds
+from algosat.core.tick_bus import FyersTickSource
+from algosat.core.strategy_scheduler import StrategyScheduler
+from algosat.core.trading_calendar import MARKET_CLOSE, PRE_MARKET_START
 from algosat.strategies.option_buy import OptionBuyStrategy
 from algosat.strategies.swing_highlow_buy import SwingHighLowBuyStrategy
 from algosat.strategies.option_sell import OptionSellStrategy
@@ -30,8 +35,8 @@ class MarketHours:
     
     @staticmethod
     def get_market_hours():
-        """Get default market hours (can be made configurable later)"""
-        return datetime.time(9, 0), datetime.time(15, 30)  # 9:00 AM - 3:30 PM
+        """Get default market hours: strategies start at pre-market so setup is done by the open"""
+        return PRE_MARKET_START, MARKET_CLOSE  # 9:00 AM - 3:30 PM
         # return datetime.time(4, 0), datetime.time(23, 30)  # 9:00 AM - 3:30 PM
     
     @staticmethod
@@ -305,7 +310,7 @@ class RiskManager:
                 await session.commit()
                 
             # 4. Exit all active orders
-            await self.order_manager.exit_all_orders(reason="Emergency Stop - Max Loss Exceeded")
+            await self.order_manager.exit_all_orders(exit_reason="Emergency Stop - Max Loss Exceeded", bulk=True)
             
             logger.critical("🚨 Emergency stop completed - strategies disabled, orders exited")
             logger.critical("🚨 Strategy runners will stop automatically on next poll cycle")
@@ -314,7 +319,7 @@ class RiskManager:
             logger.error(f"Error during emergency stop: {e}")
             # If database operations fail, still try to exit orders
             try:
-                await self.order_manager.exit_all_orders(reason="Emergency Stop - Error Fallback")
+                await self.order_manager.exit_all_orders(exit_reason="Emergency Stop - Error Fallback", bulk=True)
             except Exception as exit_error:
                 logger.error(f"Failed to exit orders during emergency fallback: {exit_error}")
     
@@ -333,7 +338,8 @@ class RiskManager:
             # Exit all orders for the specific broker only
             await self.order_manager.exit_all_orders(
                 exit_reason=f"Broker Emergency Stop - {reason}",
-                broker_names_filter=[broker_name]
+                broker_names_filter=[broker_name],
+                bulk=True
             )
             
             logger.critical(f"🚨 Broker-specific emergency stop completed for {broker_name}")
@@ -394,6 +400,9 @@ order_queue = asyncio.Queue()
 config_timestamps: Dict[int, datetime.datetime] = {}
 
 order_cache = None  # Will be initialized in run_poll_loop
+order_monitor_scheduler = None  # Will be initialized in run_poll_loop
+order_event_stream = None  # Will be initialized in run_poll_loop
+strategy_scheduler = None  # Will be initialized in run_poll_loop
 risk_manager = None  # Will be initialized in run_poll_loop
 
 async def create_lightweight_strategy_instance(symbol_id: int, config: StrategyConfig, data_manager: DataManager, order_manager: OrderManager):
@@ -544,7 +553,7 @@ async def create_strategy_instance_only(config: StrategyConfig, data_manager: Da
         return None
 
 async def order_monitor_loop(order_queue, data_manager, order_manager):
-    global order_cache
+    global order_cache, order_monitor_scheduler
     while True:
         order_info = await order_queue.get()
         if order_info is None:
@@ -570,13 +579,43 @@ async def order_monitor_loop(order_queue, data_manager, order_manager):
                 data_manager=data_manager,
                 order_manager=order_manager,
                 order_cache=order_cache,
-                strategy_instance=strategy_instance  # Pass strategy instance to OrderMonitor
+                strategy_instance=strategy_instance,  # Pass strategy instance to OrderMonitor
+                scheduler=order_monitor_scheduler  # Price ticks run in the shared batched scheduler
             )
             order_monitors[order_id] = asyncio.create_task(monitor.start())
     logger.info("Order monitor loop has exited")
 
+async def start_order_event_stream(order_manager: OrderManager):
+    """Attach order-update feeds for the streaming-capable brokers and start the stream."""
+    try:
+        for feed in await build_order_feeds(order_manager.broker_manager):
+            order_event_stream.add_feed(feed)
+        await order_event_stream.start()
+    except Exception as e:
+        logger.error(f"Failed to start order event stream, order status falls back to polling: {e}")
+
+async def start_tick_bus(data_manager: DataManager):
+    """Connect the tick bus to the data broker's socket so get_ltp is served from live ticks."""
+    tick_bus = data_manager.tick_bus
+    if tick_bus is None or tick_bus.running:
+        return
+    try:
+        await data_manager.ensure_broker()
+        broker_name = data_manager.get_current_broker_name()
+        if broker_name != "fyers":
+            logger.debug(f"Tick bus has no data socket for broker {broker_name}; LTPs use REST")
+            return
+        tick_bus.attach_source(FyersTickSource(data_manager.broker))
+        await tick_bus.start()
+    except Exception as e:
+        logger.error(f"Failed to start tick bus, LTPs fall back to REST: {e}")
+        return
+    if data_manager.candle_aggregator is not None:
+        # Bars are built from the bus' ticks, so the aggregator runs whenever the bus does
+        await data_manager.candle_aggregator.start()
+
 async def run_poll_loop(data_manager: DataManager, order_manager: OrderManager):
-    global order_cache, risk_manager, config_timestamps, strategy_cache
+    global order_cache, order_monitor_scheduler, order_event_stream, strategy_scheduler, risk_manager, config_timestamps, strategy_cache
     
     # Clear strategy cache on startup to ensure fresh instances
     logger.info("🧹 Clearing strategy cache on startup")
@@ -596,6 +635,27 @@ async def run_poll_loop(data_manager: DataManager, order_manager: OrderManager):
             market_info = MarketHours.get_market_status_info()
             logger.info(f"🌙 Market is closed ({market_info['current_time']}). OrderCache initialized but not started.")
     
+    if order_monitor_scheduler is None:
+        from algosat.core.order_monitor import DEFAULT_ORDER_MONITOR_INTERVAL
+        # One batched price tick for all open orders instead of a polling loop per order
+        order_monitor_scheduler = OrderMonitorScheduler(data_manager, interval=DEFAULT_ORDER_MONITOR_INTERVAL)
+        await order_monitor_scheduler.start()
+    
+    if strategy_scheduler is None:
+        # One candle-boundary timer for all strategy runners instead of a sleep loop per strategy
+        strategy_scheduler = StrategyScheduler()
+        await strategy_scheduler.start()
+    
+    if MarketHours.is_market_open():
+        await start_tick_bus(data_manager)
+    
+    if order_event_stream is None:
+        # Broker order-update websockets push fills into OrderCache and wake the affected monitors;
+        # the OrderCache poll becomes a low-frequency reconciliation for the streamed brokers
+        order_event_stream = OrderEventStream(order_manager, order_cache, scheduler=order_monitor_scheduler)
+        if MarketHours.is_market_open():
+            await start_order_event_stream(order_manager)
+    
     if risk_manager is None:
         risk_manager = RiskManager(order_manager)
     
@@ -646,6 +706,17 @@ async def run_poll_loop(data_manager: DataManager, order_manager: OrderManager):
                             running_tasks.pop(symbol_id, None)
                             remove_strategy_from_cache(symbol_id)
                     
+                    if data_manager.tick_bus is not None and data_manager.tick_bus.running:
+                        logger.info("🛑 Market closed - stopping tick bus")
+                        if data_manager.candle_aggregator is not None:
+                            await data_manager.candle_aggregator.stop()
+                        await data_manager.tick_bus.stop()
+                    
+                    if order_event_stream is not None and order_event_stream.running:
+                        # Order feeds hold the day's access tokens; they are rebuilt at the next open
+                        logger.info("🛑 Market closed - stopping order event stream")
+                        await order_event_stream.stop()
+                    
                     # Sleep and continue to next iteration without any processing (no risk checks, no order management)
                     logger.debug(f"⏳ Market closed - sleeping for {settings.poll_interval} seconds...")
                     await asyncio.sleep(settings.poll_interval)
@@ -661,6 +732,11 @@ async def run_poll_loop(data_manager: DataManager, order_manager: OrderManager):
                     await order_cache.start()
                     order_cache._started = True
                 
+                if order_event_stream is not None and not order_event_stream.running:
+                    await start_order_event_stream(order_manager)
+                
+                await start_tick_bus(data_manager)
+                
                 # 🚨 PRIORITY 1: Check risk limits before any strategy operations (only during market hours)
                 risk_limit_exceeded, breached_broker, breach_reason = await risk_manager.check_broker_risk_limits()
                 
@@ -780,7 +856,7 @@ async def run_poll_loop(data_manager: DataManager, order_manager: OrderManager):
                                     # Create lightweight strategy instance (no blocking setup)
                                     strategy_instance = await create_lightweight_strategy_instance(symbol_id, config, data_manager, order_manager)
                                     if strategy_instance:
-                                        task = asyncio.create_task(run_strategy_config(strategy_instance, order_queue))
+                                        task = asyncio.create_task(run_strategy_config(strategy_instance, order_queue, scheduler=strategy_scheduler))
                                         running_tasks[symbol_id] = task
                             else:
                                 # Outside trading hours - stop the strategy runner
@@ -808,4 +884,14 @@ async def run_poll_loop(data_manager: DataManager, order_manager: OrderManager):
         for task in order_monitors.values():
             task.cancel()
         order_monitors.clear()
+        if order_event_stream is not None:
+            await order_event_stream.stop()
+        if data_manager.candle_aggregator is not None:
+            await data_manager.candle_aggregator.stop()
+        if data_manager.tick_bus is not None:
+            await data_manager.tick_bus.stop()
+        if strategy_scheduler is not None:
+            await strategy_scheduler.stop()
+        if order_monitor_scheduler is not None:
+            await order_monitor_scheduler.stop()
         return
\ No newline at end of file
@@ -1,6 +1,7 @@
 import asyncio
 from algosat.common.logger import get_logger, set_strategy_context
-from algosat.common.strategy_utils import wait_for_next_candle
+from algosat.common.strategy_utils import wait_for_bar_close
+from algosat.core.tracing import root_span
 
 
 logger = get_logger("strategy_runner")
@@ -42,10 +43,12 @@ async def handle_strategy_setup(strategy, strategy_name):
     return True
 
 
-async def run_strategy_config(strategy_instance, order_queue):
+async def run_strategy_config(strategy_instance, order_queue, scheduler=None):
     """
     Run strategy with its own setup and main polling loop.
     The strategy instance is lightweight and needs setup before processing cycles.
+    With a running StrategyScheduler, cycles start when the scheduler releases this strategy at
+    a candle boundary; otherwise the runner waits for the bar close itself.
     All logs from this strategy (and any managers it calls) will be routed 
     to strategy-specific log files automatically.
     """
@@ -67,6 +70,15 @@ async def run_strategy_config(strategy_instance, order_queue):
             return
         
         logger.info(f"✅ Strategy '{strategy_name}' setup completed successfully. Starting main loop.")
+
+        # Resolve broker symbols/ids for the selected strikes now rather than when the first signal fires
+        strikes = getattr(strategy, "_strikes", None)
+        broker_manager = getattr(getattr(strategy, "order_manager", None), "broker_manager", None)
+        if strikes and broker_manager is not None and hasattr(broker_manager, "prepare_order_routing"):
+            try:
+                await broker_manager.prepare_order_routing(list(strikes))
+            except Exception as e:
+                logger.warning(f"Could not prepare order routing for '{strategy_name}': {e}")
         
         # STEP 2: Determine cycle interval based on strategy type
         cycle_interval_minutes = 5  # Default fallback
@@ -94,43 +106,64 @@ async def run_strategy_config(strategy_instance, order_queue):
 
         logger.info(f"Strategy '{strategy_name}' will process cycles every {cycle_interval_minutes} minutes")
 
-        # STEP 3: Main strategy loop
-        while True:
-            try:
+        schedule_key = f"{strategy_context}:{strategy.cfg.symbol}:{getattr(strategy.cfg, 'symbol_id', None)}"
+        if scheduler is not None:
+            scheduler.register(schedule_key, cycle_interval_minutes)
+        try:
+            await _run_cycles(strategy, strategy_name, order_queue, cycle_interval_minutes, scheduler, schedule_key)
+        finally:
+            if scheduler is not None:
+                scheduler.unregister(schedule_key)
+
+
+async def _run_cycles(strategy, strategy_name, order_queue, cycle_interval_minutes, scheduler, schedule_key):
+    # STEP 3: Main strategy loop
+    while True:
+        try:
+            with root_span("strategy.cycle", strategy=strategy_name, symbol=getattr(strategy.cfg, "symbol", None)):
                 order_result = await strategy.process_cycle()
-                logger.info(f"Processed cycle for strategy '{strategy_name}' with order result: {order_result}")
-                
-                # Handle different order result scenarios
-                if order_result and isinstance(order_result, dict):
-                    # Scenario 1: Normal main order with optional hedge order
-                    if order_result.get("order_id"):
-                        # Queue the main order for monitoring
-                        await order_queue.put({
-                            "order_id": order_result["order_id"],
-                            "strategy": strategy
-                        })
-                        
-                        # Also queue hedge order if present
-                        hedge_order_id = order_result.get("hedge_order_id")
-                        if hedge_order_id:
-                            logger.info(f"Queueing hedge order {hedge_order_id} for monitoring")
-                            await order_queue.put({
-                                "order_id": hedge_order_id,
-                                "strategy": strategy
-                            })
+            logger.info(f"Processed cycle for strategy '{strategy_name}' with order result: {order_result}")
+            
+            # Handle different order result scenarios
+            if order_result and isinstance(order_result, dict):
+                # Scenario 1: Normal main order with optional hedge order
+                if order_result.get("order_id"):
+                    # Queue the main order for monitoring
+                    await order_queue.put({
+                        "order_id": order_result["order_id"],
+                        "strategy": strategy
+                    })
                     
-                    # Scenario 2: Hedge cleanup order (no main order_id, only hedge_order_id)
-                    elif order_result.get("hedge_order_id") and order_result.get("is_hedge_cleanup"):
-                        hedge_order_id = order_result["hedge_order_id"]
-                        logger.info(f"Queueing hedge cleanup order {hedge_order_id} for monitoring")
+                    # Also queue hedge order if present
+                    hedge_order_id = order_result.get("hedge_order_id")
+                    if hedge_order_id:
+                        logger.info(f"Queueing hedge order {hedge_order_id} for monitoring")
                         await order_queue.put({
                             "order_id": hedge_order_id,
                             "strategy": strategy
                         })
-            except Exception as e:
-                logger.error(f"Error in process_cycle for '{strategy_name}': {e}", exc_info=True)
-            
-            try:
-                await wait_for_next_candle(cycle_interval_minutes)
-            except Exception as e:
-                logger.error(f"Error in wait_for_next_candle for '{strategy_name}': {e}", exc_info=True)
+                
+                # Scenario 2: Hedge cleanup order (no main order_id, only hedge_order_id)
+                elif order_result.get("hedge_order_id") and order_result.get("is_hedge_cleanup"):
+                    hedge_order_id = order_result["hedge_order_id"]
+                    logger.info(f"Queueing hedge cleanup order {hedge_order_id} for monitoring")
+                    await order_queue.put({
+                        "order_id": hedge_order_id,
+                        "strategy": strategy
+                    })
+        except Exception as e:
+            logger.error(f"Error in process_cycle for '{strategy_name}': {e}", exc_info=True)
+        finally:
+            if scheduler is not None:
+                scheduler.cycle_done(schedule_key)
+        
+        try:
+            if scheduler is not None and scheduler.running:
+                await scheduler.wait_for_boundary(schedule_key)
+            else:
+                # Returns at the bar close when the candle aggregator builds this symbol's bars
+                await wait_for_bar_close(strategy.dp, strategy.symbol, cycle_interval_minutes)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error waiting for the next cycle of '{strategy_name}': {e}", exc_info=True)
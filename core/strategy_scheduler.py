@@ -0,0 +1,241 @@
+"""
+Central candle-boundary scheduler for strategy cycles.
+
+Instead of every strategy runner sleeping on its own timer until the next candle, runners
+register their cycle interval here and wait on the scheduler. One loop sleeps until the
+next boundary of any registered interval (aligned to the 09:15 session open) and wakes the
+strategies whose interval ends there. They are released in priority order (shorter
+intervals first) and at most max_concurrent cycles run at once, so a boundary shared by
+dozens of strategies does not hit the broker rate limiter all in the same instant. A slot
+is given back when the runner reports its cycle done, or after slot_timeout for cycles that
+keep waiting inside process_cycle (e.g. an atomic confirmation on the next candle).
+
+For every cycle the scheduler records the latency from the boundary to the release and to
+the decision (cycle done).
+"""
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from datetime import timedelta
+from typing import Any, Dict, Hashable, Optional
+
+import pandas as pd
+
+from algosat.common.logger import get_logger
+from algosat.core.candle_aggregator import session_open
+from algosat.core.candle_store import to_naive_ist
+from algosat.core.time_utils import get_ist_datetime
+
+logger = get_logger("StrategyScheduler")
+
+# Cycles allowed to run at once right after a boundary
+DEFAULT_MAX_CONCURRENT = 4
+# Seconds a released cycle holds its slot at most
+DEFAULT_SLOT_TIMEOUT = 15.0
+# Number of recent cycles kept per strategy for average/max latency stats
+LATENCY_WINDOW = 200
+
+
+def next_boundary(now, interval_minutes: int) -> pd.Timestamp:
+    """The first interval_minutes candle boundary after now (naive IST), aligned to 09:15."""
+    now = to_naive_ist(now)
+    opened = session_open(now)
+    minutes = int((now - opened).total_seconds() // 60)
+    return opened + timedelta(minutes=(minutes // interval_minutes + 1) * interval_minutes)
+
+
+class _Member:
+    def __init__(self, key: Hashable, interval: int, priority: int, order: int):
+        self.key = key
+        self.interval = interval
+        self.priority = priority
+        self.order = order
+        self.waiter: Optional[asyncio.Future] = None
+        self.boundary: Optional[pd.Timestamp] = None  # boundary of the cycle in progress
+        self.boundary_at: Optional[float] = None  # monotonic time of that boundary
+        self.slot_timer: Optional[asyncio.TimerHandle] = None
+        self.stats = {"cycles": 0, "skipped": 0, "last_ms": 0.0, "avg_ms": 0.0, "max_ms": 0.0, "avg_release_ms": 0.0}
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.release_delays = deque(maxlen=LATENCY_WINDOW)
+
+
+class StrategyScheduler:
+    """Wakes registered strategy runners once per candle boundary of their interval."""
+
+    def __init__(
+        self,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+        slot_timeout: float = DEFAULT_SLOT_TIMEOUT,
+        clock=None,  # Optional callable returning the current IST datetime (tests)
+    ):
+        self.max_concurrent = max_concurrent
+        self.slot_timeout = slot_timeout
+        self._clock = clock or get_ist_datetime
+        self._members: Dict[Hashable, _Member] = {}
+        self._order = itertools.count()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._changed: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._release_tasks = set()
+        self._running = False
+        self._last_boundary: Optional[pd.Timestamp] = None
+        # Stats
+        self._boundaries = 0
+        self._released = 0
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def now(self) -> pd.Timestamp:
+        return to_naive_ist(self._clock())
+
+    def register(self, key: Hashable, interval_minutes: int, priority: Optional[int] = None) -> None:
+        """Schedule key every interval_minutes; lower priority values are released first (default: the interval)."""
+        interval = int(interval_minutes)
+        if interval <= 0:
+            raise ValueError(f"Invalid cycle interval {interval_minutes} for {key}")
+        self._members[key] = _Member(key, interval, interval if priority is None else priority, next(self._order))
+        if self._changed is not None:
+            self._changed.set()
+        logger.debug(f"StrategyScheduler: Registered {key} every {interval}m ({len(self._members)} scheduled)")
+
+    def unregister(self, key: Hashable) -> None:
+        member = self._members.pop(key, None)
+        if member is None:
+            return
+        self._release_slot(member)
+        if member.waiter is not None and not member.waiter.done():
+            member.waiter.cancel()
+        logger.debug(f"StrategyScheduler: Unregistered {key} ({len(self._members)} scheduled)")
+
+    def is_scheduled(self, key: Hashable) -> bool:
+        return key in self._members
+
+    async def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._running = True
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._changed = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"StrategyScheduler: Started with max_concurrent={self.max_concurrent}, slot_timeout={self.slot_timeout}s")
+
+    async def stop(self) -> None:
+        self._running = False
+        tasks = [self._task, *self._release_tasks] if self._task is not None else list(self._release_tasks)
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        self._release_tasks.clear()
+        for member in self._members.values():
+            self._release_slot(member)
+            if member.waiter is not None and not member.waiter.done():
+                member.waiter.cancel()
+
+    async def wait_for_boundary(self, key: Hashable) -> pd.Timestamp:
+        """Wait until key is released at its next boundary; returns that boundary (naive IST)."""
+        member = self._members.get(key)
+        if member is None:
+            raise KeyError(f"StrategyScheduler has no strategy {key}")
+        member.waiter = asyncio.get_running_loop().create_future()
+        return await member.waiter
+
+    def cycle_done(self, key: Hashable) -> None:
+        """Report that the cycle started at the last boundary has reached its decision."""
+        member = self._members.get(key)
+        if member is None:
+            return
+        self._release_slot(member)
+        if member.boundary_at is None:
+            return  # first cycle after setup, not started by a boundary
+        latency = (time.monotonic() - member.boundary_at) * 1000
+        member.boundary_at = None
+        member.latencies.append(latency)
+        stats = member.stats
+        stats["cycles"] += 1
+        stats["last_ms"] = round(latency, 2)
+        stats["avg_ms"] = round(sum(member.latencies) / len(member.latencies), 2)
+        stats["max_ms"] = round(max(stats["max_ms"], latency), 2)
+        logger.debug(f"StrategyScheduler: {key} decided {latency:.0f}ms after the {member.boundary} boundary")
+
+    async def _run(self) -> None:
+        while self._running:
+            if not self._members:
+                self._changed.clear()
+                await self._changed.wait()
+                continue
+            now = self.now()
+            # Never fire the same boundary twice if the timer wakes up a little early
+            after = max(now, self._last_boundary) if self._last_boundary is not None else now
+            boundary = min(next_boundary(after, m.interval) for m in self._members.values())
+            self._changed.clear()
+            try:
+                # A newly registered shorter interval may have an earlier boundary
+                await asyncio.wait_for(self._changed.wait(), timeout=max(0.0, (boundary - now).total_seconds()))
+                continue
+            except asyncio.TimeoutError:
+                pass
+            self._last_boundary = boundary
+            self._fire(boundary)
+
+    def _fire(self, boundary: pd.Timestamp) -> None:
+        boundary_at = time.monotonic()
+        minutes = int((boundary - session_open(boundary)).total_seconds() // 60)
+        due = []
+        for member in self._members.values():
+            if minutes % member.interval:
+                continue
+            if member.waiter is None or member.waiter.done():
+                member.stats["skipped"] += 1  # still in the previous cycle
+                continue
+            due.append(member)
+        self._boundaries += 1
+        if not due:
+            return
+        due.sort(key=lambda m: (m.priority, m.order))
+        logger.debug(f"StrategyScheduler: Boundary {boundary}, releasing {len(due)} strategies")
+        task = asyncio.create_task(self._release(due, boundary, boundary_at))
+        self._release_tasks.add(task)
+        task.add_done_callback(self._release_tasks.discard)
+
+    async def _release(self, due, boundary: pd.Timestamp, boundary_at: float) -> None:
+        loop = asyncio.get_running_loop()
+        for member in due:
+            await self._slots.acquire()
+            if self._members.get(member.key) is not member or member.waiter is None or member.waiter.done():
+                self._slots.release()
+                continue
+            member.boundary = boundary
+            member.boundary_at = boundary_at
+            member.slot_timer = loop.call_later(self.slot_timeout, self._release_slot, member)
+            delay = (time.monotonic() - boundary_at) * 1000
+            member.release_delays.append(delay)
+            member.stats["avg_release_ms"] = round(sum(member.release_delays) / len(member.release_delays), 2)
+            self._released += 1
+            member.waiter.set_result(boundary)
+
+    def _release_slot(self, member: _Member) -> None:
+        if member.slot_timer is None:
+            return
+        member.slot_timer.cancel()
+        member.slot_timer = None
+        self._slots.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "scheduled": len(self._members),
+            "boundaries": self._boundaries,
+            "released": self._released,
+            "max_concurrent": self.max_concurrent,
+            "strategies": {
+                str(key): {"interval": member.interval, **member.stats} for key, member in self._members.items()
+            },
+        }
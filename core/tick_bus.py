@@ -0,0 +1,361 @@
+"""
+In-process market-data tick bus.
+
+One TickBus owns one broker data socket (a TickSource; Fyers through FyersWrapper's data
+websocket) and keeps a latest-tick table keyed by broker symbol. The socket is subscribed to
+the union of every owner's interest: open orders (set by OrderMonitorScheduler), the dashboard
+live feed, and symbols looked up through get_ltp, which stay subscribed until they have not
+been asked for in on_demand_ttl seconds. DataManager.get_ltp serves from the table while a tick
+is at most max_tick_age seconds old and only falls back to REST for stale or unknown symbols.
+
+The table is written by the socket callback thread and read by the event loop without a lock:
+each update replaces one dict entry with a new immutable Tick. Listeners (the dashboard
+websocket) receive every raw socket message through a bounded queue that drops the oldest
+message when a consumer falls behind.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from algosat.common.logger import get_logger
+
+logger = get_logger("TickBus")
+
+# A tick older than this is not used to answer get_ltp (seconds)
+DEFAULT_MAX_TICK_AGE = 5.0
+# On-demand symbols (subscribed because get_ltp asked for them) are dropped after this idle time
+DEFAULT_ON_DEMAND_TTL = 15 * 60
+# Interval of the subscription sync loop that expires idle on-demand symbols
+SUBSCRIPTION_SYNC_INTERVAL = 30.0
+# Per-listener queue bound; the oldest message is dropped when a listener falls behind
+LISTENER_QUEUE_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class Tick:
+    """Latest trade for one symbol as seen on the data socket."""
+    symbol: str
+    ltp: float
+    received_at: float  # time.monotonic() when the message arrived
+    exchange_time: Optional[int] = None  # epoch seconds of the exchange feed, when sent
+    volume: Optional[float] = None  # cumulative volume traded today, when sent
+
+
+class TickSource:
+    """A broker data socket that pushes ticks to a callback."""
+
+    broker_name: str = ""
+
+    async def connect(self, on_message: Callable[[Any], None], on_connect: Callable[[], None]) -> None:
+        """Open the socket. on_message and on_connect may be called from any thread."""
+        raise NotImplementedError
+
+    def subscribe(self, symbols: List[str]) -> None:
+        raise NotImplementedError
+
+    def unsubscribe(self, symbols: List[str]) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class FyersTickSource(TickSource):
+    """Fyers SymbolUpdate ticks from FyersWrapper's data websocket."""
+
+    broker_name = "fyers"
+
+    def __init__(self, fyers_wrapper, data_type: str = "SymbolUpdate"):
+        self.fyers_wrapper = fyers_wrapper
+        self.data_type = data_type
+
+    async def connect(self, on_message: Callable[[Any], None], on_connect: Callable[[], None]) -> None:
+        def on_error(message):
+            logger.error(f"TickBus: Fyers data socket error: {message}")
+
+        def on_close(message):
+            logger.info(f"TickBus: Fyers data socket closed: {message}")
+            self.fyers_wrapper.ws_connected = False
+
+        def on_open():
+            self.fyers_wrapper.ws_connected = True
+            on_connect()
+
+        self.fyers_wrapper.init_websocket(
+            on_connect=on_open, on_message=on_message, on_error=on_error, on_close=on_close
+        )
+        await asyncio.get_running_loop().run_in_executor(None, self.fyers_wrapper.connect_websocket)
+
+    def subscribe(self, symbols: List[str]) -> None:
+        self.fyers_wrapper.subscribe_websocket(symbols, data_type=self.data_type)
+
+    def unsubscribe(self, symbols: List[str]) -> None:
+        self.fyers_wrapper.unsubscribe_websocket(symbols, data_type=self.data_type)
+
+    async def close(self) -> None:
+        self.fyers_wrapper.close_websocket()
+
+
+def parse_tick(message: Any, received_at: float) -> Optional[Tick]:
+    """Tick from a data-socket message, or None for control messages (connect/subscribe acks)."""
+    if not isinstance(message, dict):
+        return None
+    symbol = message.get("symbol")
+    ltp = message.get("ltp")
+    if not symbol or ltp is None:
+        return None
+    try:
+        ltp = float(ltp)
+    except (TypeError, ValueError):
+        return None
+    return Tick(
+        symbol=symbol,
+        ltp=ltp,
+        received_at=received_at,
+        exchange_time=message.get("exch_feed_time"),
+        volume=message.get("vol_traded_today"),
+    )
+
+
+class TickBus:
+    """Single data-socket subscription shared by strategies, order monitors and the dashboard."""
+
+    def __init__(
+        self,
+        max_tick_age: float = DEFAULT_MAX_TICK_AGE,
+        on_demand_ttl: float = DEFAULT_ON_DEMAND_TTL,
+        sync_interval: float = SUBSCRIPTION_SYNC_INTERVAL,
+    ):
+        self.max_tick_age = max_tick_age
+        self.on_demand_ttl = on_demand_ttl
+        self.sync_interval = sync_interval
+        self.source: Optional[TickSource] = None
+        self._ticks: Dict[str, Tick] = {}
+        self._interests: Dict[str, Set[str]] = {}  # owner -> symbols
+        self._on_demand: Dict[str, float] = {}  # symbol -> time.monotonic() of the last get_ltp
+        self._subscribed: Set[str] = set()
+        self._listeners: List[asyncio.Queue] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sync_event: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._connected = False
+        self._running = False
+        # Stats
+        self._tick_count = 0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def broker_name(self) -> Optional[str]:
+        return self.source.broker_name if self.source is not None else None
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def attach_source(self, source: TickSource) -> None:
+        if self._running:
+            raise RuntimeError("TickBus: Cannot replace the source of a running bus. Call stop() first.")
+        self.source = source
+
+    async def start(self) -> None:
+        if self._running:
+            return
+        if self.source is None:
+            raise RuntimeError("TickBus: No tick source attached. Call attach_source() first.")
+        self._loop = asyncio.get_running_loop()
+        self._sync_event = asyncio.Event()
+        self._running = True
+        try:
+            await self.source.connect(self._on_message, self._on_connect)
+        except Exception:
+            self._running = False
+            raise
+        self._task = asyncio.create_task(self._sync_loop())
+        logger.info(f"TickBus: Started on {self.broker_name} data socket")
+
+    async def stop(self) -> None:
+        self._running = False
+        self._connected = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.source is not None:
+            try:
+                await self.source.close()
+            except Exception as e:
+                logger.error(f"TickBus: Error closing {self.broker_name} data socket: {e}")
+        self._subscribed.clear()
+
+    # --- Interest management ---
+
+    def set_interest(self, owner: str, symbols: Iterable[str]) -> None:
+        """Replace the set of symbols an owner needs; the socket subscription follows the union."""
+        symbols = {s for s in symbols if s}
+        if symbols:
+            self._interests[owner] = symbols
+        else:
+            self._interests.pop(owner, None)
+        self._request_sync()
+
+    def desired_symbols(self) -> Set[str]:
+        cutoff = time.monotonic() - self.on_demand_ttl
+        desired = {symbol for symbol, last_used in self._on_demand.items() if last_used >= cutoff}
+        for symbols in self._interests.values():
+            desired |= symbols
+        return desired
+
+    def _request_sync(self) -> None:
+        if self._loop is None or self._sync_event is None:
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            self._sync_event.set()
+        else:
+            self._loop.call_soon_threadsafe(self._sync_event.set)
+
+    async def _sync_loop(self) -> None:
+        while self._running:
+            try:
+                await asyncio.wait_for(self._sync_event.wait(), timeout=self.sync_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._sync_event.clear()
+            try:
+                self.sync_subscriptions()
+            except Exception as e:
+                logger.error(f"TickBus: Subscription sync failed: {e}")
+
+    def sync_subscriptions(self) -> None:
+        """Subscribe newly needed symbols and unsubscribe ones no owner needs any more."""
+        cutoff = time.monotonic() - self.on_demand_ttl
+        for symbol in [s for s, last_used in self._on_demand.items() if last_used < cutoff]:
+            del self._on_demand[symbol]
+        if not self._connected or self.source is None:
+            return
+        desired = self.desired_symbols()
+        added = sorted(desired - self._subscribed)
+        removed = sorted(self._subscribed - desired)
+        if added:
+            self.source.subscribe(added)
+            self._subscribed.update(added)
+        if removed:
+            self.source.unsubscribe(removed)
+            self._subscribed.difference_update(removed)
+            for symbol in removed:
+                self._ticks.pop(symbol, None)
+        if added or removed:
+            logger.debug(f"TickBus: Subscribed {len(added)}, unsubscribed {len(removed)}; {len(self._subscribed)} symbols live")
+
+    # --- Socket callbacks (may run on the socket thread) ---
+
+    def _on_connect(self) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._handle_connect)
+
+    def _handle_connect(self) -> None:
+        # A (re)connected socket has no subscriptions; resubscribe everything now
+        self._connected = True
+        self._subscribed = set()
+        self._sync_event.set()
+
+    def _on_message(self, message: Any) -> None:
+        tick = parse_tick(message, time.monotonic())
+        if tick is not None:
+            self._ticks[tick.symbol] = tick
+            self._tick_count += 1
+        if self._listeners and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._fan_out, message)
+
+    # --- Readers ---
+
+    def get_tick(self, symbol: str, max_age: Optional[float] = None) -> Optional[Tick]:
+        """Latest tick for a symbol if it is at most max_age (default max_tick_age) seconds old."""
+        tick = self._ticks.get(symbol)
+        max_age = self.max_tick_age if max_age is None else max_age
+        if tick is None or time.monotonic() - tick.received_at > max_age:
+            return None
+        return tick
+
+    def get_ltps(self, symbols: Iterable[str], max_age: Optional[float] = None) -> Tuple[Dict[str, float], List[str]]:
+        """
+        Fresh LTPs for the given symbols and the symbols without one. Every requested symbol
+        becomes (or stays) an on-demand subscription.
+        """
+        now = time.monotonic()
+        ltps, missing = {}, []
+        new_symbol = False
+        for symbol in symbols:
+            if symbol not in self._on_demand:
+                new_symbol = True
+            self._on_demand[symbol] = now
+            tick = self.get_tick(symbol, max_age)
+            if tick is None:
+                missing.append(symbol)
+            else:
+                ltps[symbol] = tick.ltp
+        self._hits += len(ltps)
+        self._misses += len(missing)
+        if new_symbol:
+            self._request_sync()
+        return ltps, missing
+
+    def get_ltp(self, symbol: str, max_age: Optional[float] = None) -> Optional[float]:
+        ltps, _ = self.get_ltps([symbol], max_age)
+        return ltps.get(symbol)
+
+    # --- Listeners ---
+
+    def listen(self, maxsize: int = LISTENER_QUEUE_SIZE) -> asyncio.Queue:
+        """Queue that receives every raw data-socket message until unlisten() is called."""
+        queue = asyncio.Queue(maxsize=maxsize)
+        self._listeners.append(queue)
+        return queue
+
+    def unlisten(self, queue: asyncio.Queue) -> None:
+        if queue in self._listeners:
+            self._listeners.remove(queue)
+
+    def _fan_out(self, message: Any) -> None:
+        for queue in self._listeners:
+            if queue.full():
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+            queue.put_nowait(message)
+
+    def get_stats(self) -> Dict[str, Any]:
+        served = self._hits + self._misses
+        return {
+            "broker": self.broker_name,
+            "connected": self._connected,
+            "subscribed": len(self._subscribed),
+            "on_demand": len(self._on_demand),
+            "interests": {owner: len(symbols) for owner, symbols in self._interests.items()},
+            "listeners": len(self._listeners),
+            "ticks": self._tick_count,
+            "ltp_hits": self._hits,
+            "ltp_misses": self._misses,
+            "hit_ratio": round(self._hits / served, 4) if served else 0.0,
+        }
+
+
+_tick_bus: Optional[TickBus] = None
+
+
+def get_tick_bus() -> TickBus:
+    """The process-wide TickBus shared by DataManager, the order monitors and the live feed."""
+    global _tick_bus
+    if _tick_bus is None:
+        _tick_bus = TickBus()
+    return _tick_bus
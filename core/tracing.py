@@ -0,0 +1,319 @@
+"""
+Lightweight in-process tracing for strategy cycles and order-monitor ticks.
+
+Each strategy cycle and each OrderMonitor tick opens a root span; data fetches, indicator
+computation, rate-limiter waits, broker calls and DB sessions/statements open child spans of
+whatever span is current (a ContextVar, so asyncio tasks started inside a span inherit it).
+
+Span and trace ids follow W3C trace context (16-byte trace id, 8-byte span id) and spans are
+exported as JSON lines with OTLP field names (traceId, spanId, parentSpanId, name,
+startTimeUnixNano, endTimeUnixNano, attributes, status), so the files can be shipped by an
+OpenTelemetry collector's filelog receiver. A trace is exported in one write when its root
+span ends.
+
+Sampling is decided once per root span. When a root is not sampled, or there is no current
+span, span() returns a shared no-op scope: the cost is one ContextVar lookup.
+"""
+
+import inspect
+import json
+import os
+import random
+import sys
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Dict, List, Optional
+
+from algosat.common import constants
+from algosat.common.logger import get_logger, set_trace_context, submit_line
+
+logger = get_logger("tracing")
+
+SERVICE_NAME = "algosat"
+DEFAULT_TRACE_DIR = os.path.join(constants.ROOT_DIR, "Files/traces")
+# Spans kept per trace; a runaway cycle is cut off rather than growing without bound
+MAX_SPANS_PER_TRACE = 2000
+# Attribute values longer than this are truncated (SQL statements, messages)
+MAX_ATTRIBUTE_LENGTH = 300
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class _Trace:
+    __slots__ = ("trace_id", "spans", "open", "dropped")
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: List["Span"] = []
+        self.open = True
+        self.dropped = 0
+
+
+class Span:
+    """One timed operation; attributes follow OpenTelemetry naming where one exists."""
+
+    __slots__ = ("name", "trace", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, trace: _Trace, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.error = f"{type(exc).__name__}: {exc}"
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        return (self.end_ns - self.start_ns) / 1e6 if self.end_ns is not None else None
+
+    def to_json(self) -> dict:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "kind": "SPAN_KIND_INTERNAL",
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "attributes": {k: _attribute_value(v) for k, v in self.attributes.items()},
+            "status": {"code": "STATUS_CODE_ERROR", "message": self.error} if self.error else {"code": "STATUS_CODE_OK"},
+            "resource": {"service.name": SERVICE_NAME},
+        }
+
+
+def _attribute_value(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    text = str(value)
+    return text if len(text) <= MAX_ATTRIBUTE_LENGTH else text[:MAX_ATTRIBUTE_LENGTH] + "..."
+
+
+class FileSpanExporter:
+    """Appends spans as JSON lines to <trace_dir>/spans-YYYY-MM-DD.jsonl via the log writer thread."""
+
+    def __init__(self, trace_dir: str = DEFAULT_TRACE_DIR):
+        self.trace_dir = trace_dir
+
+    def export(self, spans: List[Span]) -> None:
+        path = os.path.join(self.trace_dir, f"spans-{time.strftime('%Y-%m-%d')}.jsonl")
+        submit_line(path, "\n".join(json.dumps(span.to_json(), separators=(",", ":")) for span in spans))
+
+
+class StdoutSpanExporter:
+    """Writes spans as JSON lines to stdout."""
+
+    def export(self, spans: List[Span]) -> None:
+        sys.stdout.write("".join(json.dumps(span.to_json(), separators=(",", ":")) + "\n" for span in spans))
+
+
+class _NoopScope:
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SCOPE = _NoopScope()
+
+
+class _DetachedScope:
+    """An unsampled root inside a traced task: its work must not join the outer trace."""
+
+    __slots__ = ("_token",)
+
+    def __enter__(self):
+        self._token = _current_span.set(None)
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_span.reset(self._token)
+        return False
+
+
+class _SpanScope:
+    """Makes span current for the with-block and ends it on exit."""
+
+    __slots__ = ("tracer", "span", "_token", "_log_context")
+
+    def __init__(self, tracer: "Tracer", span: Span):
+        self.tracer = tracer
+        self.span = span
+        self._token = None
+        self._log_context = None
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self.span)
+        if self.span.parent_id is None:
+            # Root spans stamp their trace id into the log lines written inside them
+            self._log_context = set_trace_context(self.span.trace_id)
+            self._log_context.__enter__()
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None:
+            self.span.record_exception(exc)
+        if self._log_context is not None:
+            self._log_context.__exit__(None, None, None)
+        _current_span.reset(self._token)
+        self.tracer.end(self.span)
+        return False
+
+
+class Tracer:
+    """Creates spans, decides sampling per root span and hands finished traces to the exporter."""
+
+    def __init__(self, sample_ratio: float = 0.0, exporter=None):
+        self.sample_ratio = sample_ratio
+        self.exporter = exporter
+        # Stats
+        self.roots_started = 0
+        self.roots_sampled = 0
+        self.spans_exported = 0
+        self.spans_dropped = 0
+        self.export_errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_ratio > 0 and self.exporter is not None
+
+    def root_span(self, name: str, **attributes):
+        """Start a new trace (sampled at sample_ratio); a no-op scope when not sampled."""
+        if not self.enabled:
+            return _NOOP_SCOPE
+        self.roots_started += 1
+        if self.sample_ratio < 1.0 and random.random() >= self.sample_ratio:
+            return _NOOP_SCOPE if _current_span.get() is None else _DetachedScope()
+        self.roots_sampled += 1
+        return _SpanScope(self, Span(name, _Trace(os.urandom(16).hex()), None, attributes))
+
+    def span(self, name: str, **attributes):
+        """A child of the current span; a no-op scope outside a sampled trace."""
+        parent = _current_span.get()
+        if parent is None:
+            return _NOOP_SCOPE
+        return _SpanScope(self, Span(name, parent.trace, parent.span_id, attributes))
+
+    def start_span(self, name: str, **attributes) -> Optional[Span]:
+        """
+        A child of the current span that is not made current, for callbacks that start and
+        end an operation in different places (DB statement hooks). End it with end().
+        """
+        parent = _current_span.get()
+        if parent is None:
+            return None
+        return Span(name, parent.trace, parent.span_id, attributes)
+
+    def end(self, span: Span) -> None:
+        span.end_ns = time.time_ns()
+        trace = span.trace
+        if span.parent_id is None:
+            trace.open = False
+            if trace.dropped:
+                span.attributes["spans_dropped"] = trace.dropped
+            spans, trace.spans = trace.spans + [span], []
+            self._export(spans)
+        elif trace.open:
+            if len(trace.spans) < MAX_SPANS_PER_TRACE:
+                trace.spans.append(span)
+            else:
+                trace.dropped += 1
+                self.spans_dropped += 1
+        else:
+            # Finished after its root (a task that outlived the cycle): export on its own
+            self._export([span])
+
+    def _export(self, spans: List[Span]) -> None:
+        try:
+            self.exporter.export(spans)
+            self.spans_exported += len(spans)
+        except Exception as e:
+            self.export_errors += 1
+            logger.warning(f"Could not export {len(spans)} spans: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "sample_ratio": self.sample_ratio,
+            "exporter": type(self.exporter).__name__ if self.exporter is not None else None,
+            "roots_started": self.roots_started,
+            "roots_sampled": self.roots_sampled,
+            "spans_exported": self.spans_exported,
+            "spans_dropped": self.spans_dropped,
+            "export_errors": self.export_errors,
+        }
+
+
+# Singleton instance; disabled until configure_tracing() is called
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def configure_tracing(sample_ratio: float, exporter: str = "file", trace_dir: Optional[str] = None) -> Tracer:
+    """
+    Enable tracing of sample_ratio of the root spans (0 disables it) with the "file" or
+    "stdout" exporter.
+    """
+    if exporter == "stdout":
+        _tracer.exporter = StdoutSpanExporter()
+    elif exporter == "file":
+        _tracer.exporter = FileSpanExporter(trace_dir or DEFAULT_TRACE_DIR)
+    else:
+        raise ValueError(f"Unknown trace exporter: {exporter!r} (expected 'file' or 'stdout')")
+    _tracer.sample_ratio = max(0.0, min(1.0, sample_ratio))
+    if _tracer.enabled:
+        logger.info(f"Tracing {_tracer.sample_ratio:.0%} of strategy cycles and order-monitor ticks ({exporter} exporter)")
+    return _tracer
+
+
+def root_span(name: str, **attributes):
+    return _tracer.root_span(name, **attributes)
+
+
+def span(name: str, **attributes):
+    return _tracer.span(name, **attributes)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def traced(name: Optional[str] = None):
+    """Decorator: run the (async or sync) function inside a child span of the current span."""
+    def decorator(func):
+        span_name = name or func.__qualname__
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _current_span.get() is None:
+                    return await func(*args, **kwargs)
+                with _tracer.span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return func(*args, **kwargs)
+            with _tracer.span(span_name):
+                return func(*args, **kwargs)
+        return sync_wrapper
+    return decorator
@@ -0,0 +1,196 @@
+"""
+Precomputed NSE trading calendar.
+
+The holiday list is loaded once (per IST day) and turned into a sorted array of trading
+session dates covering a few years around today, so trade-day, previous/next session,
+N-sessions-back and candle-boundary questions are answered with a bisect instead of
+re-reading the holiday file and walking back one day at a time.
+
+This module is also the single source of truth for the market hours used by the strategy
+manager, the broker monitor, the market-hours API helpers and the candle aggregator.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, List, NamedTuple, Optional
+
+from algosat.common.logger import get_logger
+from algosat.core.time_utils import get_ist_datetime, localize_to_ist
+
+logger = get_logger("trading_calendar")
+
+# Indian stock market hours (IST)
+MARKET_OPEN = time(9, 15)
+MARKET_CLOSE = time(15, 30)
+PRE_MARKET_START = time(9, 0)
+POST_MARKET_END = time(16, 0)
+# Saturday, Sunday (0=Monday)
+WEEKEND_DAYS = (5, 6)
+# Years precomputed before and after the current one; other dates extend the calendar on demand
+YEARS_BACK = 3
+YEARS_AHEAD = 2
+# Holiday formats seen in the cached NSE file: API dates and the hardcoded fallback list
+HOLIDAY_FORMATS = ("%d-%b-%Y", "%Y-%m-%d")
+
+
+class Session(NamedTuple):
+    """One trading session; open and close are naive IST datetimes."""
+    date: date
+    open: datetime
+    close: datetime
+
+
+def parse_holiday(value) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    for fmt in HOLIDAY_FORMATS:
+        try:
+            return datetime.strptime(str(value).strip(), fmt).date()
+        except ValueError:
+            continue
+    logger.warning(f"Ignoring unparseable holiday date: {value!r}")
+    return None
+
+
+def _as_date(value) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _naive_ist(value: datetime) -> datetime:
+    return localize_to_ist(value).replace(tzinfo=None) if value.tzinfo is not None else value
+
+
+class TradingCalendar:
+    """Sorted trading session dates with O(log n) lookups."""
+
+    def __init__(self, holidays: Iterable = (), today: Optional[date] = None):
+        self.holidays = frozenset(d for d in map(parse_holiday, holidays) if d is not None)
+        today = today or get_ist_datetime().date()
+        years = [holiday.year for holiday in self.holidays]
+        self._first_year = min([today.year - YEARS_BACK, *years])
+        self._last_year = max([today.year + YEARS_AHEAD, *years])
+        self._build()
+
+    def _build(self) -> None:
+        day = date(self._first_year, 1, 1)
+        last = date(self._last_year, 12, 31)
+        ordinals = []
+        while day <= last:
+            if day.weekday() not in WEEKEND_DAYS and day not in self.holidays:
+                ordinals.append(day.toordinal())
+            day += timedelta(days=1)
+        self._ordinals: List[int] = ordinals
+
+    def _ordinal(self, value) -> int:
+        day = _as_date(value)
+        # Keep one year of margin so next/previous lookups never fall off either end
+        if day.year <= self._first_year or day.year >= self._last_year:
+            self._first_year = min(self._first_year, day.year - 1)
+            self._last_year = max(self._last_year, day.year + 1)
+            self._build()
+        return day.toordinal()
+
+    def is_trading_day(self, value) -> bool:
+        ordinal = self._ordinal(value)
+        index = bisect_left(self._ordinals, ordinal)
+        return index < len(self._ordinals) and self._ordinals[index] == ordinal
+
+    def trade_day(self, value) -> date:
+        """The trading day on or before value."""
+        ordinal = self._ordinal(value)
+        return date.fromordinal(self._ordinals[bisect_right(self._ordinals, ordinal) - 1])
+
+    def previous_trading_day(self, value) -> date:
+        """The last trading day strictly before value."""
+        ordinal = self._ordinal(value)
+        return date.fromordinal(self._ordinals[bisect_left(self._ordinals, ordinal) - 1])
+
+    def next_trading_day(self, value) -> date:
+        """The first trading day strictly after value."""
+        ordinal = self._ordinal(value)
+        return date.fromordinal(self._ordinals[bisect_right(self._ordinals, ordinal)])
+
+    def sessions_back(self, value, count: int) -> date:
+        """The trading day count sessions before the trade day of value (0 is the trade day itself)."""
+        ordinal = self._ordinal(value)
+        index = bisect_right(self._ordinals, ordinal) - 1 - count
+        while index < 0:
+            self._first_year -= 1
+            self._build()
+            index = bisect_right(self._ordinals, ordinal) - 1 - count
+        return date.fromordinal(self._ordinals[index])
+
+    def trading_days(self, start, end) -> List[date]:
+        """Trading days from start to end, both inclusive."""
+        first, last = self._ordinal(start), self._ordinal(end)
+        return [date.fromordinal(o) for o in self._ordinals[bisect_left(self._ordinals, first):bisect_right(self._ordinals, last)]]
+
+    def session(self, value) -> Optional[Session]:
+        """The session on the date of value, or None on weekends and holidays."""
+        day = _as_date(value)
+        if not self.is_trading_day(day):
+            return None
+        return Session(day, datetime.combine(day, MARKET_OPEN), datetime.combine(day, MARKET_CLOSE))
+
+    def next_session(self, when: datetime) -> Session:
+        """The session in progress at when, or else the next one to open."""
+        when = _naive_ist(when)
+        session = self.session(when)
+        if session is not None and when < session.close:
+            return session
+        return self.session(self.next_trading_day(when))
+
+    def is_market_open(self, when: datetime) -> bool:
+        when = _naive_ist(when)
+        session = self.session(when)
+        return session is not None and session.open <= when < session.close
+
+    def next_candle_close(self, when: datetime, interval_minutes: int) -> datetime:
+        """
+        The first interval_minutes candle boundary after when (naive IST), aligned to the
+        session open. The last candle of a session closes at the session close.
+        """
+        when = _naive_ist(when)
+        session = self.next_session(when)
+        candles = 1
+        if when >= session.open:
+            candles += int((when - session.open).total_seconds() // 60) // interval_minutes
+        return min(session.open + timedelta(minutes=candles * interval_minutes), session.close)
+
+    def get_stats(self) -> dict:
+        return {
+            "holidays": len(self.holidays),
+            "sessions": len(self._ordinals),
+            "first_year": self._first_year,
+            "last_year": self._last_year,
+        }
+
+
+def _load_nse_holidays() -> list:
+    from algosat.common.broker_utils import get_nse_holiday_list
+    return get_nse_holiday_list() or []
+
+
+# Singleton instance, rebuilt once per IST day so a refreshed holiday file is picked up
+_trading_calendar: Optional[TradingCalendar] = None
+_loaded_on: Optional[date] = None
+
+
+def get_trading_calendar() -> TradingCalendar:
+    global _trading_calendar, _loaded_on
+    today = get_ist_datetime().date()
+    if _trading_calendar is None or _loaded_on != today:
+        try:
+            holidays = _load_nse_holidays()
+        except Exception as e:
+            logger.error(f"Error loading NSE holidays for the trading calendar: {e}")
+            if _trading_calendar is not None:
+                return _trading_calendar  # keep yesterday's calendar, retry on the next call
+            logger.warning("🟡 NSE holiday list unavailable, assuming no holidays.")
+            holidays = []
+        _trading_calendar = TradingCalendar(holidays, today=today)
+        _loaded_on = today
+        logger.debug(f"Trading calendar built: {_trading_calendar.get_stats()}")
+    return _trading_calendar
@@ -8,7 +8,7 @@ from algosat.core.db import init_db, engine
 from algosat.core.db import seed_default_strategies_and_configs
 from algosat.core.dbschema import strategies, strategy_configs, broker_credentials
 from algosat.core.strategy_manager import run_poll_loop
-from algosat.common.broker_utils import get_broker_credentials, upsert_broker_credentials, get_nse_holiday_list
+from algosat.common.broker_utils import get_broker_credentials, upsert_broker_credentials
 from algosat.common.logger import get_logger
 from algosat.common.default_broker_configs import DEFAULT_BROKER_CONFIGS # Import the default configs
 from algosat.common.default_strategy_configs import DEFAULT_STRATEGY_CONFIGS
@@ -16,8 +16,15 @@ from algosat.core.time_utils import get_ist_datetime
 from sqlalchemy import select
 from datetime import datetime, timedelta, time
 from algosat.core.data_manager import DataManager
+from algosat.core.candle_store import CandleStore
+from algosat.core.tick_bus import get_tick_bus
+from algosat.core.candle_aggregator import get_candle_aggregator
+from algosat.core.trading_calendar import get_trading_calendar
 from algosat.core.broker_manager import BrokerManager
 from algosat.core.order_manager import OrderManager
+from algosat.core.monitoring import start_metrics_server
+from algosat.core.tracing import configure_tracing
+from algosat.config import settings
 import warnings
 warnings.filterwarnings("ignore", category=UserWarning, message="pkg_resources is deprecated")
 
@@ -25,7 +32,12 @@ logger = get_logger(__name__)
 
 broker_manager = BrokerManager()
 
-data_manager = DataManager(broker_manager=broker_manager)
+data_manager = DataManager(
+    broker_manager=broker_manager,
+    candle_store=CandleStore(retention_days=settings.candle_store_retention_days),
+    tick_bus=get_tick_bus(),
+    candle_aggregator=get_candle_aggregator(),
+)
 
 if __name__ == "__main__" and __package__ is None:
     print("\n[ERROR] Do not run this file directly. Use: python -m algosat.main from the project root.\n", file=sys.stderr)
@@ -38,23 +50,7 @@ def is_trading_day(check_date=None):
     """
     if check_date is None:
         check_date = get_ist_datetime()
-    
-    # Check weekend (Saturday = 5, Sunday = 6)
-    if check_date.weekday() >= 5:
-        return False
-    
-    # Check NSE holidays
-    try:
-        nse_holidays = get_nse_holiday_list()
-        if nse_holidays is None:
-            logger.warning("🟡 NSE holiday list unavailable, using basic weekend check")
-            return True  # If we can't get holidays, assume it's trading day (weekday)
-        
-        today_str = check_date.strftime("%d-%b-%Y")
-        return today_str not in nse_holidays
-    except Exception as e:
-        logger.error(f"Error checking NSE holidays: {e}")
-        return True  # If error, assume trading day
+    return get_trading_calendar().is_trading_day(check_date)
 
 def get_next_trading_day(start_date=None):
     """
@@ -63,16 +59,8 @@ def get_next_trading_day(start_date=None):
     if start_date is None:
         start_date = get_ist_datetime()
     
-    # Start checking from tomorrow if current date is not a trading day
-    check_date = start_date + timedelta(days=1)
-    
-    # Find next trading day
-    while not is_trading_day(check_date):
-        check_date += timedelta(days=1)
-        # Safety check - don't go beyond 30 days
-        if (check_date - start_date).days > 30:
-            logger.error("Could not find trading day within 30 days")
-            break
+    next_day = get_trading_calendar().next_trading_day(start_date)
+    check_date = start_date + timedelta(days=(next_day - start_date.date()).days)
     
     # Set time to 9:12 AM
     next_trading_start = check_date.replace(hour=9, minute=12, second=0, microsecond=0)
@@ -145,6 +133,12 @@ async def shutdown_gracefully():
 
 async def main():
     try:
+        # Expose order/data/DB latency metrics of this process for Prometheus (METRICS_PORT=0 disables)
+        if settings.metrics_port:
+            start_metrics_server(settings.metrics_port)
+        if settings.trace_sample_ratio > 0:
+            configure_tracing(settings.trace_sample_ratio, settings.trace_exporter)
+
         # 0) Check if today is a trading day - if not, wait for next trading day
         await wait_for_trading_day()
         
@@ -0,0 +1,7 @@
+-- Keyset pagination index for the order listings (get_orders_with_broker_executions).
+-- Matches their sort: signal_time DESC NULLS LAST, id DESC. New databases get it from
+-- metadata.create_all (core/dbschema.py); existing databases need this migration.
+-- CONCURRENTLY keeps the orders table writable while the index builds; run it outside a
+-- transaction block (psql -f does this by default).
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orders_signal_time_id
+    ON orders (signal_time DESC NULLS LAST, id DESC);
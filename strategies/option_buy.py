@@ -8,6 +8,7 @@ from algosat.core.execution_manager import ExecutionManager
 from algosat.core.data_manager import DataManager
 from algosat.core.dbschema import strategy_configs
 from algosat.core.order_manager import OrderManager
+from algosat.core.tracing import traced
 from algosat.core.broker_manager import BrokerManager
 from algosat.core.order_request import Side
 from algosat.core.db import AsyncSessionLocal, get_order_by_id
@@ -519,6 +520,7 @@ class OptionBuyStrategy(StrategyBase):
                 logger.error(f"Error during signal evaluation or order for {strike}: {e}")
         return None  # No order placed
 
+    @traced("strategy.fetch_history_data")
     async def fetch_history_data(self, broker, strike_symbols, current_date, trade_config: dict):
         """
         Fetch candle data for the given strike symbols.
@@ -615,6 +617,7 @@ class OptionBuyStrategy(StrategyBase):
             logger.debug(f"No signal for {strike} at {data.iloc[-1].get('timestamp', 'N/A')}")
             return None
 
+    @traced("strategy.evaluate_signal")
     async def evaluate_signal(self, data, config: dict, strike: str) -> Optional[TradeSignal]:
         """
         Entry logic: Only enter on BUY signal if not immediately after a SELL-to-BUY reversal.
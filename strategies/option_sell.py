@@ -8,6 +8,7 @@ from algosat.core.execution_manager import ExecutionManager
 from algosat.core.data_manager import DataManager
 from algosat.core.dbschema import strategy_configs
 from algosat.core.order_manager import OrderManager
+from algosat.core.tracing import traced
 from algosat.core.broker_manager import BrokerManager
 from algosat.core.order_request import Side
 from algosat.core.db import AsyncSessionLocal, get_all_orders_for_strategy_symbol_and_tradeday, get_order_by_id
@@ -533,6 +534,7 @@ class OptionSellStrategy(StrategyBase):
                 logger.error(f"Error during signal evaluation or order for {strike}: {e}")
         return None  # No order placed
 
+    @traced("strategy.fetch_history_data")
     async def fetch_history_data(self, broker, strike_symbols, current_date, trade_config: dict):
         """
         Fetch candle data for the given strike symbols.
@@ -967,6 +969,7 @@ class OptionSellStrategy(StrategyBase):
             logger.error(f"💥 CRITICAL: No hedge order information available to return for monitoring")
             return None
 
+    @traced("strategy.evaluate_signal")
     async def evaluate_signal(self, data, config: dict, strike: str) -> Optional[TradeSignal]:
         """
         Entry logic: Only enter on SELL signal if not immediately after a BUY-to-SELL reversal.
@@ -13,6 +13,7 @@ from algosat.common.strategy_utils import (
 )
 from algosat.core.data_manager import DataManager
 from algosat.core.order_manager import OrderManager
+from algosat.core.tracing import traced
 from algosat.core.time_utils import localize_to_ist, get_ist_datetime, to_ist
 from algosat.strategies.base import StrategyBase
 from algosat.common.logger import get_logger
@@ -23,24 +24,11 @@ logger = get_logger(__name__)
 
 def is_holiday_or_weekend(check_date):
     """
-    Check if given date is a holiday or weekend using centralized broker_utils.
+    Check if given date is a holiday or weekend using the centralized trading calendar.
     """
     try:
-        # Check weekend (Saturday = 5, Sunday = 6)
-        if check_date.weekday() >= 5:
-            return True
-        
-        # Use centralized holiday checking from broker_utils
-        from algosat.common.broker_utils import get_nse_holiday_list
-        holidays = get_nse_holiday_list()
-        if holidays is None:
-            logger.warning("NSE holiday data not available, using basic weekend check")
-            return False
-        
-        # Convert check_date to string format used by NSE API (DD-MMM-YYYY)
-        check_date_str = check_date.strftime("%d-%b-%Y")
-        return check_date_str in holidays
-        
+        from algosat.core.trading_calendar import get_trading_calendar
+        return not get_trading_calendar().is_trading_day(check_date)
     except Exception as e:
         logger.error(f"Error checking holiday/weekend: {e}")
         return False
@@ -158,9 +146,24 @@ class SwingHighLowBuyStrategy(StrategyBase):
         
         # Regime reference for sideways detection
         self.regime_reference = None
+        # Incremental swing pivot state per (purpose, candle interval), kept across process_cycle calls
+        self._swing_trackers = {}
         logger.info(f"SwingHighLowBuyStrategy config: {self.trade}")
         logger.info(f"Smart levels enabled: {self._smart_levels_enabled}, strategy_symbol_id: {self._strategy_symbol_id}")
     
+    def get_swing_tracker(self, purpose: str, interval_minutes: int) -> swing_utils.SwingPivotTracker:
+        """
+        Swing pivot tracker for the spot candles of one purpose ("entry" or "stoploss") and
+        interval, created on first use. Entry and stoploss fetch their own frames, so they get
+        separate trackers even on the same timeframe.
+        """
+        key = (purpose, interval_minutes)
+        tracker = self._swing_trackers.get(key)
+        if tracker is None:
+            tracker = swing_utils.SwingPivotTracker(self.entry_swing_left_bars, self.entry_swing_right_bars)
+            self._swing_trackers[key] = tracker
+        return tracker
+
     async def ensure_broker(self):
         # No longer needed for data fetches, but keep for order placement if required
         await self.dp._ensure_broker()
@@ -182,6 +185,11 @@ class SwingHighLowBuyStrategy(StrategyBase):
                 f"rsi_ignore_above={self.rsi_ignore_above}, rsi_ignore_below={self.rsi_ignore_below}, rsi_period={self.rsi_period}, stop_percentage={self.stop_percentage}"
             )
             
+            # Build the entry and confirm bars locally from live ticks when the aggregator is running
+            candle_aggregator = getattr(self.dp, "candle_aggregator", None)
+            if candle_aggregator is not None:
+                candle_aggregator.track(self.symbol, [self.entry_minutes, self.confirm_minutes])
+
             # Setup regime reference for sideways detection
             today_dt = get_ist_datetime()
             first_candle_time = self.trade.get("first_candle_time", "09:15")
@@ -841,7 +849,7 @@ class SwingHighLowBuyStrategy(StrategyBase):
                     logger.info(f"✅ Order placed successfully: {order_info}")
                     logger.info(f"⏳ Awaiting atomic confirmation on next entry candle close (entry_minutes={self.entry_minutes})")
                     # Wait for next entry candle to confirm breakout
-                    await strategy_utils.wait_for_next_candle(self.entry_minutes)
+                    await strategy_utils.wait_for_bar_close(self.dp, self.symbol, self.entry_minutes)
                     # Fetch fresh entry_df for confirmation
                     entry_history_dict2 = await self.fetch_history_data(
                         self.dp, [self.symbol], self.entry_minutes
@@ -924,6 +932,7 @@ class SwingHighLowBuyStrategy(StrategyBase):
             return None
 
 
+    @traced("strategy.fetch_history_data")
     async def fetch_history_data(self, broker, symbols, interval_minutes):
         """
         Modular history fetch for spot/option data, returns dict[symbol] = pd.DataFrame.
@@ -945,6 +954,12 @@ class SwingHighLowBuyStrategy(StrategyBase):
             broker_name = self.dp.get_current_broker_name()
             end_date = calculate_end_date(current_end_date, interval_minutes, broker_name)
             # end_date = end_date.replace(day=15,hour=10, minute=48, second=0, microsecond=0)  # Market close time
+            live_history = await strategy_utils.fetch_history_with_live_bars(
+                self.dp, self.symbol, start_date, interval_minutes
+            )
+            if live_history is not None:
+                logger.debug(f"Using today's {interval_minutes}m bars for {self.symbol} from the candle aggregator")
+                return {self.symbol: live_history}
             logger.info(f"Fetching history for {symbols} from {start_date} to {end_date} interval {interval_minutes}m")
             # history_dict = await strategy_utils.fetch_instrument_history(
             #     broker, symbols, start_date, end_date, interval_minutes, ins_type=self.instrument, cache=False
@@ -1227,7 +1242,7 @@ class SwingHighLowBuyStrategy(StrategyBase):
                             import asyncio
                             await asyncio.sleep(1)  # Brief pause
                             from algosat.common import strategy_utils
-                            await strategy_utils.wait_for_next_candle(self.entry_minutes)
+                            await strategy_utils.wait_for_bar_close(self.dp, self.symbol, self.entry_minutes)
                             
                             # Fetch fresh data for confirmation
                             entry_history_dict2 = await self.fetch_history_data(self.dp, [self.symbol], self.entry_minutes)
@@ -1701,12 +1716,9 @@ class SwingHighLowBuyStrategy(StrategyBase):
             try:
                 # Calculate latest swing high/low from current history data
                 if len(history_df) >= 10:  # Need enough data for swing calculation
-                    swing_df = swing_utils.find_hhlh_pivots(
-                        history_df,
-                        left_bars=self.entry_swing_left_bars,
-                        right_bars=self.entry_swing_right_bars
-                    )
-                    latest_hh, latest_ll = swing_utils.get_latest_confirmed_high_low(swing_df)
+                    tracker = self.get_swing_tracker("stoploss", self.stoploss_minutes)
+                    tracker.update(history_df)
+                    latest_hh, latest_ll = tracker.get_latest_confirmed_high_low()
                     
                     if latest_hh and latest_ll:
                         new_stoploss = None
@@ -2231,6 +2243,7 @@ class SwingHighLowBuyStrategy(StrategyBase):
             # On error, allow trading to avoid blocking legitimate trades
             return True, f"Error checking trade limits, allowing trade: {e}"
         
+    @traced("strategy.evaluate_signal")
     async def evaluate_signal(self, entry_df, confirm_df, config) -> Optional[TradeSignal]:
         """
         Modular method to evaluate entry signals for swing high/low breakouts.
@@ -2238,17 +2251,12 @@ class SwingHighLowBuyStrategy(StrategyBase):
         """
         from algosat.core.signal import TradeSignal, SignalType
         try:
-            # 1. Identify most recent swing high/low from entry_df
-            entry_left = self.entry_swing_left_bars
-            entry_right = self.entry_swing_right_bars
-            swing_df = swing_utils.find_hhlh_pivots(
-                entry_df,
-                left_bars=entry_left,
-                right_bars=entry_right
-            )
-            last_hh, last_ll, last_hl, last_lh = swing_utils.get_last_swing_points(swing_df)
+            # 1. Identify most recent swing high/low from entry_df (incrementally, see SwingPivotTracker)
+            tracker = self.get_swing_tracker("entry", self.entry_minutes)
+            tracker.update(entry_df)
+            last_hh, last_ll, last_hl, last_lh = tracker.get_last_swing_points()
             logger.info(f"{self.cfg.symbol}'s Latest swing points: HH={last_hh}, LL={last_ll}, HL={last_hl}, LH={last_lh}")
-            last_hh, last_ll = swing_utils.get_latest_confirmed_high_low(swing_df)
+            last_hh, last_ll = tracker.get_latest_confirmed_high_low()
             if not last_hh or not last_ll:
                 logger.info("No HH/LL pivot available for breakout evaluation.")
                 return None
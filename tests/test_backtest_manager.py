@@ -0,0 +1,198 @@
+"""
+Tests for the event-driven backtest engine in algosat.core.backtest_manager.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from algosat.core.backtest_manager import (
+    BacktestConfig,
+    BacktestEngine,
+    SimulatedBroker,
+    SimulatedClock,
+    SimulatedDataManager,
+    SimulatedOrder,
+    StrategyAdapter,
+    ORDER_STOP,
+    resample_candles,
+)
+from algosat.core.signal import SignalType, TradeSignal
+from algosat.models.strategy_config import StrategyConfig
+
+SYMBOL = "NSE:NIFTY50-INDEX"
+
+
+def _minutes(day="2025-01-06", start="09:15", end="15:29"):
+    day = pd.Timestamp(day)
+    return pd.date_range(day + pd.Timedelta(start + ":00"), day + pd.Timedelta(end + ":00"), freq="1min")
+
+
+def _flat(times, price=100.0):
+    n = len(times)
+    return pd.DataFrame({"timestamp": times, "open": [price] * n, "high": [price + 1] * n,
+                         "low": [price - 1] * n, "close": [price] * n, "volume": [10] * n})
+
+
+def _config(**trade):
+    return StrategyConfig(id=1, strategy_id=1, exchange="NSE", symbol=SYMBOL, trade=trade)
+
+
+class _ScriptedStrategy:
+    """Emits the scripted signal once, at the bar close given by signal_at."""
+
+    def __init__(self, config, data_manager, execution_manager):
+        self.cfg = config
+        self.symbol = config.symbol
+        self.trade = config.trade
+        self.dp = data_manager
+        self.order_manager = execution_manager
+        self._positions = {}
+        self.regime_reference = None
+        self.seen_times = []
+
+    async def process_order(self, signal, data, strike):
+        order_request = await self.order_manager.broker_manager.build_order_request_for_strategy(signal, self.cfg)
+        return await self.order_manager.place_order(self.cfg, order_request, strategy_name=None)
+
+
+class _ScriptedAdapter(StrategyAdapter):
+    interval_minutes = 1
+
+    def make_order(self, signal):
+        return SimulatedOrder(order_id=0, symbol=signal.symbol, side=str(signal.side), qty=signal.lot_qty,
+                              stop_loss=signal.stop_loss, target_price=signal.target_price,
+                              signal_time=signal.signal_time, key=signal.symbol)
+
+    async def on_bar_close(self, now):
+        from algosat.core import time_utils
+        self.strategy.seen_times.append(time_utils.get_ist_datetime())
+        history = await self.dm.get_history(SYMBOL, None, None, ohlc_interval=1)
+        assert history["timestamp"].iloc[-1] < now
+        script = self.strategy.trade["script"]
+        if now == pd.Timestamp(script["signal_at"]) and not self.strategy._positions:
+            signal = TradeSignal(symbol=SYMBOL, side=script["side"], signal_type=SignalType.ENTRY,
+                                 stop_loss=script.get("stop_loss"), target_price=script.get("target_price"),
+                                 signal_time=now, lot_qty=10)
+            self.strategy._positions[SYMBOL] = [signal]
+            await self.strategy.process_order(signal, history, SYMBOL)
+
+
+def test_resample_anchors_candles_at_session_open():
+    frame = _flat(_minutes(end="09:29"))
+    frame.loc[2, "high"] = 150.0
+    five = resample_candles(frame, 5)
+    assert list(five["timestamp"].dt.strftime("%H:%M")) == ["09:15", "09:20", "09:25"]
+    assert five["high"].iat[0] == 150.0
+    assert five["close_time"].iat[0] == pd.Timestamp("2025-01-06 09:20")
+
+
+@pytest.mark.asyncio
+async def test_simulated_history_returns_only_closed_candles():
+    clock = SimulatedClock()
+    data_manager = SimulatedDataManager({SYMBOL: _flat(_minutes(end="10:00"))}, clock)
+    clock.set("2025-01-06 09:32")
+
+    history = await data_manager.get_history(SYMBOL, pd.Timestamp("2025-01-06 09:15"), pd.Timestamp("2025-01-06 10:00"), 5)
+
+    # 09:30 candle is still forming at 09:32
+    assert history["timestamp"].iat[-1] == pd.Timestamp("2025-01-06 09:25")
+    assert "close_time" not in history.columns
+    assert await data_manager.get_ltp(SYMBOL) == {SYMBOL: 100.0}
+
+
+def _broker(frame, **settings):
+    clock = SimulatedClock()
+    data_manager = SimulatedDataManager({SYMBOL: frame}, clock)
+    broker = SimulatedBroker(BacktestConfig(**settings), data_manager)
+    times = data_manager.minute_frame(SYMBOL)["timestamp"]
+    broker.attach(times.to_numpy(dtype="datetime64[ns]").view(np.int64))
+    return broker, times
+
+
+def test_stoploss_wins_when_a_bar_touches_both_levels():
+    frame = _flat(_minutes(end="09:20"))
+    frame.loc[2, ["high", "low"]] = [110.0, 90.0]
+    broker, times = _broker(frame, slippage=0.5, commission_per_order=0)
+    broker.submit(SimulatedOrder(order_id=0, symbol=SYMBOL, side="BUY", qty=10, stop_loss=95.0, target_price=105.0))
+
+    for i in range(3):
+        broker.process_bar(i, times.iat[i], square_off=False)
+
+    trade = broker.trades[0]
+    assert trade["entry_price"] == 100.5  # next bar open plus slippage
+    assert trade["exit_reason"] == "STOPLOSS"
+    assert trade["exit_price"] == 94.5
+    assert trade["pnl"] == -60.0
+
+
+def test_stop_entry_triggers_on_touch_and_expires_otherwise():
+    frame = _flat(_minutes(end="09:20"))
+    frame.loc[1, "high"] = 104.0
+    broker, times = _broker(frame, commission_per_order=0)
+    filled = broker.submit(SimulatedOrder(order_id=0, symbol=SYMBOL, side="BUY", qty=1, order_type=ORDER_STOP,
+                                          trigger_price=103.0, target_price=200.0))
+    expired = broker.submit(SimulatedOrder(order_id=0, symbol=SYMBOL, side="BUY", qty=1, order_type=ORDER_STOP,
+                                           trigger_price=120.0, expires_at=times.iat[3]))
+
+    for i in range(5):
+        broker.process_bar(i, times.iat[i], square_off=False)
+
+    assert filled.status == "OPEN" and filled.entry_price == 103.0
+    assert expired.status == "CANCELLED"
+
+
+@pytest.mark.asyncio
+async def test_engine_replays_strategy_and_squares_off():
+    frame = _flat(_minutes())
+    rising = frame["timestamp"] >= pd.Timestamp("2025-01-06 10:00")
+    frame.loc[rising, ["open", "close"]] = 102.0
+    frame.loc[rising, "high"] = 103.0
+    frame.loc[rising, "low"] = 101.0
+    config = _config(script={"signal_at": "2025-01-06 09:45", "side": "BUY", "stop_loss": 90.0, "target_price": 150.0})
+
+    engine = BacktestEngine(_ScriptedStrategy, config, {SYMBOL: frame},
+                            BacktestConfig(commission_per_order=10), adapter_cls=_ScriptedAdapter)
+    result = await engine.run()
+
+    assert len(result.trades) == 1
+    trade = result.trades[0]
+    assert trade["entry_time"] == pd.Timestamp("2025-01-06 09:45")
+    assert trade["exit_reason"] == "SQUARE_OFF"
+    assert trade["exit_time"] == pd.Timestamp("2025-01-06 15:15")
+    assert trade["pnl"] == 20 - 20
+    # The position was released back to the strategy when it closed
+    assert engine.strategy._positions == {}
+    # Strategy code saw the simulated clock, not the wall clock
+    assert engine.strategy.seen_times[0].strftime("%Y-%m-%d %H:%M") == "2025-01-06 09:16"
+    assert result.stats["trades"] == 1
+    assert result.stats["bars"] == len(frame)
+    assert result.stats["bars_per_second"] > 0
+    assert result.equity.iat[-1] == result.stats["final_equity"]
+
+
+@pytest.mark.asyncio
+async def test_option_buy_strategy_runs_through_the_engine():
+    from algosat.strategies.option_buy import OptionBuyStrategy
+
+    rng = np.random.default_rng(7)
+    times = _minutes("2025-01-03").append(_minutes("2025-01-06"))
+    candles = {}
+    for symbol, base in ((SYMBOL, 24000.0), ("NSE:NIFTY2510924000CE", 200.0)):
+        close = base + np.cumsum(rng.normal(0, 1.0, len(times)))
+        candles[symbol] = pd.DataFrame({"timestamp": times, "open": close, "high": close + 1, "low": close - 1,
+                                        "close": close, "volume": 100})
+    config = StrategyConfig(id=1, strategy_id=1, exchange="NSE", symbol=SYMBOL, indicators={"entry": {}}, trade={
+        "interval_minutes": 5, "max_range": 100, "range_threshold_entry": 20, "small_entry_buffer": 1,
+        "large_entry_buffer": 2, "range_threshold_stoploss": 20, "small_sl_buffer": 1, "large_sl_buffer": 2,
+        "range_threshold_target": 10, "small_target_buffer": 1, "large_target_buffer": 2,
+        "atr_target_multiplier": 2, "ce_lot_qty": 1, "pe_lot_qty": 1,
+    })
+
+    result = await BacktestEngine(OptionBuyStrategy, config, candles).run()
+
+    assert result.stats["strategy"] == "OptionBuyStrategy"
+    assert result.stats["trades"] == len(result.trades)
+    for trade in result.trades:
+        assert trade["entry_time"] < trade["exit_time"]
+        assert trade["symbol"] == "NSE:NIFTY2510924000CE"
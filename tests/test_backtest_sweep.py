@@ -0,0 +1,108 @@
+"""
+Tests for the process-pool parameter sweep in algosat.core.backtest_sweep.
+"""
+
+import json
+
+import pandas as pd
+
+from algosat.core.backtest_manager import BacktestConfig, SimulatedOrder, StrategyAdapter
+from algosat.core.backtest_sweep import (
+    apply_params,
+    combination_id,
+    load_shared_candles,
+    parameter_grid,
+    run_sweep,
+    share_candles,
+)
+from algosat.core.signal import SignalType, TradeSignal
+from algosat.models.strategy_config import StrategyConfig
+
+SYMBOL = "NSE:NIFTY50-INDEX"
+
+
+def _candles():
+    times = pd.date_range("2025-01-06 09:15", "2025-01-06 15:29", freq="1min")
+    # Price climbs one point a minute, so a later exit is always worth more
+    close = [100.0 + i for i in range(len(times))]
+    return {SYMBOL: pd.DataFrame({"timestamp": times, "open": close, "high": close, "low": close,
+                                  "close": close, "volume": 1})}
+
+
+class _HoldStrategy:
+    def __init__(self, config, data_manager, execution_manager):
+        self.cfg = config
+        self.symbol = config.symbol
+        self.trade = config.trade
+        self.order_manager = execution_manager
+        self._positions = {}
+        self.regime_reference = None
+
+
+class _HoldAdapter(StrategyAdapter):
+    """Buys at 09:30 and takes profit `target_points` above the entry."""
+    interval_minutes = 1
+
+    def make_order(self, signal):
+        return SimulatedOrder(order_id=0, symbol=SYMBOL, side="BUY", qty=1, target_price=signal.target_price, key=SYMBOL)
+
+    async def on_bar_close(self, now):
+        if now == pd.Timestamp("2025-01-06 09:30") and not self.strategy._positions:
+            target = 116.0 + self.strategy.trade["exit"]["target_points"]
+            self.strategy._positions[SYMBOL] = True
+            await self.strategy.order_manager.place_order(
+                self.strategy.cfg, TradeSignal(symbol=SYMBOL, side="BUY", signal_type=SignalType.ENTRY, target_price=target))
+
+
+def _config():
+    return StrategyConfig(id=1, strategy_id=1, exchange="NSE", symbol=SYMBOL, trade={"exit": {"target_points": 1}})
+
+
+def test_parameter_grid_and_apply_params():
+    grid = parameter_grid({"exit.target_points": [5, 10], "entry_minutes": [3]})
+    assert grid == [{"entry_minutes": 3, "exit.target_points": 5}, {"entry_minutes": 3, "exit.target_points": 10}]
+    assert combination_id(grid[0]) == combination_id(dict(reversed(list(grid[0].items()))))
+
+    config = _config()
+    updated = apply_params(config, grid[1])
+    assert updated.trade["exit"]["target_points"] == 10
+    assert updated.trade["entry"]["timeframe"] == "3m"
+    assert config.trade == {"exit": {"target_points": 1}}
+
+
+def test_shared_candles_round_trip():
+    candles = _candles()
+    handles, blocks = share_candles(candles)
+    try:
+        restored = load_shared_candles(handles)[SYMBOL]
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+    pd.testing.assert_frame_equal(restored, candles[SYMBOL].astype({"volume": float}))
+
+
+def test_sweep_ranks_results_and_resumes_from_checkpoint(tmp_path):
+    checkpoint = tmp_path / "sweep.jsonl"
+    output = tmp_path / "ranked.csv"
+    settings = BacktestConfig(commission_per_order=0)
+    grid = {"exit.target_points": [10, 50, 30]}
+
+    first = run_sweep(_HoldStrategy, _config(), _candles(), grid, settings=settings, adapter_cls=_HoldAdapter,
+                      max_workers=2, checkpoint_path=str(checkpoint), output_path=str(output))
+
+    assert [r["error"] for r in first.results] == [None, None, None]
+    assert list(first.ranking["exit.target_points"]) == [50, 30, 10]
+    assert list(first.ranking["rank"]) == [1, 2, 3]
+    assert sum(entry["combinations"] for entry in first.workers.values()) == 3
+    assert all(entry["bars_per_second"] > 0 for entry in first.workers.values())
+    assert len(pd.read_csv(output)) == 3
+
+    grid["exit.target_points"].append(20)
+    resumed = run_sweep(_HoldStrategy, _config(), _candles(), grid, settings=settings, adapter_cls=_HoldAdapter,
+                        max_workers=1, checkpoint_path=str(checkpoint))
+
+    # Only the new combination ran; the rest came from the checkpoint
+    assert sum(entry["combinations"] for entry in resumed.workers.values()) == 1
+    assert list(resumed.ranking["exit.target_points"]) == [50, 30, 20, 10]
+    assert len([json.loads(line) for line in checkpoint.read_text().splitlines()]) == 4
@@ -0,0 +1,93 @@
+"""
+Tests for the concurrent broker fan-out in BrokerManager.place_order.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from algosat.core.broker_manager import BrokerManager
+from algosat.core.order_request import OrderRequest, OrderType, Side
+
+
+class _FakeBroker:
+    def __init__(self, delay, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.placed = []
+
+    async def place_order(self, payload):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ValueError("rejected by broker")
+        self.placed.append(payload)
+        return {"status": True, "order_id": f"{payload.symbol}-1", "symbol": payload.symbol}
+
+
+def _manager(brokers):
+    manager = BrokerManager()
+    manager.brokers = dict(brokers)
+    manager._broker_ids = {name: i for i, name in enumerate(brokers, start=1)}
+    symbol_lookups = []
+
+    async def trade_enabled():
+        return dict(manager.brokers)
+
+    async def symbol_info(broker_name, symbol, instrument_type=None):
+        symbol_lookups.append((broker_name, symbol))
+        return {"symbol": f"{broker_name.upper()}:{symbol}"}
+
+    manager.get_all_trade_enabled_brokers = trade_enabled
+    manager.get_active_trade_brokers = trade_enabled
+    manager.get_symbol_info = symbol_info
+    return manager, symbol_lookups
+
+
+def _order():
+    return OrderRequest(symbol="NIFTY2511624000CE", quantity=75, side=Side.BUY, order_type=OrderType.MARKET)
+
+
+@pytest.mark.asyncio
+async def test_brokers_are_placed_concurrently_with_latency_recorded():
+    manager, _ = _manager({"fyers": _FakeBroker(0.05), "zerodha": _FakeBroker(0.6), "angel": _FakeBroker(0.6)})
+
+    started = time.perf_counter()
+    results = await manager.place_order(_order(), retries=1)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 1.1  # the slowest broker's delay (0.6s), not the sum of all three (1.25s)
+    assert list(results) == ["fyers", "zerodha", "angel"]
+    assert results["zerodha"]["order_id"] == "ZERODHA:NIFTY2511624000CE-1"
+    assert results["zerodha"]["broker_id"] == 2
+    assert results["fyers"]["placement_latency_ms"] < results["zerodha"]["placement_latency_ms"]
+    stats = manager.get_placement_stats()
+    assert stats["brokers"]["fyers"]["orders"] == 1
+    assert stats["last_fanout"]["skew_ms"] >= 100
+
+
+@pytest.mark.asyncio
+async def test_slow_or_failing_broker_does_not_block_the_others():
+    manager, _ = _manager({"fyers": _FakeBroker(0.01), "zerodha": _FakeBroker(5.0), "angel": _FakeBroker(0.01, fail=True)})
+    manager.order_timeouts["zerodha"] = 0.2
+
+    started = time.perf_counter()
+    results = await manager.place_order(_order(), retries=1)
+
+    assert time.perf_counter() - started < 3.0  # the timeout, not zerodha's 5s
+    assert results["fyers"]["status"] is True
+    assert results["zerodha"] == {"status": False, "message": "Order placement timed out after 0.2s"}
+    assert results["angel"]["status"] is False
+    stats = manager.get_placement_stats()["brokers"]
+    assert stats["zerodha"]["timeouts"] == 1
+    assert stats["angel"]["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_prepared_routing_skips_symbol_lookups_at_order_time():
+    manager, lookups = _manager({"fyers": _FakeBroker(0), "zerodha": _FakeBroker(0)})
+    await manager.prepare_order_routing(["NIFTY2511624000CE", "NIFTY2511624000PE"])
+    assert len(lookups) == 4
+
+    await manager.place_order(_order(), retries=1)
+    assert len(lookups) == 4
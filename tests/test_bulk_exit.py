@@ -0,0 +1,172 @@
+"""
+Tests for the bulk exit engine in algosat.core.bulk_exit: concurrent broker calls within
+the per-broker budget, hedges after their mains and a single batched write.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from algosat.common.constants import TRADE_STATUS_EXIT_MANUAL_PENDING
+from algosat.core.bulk_exit import BulkExitEngine
+from algosat.core.order_manager import OrderManager
+
+
+class _FakeBrokerManager:
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.calls = []
+        self.in_flight = {}
+        self.peak = {}
+
+    async def _call(self, kind, broker_id, broker_order_id):
+        self.in_flight[broker_id] = self.in_flight.get(broker_id, 0) + 1
+        self.peak[broker_id] = max(self.peak.get(broker_id, 0), self.in_flight[broker_id])
+        await asyncio.sleep(self.delay)
+        self.in_flight[broker_id] -= 1
+        self.calls.append((kind, broker_order_id))
+
+    async def exit_order(self, broker_id, broker_order_id, **kwargs):
+        await self._call("exit", broker_id, broker_order_id)
+        if broker_order_id == "BAD":
+            raise RuntimeError("exchange rejected exit")
+        return {"order_id": f"X-{broker_order_id}"}
+
+    async def cancel_order(self, broker_id, broker_order_id, **kwargs):
+        await self._call("cancel", broker_id, broker_order_id)
+        return {"status": True}
+
+
+def _execution(exec_id, order_id, broker_id, broker_order_id, status="FILLED", action="SELL", side="ENTRY"):
+    return {"id": exec_id, "parent_order_id": order_id, "broker_id": broker_id, "broker_order_id": broker_order_id,
+            "status": status, "action": action, "side": side, "symbol": f"NIFTY{order_id}", "product_type": "MIS",
+            "executed_quantity": 75, "quantity": 75}
+
+
+class _Engine(BulkExitEngine):
+    """BulkExitEngine with the database replaced by in-memory rows."""
+
+    def __init__(self, order_manager, mains, hedges, executions, **kwargs):
+        super().__init__(order_manager, **kwargs)
+        self.rows = (mains, hedges, executions, {1: "zerodha", 2: "angel"})
+        self.batches = []
+
+    async def _load(self, strategy_id):
+        return self.rows
+
+    async def _persist(self, batch):
+        self.batches.append(batch)
+
+
+def _book(orders=20):
+    mains = [{"id": i, "status": "OPEN", "side": "SELL"} for i in range(1, orders + 1)]
+    hedges = [{"id": 100 + i, "status": "OPEN", "side": "BUY", "parent_order_id": i} for i in range(1, 3)]
+    executions = {order["id"]: [_execution(order["id"], order["id"], 1 + order["id"] % 2, f"B{order['id']}")]
+                  for order in mains}
+    for hedge in hedges:
+        executions[hedge["id"]] = [_execution(hedge["id"], hedge["id"], 1, f"H{hedge['id']}", action="BUY")]
+    return mains, hedges, executions
+
+
+@pytest.mark.asyncio
+async def test_bulk_exit_is_concurrent_and_exits_hedges_last():
+    broker_manager = _FakeBrokerManager(delay=0.1)
+    engine = _Engine(OrderManager(broker_manager), *_book(), concurrency_per_broker={"zerodha": 5, "angel": 5})
+
+    started = time.perf_counter()
+    report = await engine.run(exit_reason="Emergency Stop")
+    elapsed = time.perf_counter() - started
+
+    # 20 mains over two brokers with 5 calls each in flight, then 2 hedges: 3 rounds (0.3s), not 22 (2.2s)
+    assert elapsed < 1.5
+    assert broker_manager.peak == {1: 5, 2: 5}
+    assert [kind for kind, _ in broker_manager.calls] == ["exit"] * 22
+    assert {order_id for _, order_id in broker_manager.calls[-2:]} == {"H101", "H102"}
+
+    assert report.exits == 22 and report.failed == 0 and report.legs == 22
+    assert report.brokers["zerodha"]["exits"] == 12 and report.brokers["angel"]["exits"] == 10
+    assert 0 < report.time_to_flat_seconds <= report.elapsed_seconds
+
+    [batch] = engine.batches
+    assert len(batch.exit_executions) == 22
+    hedge_exit = next(row for row in batch.exit_executions if row["parent_order_id"] == 101)
+    assert (hedge_exit["side"], hedge_exit["action"], hedge_exit["exit_broker_order_id"]) == ("EXIT", "SELL", "X-H101")
+    assert batch.order_statuses == {101: "CLOSED", 102: "CLOSED"}
+
+
+@pytest.mark.asyncio
+async def test_bulk_exit_decisions_follow_execution_status():
+    mains = [{"id": i, "status": "OPEN", "side": "BUY"} for i in range(1, 6)]
+    executions = {
+        1: [_execution(1, 1, 1, "B1", status="FILLED", action="BUY"),
+            _execution(9, 1, 1, "B1", status="PENDING", side="EXIT")],  # already exited once
+        2: [_execution(2, 2, 1, "B2", status="PENDING")],
+        3: [_execution(3, 3, 2, "B3", status="REJECTED")],
+        4: [_execution(4, 4, 2, "BAD", status="FILLED")],
+        5: [_execution(5, 5, 2, "B5", status="FILLED")],
+    }
+    broker_manager = _FakeBrokerManager(delay=0)
+    engine = _Engine(OrderManager(broker_manager), mains, [], executions, concurrency_per_broker={"zerodha": 2, "angel": 2})
+
+    report = await engine.run(exit_reason="manual", broker_ids_filter=[1, 2])
+
+    assert (report.exits, report.cancels, report.skipped, report.failed) == (3, 1, 1, 0)
+    assert sorted(broker_manager.calls) == [("cancel", "B2"), ("exit", "B1"), ("exit", "B5"), ("exit", "BAD")]
+    [batch] = engine.batches
+    # A failed broker exit still records its EXIT row, as exit_order does; order 1 already had one
+    assert sorted(row["parent_order_id"] for row in batch.exit_executions) == [4, 5]
+    assert next(row for row in batch.exit_executions if row["parent_order_id"] == 4)["exit_broker_order_id"] is None
+    assert batch.execution_updates == [(2, {"status": "CANCELLED"})]
+    assert batch.order_statuses == {i: TRADE_STATUS_EXIT_MANUAL_PENDING for i in range(1, 6)}
+
+
+@pytest.mark.asyncio
+async def test_bulk_exit_uses_one_live_snapshot():
+    mains = [{"id": 1, "status": "OPEN", "side": "BUY"}, {"id": 2, "status": "OPEN", "side": "BUY"}]
+    executions = {1: [_execution(1, 1, 1, "B1", status="PENDING")], 2: [_execution(2, 2, 1, "B2", status="PENDING")]}
+    broker_manager = _FakeBrokerManager(delay=0)
+    order_manager = OrderManager(broker_manager)
+    snapshots = []
+
+    async def live_orders():
+        snapshots.append(1)
+        return {"zerodha": [{"order_id": "B1", "status": "FILLED", "executed_quantity": 75, "exec_price": 101.5},
+                            {"order_id": "B2", "status": "PENDING"}]}
+
+    order_manager.get_all_broker_order_details = live_orders
+    engine = _Engine(order_manager, mains, [], executions, concurrency_per_broker={"zerodha": 5})
+
+    report = await engine.run(exit_reason="Emergency Stop", check_live_status=True)
+
+    assert snapshots == [1]
+    assert sorted(broker_manager.calls) == [("cancel", "B2"), ("exit", "B1")]
+    assert (report.exits, report.cancels) == (1, 1)
+    [batch] = engine.batches
+    assert (1, {"status": "FILLED", "execution_price": 101.5}) in batch.execution_updates
+
+
+@pytest.mark.asyncio
+async def test_filtered_bulk_exit_leaves_partly_open_hedges_unclosed():
+    mains = [{"id": 1, "status": "OPEN", "side": "SELL"}]
+    hedges = [{"id": 101, "status": "OPEN", "side": "BUY", "parent_order_id": 1},
+              {"id": 102, "status": "OPEN", "side": "BUY", "parent_order_id": 1},
+              {"id": 103, "status": "OPEN", "side": "BUY", "parent_order_id": 1}]
+    executions = {
+        1: [_execution(1, 1, 1, "M1")],
+        # Legs on both brokers; only zerodha (1) is being stopped
+        101: [_execution(11, 101, 1, "H1", action="BUY"), _execution(12, 101, 2, "H2", action="BUY")],
+        # Flat on zerodha; its angel leg was rejected and has nothing to exit
+        102: [_execution(21, 102, 1, "H3", action="BUY"), _execution(22, 102, 2, "H4", status="REJECTED", action="BUY")],
+        # The broker rejects the exit
+        103: [_execution(31, 103, 1, "BAD", action="BUY")],
+    }
+    broker_manager = _FakeBrokerManager(delay=0)
+    engine = _Engine(OrderManager(broker_manager), mains, hedges, executions, concurrency_per_broker={"zerodha": 5, "angel": 5})
+
+    report = await engine.run(exit_reason="Emergency Stop", broker_ids_filter=[1])
+
+    assert sorted(broker_manager.calls) == [("exit", "BAD"), ("exit", "H1"), ("exit", "H3"), ("exit", "M1")]
+    assert report.legs == 4
+    [batch] = engine.batches
+    assert batch.order_statuses == {102: "CLOSED"}
@@ -0,0 +1,97 @@
+"""
+Tests for the CandleAggregator: bars for several intervals from one tick stream aligned to
+09:15, closing on the clock at the boundary, and reconciliation against broker history.
+"""
+
+import asyncio
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from algosat.core.candle_aggregator import CandleAggregator, bar_end, bar_start
+
+SYMBOL = "NSE:NIFTY50-INDEX"
+
+
+class _Clock:
+    def __init__(self, now):
+        self.now = pd.Timestamp(now)
+
+    def __call__(self):
+        return self.now
+
+
+def _aggregator(now="2025-01-06 09:16:00", intervals=(1, 3, 5, 15)):
+    clock = _Clock(now)
+    aggregator = CandleAggregator(clock=clock)
+    aggregator.track("NIFTY50-INDEX", intervals)  # bare symbols are tracked under their feed name
+    return aggregator, clock
+
+
+def test_bars_align_to_session_open():
+    assert bar_start(pd.Timestamp("2025-01-06 09:29:59"), 15) == pd.Timestamp("2025-01-06 09:15")
+    assert bar_start(pd.Timestamp("2025-01-06 10:14:00"), 60) == pd.Timestamp("2025-01-06 09:15")
+    assert bar_start(datetime(2025, 1, 6, 9, 20, 30), 3) == pd.Timestamp("2025-01-06 09:18")
+    assert bar_end(pd.Timestamp("2025-01-06 15:15"), 60) == pd.Timestamp("2025-01-06 15:30")
+
+
+def test_one_tick_stream_builds_every_interval():
+    aggregator, clock = _aggregator(now="2025-01-06 09:14:50")
+    ticks = [("09:15:01", 100, 1000), ("09:15:40", 103, 1100), ("09:16:10", 99, 1150),
+             ("09:17:59", 101, 1200), ("09:18:00", 102, 1300)]
+    for ts, price, volume in ticks:
+        aggregator.on_tick(SYMBOL, price, pd.Timestamp(f"2025-01-06 {ts}"), volume)
+
+    ones = aggregator.get_bars(SYMBOL, 1)
+    assert list(ones["timestamp"].dt.strftime("%H:%M")) == ["09:15", "09:16", "09:17"]
+    assert list(ones["close"]) == [103, 99, 101]
+    assert list(ones["volume"]) == [100, 50, 50]  # first cumulative volume only sets the baseline
+
+    three = aggregator.last_bar(SYMBOL, 3)
+    assert (three.open, three.high, three.low, three.close) == (100, 103, 99, 101)
+    assert aggregator.last_bar(SYMBOL, 5) is None  # 09:15-09:20 still in progress
+    assert aggregator.session_complete("NIFTY50-INDEX", 3)
+
+
+@pytest.mark.asyncio
+async def test_clock_closes_bar_at_boundary_and_wakes_waiters():
+    aggregator, clock = _aggregator(now="2025-01-06 09:14:59", intervals=(5,))
+    aggregator.on_tick(SYMBOL, 100, pd.Timestamp("2025-01-06 09:16:00"))
+    waiter = asyncio.create_task(aggregator.wait_for_close(SYMBOL, 5, timeout=1))
+    await asyncio.sleep(0)
+
+    assert aggregator.close_due_bars(pd.Timestamp("2025-01-06 09:19:59")) == []
+    assert not waiter.done()
+    closed = aggregator.close_due_bars(pd.Timestamp("2025-01-06 09:20:00"))
+    bar = await waiter
+    assert closed == [bar] and bar.start == pd.Timestamp("2025-01-06 09:15")
+    assert await aggregator.wait_for_close(SYMBOL, 5, timeout=0.01) is None
+    with pytest.raises(KeyError):
+        await aggregator.wait_for_close(SYMBOL, 15)
+
+
+def test_reconcile_corrects_and_backfills_bars():
+    aggregator, clock = _aggregator(now="2025-01-06 09:17:30", intervals=(1,))
+    for ts, price in [("09:17:40", 100), ("09:18:10", 101), ("09:19:05", 102)]:
+        aggregator.on_tick(SYMBOL, price, pd.Timestamp(f"2025-01-06 {ts}"))
+    clock.now = pd.Timestamp("2025-01-06 09:20:00")
+    aggregator.close_due_bars(clock.now)
+    # The 09:17 bar started before tracking and 09:15/09:16 were never seen
+    assert [bar.complete for bar in aggregator._series[(SYMBOL, 1)].bars] == [False, True, True]
+    assert not aggregator.session_complete(SYMBOL, 1)
+
+    history = pd.DataFrame({
+        "timestamp": pd.to_datetime(["2025-01-03 15:29", "2025-01-06 09:15", "2025-01-06 09:16",
+                                     "2025-01-06 09:17", "2025-01-06 09:18", "2025-01-06 09:19"]),
+        "open": [90, 95, 96, 98, 101, 102], "high": [90, 96, 98, 100, 101, 102],
+        "low": [90, 95, 96, 98, 101, 102], "close": [90, 96, 98, 100, 101, 102],
+        "volume": [0, 5, 5, 5, 5, 5],
+    })
+    assert aggregator.reconcile(SYMBOL, 1, history) == 3  # 09:15, 09:16 added, 09:17 corrected
+
+    bars = aggregator.get_bars(SYMBOL, 1)
+    assert list(bars["timestamp"].dt.strftime("%H:%M")) == ["09:15", "09:16", "09:17", "09:18", "09:19"]
+    assert list(bars["open"]) == [95, 96, 98, 101, 102]
+    assert aggregator.session_complete(SYMBOL, 1)
+    assert aggregator.reconcile(SYMBOL, 1, history) == 0
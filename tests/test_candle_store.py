@@ -0,0 +1,163 @@
+"""
+Tests for the local candle store and incremental history fetch in DataManager.get_history.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+import pytz
+
+from algosat.core.candle_store import CandleStore, merge_candles, last_closed_candle_start
+from algosat.core.data_manager import DataManager
+
+IST = pytz.timezone("Asia/Kolkata")
+
+
+class _FakeBroker:
+    """Returns 5-minute candles (naive IST timestamps, like Fyers) for every requested session minute."""
+
+    def __init__(self, now):
+        self.now = now
+        self.calls = []
+
+    async def get_history(self, symbol, from_date, to_date, ohlc_interval, ins_type=""):
+        self.calls.append((pd.Timestamp(from_date).tz_convert(IST).tz_localize(None),
+                           pd.Timestamp(to_date).tz_convert(IST).tz_localize(None)))
+        start, end = self.calls[-1]
+        times = [ts for ts in pd.date_range(start.floor("5min"), end, freq="5min")
+                 if ts.time() >= datetime.strptime("09:15", "%H:%M").time()
+                 and ts.time() <= datetime.strptime("15:25", "%H:%M").time()
+                 and ts <= pd.Timestamp(self.now).tz_convert(IST).tz_localize(None)]
+        if not times:
+            return None
+        closes = [ts.hour * 100 + ts.minute for ts in times]
+        return pd.DataFrame({"timestamp": times, "open": closes, "high": closes, "low": closes,
+                             "close": closes, "volume": [1] * len(times)})
+
+
+def _ist(text):
+    return IST.localize(datetime.strptime(text, "%Y-%m-%d %H:%M"))
+
+
+async def _get(data_manager, now, from_text, to_text):
+    with patch("algosat.core.time_utils.get_ist_datetime", return_value=now), \
+         patch("algosat.core.data_manager.validate_broker_response", return_value=True):
+        return await data_manager.get_history("NSE:NIFTY50-INDEX", _ist(from_text), _ist(to_text), 5, cache=False)
+
+
+@pytest.mark.asyncio
+async def test_second_cycle_fetches_only_the_tail(tmp_path):
+    now = _ist("2025-08-05 10:02")
+    broker = _FakeBroker(now)
+    data_manager = DataManager(broker=broker, cache=None, candle_store=CandleStore(path=str(tmp_path)))
+
+    first = await _get(data_manager, now, "2025-08-04 09:15", "2025-08-05 09:55")
+    assert len(broker.calls) == 1
+
+    later = now + timedelta(minutes=5)
+    broker.now = later
+    second = await _get(data_manager, later, "2025-08-04 09:15", "2025-08-05 10:00")
+
+    # Tail fetch starts at the last stored bar instead of re-downloading the window
+    assert broker.calls[1][0] == pd.Timestamp("2025-08-05 09:55")
+    assert len(second) == len(first) + 1
+    assert second["timestamp"].is_monotonic_increasing
+    assert not second["timestamp"].duplicated().any()
+    stats = data_manager.candle_store.get_stats()
+    assert stats["full_fetches"] == 1 and stats["tail_fetches"] == 1
+    assert stats["candles_from_store"] == len(first) - 1
+    assert stats["candles_fetched"] == len(first) + 2
+
+
+@pytest.mark.asyncio
+async def test_store_survives_restart_and_serves_without_fetch(tmp_path):
+    now = _ist("2025-08-05 10:02")
+    broker = _FakeBroker(now)
+    await _get(DataManager(broker=broker, candle_store=CandleStore(path=str(tmp_path))),
+               now, "2025-08-04 09:15", "2025-08-05 09:55")
+
+    restarted_broker = _FakeBroker(now)
+    restarted = DataManager(broker=restarted_broker, candle_store=CandleStore(path=str(tmp_path)))
+    history = await _get(restarted, now, "2025-08-04 10:00", "2025-08-05 09:30")
+
+    assert restarted_broker.calls == []
+    assert history["timestamp"].iloc[0] == pd.Timestamp("2025-08-04 10:00")
+    assert history["timestamp"].iloc[-1] == pd.Timestamp("2025-08-05 09:30")
+    assert restarted.candle_store.get_stats()["store_only"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unclosed_candle_is_returned_but_not_stored(tmp_path):
+    now = _ist("2025-08-05 10:02")
+    broker = _FakeBroker(now)
+    data_manager = DataManager(broker=broker, candle_store=CandleStore(path=str(tmp_path)))
+
+    # Zerodha-style end time: the 10:00 candle is still forming at 10:02
+    history = await _get(data_manager, now, "2025-08-05 09:15", "2025-08-05 10:00")
+
+    assert history["timestamp"].iloc[-1] == pd.Timestamp("2025-08-05 10:00")
+    series = await data_manager.candle_store.load("NSE:NIFTY50-INDEX", 5)
+    assert series.frame["timestamp"].iloc[-1] == pd.Timestamp("2025-08-05 09:55")
+    assert series.covered_to == pd.Timestamp("2025-08-05 09:55")
+
+
+@pytest.mark.asyncio
+async def test_request_before_stored_window_does_a_full_fetch(tmp_path):
+    now = _ist("2025-08-05 10:02")
+    broker = _FakeBroker(now)
+    data_manager = DataManager(broker=broker, candle_store=CandleStore(path=str(tmp_path)))
+    await _get(data_manager, now, "2025-08-05 09:15", "2025-08-05 09:55")
+
+    history = await _get(data_manager, now, "2025-08-04 09:15", "2025-08-05 09:55")
+
+    assert broker.calls[1][0] == pd.Timestamp("2025-08-04 09:15")
+    assert history["timestamp"].iloc[0] == pd.Timestamp("2025-08-04 09:15")
+    series = await data_manager.candle_store.load("NSE:NIFTY50-INDEX", 5)
+    assert series.covered_from == pd.Timestamp("2025-08-04 09:15")
+
+
+@pytest.mark.asyncio
+async def test_backfill_then_cycle_uses_store(tmp_path):
+    now = _ist("2025-08-05 10:02")
+    broker = _FakeBroker(now)
+    data_manager = DataManager(broker=broker, candle_store=CandleStore(path=str(tmp_path)))
+
+    with patch("algosat.core.time_utils.get_ist_datetime", return_value=now), \
+         patch("algosat.core.data_manager.validate_broker_response", return_value=True):
+        stored = await data_manager.backfill_candles("NSE:NIFTY50-INDEX", 5, days=3, chunk_days=1)
+    assert stored > 0
+
+    broker.calls.clear()
+    await _get(data_manager, now, "2025-08-04 09:15", "2025-08-05 09:55")
+    assert broker.calls == []
+
+
+@pytest.mark.asyncio
+async def test_retention_prunes_old_days_unless_disabled(tmp_path):
+    times = pd.date_range("2025-01-01 09:15", periods=200, freq="1D", tz=IST)
+    frame = pd.DataFrame({"timestamp": times, "open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "volume": 1})
+
+    pruned = await CandleStore(path=str(tmp_path / "live"), retention_days=60).save("NIFTY", 5, frame, times[0], times[-1])
+    assert len(pruned.frame) == 61 and pruned.frame["timestamp"].iloc[0] == times[-61]
+
+    kept = await CandleStore(path=str(tmp_path / "backtest"), retention_days=None).save("NIFTY", 5, frame, times[0], times[-1])
+    assert len(kept.frame) == 200
+
+
+def test_merge_candles_dedupes_tz_aware_frames_keeping_latest():
+    times = pd.to_datetime(["2025-08-05 09:15", "2025-08-05 09:20"]).tz_localize(IST)
+    old = pd.DataFrame({"timestamp": times, "close": [1.0, 2.0]}, index=pd.Index(times, name="date"))
+    new = pd.DataFrame({"timestamp": times[1:], "close": [2.5]}, index=pd.Index(times[1:], name="date"))
+
+    merged = merge_candles(old, new)
+
+    assert list(merged["close"]) == [1.0, 2.5]
+    assert merged.index.name == "date"
+
+
+def test_last_closed_candle_start():
+    assert last_closed_candle_start(_ist("2025-08-05 10:02"), 5) == pd.Timestamp("2025-08-05 09:55")
+    assert last_closed_candle_start(_ist("2025-08-05 10:05"), 5) == pd.Timestamp("2025-08-05 10:00")
+    assert last_closed_candle_start(_ist("2025-08-05 10:05"), 1) == pd.Timestamp("2025-08-05 10:04")
@@ -0,0 +1,137 @@
+"""
+Tests for DataManager request coalescing: concurrent identical history/option chain requests
+share one broker call, results and exceptions reach every caller, and hit rates are reported.
+"""
+
+import asyncio
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from algosat.core.data_manager import DataManager, _SingleFlight
+
+
+class _SlowBroker:
+    def __init__(self):
+        self.history_calls = []
+        self.chain_calls = 0
+
+    async def get_history(self, symbol, from_dt, to_dt, ohlc_interval, ins_type):
+        self.history_calls.append((symbol, ohlc_interval))
+        await asyncio.sleep(0.05)
+        return pd.DataFrame({
+            "timestamp": pd.date_range("2025-01-06 09:15", periods=3, freq="1min"),
+            "open": [1, 2, 3], "high": [1, 2, 3], "low": [1, 2, 3], "close": [1, 2, 3], "volume": [0, 0, 0],
+        })
+
+    async def get_option_chain(self, symbol, expiry):
+        self.chain_calls += 1
+        await asyncio.sleep(0.05)
+        return {"code": 200, "data": {"optionsChain": [{"symbol": symbol}]}}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_history_requests_share_one_call():
+    broker = _SlowBroker()
+    data_manager = DataManager(broker=broker, broker_name="fyers")
+    args = ("NSE:NIFTY50-INDEX", datetime(2025, 1, 6, 9, 15), datetime(2025, 1, 6, 9, 17))
+
+    results = await asyncio.gather(
+        data_manager.get_history(*args, ohlc_interval=1, cache=False),
+        data_manager.get_history(*args, ohlc_interval=1, cache=False),
+        data_manager.get_history(*args, ohlc_interval=5, cache=False),
+    )
+
+    assert broker.history_calls == [("NSE:NIFTY50-INDEX", 1), ("NSE:NIFTY50-INDEX", 5)]
+    results[0]["signal"] = 1  # each caller gets its own frame
+    assert "signal" not in results[1].columns
+    stats = data_manager.single_flight.get_stats()["namespaces"]["history"]
+    assert stats == {"calls": 3, "coalesced": 1, "broker_calls": 2, "hit_rate": round(1 / 3, 4)}
+
+    await data_manager.get_history(*args, ohlc_interval=1, cache=False)
+    assert len(broker.history_calls) == 3  # nothing is kept once the call finished
+
+
+@pytest.mark.asyncio
+async def test_leader_modifying_its_frame_does_not_affect_followers():
+    broker = _SlowBroker()
+    data_manager = DataManager(broker=broker, broker_name="fyers")
+    args = ("NSE:NIFTY50-INDEX", datetime(2025, 1, 6, 9, 15), datetime(2025, 1, 6, 9, 17))
+
+    async def leader():
+        df = await data_manager.get_history(*args, ohlc_interval=1, cache=False)
+        df["close"] = df["close"] * 100
+        return df
+
+    leader_task = asyncio.create_task(leader())
+    await asyncio.sleep(0)
+    follower = await data_manager.get_history(*args, ohlc_interval=1, cache=False)
+
+    assert len(broker.history_calls) == 1
+    assert list(follower["close"]) == [1, 2, 3]
+    assert list((await leader_task)["close"]) == [100, 200, 300]
+
+
+@pytest.mark.asyncio
+async def test_option_chain_requests_coalesce():
+    broker = _SlowBroker()
+    data_manager = DataManager(broker=broker, broker_name="fyers")
+    async def _miss(key, ttl=60):
+        return None
+    data_manager.cache.aget = _miss  # force a broker call for every request
+
+    chains = await asyncio.gather(*(data_manager.get_option_chain("NSE:NIFTY50-INDEX") for _ in range(4)))
+
+    assert broker.chain_calls == 1
+    assert all(chain == chains[0] for chain in chains)
+    assert data_manager.single_flight.get_stats()["namespaces"]["option_chain"]["coalesced"] == 3
+
+
+@pytest.mark.asyncio
+async def test_callers_modifying_a_shared_option_chain_do_not_affect_each_other():
+    broker = _SlowBroker()
+    data_manager = DataManager(broker=broker, broker_name="fyers")
+    async def _miss(key, ttl=60):
+        return None
+    data_manager.cache.aget = _miss
+
+    async def modifying_caller():
+        chain = await data_manager.get_option_chain("NSE:NIFTY50-INDEX")
+        chain["data"]["optionsChain"].append({"symbol": "extra"})
+        chain["code"] = 500
+        return chain
+
+    modified, untouched = await asyncio.gather(modifying_caller(), data_manager.get_option_chain("NSE:NIFTY50-INDEX"))
+
+    assert broker.chain_calls == 1
+    assert len(modified["data"]["optionsChain"]) == 2
+    assert untouched == {"code": 200, "data": {"optionsChain": [{"symbol": "NSE:NIFTY50-INDEX"}]}}
+
+
+@pytest.mark.asyncio
+async def test_exception_reaches_every_waiter_and_cancelling_one_keeps_the_call():
+    flight = _SingleFlight()
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        raise RuntimeError("broker down")
+
+    results = await asyncio.gather(flight.do("ltp:A", failing), flight.do("ltp:A", failing), return_exceptions=True)
+    assert calls == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+    async def ok():
+        await asyncio.sleep(0.05)
+        return {"A": 1.0}
+
+    leader = asyncio.create_task(flight.do("ltp:A", ok))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("ltp:A", ok))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert await follower == {"A": 1.0}
+    assert flight.get_stats()["inflight"] == 0
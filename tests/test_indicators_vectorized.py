@@ -0,0 +1,160 @@
+"""
+Parity tests for the array-based supertrend/ATR/RSI in algosat.utils.indicators against the
+previous row-by-row DataFrame implementations, plus a timing check on large inputs.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from algosat.utils.indicators import calculate_atr, calculate_rsi, calculate_supertrend, true_range
+
+
+# --- previous implementations, kept verbatim as the reference ---
+
+def _legacy_true_range(data):
+    data['h-l'] = data['high'] - data['low']
+    data['h-c'] = abs(data['high'] - data['close'].shift(1))
+    data['l-pc'] = abs(data['low'] - data['close'].shift(1))
+    data['TR'] = data.loc[:, ['h-l', 'h-c', 'l-pc']].max(axis=1)
+    data.drop(['h-l', 'h-c', 'l-pc'], inplace=True, axis=1)
+    return data
+
+
+def _legacy_atr(data, period=14, drop_tr=True, smoothing="RMA"):
+    data = _legacy_true_range(data)
+    if smoothing == "RMA":
+        data['atr'] = data['TR'].ewm(com=period - 1, min_periods=period).mean()
+    elif smoothing == "SMA":
+        data['atr'] = data['TR'].rolling(window=period).mean()
+    elif smoothing == "EMA":
+        data['atr'] = data['TR'].ewm(span=period, adjust=False).mean()
+    if drop_tr:
+        data.drop(['TR'], inplace=True, axis=1)
+    return data
+
+
+def _legacy_supertrend(df, period=7, multiplier=3):
+    df = df.reset_index(drop=True)
+    df = _legacy_atr(df, period, True)
+    df['basic_ub'] = ((df['high'] + df['low']) / 2) + (df['atr'] * multiplier)
+    df['basic_lb'] = ((df['high'] + df['low']) / 2) - (df['atr'] * multiplier)
+    df['final_ub'] = 0.0
+    df['final_lb'] = 0.0
+    for i in range(period, len(df)):
+        df.loc[i, 'final_ub'] = (
+            df.loc[i, 'basic_ub']
+            if df.loc[i, 'basic_ub'] < df.loc[i - 1, 'final_ub'] or df.loc[i - 1, 'close'] > df.loc[i - 1, 'final_ub']
+            else df.loc[i - 1, 'final_ub']
+        )
+        df.loc[i, 'final_lb'] = (
+            df.loc[i, 'basic_lb']
+            if df.loc[i, 'basic_lb'] > df.loc[i - 1, 'final_lb'] or df.loc[i - 1, 'close'] < df.loc[i - 1, 'final_lb']
+            else df.loc[i - 1, 'final_lb']
+        )
+    df['supertrend'] = 0.0
+    for i in range(period, len(df)):
+        df.loc[i, 'supertrend'] = (
+            df.loc[i, 'final_ub']
+            if (df.loc[i - 1, 'supertrend'] == df.loc[i - 1, 'final_ub'] and df.loc[i, 'close'] <= df.loc[i, 'final_ub'])
+            else df.loc[i, 'final_lb']
+            if (df.loc[i - 1, 'supertrend'] == df.loc[i - 1, 'final_ub'] and df.loc[i, 'close'] > df.loc[i, 'final_ub'])
+            else df.loc[i, 'final_lb']
+            if (df.loc[i - 1, 'supertrend'] == df.loc[i - 1, 'final_lb'] and df.loc[i, 'close'] >= df.loc[i, 'final_lb'])
+            else df.loc[i, 'final_ub']
+            if (df.loc[i - 1, 'supertrend'] == df.loc[i - 1, 'final_lb'] and df.loc[i, 'close'] < df.loc[i, 'final_lb'])
+            else 0.0
+        )
+    df.drop(['basic_ub', 'basic_lb', 'final_ub', 'final_lb'], axis=1, inplace=True)
+    df['supertrend_signal'] = None
+    df.loc[df['supertrend'] > 0.0, 'supertrend_signal'] = 'SELL'
+    df.loc[(df['supertrend'] > 0.0) & (df['close'] >= df['supertrend']), 'supertrend_signal'] = 'BUY'
+    return df
+
+
+def _legacy_rsi(data, period=14):
+    df = data.copy()
+    df['price_change'] = df['close'].diff()
+    df['gain'] = df['price_change'].where(df['price_change'] > 0, 0)
+    df['loss'] = -df['price_change'].where(df['price_change'] < 0, 0)
+    df['avg_gain'] = df['gain'].ewm(com=period - 1, min_periods=period).mean()
+    df['avg_loss'] = df['loss'].ewm(com=period - 1, min_periods=period).mean()
+    df['rs'] = df['avg_gain'] / df['avg_loss']
+    df['rsi'] = 100 - (100 / (1 + df['rs']))
+    return df.drop(['price_change', 'gain', 'loss', 'avg_gain', 'avg_loss', 'rs'], axis=1)
+
+
+def _ohlc(n, seed=0, start_index=0):
+    rng = np.random.default_rng(seed)
+    close = 24000 + np.cumsum(rng.normal(0, 8, n))
+    open_ = close + rng.normal(0, 3, n)
+    high = np.maximum(open_, close) + rng.uniform(0, 6, n)
+    low = np.minimum(open_, close) - rng.uniform(0, 6, n)
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2025-01-06 09:15", periods=n, freq="1min"),
+        "open": open_, "high": high, "low": low, "close": close, "volume": rng.integers(1, 1000, n),
+    }, index=range(start_index, start_index + n))
+
+
+@pytest.mark.parametrize("period,multiplier", [(7, 3), (10, 2), (1, 1.5)])
+def test_supertrend_matches_previous_implementation(period, multiplier):
+    data = _ohlc(400, seed=period, start_index=100)
+    original = data.copy()
+
+    result = calculate_supertrend(data, period, multiplier)
+
+    pd.testing.assert_frame_equal(result, _legacy_supertrend(data.copy(), period, multiplier))
+    pd.testing.assert_frame_equal(data, original)
+    assert set(result["supertrend_signal"].dropna()) == {"BUY", "SELL"}
+
+
+def test_supertrend_with_gaps_and_short_input():
+    data = _ohlc(60, seed=3)
+    data.loc[10, ["high", "low"]] = np.nan
+    data.loc[20, "close"] = np.nan
+    pd.testing.assert_frame_equal(calculate_supertrend(data, 7, 3), _legacy_supertrend(data.copy(), 7, 3))
+
+    short = _ohlc(5)
+    assert calculate_supertrend(short, 7, 3) is short
+
+
+@pytest.mark.parametrize("smoothing", ["RMA", "SMA", "EMA"])
+@pytest.mark.parametrize("drop_tr", [True, False])
+def test_atr_matches_previous_implementation(smoothing, drop_tr):
+    data = _ohlc(300, seed=11)
+    data.loc[42, "close"] = np.nan
+    original = data.copy()
+
+    result = calculate_atr(data, 14, drop_tr, smoothing)
+
+    pd.testing.assert_frame_equal(result, _legacy_atr(data.copy(), 14, drop_tr, smoothing))
+    pd.testing.assert_frame_equal(data, original)
+    pd.testing.assert_frame_equal(true_range(data), _legacy_true_range(data.copy()))
+
+
+def test_rsi_matches_previous_implementation():
+    data = _ohlc(500, seed=5)
+    data.loc[30:33, "close"] = data.loc[29, "close"]  # flat stretch
+    pd.testing.assert_frame_equal(calculate_rsi(data, 14), _legacy_rsi(data, 14))
+    assert calculate_rsi(pd.DataFrame(), 14).empty
+
+
+@pytest.mark.slow
+def test_supertrend_benchmark_100k_bars():
+    data = _ohlc(100_000, seed=1)
+
+    started = time.perf_counter()
+    result = calculate_supertrend(data, 7, 3)
+    vectorized = time.perf_counter() - started
+
+    # The .loc loop is far too slow for 100k rows; time it on a slice and extrapolate
+    sample = data.iloc[:2_000]
+    started = time.perf_counter()
+    _legacy_supertrend(sample.copy(), 7, 3)
+    legacy_estimate = (time.perf_counter() - started) * len(data) / len(sample)
+
+    assert result["supertrend"].iloc[-1] > 0
+    assert vectorized < 2.0
+    assert legacy_estimate / vectorized > 20
@@ -0,0 +1,192 @@
+"""
+Tests for the dict-indexed instrument master in algosat.core.instrument_master, checked
+against the pandas scans it replaced in BrokerManager.get_symbol_info and AngelWrapper.
+"""
+
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from algosat.core import instrument_master as im
+from algosat.core.instrument_master import InstrumentMaster, InstrumentTable
+
+
+def _zerodha_frame(expiries=8, strikes=200):
+    rows = [
+        {"instrument_token": 256265, "tradingsymbol": "NIFTY 50", "name": "NIFTY 50", "expiry": "", "strike": 0.0,
+         "instrument_type": "EQ", "segment": "INDICES"},
+        {"instrument_token": 260105, "tradingsymbol": "NIFTY BANK", "name": "NIFTY BANK", "expiry": "", "strike": 0.0,
+         "instrument_type": "EQ", "segment": "INDICES"},
+        {"instrument_token": 779521, "tradingsymbol": "SBIN", "name": "STATE BANK OF INDIA", "expiry": "", "strike": 0.0,
+         "instrument_type": "EQ", "segment": "NSE"},
+        # Same tradingsymbol on BSE, listed first: an unsegmented lookup must return this row
+        {"instrument_token": 128028676, "tradingsymbol": "RELIANCE", "name": "RELIANCE INDUSTRIES", "expiry": "",
+         "strike": 0.0, "instrument_type": "EQ", "segment": "BSE"},
+        {"instrument_token": 738561, "tradingsymbol": "RELIANCE", "name": "RELIANCE INDUSTRIES", "expiry": "",
+         "strike": 0.0, "instrument_type": "EQ", "segment": "NSE"},
+    ]
+    token = 10_000_000
+    for week in range(expiries):
+        expiry = date(2025, 9, 2) + pd.Timedelta(days=7 * week)
+        code = f"25{expiry.month}{expiry.day:02d}"
+        for strike in range(20000, 20000 + 50 * strikes, 50):
+            for option_type in ("CE", "PE"):
+                token += 1
+                rows.append({"instrument_token": token, "tradingsymbol": f"NIFTY{code}{strike}{option_type}",
+                             "name": "NIFTY", "expiry": expiry, "strike": float(strike),
+                             "instrument_type": option_type, "segment": "NFO-OPT"})
+    return pd.DataFrame(rows)
+
+
+def _angel_frame():
+    return pd.DataFrame([
+        {"token": "99926000", "symbol": "Nifty 50", "name": "NIFTY", "expiry": "", "strike": "0.000000",
+         "lotsize": "1", "instrumenttype": "AMXIDX", "exch_seg": "NSE"},
+        {"token": "3045", "symbol": "SBIN-EQ", "name": "SBIN", "expiry": "", "strike": "-1.000000",
+         "lotsize": "1", "instrumenttype": "", "exch_seg": "NSE"},
+        {"token": "44628", "symbol": "NIFTY16SEP2524950CE", "name": "NIFTY", "expiry": "16SEP2025",
+         "strike": "2495000.000000", "lotsize": "75", "instrumenttype": "OPTIDX", "exch_seg": "NFO"},
+        {"token": "44629", "symbol": "NIFTY16SEP2524950PE", "name": "NIFTY", "expiry": "16SEP2025",
+         "strike": "2495000.000000", "lotsize": "75", "instrumenttype": "OPTIDX", "exch_seg": "NFO"},
+        {"token": "52168", "symbol": "NIFTY30SEP25FUT", "name": "NIFTY", "expiry": "30SEP2025",
+         "strike": "-1.000000", "lotsize": "75", "instrumenttype": "FUTIDX", "exch_seg": "NFO"},
+    ])
+
+
+def _zerodha_scan(df, symbol, instrument_type):
+    """The pandas filters BrokerManager.get_symbol_info used before the instrument master."""
+    if instrument_type == "INDEX":
+        match = df[(df["segment"] == "INDICES") & (df["name"].str.replace(" ", "").str.upper() == symbol.replace(" ", "").upper())]
+    elif instrument_type == "EQ":
+        match = df[(df["segment"] == "NSE") & (df["name"].str.upper() == symbol.upper())]
+    elif instrument_type == "NFO":
+        match = df[(df["segment"] == "NFO-OPT") & (df["tradingsymbol"].str.upper() == symbol.upper())]
+    else:
+        match = df[df["tradingsymbol"].str.upper() == symbol.upper()]
+    return None if match.empty else match.iloc[0]["instrument_token"]
+
+
+def _zerodha_lookup(table, symbol, instrument_type):
+    if instrument_type == "INDEX":
+        row = table.find_name(symbol, segment="INDICES", ignore_spaces=True)
+    elif instrument_type == "EQ":
+        row = table.find_name(symbol, segment="NSE")
+    elif instrument_type == "NFO":
+        row = table.find_symbol(symbol, segment="NFO-OPT")
+    else:
+        row = table.find_symbol(symbol)
+    return None if row is None else table.token(row)
+
+
+ZERODHA_CASES = [
+    ("NIFTY50", "INDEX"), ("niftybank", "INDEX"), ("STATE BANK OF INDIA", "EQ"), ("SBIN", "EQ"),
+    ("NIFTY2590220500CE", "NFO"), ("nifty2591621000pe", "NFO"), ("NIFTY25916021000PE", "NFO"),
+    ("RELIANCE", None), ("NIFTY 50", None), ("MISSING", None),
+]
+
+
+@pytest.mark.parametrize("symbol,instrument_type", ZERODHA_CASES)
+def test_zerodha_lookups_match_pandas_scans(symbol, instrument_type):
+    frame = _zerodha_frame(expiries=3, strikes=20)
+    table = InstrumentTable("zerodha", frame, date(2025, 9, 1))
+    assert _zerodha_lookup(table, symbol, instrument_type) == _zerodha_scan(frame, symbol, instrument_type)
+
+
+def test_contract_and_token_indexes():
+    table = InstrumentTable("zerodha", _zerodha_frame(expiries=3, strikes=20), date(2025, 9, 1))
+    row = table.find_contract("nifty", "2025-09-09", 20500, "pe")
+    assert table.symbol(row) == "NIFTY2590920500PE"
+    assert table.symbol_for_token(table.token(row)) == "NIFTY2590920500PE"
+    assert table.find_contract("NIFTY", date(2025, 9, 9), 20525, "PE") is None
+
+    angel = InstrumentTable("angel", _angel_frame(), date(2025, 9, 1))
+    # ScripMaster strikes are in paise
+    assert angel.token(angel.find_contract("NIFTY", date(2025, 9, 16), 24950, "CE")) == "44628"
+    assert angel.token(angel.find_contract("NIFTY", "2025-09-30", None, "FUT")) == "52168"
+    assert angel.symbol_for_token(3045) == "SBIN-EQ"
+
+
+def test_angel_symbol_name_and_search_match_pandas():
+    frame = _angel_frame()
+    table = InstrumentTable("angel", frame, date(2025, 9, 1))
+    assert table.token(table.find_symbol("sbin-eq", segment="nse")) == "3045"
+    assert table.find_symbol("SBIN-EQ", segment="NFO") is None
+    # Name fallback returns the first NIFTY row in dump order, as match.iloc[0] did
+    assert table.token(table.find_name("NIFTY")) == "99926000"
+    assert table.token(table.find_name("nifty", segment="NFO")) == "44628"
+
+    found = table.search("nifty16", segment="NFO", instrument_type="optidx", limit=1)
+    expected = frame[frame["symbol"].str.contains("nifty16", case=False) | frame["name"].str.contains("nifty16", case=False)]
+    expected = expected[(expected["exch_seg"] == "NFO") & (expected["instrumenttype"] == "OPTIDX")].head(1)
+    pd.testing.assert_frame_equal(found, expected)
+    assert len(table.search("NIFTY")) == 4
+
+
+@pytest.mark.asyncio
+async def test_master_loads_once_per_day_and_restarts_from_snapshot(tmp_path, monkeypatch):
+    today = {"value": date(2025, 9, 1)}
+    monkeypatch.setattr(im, "get_ist_today", lambda: today["value"])
+    downloads = []
+
+    async def fetch():
+        downloads.append(1)
+        return _angel_frame()
+
+    master = InstrumentMaster(path=str(tmp_path))
+    first = await master.load("angel", fetch)
+    assert await master.load("angel", fetch) is first
+    assert len(downloads) == 1
+
+    # A restart on the same day rebuilds the table from the snapshot without downloading
+    restarted = InstrumentMaster(path=str(tmp_path))
+    table = await restarted.load("angel", fetch)
+    assert len(downloads) == 1
+    assert restarted.get_stats()["snapshot_loads"] == 1
+    pd.testing.assert_frame_equal(table.frame, first.frame)
+
+    # The next trading day downloads again and replaces the old snapshot
+    today["value"] = date(2025, 9, 2)
+    assert restarted.get("angel") is None
+    await restarted.load("angel", fetch)
+    assert len(downloads) == 2
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["angel_2025-09-02.pkl"]
+
+    restarted.invalidate("angel")
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_master_rejects_empty_dump(tmp_path):
+    async def fetch():
+        return pd.DataFrame()
+
+    with pytest.raises(ValueError):
+        await InstrumentMaster(path=str(tmp_path)).load("zerodha", fetch)
+
+
+@pytest.mark.slow
+def test_benchmark_lookup_vs_pandas_scan():
+    frame = _zerodha_frame(expiries=25, strikes=2000)  # 100k option rows
+    symbols = frame["tradingsymbol"].sample(200, random_state=1).tolist()
+
+    started = time.perf_counter()
+    table = InstrumentTable("zerodha", frame, date(2025, 9, 1))
+    tokens = [_zerodha_lookup(table, symbol, "NFO") for symbol in symbols]
+    indexed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    expected = [_zerodha_scan(frame, symbol, "NFO") for symbol in symbols[:20]]
+    scan_per_lookup = (time.perf_counter() - started) / 20
+
+    assert tokens[:20] == expected
+    lookup_started = time.perf_counter()
+    for symbol in symbols:
+        table.find_symbol(symbol, segment="NFO-OPT")
+    per_lookup = (time.perf_counter() - lookup_started) / len(symbols)
+    print(f"\n{len(frame)} instruments: build + 200 lookups {indexed * 1000:.0f} ms, "
+          f"{per_lookup * 1e6:.1f} us per lookup vs {scan_per_lookup * 1000:.1f} ms per pandas scan")
+    assert per_lookup * 100 < scan_per_lookup
+    assert np.isfinite(indexed)
@@ -0,0 +1,131 @@
+"""
+Tests for the log index behind /logs/content: paginated queries must match a full
+parse/filter/sort of the files, the index must follow appended lines, and sidecars of
+deleted log files must be pruned.
+"""
+
+import os
+
+import pytest
+
+from algosat.core.log_index import FileIndex, LogIndex, _bucket_may_match, parse_record, search_terms
+
+DATE = "2025-01-06"
+LEVELS = ["INFO", "INFO", "DEBUG", "ERROR"]
+
+
+def _write_log(path, count, seed):
+    lines = []
+    for i in range(count):
+        minute, second = divmod(i * 7 + seed, 60)
+        level = LEVELS[(i + seed) % len(LEVELS)]
+        lines.append(f"{DATE} 09:{minute % 60:02d}:{second:02d} - strategy.swing - runner.py:{i} - {level} - "
+                     f"order {i} placed for NIFTY{i % 5}")
+        if i % 25 == 0:
+            lines.append("Traceback (most recent call last):")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def _brute_force(paths, offset, limit, level=None, search=None):
+    records = []
+    for path in sorted(paths, key=lambda p: p.name):
+        for line in path.read_text().splitlines():
+            record = parse_record(line)
+            if record is None:
+                continue
+            if level and record.level != level.upper():
+                continue
+            if search and search.lower() not in record.message.lower():
+                continue
+            records.append(record)
+    records.sort(key=lambda r: r.timestamp, reverse=True)
+    return records[offset:offset + limit], len(records)
+
+
+@pytest.fixture
+def logs(tmp_path):
+    logs_dir = tmp_path / "logs"
+    date_dir = logs_dir / DATE
+    date_dir.mkdir(parents=True)
+    paths = [date_dir / f"algosat-{DATE}.log", date_dir / f"api-{DATE}.log"]
+    for seed, path in enumerate(paths):
+        _write_log(path, 400, seed)
+    return LogIndex(tmp_path / "log_index", logs_dir, save_interval=0), paths
+
+
+@pytest.mark.parametrize("offset,limit,level,search", [
+    (0, 50, None, None),
+    (133, 37, None, None),
+    (790, 100, None, None),
+    (10, 25, "error", None),
+    (0, 20, None, "nifty3"),
+    (5, 10, "INFO", "order 12"),
+    (0, 30, None, "der 12 pla"),
+    (3, 30, "DEBUG", "ed for nifty"),
+    (0, 10, None, "no such message"),
+])
+def test_query_matches_full_scan(logs, offset, limit, level, search):
+    index, paths = logs
+    assert index.query(paths, offset, limit, level, search) == _brute_force(paths, offset, limit, level, search)
+
+
+def test_appended_lines_are_indexed_once_complete(logs):
+    index, paths = logs
+    index.query(paths, 0, 1)
+    with open(paths[0], "a") as f:
+        f.write(f"{DATE} 15:29:59 - api.app - app.py:1 - INFO - last complete line\n")
+        f.write(f"{DATE} 15:30:00 - api.app - app.py:2 - INFO - still being written")
+    page, total = index.query(paths, 0, 1)
+    assert page[0].message == "last complete line"
+    assert total == 801
+
+    # A fresh LogIndex picks the saved sidecar up and indexes only the rest of the file
+    with open(paths[0], "a") as f:
+        f.write("\n")
+    reloaded = LogIndex(index.index_dir, index.logs_dir)
+    page, total = reloaded.query(paths, 0, 1)
+    assert page[0].message == "still being written"
+    assert total == 802
+
+
+def test_prune_removes_sidecars_of_deleted_logs(logs):
+    index, paths = logs
+    index.query(paths, 0, 1)
+    sidecars = sorted(p.name for p in (index.index_dir / DATE).iterdir())
+    assert sidecars == [f"algosat-{DATE}.log.idx", f"api-{DATE}.log.idx"]
+
+    os.unlink(paths[1])
+    assert index.prune() == 1
+    assert [p.name for p in (index.index_dir / DATE).iterdir()] == [f"algosat-{DATE}.log.idx"]
+
+
+def test_search_words_bounded_in_the_term_must_be_whole_tokens():
+    bucket = ["2025-01-06 09:15", 0, 100, {"INFO": 1}, {"reorder", "placed", "nifty2"}]
+    assert _bucket_may_match(bucket, None, search_terms("order placed"))  # "reorder placed"
+    assert not _bucket_may_match(bucket, None, search_terms("order placed for"))
+    assert not _bucket_may_match(bucket, None, search_terms("x order placed"))
+    assert _bucket_may_match(bucket, None, search_terms("laced nift"))
+    assert not _bucket_may_match(bucket, "ERROR", search_terms("placed"))
+
+
+def test_growing_index_rewrites_only_the_changed_buckets(logs):
+    index, paths = logs
+    index.query(paths, 0, 1)
+    sidecar = index._sidecar(paths[0])
+    before = sidecar.read_bytes()
+    inode = os.stat(sidecar).st_ino
+    unchanged = index.file_index(paths[0]).saved_tail  # everything before the last bucket
+
+    with open(paths[0], "a") as f:
+        f.write(f"{DATE} 09:59:30 - api.app - app.py:1 - INFO - same minute as the last bucket\n")
+        f.write(f"{DATE} 15:29:59 - api.app - app.py:2 - INFO - a new minute\n")
+    index.query(paths, 0, 1)
+
+    after = sidecar.read_bytes()
+    assert os.stat(sidecar).st_ino == inode
+    assert after[:unchanged] == before[:unchanged] and after != before
+
+    rebuilt = FileIndex(paths[0])
+    rebuilt.update()
+    reloaded = LogIndex(index.index_dir, index.logs_dir).file_index(paths[0])
+    assert (reloaded.indexed_to, reloaded.buckets) == (rebuilt.indexed_to, rebuilt.buckets)
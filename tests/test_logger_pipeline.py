@@ -0,0 +1,107 @@
+"""
+Tests for the queued logging pipeline: records are written by the writer thread in order,
+INFO/DEBUG are dropped (and counted) when the queue is full, bad format args go to
+handleError, files are never closed under a running writer, and the per-call-site rate
+limit suppresses repeats without ever touching warnings.
+"""
+
+import logging
+import threading
+
+from algosat.common.logger import ISTFormatter, _LogPipeline, _RateLimitFilter
+
+
+def _record(message, level=logging.INFO, lineno=10, created=1000.0, args=None):
+    record = logging.LogRecord("OrderMonitor", level, "order_monitor.py", lineno, message, args, None)
+    record.created = created
+    return record
+
+
+def _handler():
+    handler = logging.Handler()
+    handler.setFormatter(ISTFormatter("%(levelname)s - %(message)s"))
+    return handler
+
+
+def test_writer_thread_appends_records_in_order(tmp_path):
+    pipeline = _LogPipeline(maxsize=100)
+    handler = _handler()
+    path = str(tmp_path / "2025-01-06" / "algosat-2025-01-06.log")
+    for i in range(50):
+        pipeline.submit(handler, _record("order %s placed", args=(i,)), path)
+    pipeline.stop()
+
+    with open(path) as f:
+        lines = f.read().splitlines()
+    assert lines == [f"INFO - order {i} placed" for i in range(50)]
+    stats = pipeline.get_stats()
+    assert stats["enqueued"] == stats["written"] == 50 and stats["dropped"] == 0
+
+    # After shutdown records are written inline
+    pipeline.submit(handler, _record("late"), path)
+    with open(path) as f:
+        assert f.read().splitlines()[-1] == "INFO - late"
+
+
+def test_full_queue_drops_info_but_keeps_warnings(tmp_path):
+    pipeline = _LogPipeline(maxsize=2, block_timeout=0.01)
+    pipeline._ensure_started = lambda: True  # no writer thread: the queue only fills up
+    handler = _handler()
+    path = str(tmp_path / "algosat.log")
+    for i in range(2):
+        pipeline.submit(handler, _record(f"fill {i}"), path)
+    pipeline.submit(handler, _record("dropped"), path)
+    pipeline.submit(handler, _record("waited", level=logging.WARNING), path)
+
+    stats = pipeline.get_stats()
+    assert stats["queued"] == 2
+    assert stats["dropped"] == 2 and stats["blocked"] == 1
+
+
+def test_args_that_do_not_fit_the_format_go_to_handle_error(tmp_path):
+    pipeline = _LogPipeline(maxsize=100)
+    handler = _handler()
+    handled = []
+    handler.handleError = handled.append
+    record = _record("%d items", args=("abc",))
+    pipeline.submit(handler, record, str(tmp_path / "algosat.log"))  # does not raise
+    pipeline.stop()
+
+    assert handled == [record]
+    assert pipeline.get_stats()["errors"] == 1 and pipeline.get_stats()["enqueued"] == 0
+
+
+def test_stop_leaves_files_to_a_writer_that_is_still_busy(tmp_path):
+    pipeline = _LogPipeline(maxsize=100)
+    handler = _handler()
+    path = str(tmp_path / "algosat.log")
+    pipeline.submit(handler, _record("first"), path)
+
+    release = threading.Event()
+    console = _handler()
+    console.write = lambda record: release.wait(5)
+    pipeline.submit(console, _record("slow console"))
+    pipeline.submit(handler, _record("last"), path)
+    pipeline.stop(timeout=0.05)
+
+    [stream] = pipeline._streams.values()
+    assert not stream.closed  # the writer is still working; stop() did not close its file
+    release.set()
+    pipeline._thread.join(5)
+    assert stream.closed and pipeline._streams == {}
+    with open(path) as f:
+        assert f.read().splitlines() == ["INFO - first", "INFO - last"]
+
+
+def test_rate_limit_suppresses_repeats_per_call_site():
+    rate_filter = _RateLimitFilter(max_records=2, per_seconds=1.0)
+    passed = [rate_filter.filter(_record(f"tick {i}", created=1000.0 + i * 0.1)) for i in range(5)]
+    assert passed == [True, True, False, False, False]
+    # Another call site and warnings are not affected
+    assert rate_filter.filter(_record("other", lineno=20, created=1000.5))
+    assert rate_filter.filter(_record("slow fill", level=logging.WARNING, created=1000.5))
+
+    record = _record("tick 10", created=1001.2)
+    assert rate_filter.filter(record)
+    assert record.msg == "tick 10 [3 similar messages suppressed]"
+    assert rate_filter.suppressed == 3
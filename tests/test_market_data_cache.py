@@ -0,0 +1,147 @@
+"""
+Tests for DataManager's tiered cache (_CacheManager and algosat.core.market_data_cache).
+"""
+
+import os
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from algosat.core.data_manager import _CacheManager, DataManager
+from algosat.core.market_data_cache import estimate_size
+
+
+def _history(rows=50):
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2025-08-01 09:15", periods=rows, freq="5min", tz="Asia/Kolkata"),
+        "open": range(rows), "high": range(rows), "low": range(rows), "close": range(rows), "volume": range(rows),
+    })
+
+
+def test_memory_hits_and_misses_are_counted_per_namespace():
+    cache = _CacheManager(disk_path=None)
+    cache.set("option_chain:NIFTY:None", {"code": 200, "data": [1, 2, 3]}, ttl=120)
+
+    assert cache.get("option_chain:NIFTY:None", ttl=120) == {"code": 200, "data": [1, 2, 3]}
+    assert cache.get("history:NIFTY:x", ttl=600) is None
+
+    stats = cache.get_stats()["namespaces"]
+    assert stats["option_chain"]["hits"] == 1
+    assert stats["option_chain"]["entries"] == 1
+    assert stats["option_chain"]["bytes"] > 0
+    assert stats["history"]["misses"] == 1
+
+
+def test_lru_eviction_respects_entry_and_byte_limits():
+    frame = _history()
+    frame_bytes = estimate_size(frame)
+    cache = _CacheManager(maxsize=10, max_bytes=int(frame_bytes * 2.5), disk_path=None)
+
+    cache.set("history:A", frame, ttl=600)
+    cache.set("history:B", _history(), ttl=600)
+    cache.get("history:A", ttl=600)  # A is now most recently used
+    cache.set("history:C", _history(), ttl=600)
+
+    assert cache.get("history:B", ttl=600) is None
+    assert cache.get("history:A", ttl=600) is not None
+    assert cache.get("history:C", ttl=600) is not None
+    stats = cache.get_stats()
+    assert stats["namespaces"]["history"]["evictions"] == 1
+    assert stats["memory_bytes"] <= stats["memory_max_bytes"]
+
+
+def test_entries_expire_by_stored_ttl():
+    cache = _CacheManager(disk_path=None)
+    with patch("algosat.core.data_manager.time.time", return_value=1000.0):
+        cache.set("option_chain:NIFTY:None", {"data": 1}, ttl=120)
+    with patch("algosat.core.market_data_cache.time.time", return_value=1121.0):
+        assert cache.get("option_chain:NIFTY:None", ttl=120) is None
+    assert cache.get_stats()["namespaces"]["option_chain"]["expirations"] == 1
+
+
+def test_disk_tier_persists_values_and_expiry_across_restarts(tmp_path):
+    cache = _CacheManager(disk_path=str(tmp_path), flush_interval=0.01)
+    cache.set("history:NIFTY:5", _history(), ttl=600)
+    cache.set("option_chain:NIFTY:None", {"data": [1, 2]}, ttl=120)
+    cache.flush()
+    # Expire the option chain on disk, as if the process restarted long after it was written
+    cache.disk._index["option_chain:NIFTY:None"]["expires_at"] = time.time() - 1
+    cache.disk._save_index()
+
+    restarted = _CacheManager(disk_path=str(tmp_path))
+    history = restarted.get("history:NIFTY:5", ttl=600)
+    assert isinstance(history, pd.DataFrame) and len(history) == 50
+    assert restarted.get("option_chain:NIFTY:None", ttl=120) is None
+    assert restarted.get_stats()["namespaces"]["history"]["disk_hits"] == 1
+    # The expired entry was purged from disk when the index was loaded
+    assert len([name for name in os.listdir(tmp_path) if name != "index.json"]) == 1
+
+
+def test_memory_miss_does_not_touch_disk_for_unknown_keys(tmp_path):
+    cache = _CacheManager(disk_path=str(tmp_path))
+    with patch("builtins.open") as mocked_open:
+        assert cache.get("option_chain:BANKNIFTY:None", ttl=120) is None
+    mocked_open.assert_not_called()
+
+
+def test_dicts_with_int_keys_round_trip_through_disk(tmp_path):
+    cache = _CacheManager(disk_path=str(tmp_path))
+    strikes = {24000: {"ce": 101.5, "pe": 88.0}, 24050: {"ce": 80.25, "pe": 110.0}}
+    cache.set("option_chain:NIFTY:strikes", strikes, ttl=120)
+    cache.flush()
+
+    restarted = _CacheManager(disk_path=str(tmp_path))
+    assert restarted.get("option_chain:NIFTY:strikes", ttl=120) == strikes
+    assert restarted.get_stats()["namespaces"]["option_chain"].get("disk_errors", 0) == 0
+
+
+@pytest.mark.asyncio
+async def test_async_lookup_reads_disk_hits_off_the_event_loop(tmp_path):
+    cache = _CacheManager(disk_path=str(tmp_path))
+    cache.set("history:NIFTY:5", _history(), ttl=600)
+    cache.flush()
+
+    restarted = _CacheManager(disk_path=str(tmp_path))
+    loop_thread = threading.get_ident()
+    read_threads = []
+    read = restarted.disk._read
+    restarted.disk._read = lambda meta: read_threads.append(threading.get_ident()) or read(meta)
+
+    history = await restarted.aget("history:NIFTY:5", ttl=600)
+    assert len(history) == 50 and read_threads and read_threads[0] != loop_thread
+    assert await restarted.aget("history:NIFTY:5", ttl=600) is history  # now a memory hit
+    assert await restarted.aget("history:BANKNIFTY:5", ttl=600) is None
+    assert len(read_threads) == 1
+
+
+def test_disk_writes_are_batched_by_the_background_writer(tmp_path):
+    cache = _CacheManager(disk_path=str(tmp_path), flush_interval=0.05)
+    for i in range(20):
+        cache.set(f"option_chain:SYM{i}:None", {"data": i}, ttl=120)
+    cache.set("option_chain:SYM0:None", {"data": "latest"}, ttl=120)
+
+    deadline = time.time() + 5
+    while cache.disk._pending and time.time() < deadline:
+        time.sleep(0.02)
+
+    assert cache.get_stats()["namespaces"]["option_chain"]["disk_writes"] == 20
+    restarted = _CacheManager(disk_path=str(tmp_path))
+    assert restarted.get("option_chain:SYM0:None", ttl=120) == {"data": "latest"}
+
+
+@pytest.mark.asyncio
+async def test_option_chain_served_from_cache_on_second_call():
+    broker = MagicMock()
+    broker.get_option_chain = MagicMock(return_value={"code": 200, "data": {"optionsChain": [1]}})
+    data_manager = DataManager(broker=broker, broker_name="fyers", cache=_CacheManager(disk_path=None))
+
+    with patch("algosat.core.data_manager.validate_broker_response", return_value=True):
+        first = await data_manager.get_option_chain("NSE:NIFTY50-INDEX")
+        second = await data_manager.get_option_chain("NSE:NIFTY50-INDEX")
+
+    assert first == second
+    broker.get_option_chain.assert_called_once()
+    assert data_manager.cache.get_stats()["namespaces"]["option_chain"]["hits"] == 1
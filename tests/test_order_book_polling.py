@@ -0,0 +1,115 @@
+"""
+Tests for concurrent, shared order-book fetches (BrokerManager), incremental order
+normalization (OrderManager) and the order-id index in OrderCache.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from algosat.core.broker_manager import BrokerManager
+from algosat.core.order_cache import OrderCache
+from algosat.core.order_manager import OrderManager
+
+
+class _FakeBroker:
+    def __init__(self, orders, delay=0.4):
+        self.orders = orders
+        self.delay = delay
+        self.calls = 0
+
+    async def get_order_details(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return [dict(order) for order in self.orders]
+
+
+def _zerodha_order(order_id, status="OPEN", filled=0):
+    return {"order_id": order_id, "status": status, "tradingsymbol": "NIFTY2511624000CE", "quantity": 75,
+            "filled_quantity": filled, "average_price": 0, "product": "MIS", "order_type": "LIMIT",
+            "transaction_type": "BUY", "order_timestamp": None}
+
+
+def _manager(brokers):
+    manager = BrokerManager()
+    manager.brokers = dict(brokers)
+
+    async def trade_enabled():
+        return dict(manager.brokers)
+
+    manager.get_all_trade_enabled_brokers = trade_enabled
+    return manager
+
+
+def _order_manager(broker_manager):
+    order_manager = OrderManager(broker_manager)
+
+    async def broker_id(broker_name):
+        return {"fyers": 1, "zerodha": 2, "angel": 3}[broker_name]
+
+    order_manager._get_broker_id = broker_id
+    return order_manager
+
+
+@pytest.mark.asyncio
+async def test_order_books_are_fetched_concurrently_and_shared():
+    brokers = {
+        "fyers": _FakeBroker([{"id": "F1", "status": 6, "filledQty": 0}]),
+        "zerodha": _FakeBroker([_zerodha_order("Z1")]),
+        "angel": _FakeBroker([{"orderid": "A1", "status": "open", "filledshares": "0", "averageprice": "0"}]),
+    }
+    manager = _manager(brokers)
+
+    started = time.perf_counter()
+    everything, zerodha_only = await asyncio.gather(
+        manager.get_all_broker_order_details(retries=1), manager.get_broker_order_details("zerodha", retries=1))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 1.0  # one broker's delay (0.4s), not the sum of three (1.2s)
+    assert set(everything) == {"fyers", "zerodha", "angel"}
+    assert zerodha_only == everything["zerodha"]
+    # The per-broker request joined the in-flight download instead of starting another
+    assert [broker.calls for broker in brokers.values()] == [1, 1, 1]
+    assert manager._order_book_fetches == {}
+
+
+@pytest.mark.asyncio
+async def test_only_changed_orders_are_normalized_again():
+    broker = _FakeBroker([_zerodha_order("Z1"), _zerodha_order("Z2")], delay=0)
+    order_manager = _order_manager(_manager({"zerodha": broker}))
+
+    first = await order_manager.get_broker_order_details("zerodha")
+    broker.orders = [_zerodha_order("Z1", status="COMPLETE", filled=75), _zerodha_order("Z2"), _zerodha_order("Z3")]
+    second = await order_manager.get_broker_order_details("zerodha")
+
+    assert second[1] is first[1]  # unchanged order reused
+    assert second[0] is not first[0]
+    assert second[0]["executed_quantity"] == 75
+    assert [order["order_id"] for order in second] == ["Z1", "Z2", "Z3"]
+    assert order_manager._normalize_stats == {"normalized": 4, "reused": 1}
+
+    everything = await order_manager.get_all_broker_order_details()
+    assert everything["zerodha"] == second
+    assert everything["zerodha"][0]["broker_id"] == 2
+
+
+@pytest.mark.asyncio
+async def test_order_cache_indexes_orders_by_id():
+    broker = _FakeBroker([_zerodha_order("Z1"), _zerodha_order(1002)], delay=0)
+    cache = OrderCache(_order_manager(_manager({"zerodha": broker})), refresh_interval=0.05)
+    await cache.start()
+    try:
+        assert (await cache.get_order_by_id("zerodha", "1002"))["order_id"] == 1002
+        assert await cache.get_order_by_id("zerodha", "missing") is None
+
+        broker.orders = [_zerodha_order("Z1", status="COMPLETE", filled=75)]
+        deadline = time.perf_counter() + 2.0  # a few refresh intervals, with room for a loaded machine
+        while (await cache.get_order_by_id("zerodha", "Z1"))["executed_quantity"] != 75:
+            assert time.perf_counter() < deadline
+            await asyncio.sleep(0.02)
+        assert await cache.get_order_by_id("zerodha", 1002) is None
+        assert len(await cache.get_orders("zerodha")) == 1
+    finally:
+        await cache.stop()
+    assert await cache.get_order_by_id("fyers", "Z1") is None
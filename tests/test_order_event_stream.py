@@ -0,0 +1,257 @@
+"""
+Tests for push-based order updates: OrderEventStream against a local fake order-update
+websocket server, in-place OrderCache updates and OrderMonitorScheduler wake-ups.
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiohttp import web
+
+from algosat.core.order_cache import OrderCache
+from algosat.core.order_event_stream import OrderEventStream, WebSocketOrderFeed, extract_order_updates
+from algosat.core.order_manager import OrderManager
+from algosat.core.order_monitor_scheduler import OrderMonitorScheduler
+from algosat.core.order_request import OrderStatus
+
+
+def _zerodha_order(order_id, status="OPEN", filled=0, price=0):
+    return {"order_id": order_id, "status": status, "tradingsymbol": "NIFTY2511624000CE", "quantity": 75,
+            "filled_quantity": filled, "average_price": price, "product": "MIS", "order_type": "LIMIT",
+            "transaction_type": "BUY", "order_timestamp": None}
+
+
+def _order_manager(orders):
+    broker_manager = MagicMock()
+    broker_manager.get_all_broker_order_details = AsyncMock(side_effect=lambda: {"zerodha": [dict(o) for o in orders]})
+    broker_manager.get_broker_order_details = AsyncMock(side_effect=lambda broker_name: [dict(o) for o in orders])
+    order_manager = OrderManager(broker_manager)
+    order_manager._get_broker_id = AsyncMock(return_value=2)
+    return order_manager
+
+
+class _FakeScheduler:
+    def __init__(self):
+        self.woken = []
+        self.event = asyncio.Event()
+
+    def wake(self, broker_order_ids):
+        self.woken.append(list(broker_order_ids))
+        self.event.set()
+        return len(broker_order_ids)
+
+
+@asynccontextmanager
+async def _fake_order_socket(messages):
+    """Local websocket server that sends each message as a JSON text frame, then waits."""
+    async def handler(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.send_bytes(b"\x00\x01")  # market-data tick, ignored by the feed
+        for message in messages:
+            await ws.send_str(json.dumps(message))
+        async for _ in ws:
+            pass
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}/"
+    finally:
+        await runner.cleanup()
+
+
+def test_extract_order_updates_handles_broker_envelopes():
+    fyers = {"s": "ok", "orders": {"id": "F1", "status": 2}}
+    kite = {"type": "order", "data": {"order_id": "Z1", "status": "COMPLETE"}}
+    assert extract_order_updates(fyers) == [{"id": "F1", "status": 2}]
+    assert extract_order_updates(json.dumps(kite)) == [{"order_id": "Z1", "status": "COMPLETE"}]
+    assert extract_order_updates({"type": "message", "data": "connected"}) == []
+    assert extract_order_updates({"s": "ok", "code": 1605, "message": "subscribed"}) == []
+    assert extract_order_updates("not json") == []
+
+
+@pytest.mark.asyncio
+async def test_stream_updates_cache_and_wakes_monitors():
+    order_manager = _order_manager([_zerodha_order("Z1"), _zerodha_order("Z2")])
+    cache = OrderCache(order_manager, refresh_interval=60, reconcile_interval=120)
+    await cache.start()
+    scheduler = _FakeScheduler()
+    stream = OrderEventStream(order_manager, cache, scheduler=scheduler)
+    messages = [
+        {"type": "order", "data": _zerodha_order("Z1", status="COMPLETE", filled=75, price=101.5)},
+        {"type": "order", "data": _zerodha_order("Z2")},  # unchanged
+    ]
+    try:
+        async with _fake_order_socket(messages) as url:
+            stream.add_feed(WebSocketOrderFeed("zerodha", url))
+            await stream.start()
+            await asyncio.wait_for(scheduler.event.wait(), timeout=5)
+            await asyncio.sleep(0.1)
+
+            assert stream.is_connected("zerodha")
+            assert "zerodha" in cache._push_brokers
+            order = await cache.get_order_by_id("zerodha", "Z1")
+            assert order["status"] == OrderStatus.FILLED
+            assert order["executed_quantity"] == 75
+            assert scheduler.woken == [["Z1"]]
+            assert cache._poll_interval("zerodha") == 120
+            assert stream.get_stats()["changed"] == 1
+            await stream.stop()
+    finally:
+        await cache.stop()
+    assert not stream.is_connected("zerodha")
+    assert "zerodha" not in cache._push_brokers
+    assert cache._poll_interval("zerodha") == 60
+
+
+@pytest.mark.asyncio
+async def test_stopped_stream_restarts_with_rebuilt_feeds():
+    order_manager = _order_manager([_zerodha_order("Z1")])
+    cache = OrderCache(order_manager, refresh_interval=60)
+    stream = OrderEventStream(order_manager, cache)
+    stale = WebSocketOrderFeed("zerodha", "ws://127.0.0.1:1/?access_token=yesterday")
+    stream.add_feed(stale)
+    await stream.start()
+    assert stream.running
+    await stream.stop()
+    assert not stream.running and stream.get_stats()["feeds"] == []
+
+    # Next session: the feed built with the new token is the one that runs
+    scheduler = _FakeScheduler()
+    stream.scheduler = scheduler
+    await cache.start()
+    try:
+        async with _fake_order_socket([{"type": "order", "data": _zerodha_order("Z1", status="COMPLETE", filled=75)}]) as url:
+            stream.add_feed(WebSocketOrderFeed("zerodha", url))
+            await stream.start()
+            await asyncio.wait_for(scheduler.event.wait(), timeout=5)
+            assert stream.is_connected("zerodha")
+            await stream.stop()
+    finally:
+        await cache.stop()
+
+
+@pytest.mark.asyncio
+async def test_reconcile_keeps_orders_pushed_during_fetch():
+    orders = [_zerodha_order("Z1")]
+    order_manager = _order_manager(orders)
+    cache = OrderCache(order_manager, refresh_interval=60)
+    cache._store("zerodha", await order_manager.get_broker_order_details("zerodha"))
+
+    push_seq = cache._push_seq
+    stale_book = await order_manager.get_broker_order_details("zerodha")
+    pushed = await order_manager.normalize_order_update("zerodha", _zerodha_order("Z1", status="COMPLETE", filled=75))
+    assert cache.apply_order_update("zerodha", pushed)
+    assert not cache.apply_order_update("zerodha", dict(pushed))
+    cache._store("zerodha", stale_book, pushed_after=push_seq)
+
+    assert cache._index["zerodha"]["Z1"]["status"] == OrderStatus.FILLED
+    # The next fetch started after the push, so the order book wins again
+    cache._store("zerodha", [dict(stale_book[0])], pushed_after=cache._push_seq)
+    assert cache._index["zerodha"]["Z1"]["status"] == OrderStatus.OPEN
+
+
+@asynccontextmanager
+async def _fake_session():
+    yield MagicMock()
+
+
+class _FakeMonitor:
+    def __init__(self, order_id):
+        self.order_id = order_id
+        self._running = True
+        self._rerun_immediately = False
+        self.ticks = 0
+
+    async def _price_order_monitor_tick(self, snapshot=None):
+        self.ticks += 1
+        return True
+
+    def stop(self):
+        self._running = False
+
+
+@pytest.mark.asyncio
+async def test_scheduler_wake_ticks_only_affected_orders():
+    data_manager = MagicMock()
+    data_manager.ensure_broker = AsyncMock()
+    data_manager.get_ltp_batch = AsyncMock(return_value={})
+    scheduler = OrderMonitorScheduler(data_manager, interval=60)
+    monitors = {1: _FakeMonitor(1), 2: _FakeMonitor(2)}
+    for monitor in monitors.values():
+        scheduler.register(monitor)
+
+    async def bulk_load(session, order_ids):
+        orders_by_id = {i: {"id": i, "status": "AWAITING_ENTRY"} for i in order_ids}
+        executions = {
+            1: [{"id": 11, "side": "ENTRY", "broker_order_id": "Z1"}],
+            2: [{"id": 21, "side": "ENTRY", "broker_order_id": "F2-BO-1"}],
+        }
+        return orders_by_id, {i: executions[i] for i in order_ids}
+
+    with patch("algosat.core.db.AsyncSessionLocal", _fake_session), \
+         patch("algosat.core.db.get_orders_with_executions_by_ids", bulk_load):
+        await scheduler.start()
+        await asyncio.sleep(0.05)
+        assert [m.ticks for m in monitors.values()] == [1, 1]
+
+        assert scheduler.wake(["F2", "unknown"]) == 1
+        await asyncio.sleep(0.05)
+        assert [m.ticks for m in monitors.values()] == [1, 2]
+        stats = scheduler.get_stats()
+        assert stats["wake_count"] == 1
+        assert stats["last_tick"]["woken"] is True
+        await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_scheduler_wake_reaches_orders_registered_since_the_last_tick():
+    data_manager = MagicMock()
+    data_manager.ensure_broker = AsyncMock()
+    data_manager.get_ltp_batch = AsyncMock(return_value={})
+    scheduler = OrderMonitorScheduler(data_manager, interval=60)
+    monitors = {1: _FakeMonitor(1), 3: _FakeMonitor(3)}
+    scheduler.register(monitors[1])
+
+    async def bulk_load(session, order_ids):
+        executions = {1: [{"id": 11, "side": "ENTRY", "broker_order_id": "Z1"}],
+                      3: [{"id": 31, "side": "ENTRY", "broker_order_id": "Z3"}]}
+        return {i: {"id": i, "status": "AWAITING_ENTRY"} for i in order_ids}, {i: executions[i] for i in order_ids}
+
+    with patch("algosat.core.db.AsyncSessionLocal", _fake_session), \
+         patch("algosat.core.db.get_orders_with_executions_by_ids", bulk_load):
+        await scheduler.start()
+        await asyncio.sleep(0.05)
+        # Registered after the regular tick: Z3 is not indexed, so its fill wakes order 3
+        scheduler.register(monitors[3])
+        assert scheduler.wake(["Z3"]) == 1
+        await asyncio.sleep(0.05)
+        assert [m.ticks for m in monitors.values()] == [1, 1]
+        # Now indexed, so an unknown id wakes nothing
+        assert scheduler.wake(["unknown"]) == 0
+        assert scheduler.wake(["Z3"]) == 1
+        await asyncio.sleep(0.05)
+        assert [m.ticks for m in monitors.values()] == [1, 2]
+        await scheduler.stop()
+
+
+def test_pushed_updates_replace_cached_orders_in_place():
+    cache = OrderCache(_order_manager([]), refresh_interval=60)
+    cache._store("zerodha", [{"order_id": "Z1", "status": "OPEN"}, {"order_id": "Z2", "status": "OPEN"}])
+
+    assert cache.apply_order_update("zerodha", {"order_id": "Z2", "status": "FILLED"})
+    assert cache.apply_order_update("zerodha", {"order_id": "Z3", "status": "OPEN"})
+    assert cache.apply_order_update("zerodha", {"order_id": "Z3", "status": "CANCELLED"})
+
+    assert [(o["order_id"], o["status"]) for o in cache._cache["zerodha"]] == [
+        ("Z1", "OPEN"), ("Z2", "FILLED"), ("Z3", "CANCELLED")]
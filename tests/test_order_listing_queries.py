@@ -0,0 +1,163 @@
+"""
+Tests for the shared order listing loader (get_orders_with_broker_executions) and the /orders route.
+Uses a fake session that counts round trips, so no database is needed.
+"""
+
+import time
+from datetime import datetime, date, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import Response
+from sqlalchemy.dialects import postgresql
+
+from algosat.core.db import (
+    get_orders_with_broker_executions,
+    get_all_orders,
+    get_orders_by_broker,
+    encode_order_cursor,
+    decode_order_cursor,
+)
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def fetchall(self):
+        return self._rows
+
+
+class _CountingSession:
+    """Returns the given result sets in order and records every executed statement."""
+
+    def __init__(self, *result_sets):
+        self._result_sets = list(result_sets)
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        rows = self._result_sets.pop(0) if self._result_sets else []
+        return _Result([SimpleNamespace(_mapping=row) for row in rows])
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def _order_rows(count):
+    base = datetime(2025, 8, 1, 9, 15, tzinfo=timezone.utc)
+    return [
+        {"id": order_id, "status": "CLOSED", "signal_time": base + timedelta(minutes=order_id),
+         "parent_order_id": None, "executed_quantity": None}
+        for order_id in range(count, 0, -1)
+    ]
+
+
+def _execution_rows(order_ids):
+    rows = []
+    for order_id in order_ids:
+        for side in ("ENTRY", "EXIT"):
+            rows.append({"parent_order_id": order_id, "id": order_id * 10 + len(rows) % 2,
+                         "side": side, "broker_name": "fyers"})
+    return rows
+
+
+@pytest.mark.asyncio
+async def test_all_orders_uses_two_queries_regardless_of_order_count():
+    order_count = 500
+    order_rows = _order_rows(order_count)
+    session = _CountingSession(order_rows, _execution_rows([row["id"] for row in order_rows]))
+
+    started = time.perf_counter()
+    result = await get_all_orders(session)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    # Previously 1 + N queries (one broker_executions query per order)
+    assert len(session.statements) == 2
+    assert len(result) == order_count
+    assert all(len(order["broker_executions"]) == 2 for order in result)
+    assert all("parent_order_id" not in execution for execution in result[0]["broker_executions"])
+    assert result[0]["executed_quantity"] == 0
+    print(f"get_all_orders: {order_count} orders in {len(session.statements)} queries, {elapsed_ms:.1f} ms")
+
+
+@pytest.mark.asyncio
+async def test_broker_filter_is_a_subquery_not_a_separate_round_trip():
+    session = _CountingSession(_order_rows(3), _execution_rows([3, 2, 1]))
+
+    result = await get_orders_by_broker(session, "zerodha")
+
+    assert len(session.statements) == 2
+    assert "broker_credentials.broker_name = 'zerodha'" in _sql(session.statements[0])
+    assert [order["id"] for order in result] == [3, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_filters_projection_and_pagination_are_pushed_into_sql():
+    session = _CountingSession(_order_rows(2))
+
+    await get_orders_with_broker_executions(
+        session,
+        statuses=["OPEN", "CLOSED"],
+        start_date=date(2025, 8, 1),
+        end_date=date(2025, 8, 1),
+        limit=50,
+        columns=["pnl"],
+        include_executions=False,
+    )
+
+    assert len(session.statements) == 1
+    sql = _sql(session.statements[0])
+    assert "orders.status IN ('OPEN', 'CLOSED')" in sql
+    assert "orders.signal_time >= '2025-08-01 00:00:00+05:30'" in sql
+    assert "orders.signal_time < '2025-08-02 00:00:00+05:30'" in sql
+    assert "ORDER BY orders.signal_time DESC NULLS LAST, orders.id DESC" in sql
+    assert "LIMIT 50" in sql
+    selected = sql.split(" FROM ")[0]
+    assert "orders.pnl" in selected and "orders.entry_spot_price" not in selected
+
+
+@pytest.mark.asyncio
+async def test_unknown_projection_column_is_rejected():
+    with pytest.raises(ValueError):
+        await get_orders_with_broker_executions(_CountingSession(), columns=["password"])
+
+
+@pytest.mark.asyncio
+async def test_cursor_round_trip_and_keyset_condition():
+    signal_time = datetime(2025, 8, 1, 10, 0, tzinfo=timezone.utc)
+    cursor = encode_order_cursor({"id": 42, "signal_time": signal_time})
+    assert decode_order_cursor(cursor) == (signal_time, 42)
+    assert decode_order_cursor(encode_order_cursor({"id": 7, "signal_time": None})) == (None, 7)
+    with pytest.raises(ValueError):
+        decode_order_cursor("not-a-cursor")
+
+    session = _CountingSession([])
+    await get_orders_with_broker_executions(session, cursor=cursor, limit=10)
+    sql = _sql(session.statements[0])
+    assert "orders.signal_time < '2025-08-01 10:00:00+00:00'" in sql
+    assert "orders.id < 42" in sql
+    assert "orders.signal_time IS NULL" in sql
+    # No orders on this page, so no executions query either
+    assert len(session.statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_list_orders_route_sets_next_cursor_header():
+    from algosat.api.routes.orders import list_orders
+
+    rows = _order_rows(2)
+    loader = AsyncMock(return_value=[dict(row, broker_executions=[]) for row in rows])
+    response = Response()
+    with patch("algosat.api.routes.orders.get_orders_with_broker_executions", loader):
+        orders = await list_orders(
+            response=response, broker_name=None, strategy_config_id=None, status="open,closed",
+            start_date=None, end_date=None, limit=2, cursor=None, fields=None,
+            include_executions=True, db=object(), current_user={},
+        )
+
+    assert [order.id for order in orders] == [2, 1]
+    assert loader.await_args.kwargs["statuses"] == ["OPEN", "CLOSED"]
+    assert decode_order_cursor(response.headers["X-Next-Cursor"])[1] == 1
@@ -0,0 +1,171 @@
+"""
+Tests for the batched OrderMonitorScheduler and the OrderMonitor snapshot helpers.
+"""
+
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from algosat.core.order_monitor import OrderMonitor, OrderTickSnapshot
+from algosat.core.order_monitor_scheduler import OrderMonitorScheduler
+
+
+@asynccontextmanager
+async def _fake_session():
+    yield MagicMock()
+
+
+class _FakeMonitor:
+    """Duck-typed stand-in for OrderMonitor that records the snapshots it receives."""
+
+    def __init__(self, order_id, keep_running=True):
+        self.order_id = order_id
+        self._running = True
+        self._rerun_immediately = False
+        self.keep_running = keep_running
+        self.snapshots = []
+
+    async def _price_order_monitor_tick(self, snapshot=None):
+        self.snapshots.append(snapshot)
+        return self.keep_running
+
+    def stop(self):
+        self._running = False
+
+
+def _orders_and_execs():
+    orders_by_id = {
+        1: {"id": 1, "status": "OPEN", "strike_symbol": "NSE:NIFTY25AUG24500CE"},
+        2: {"id": 2, "status": "OPEN", "strike_symbol": "NSE:NIFTY25AUG24500CE"},
+        3: {"id": 3, "status": "AWAITING_ENTRY", "strike_symbol": "NSE:NIFTY25AUG24000PE"},
+    }
+    executions = {
+        1: [{"id": 11, "side": "ENTRY", "broker_id": 1}],
+        2: [{"id": 21, "side": "ENTRY", "broker_id": 2}],
+        3: [],
+    }
+    return orders_by_id, executions
+
+
+@pytest.mark.asyncio
+async def test_tick_bulk_loads_once_and_batches_ltp():
+    data_manager = MagicMock()
+    data_manager.ensure_broker = AsyncMock()
+    data_manager.get_ltp_batch = AsyncMock(return_value={"NSE:NIFTY25AUG24500CE": 101.5})
+    scheduler = OrderMonitorScheduler(data_manager, interval=1)
+    monitors = [_FakeMonitor(1), _FakeMonitor(2), _FakeMonitor(3)]
+    for monitor in monitors:
+        scheduler.register(monitor)
+
+    bulk_load = AsyncMock(return_value=_orders_and_execs())
+    with patch("algosat.core.db.AsyncSessionLocal", _fake_session), \
+         patch("algosat.core.db.get_orders_with_executions_by_ids", bulk_load), \
+         patch("algosat.core.db.get_broker_risk_summary", AsyncMock(return_value={"summary": {"trade_enabled_brokers": 2}})):
+        await scheduler.tick()
+
+    bulk_load.assert_awaited_once()
+    # Only OPEN orders need an LTP, and the shared symbol is requested once
+    data_manager.get_ltp_batch.assert_awaited_once_with(["NSE:NIFTY25AUG24500CE"])
+
+    snapshot_1 = monitors[0].snapshots[0]
+    assert isinstance(snapshot_1, OrderTickSnapshot)
+    assert snapshot_1.ltp == 101.5
+    assert snapshot_1.trade_enabled_brokers == 2
+    assert snapshot_1.executions == [{"id": 11, "side": "ENTRY", "broker_id": 1}]
+    assert monitors[2].snapshots[0].ltp is None
+
+    stats = scheduler.get_stats()
+    assert stats["tick_count"] == 1
+    assert stats["last_tick"]["orders"] == 3
+    assert stats["last_tick"]["ltp_symbols"] == 1
+    assert set(stats["orders"]) == {1, 2, 3}
+    assert all(order_stats["ticks"] == 1 for order_stats in stats["orders"].values())
+
+
+@pytest.mark.asyncio
+async def test_stopped_monitor_is_unregistered():
+    data_manager = MagicMock()
+    data_manager.ensure_broker = AsyncMock()
+    data_manager.get_ltp_batch = AsyncMock(return_value={})
+    scheduler = OrderMonitorScheduler(data_manager, interval=1)
+    finished = _FakeMonitor(1, keep_running=False)
+    active = _FakeMonitor(2)
+    scheduler.register(finished)
+    scheduler.register(active)
+
+    with patch("algosat.core.db.AsyncSessionLocal", _fake_session), \
+         patch("algosat.core.db.get_orders_with_executions_by_ids", AsyncMock(return_value=_orders_and_execs())), \
+         patch("algosat.core.db.get_broker_risk_summary", AsyncMock(return_value={"summary": {}})):
+        await scheduler.tick()
+
+    assert not scheduler.is_monitoring(1)
+    assert scheduler.is_monitoring(2)
+    assert finished._running is False
+
+
+@pytest.mark.asyncio
+async def test_bulk_load_failure_falls_back_to_per_order_ticks():
+    data_manager = MagicMock()
+    data_manager.get_ltp_batch = AsyncMock(return_value={})
+    scheduler = OrderMonitorScheduler(data_manager, interval=1)
+    monitor = _FakeMonitor(1)
+    scheduler.register(monitor)
+
+    with patch("algosat.core.db.AsyncSessionLocal", _fake_session), \
+         patch("algosat.core.db.get_orders_with_executions_by_ids", AsyncMock(side_effect=RuntimeError("pool exhausted"))):
+        await scheduler.tick()
+
+    assert monitor.snapshots == [None]
+    data_manager.get_ltp_batch.assert_not_called()
+
+
+def _make_order_monitor():
+    return OrderMonitor(
+        order_id=1,
+        data_manager=MagicMock(),
+        order_manager=MagicMock(),
+        order_cache=MagicMock(),
+    )
+
+
+def test_snapshot_parts_go_stale_after_writes():
+    monitor = _make_order_monitor()
+    monitor._tick_snapshot = OrderTickSnapshot(
+        order={"id": 1, "status": "OPEN"},
+        executions=[{"id": 11, "side": "ENTRY"}, {"id": 12, "side": "EXIT"}],
+    )
+    assert monitor._snapshot_executions(side="ENTRY") == [{"id": 11, "side": "ENTRY"}]
+    assert monitor._snapshot_order_row() == {"id": 1, "status": "OPEN"}
+
+    monitor._invalidate_snapshot(executions=True)
+    assert monitor._snapshot_executions(side="ENTRY") is None
+    assert monitor._snapshot_order_row() is not None
+
+    monitor._invalidate_snapshot(order=True)
+    assert monitor._snapshot_order_row() is None
+
+
+@pytest.mark.asyncio
+async def test_snapshot_ltp_skips_broker_call():
+    monitor = _make_order_monitor()
+    monitor.data_manager.get_ltp = AsyncMock()
+    monitor._update_current_price_in_db = AsyncMock()
+    monitor._tick_snapshot = OrderTickSnapshot(order={"id": 1, "status": "OPEN"}, ltp=88.25)
+
+    ltp = await monitor._update_current_price_for_open_order({"id": 1, "strike_symbol": "NSE:NIFTY25AUG24500CE"})
+
+    assert ltp == 88.25
+    monitor.data_manager.get_ltp.assert_not_called()
+    monitor._update_current_price_in_db.assert_awaited_once_with("NSE:NIFTY25AUG24500CE", 88.25)
+
+
+@pytest.mark.asyncio
+async def test_get_ltp_batch_chunks_symbols_into_comma_separated_calls():
+    from algosat.core.data_manager import DataManager
+    data_manager = DataManager(broker=MagicMock(), broker_name="fyers")
+    data_manager.get_ltp = AsyncMock(side_effect=[{"A": 1, "B": 2}, {"C": "3.5"}])
+
+    ltp_map = await data_manager.get_ltp_batch(["A", "B", "A", "C"], chunk_size=2)
+
+    assert ltp_map == {"A": 1.0, "B": 2.0, "C": 3.5}
+    assert [call.args[0] for call in data_manager.get_ltp.await_args_list] == ["A,B", "C"]
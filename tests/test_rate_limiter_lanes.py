@@ -0,0 +1,75 @@
+"""
+Tests for the priority lanes of the broker rate limiter: a queued exit is served before
+queued data fetches, non-critical lanes leave the critical reserve alone, a drained endpoint
+bucket does not hold up other endpoints, and per-lane queue and wait stats are reported.
+"""
+
+import asyncio
+
+from algosat.core.rate_limiter import BrokerRateLimiter, EndpointLimit, GlobalRateLimiter, Lane, RateConfig
+
+
+async def _acquire(limiter, order, name, **kwargs):
+    async with limiter.acquire(**kwargs):
+        order.append(name)
+
+
+async def test_critical_request_preempts_queued_data_fetches():
+    limiter = BrokerRateLimiter("lanes_test", RateConfig(rps=50, burst=1))
+    async with limiter.acquire():
+        pass  # bucket is now empty
+
+    order = []
+    tasks = [asyncio.create_task(_acquire(limiter, order, f"data{i}", endpoint="history")) for i in range(3)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(_acquire(limiter, order, "exit", endpoint="orders")))
+    await asyncio.gather(*tasks)
+
+    assert order == ["exit", "data0", "data1", "data2"]
+
+
+async def test_non_critical_lanes_leave_the_reserve_for_orders():
+    limiter = BrokerRateLimiter("lanes_test", RateConfig(rps=1, burst=3, critical_reserve=1))
+    for _ in range(2):
+        async with limiter.acquire(lane=Lane.MARKET_DATA):
+            pass
+
+    blocked = asyncio.create_task(_acquire(limiter, [], "data", lane=Lane.BACKGROUND))
+    await asyncio.sleep(0.05)
+    assert not blocked.done()
+
+    # The last token is still there for an order
+    await asyncio.wait_for(_acquire(limiter, [], "order", lane=Lane.CRITICAL), timeout=0.1)
+
+    blocked.cancel()
+    await asyncio.gather(blocked, return_exceptions=True)
+    assert limiter.get_lane_stats()["background"]["queued"] == 0
+
+
+async def test_drained_endpoint_does_not_block_other_endpoints():
+    limiter = BrokerRateLimiter("lanes_test", RateConfig(rps=100, burst=10), {"ltp": EndpointLimit(per_second=1)})
+    async with limiter.acquire(endpoint="ltp"):
+        pass
+
+    order = []
+    ltp = asyncio.create_task(_acquire(limiter, order, "ltp", endpoint="ltp"))
+    await asyncio.sleep(0)
+    await asyncio.wait_for(_acquire(limiter, order, "history", endpoint="history"), timeout=0.2)
+    assert order == ["history"] and not ltp.done()
+
+    await asyncio.wait_for(ltp, timeout=2)
+    stats = limiter.get_lane_stats()["market_data"]
+    assert stats["granted"] == 3 and stats["waited"] == 2
+    assert stats["max_wait_ms"] > 500 and stats["queued"] == 0
+
+
+async def test_global_limiter_reports_lanes_and_applies_endpoint_limits():
+    limiter = GlobalRateLimiter()
+    async with limiter.acquire("zerodha", endpoint="orders"):
+        pass
+
+    broker_limiter = limiter.get_limiter("zerodha")
+    assert set(broker_limiter._endpoint_buckets) >= {"ltp", "history", "orders"}
+    lanes = limiter.get_stats()["zerodha"]["lanes"]
+    assert list(lanes) == ["critical", "order_status", "market_data", "background"]
+    assert lanes["critical"]["granted"] == 1
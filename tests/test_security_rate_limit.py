@@ -0,0 +1,66 @@
+"""
+Tests for SecurityManager's in-memory API rate limiter and batched access-log writer.
+"""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+from algosat.core.security import SecurityManager, SlidingWindowRateLimiter
+
+
+class _Clock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_sliding_window_weights_the_previous_window():
+    clock = _Clock(0.0)
+    limiter = SlidingWindowRateLimiter(clock=clock)
+    key = ("1.2.3.4", "/orders", 60)
+    assert all(limiter.hit(key, 10, 60)[0] for _ in range(10))
+    assert limiter.hit(key, 10, 60) == (False, 10)
+
+    clock.now = 90.0  # half of the previous window still overlaps: 10 * 0.5 = 5 counted
+    assert [limiter.hit(key, 10, 60)[0] for _ in range(6)] == [True] * 5 + [False]
+
+    clock.now = 200.0  # two windows later nothing is left
+    assert limiter.hit(key, 10, 60) == (True, 1)
+
+
+def test_keys_are_bounded_least_recently_seen_first():
+    limiter = SlidingWindowRateLimiter(max_keys=2, clock=_Clock())
+    for ip in ("a", "b", "a", "c"):
+        limiter.hit((ip, "/", 60), 100, 60)
+    assert len(limiter) == 2 and limiter.evictions == 1
+    assert ("b", "/", 60) not in limiter._windows
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_and_batched_access_log(tmp_path):
+    manager = SecurityManager(master_key="test-key", data_dir=str(tmp_path))
+    manager.access_log.flush_interval = 0.01
+
+    results = [await manager.check_rate_limit("10.0.0.1", "/api/orders", max_requests=3) for _ in range(5)]
+    assert results == [True, True, True, False, False]
+    assert await manager.check_rate_limit("10.0.0.2", "/api/orders", max_requests=3)
+
+    for _ in range(20):
+        await manager.log_api_access("10.0.0.1", "/api/orders", "GET", success=True, response_time_ms=3)
+    await asyncio.sleep(0.1)
+    await manager.log_api_access("10.0.0.1", "/api/health", "GET")
+    await manager.close()
+
+    conn = sqlite3.connect(str(manager.security_db_path))
+    try:
+        rows = conn.execute("SELECT endpoint, COUNT(*) FROM api_access_logs GROUP BY endpoint ORDER BY endpoint").fetchall()
+        events = conn.execute("SELECT COUNT(*) FROM security_events WHERE event_type = 'RATE_LIMIT_EXCEEDED'").fetchone()[0]
+    finally:
+        conn.close()
+    assert rows == [("/api/health", 1), ("/api/orders", 20)]
+    assert events == 1  # only the first rejection in the window is recorded
+    assert manager.access_log.written == 21
@@ -0,0 +1,81 @@
+"""
+Tests for the StrategyScheduler: boundary alignment, one wake-up per boundary for the due
+intervals, priority-ordered release limited by max_concurrent, and boundary-to-decision latency.
+"""
+
+import asyncio
+import time
+
+import pandas as pd
+import pytest
+
+from algosat.core.strategy_scheduler import StrategyScheduler, next_boundary
+
+
+def _clock_starting_at(ts):
+    started = time.monotonic()
+    start = pd.Timestamp(ts)
+    return lambda: start + pd.Timedelta(seconds=time.monotonic() - started)
+
+
+def test_next_boundary_is_aligned_to_session_open():
+    assert next_boundary(pd.Timestamp("2025-01-06 09:16:30"), 5) == pd.Timestamp("2025-01-06 09:20")
+    assert next_boundary(pd.Timestamp("2025-01-06 09:20:00"), 5) == pd.Timestamp("2025-01-06 09:25")
+    assert next_boundary(pd.Timestamp("2025-01-06 09:40:00"), 60) == pd.Timestamp("2025-01-06 10:15")
+    assert next_boundary(pd.Timestamp("2025-01-06 09:00:00"), 15) == pd.Timestamp("2025-01-06 09:15")
+
+
+@pytest.mark.asyncio
+async def test_due_strategies_are_released_in_priority_order_within_slots():
+    scheduler = StrategyScheduler(max_concurrent=1, slot_timeout=5, clock=_clock_starting_at("2025-01-06 09:19:59.9"))
+    scheduler.register("swing:5m", 5)
+    scheduler.register("option:1m", 1)
+    scheduler.register("swing:3m", 3)  # 09:20 is not a 3-minute boundary
+    await scheduler.start()
+    released = []
+
+    async def runner(key):
+        boundary = await scheduler.wait_for_boundary(key)
+        released.append((key, boundary))
+        await asyncio.sleep(0.15)
+        scheduler.cycle_done(key)
+
+    tasks = [asyncio.create_task(runner(key)) for key in ("swing:5m", "option:1m", "swing:3m")]
+    try:
+        await asyncio.sleep(0.2)
+        # Only one slot: the 5-minute strategy is released after the 1-minute one decided
+        assert [key for key, _ in released] == ["option:1m"]
+        await asyncio.sleep(0.25)
+        assert released == [("option:1m", pd.Timestamp("2025-01-06 09:20")), ("swing:5m", pd.Timestamp("2025-01-06 09:20"))]
+
+        stats = scheduler.get_stats()
+        assert stats["boundaries"] == 1 and stats["released"] == 2
+        assert stats["strategies"]["option:1m"]["cycles"] == 1
+        assert stats["strategies"]["swing:5m"]["avg_release_ms"] >= 100
+        assert stats["strategies"]["swing:5m"]["last_ms"] >= stats["strategies"]["swing:5m"]["avg_release_ms"]
+        assert not tasks[2].done()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_slot_is_given_back_after_timeout_and_unregister():
+    scheduler = StrategyScheduler(max_concurrent=1, slot_timeout=0.05, clock=_clock_starting_at("2025-01-06 09:15:59.95"))
+    scheduler.register("a", 1)
+    scheduler.register("b", 1)
+    await scheduler.start()
+    try:
+        first = asyncio.create_task(scheduler.wait_for_boundary("a"))
+        second = asyncio.create_task(scheduler.wait_for_boundary("b"))
+        await asyncio.wait_for(first, timeout=1)
+        assert not second.done()  # "a" never reports done, its slot times out
+        await asyncio.wait_for(second, timeout=1)
+
+        scheduler.unregister("b")
+        assert not scheduler.is_scheduled("b")
+        with pytest.raises(KeyError):
+            await scheduler.wait_for_boundary("b")
+    finally:
+        await scheduler.stop()
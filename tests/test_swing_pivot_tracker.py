@@ -0,0 +1,78 @@
+"""
+Tests for the incremental SwingPivotTracker in algosat.common.swing_utils: it must report
+exactly what the batch find_hhlh_pivots() pipeline reports for the same candles.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from algosat.common.swing_utils import (
+    SwingPivotTracker,
+    find_hhlh_pivots,
+    get_last_swing_points,
+    get_latest_confirmed_high_low,
+)
+
+
+def _bars(n, seed=0, ties=False):
+    rng = np.random.default_rng(seed)
+    close = 24000 + np.cumsum(rng.normal(0, 10, n))
+    high = close + rng.uniform(0, 8, n)
+    low = close - rng.uniform(0, 8, n)
+    if ties:
+        close, high, low = close.round(-1), high.round(-1), low.round(-1)
+    return pd.DataFrame({"timestamp": pd.date_range("2025-01-06 09:15", periods=n, freq="5min"),
+                         "open": close, "high": high, "low": low, "close": close})
+
+
+@pytest.mark.parametrize("left_bars,right_bars", [(3, 3), (2, 4), (0, 2), (2, 0)])
+@pytest.mark.parametrize("ties", [False, True])
+def test_streaming_matches_batch_after_every_candle(left_bars, right_bars, ties):
+    df = _bars(240, seed=left_bars * 10 + right_bars, ties=ties)
+    df.loc[100, "high"] = np.nan
+    tracker = SwingPivotTracker(left_bars, right_bars)
+
+    for n in range(1, len(df) + 1):
+        window = df.iloc[:n]
+        assert tracker.update(window) == 1
+        batch = find_hhlh_pivots(window, left_bars, right_bars)
+        assert tracker.get_last_swing_points() == get_last_swing_points(batch)
+        assert tracker.get_latest_confirmed_high_low() == get_latest_confirmed_high_low(batch)
+
+    labels = list(SwingPivotTracker.LABELS)
+    streamed = pd.DataFrame(False, index=batch.index, columns=labels)
+    for pivot in tracker.pivots:
+        streamed.loc[pivot["index"], labels] = [pivot[label] for label in labels]
+    pd.testing.assert_frame_equal(streamed, batch[labels])
+    assert streamed.any().all()
+    assert tracker.rebuilds == 0
+
+
+def test_rebuilds_when_history_is_not_an_extension():
+    df = _bars(200, seed=4)
+    tracker = SwingPivotTracker(3, 3)
+    tracker.update(df.iloc[:150])
+
+    # Same frame again: nothing to do
+    assert tracker.update(df.iloc[:150]) == 0
+    # A revised last candle, then a window that starts later, both force a rebuild
+    revised = df.iloc[:151].copy()
+    revised.loc[149, "high"] += 50
+    assert tracker.update(revised) == 151
+    shifted = df.iloc[20:]
+    assert tracker.update(shifted) == len(shifted)
+    assert tracker.rebuilds == 2
+    assert tracker.get_latest_confirmed_high_low() == get_latest_confirmed_high_low(find_hhlh_pivots(shifted, 3, 3))
+
+
+def test_rebuilds_when_a_middle_candle_is_revised():
+    df = _bars(200, seed=5)
+    tracker = SwingPivotTracker(3, 3)
+    tracker.update(df.iloc[:150])
+
+    revised = df.iloc[:160].copy()
+    revised.loc[75, "low"] -= 40
+    assert tracker.update(revised) == 160
+    assert tracker.rebuilds == 1
+    assert tracker.get_latest_confirmed_high_low() == get_latest_confirmed_high_low(find_hhlh_pivots(revised, 3, 3))
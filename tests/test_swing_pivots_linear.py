@@ -0,0 +1,139 @@
+"""
+Golden-output tests for the linear-time pivot detection in algosat.common.swing_utils.
+
+The reference below is the previous per-bar implementation (window np.max/np.argmax,
+previous_non_nan rescans and find_abcd_e backward walks), condensed but unchanged in logic.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from algosat.common.swing_utils import (
+    apply_zigzag_filters,
+    build_initial_zigzag,
+    compute_raw_pivots,
+    find_abcd_e,
+    find_hhlh_pivots,
+    previous_non_nan,
+)
+
+
+def _reference_raw_pivots(highs, lows, left_bars, right_bars):
+    n = len(highs)
+    raw_ph = np.zeros(n, dtype=bool)
+    raw_pl = np.zeros(n, dtype=bool)
+    for i in range(left_bars, n - right_bars):
+        window_high = highs[i - left_bars: i + right_bars + 1]
+        if highs[i] == np.max(window_high) and np.argmax(window_high) == left_bars:
+            raw_ph[i] = True
+        window_low = lows[i - left_bars: i + right_bars + 1]
+        if lows[i] == np.min(window_low) and np.argmin(window_low) == left_bars:
+            raw_pl[i] = True
+    return raw_ph, raw_pl
+
+
+def _reference_pivots(df, left_bars=2, right_bars=4):
+    df = df.copy().reset_index(drop=True)
+    highs, lows, close = df["high"].values, df["low"].values, df["close"].values
+    n = len(df)
+    raw_ph, raw_pl = _reference_raw_pivots(highs, lows, left_bars, right_bars)
+    hl1 = np.where(raw_ph, 1.0, np.where(raw_pl, -1.0, np.nan))
+    zz1 = np.where(raw_ph, highs, np.where(raw_pl, lows, np.nan))
+
+    for i in range(n):
+        checks = (
+            lambda ph, pz: raw_pl[i] and hl1[i] == -1.0 and ph == -1.0 and lows[i] > pz,
+            lambda ph, pz: raw_ph[i] and hl1[i] == 1.0 and ph == 1.0 and highs[i] < pz,
+            lambda ph, pz: raw_pl[i] and hl1[i] == -1.0 and ph == 1.0 and zz1[i] > pz,
+            lambda ph, pz: raw_ph[i] and hl1[i] == 1.0 and ph == -1.0 and zz1[i] < pz,
+        )
+        for check in checks:
+            if check(previous_non_nan(hl1, i), previous_non_nan(zz1, i)):
+                hl1[i] = zz1[i] = np.nan
+        if np.isnan(hl1[i]):
+            zz1[i] = np.nan
+
+    flags = {name: np.zeros(n, dtype=bool) for name in ("is_HH", "is_LL", "is_HL", "is_LH")}
+    for i in np.flatnonzero(~np.isnan(zz1)):
+        a = zz1[i]
+        b, c, d, e = find_abcd_e(hl1[i], hl1, zz1, i)
+        flags["is_HH"][i] = a > b and a > c and c > b and c > d
+        flags["is_LL"][i] = a < b and a < c and c < b and c < d
+        flags["is_HL"][i] = (a >= c and b > c and b > d and d > c and d > e) or (a < b and a > c and b < d)
+        flags["is_LH"][i] = (a <= c and b < c and b < d and d < c and d < e) or (a > b and a < c and b > d)
+    for name, values in flags.items():
+        df[name] = values
+    df["zz"], df["hl"] = zz1, hl1
+
+    res, sup, trend = np.full(n, np.nan), np.full(n, np.nan), np.full(n, np.nan)
+    for i in range(n):
+        res[i] = zz1[i] if flags["is_LH"][i] else (res[i - 1] if i else np.nan)
+        sup[i] = zz1[i] if flags["is_HL"][i] else (sup[i - 1] if i else np.nan)
+        trend[i] = 1.0 if close[i] > res[i] else -1.0 if close[i] < sup[i] else (trend[i - 1] if i else np.nan)
+        if (trend[i] == 1.0 and flags["is_HH"][i]) or (trend[i] == -1.0 and flags["is_LH"][i]):
+            res[i] = zz1[i]
+        if (trend[i] == 1.0 and flags["is_HL"][i]) or (trend[i] == -1.0 and flags["is_LL"][i]):
+            sup[i] = zz1[i]
+    df["resistance"], df["support"], df["trend"] = res, sup, trend
+    return df
+
+
+def _bars(n, seed=0, ties=False, gaps=False):
+    rng = np.random.default_rng(seed)
+    close = 24000 + np.cumsum(rng.normal(0, 10, n))
+    high = close + rng.uniform(0, 8, n)
+    low = close - rng.uniform(0, 8, n)
+    if ties:
+        # Coarse prices so equal highs/lows inside a window exercise the first-occurrence rule
+        close, high, low = close.round(-1), high.round(-1), low.round(-1)
+    df = pd.DataFrame({"timestamp": pd.date_range("2025-01-06 09:15", periods=n, freq="5min"),
+                       "open": close, "high": high, "low": low, "close": close}, index=range(7, 7 + n))
+    if gaps and n:
+        df.iloc[rng.choice(n, max(1, n // 40), replace=False), df.columns.get_loc("high")] = np.nan
+        df.iloc[rng.choice(n, max(1, n // 40), replace=False), df.columns.get_loc("low")] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("left_bars,right_bars", [(2, 4), (3, 3), (0, 2), (2, 0), (1, 1)])
+@pytest.mark.parametrize("ties,gaps", [(False, False), (True, False), (True, True)])
+def test_find_hhlh_pivots_matches_reference(left_bars, right_bars, ties, gaps):
+    for seed in range(4):
+        df = _bars(600, seed=seed, ties=ties, gaps=gaps)
+        result = find_hhlh_pivots(df, left_bars, right_bars)
+        pd.testing.assert_frame_equal(result, _reference_pivots(df, left_bars, right_bars))
+        assert result[["is_HH", "is_LL", "is_HL", "is_LH"]].any().all()
+
+
+def test_short_frames_and_stage_outputs():
+    for n in (0, 1, 4, 7):
+        df = _bars(n, seed=n)
+        pd.testing.assert_frame_equal(find_hhlh_pivots(df), _reference_pivots(df))
+
+    df = _bars(300, seed=9, ties=True).reset_index(drop=True)
+    raw_ph, raw_pl = compute_raw_pivots(df, 2, 4)
+    ref_ph, ref_pl = _reference_raw_pivots(df["high"].values, df["low"].values, 2, 4)
+    np.testing.assert_array_equal(raw_ph, ref_ph)
+    np.testing.assert_array_equal(raw_pl, ref_pl)
+    hl1, zz1 = apply_zigzag_filters(df, raw_ph, raw_pl, *build_initial_zigzag(df, raw_ph, raw_pl))
+    reference = _reference_pivots(df)
+    np.testing.assert_array_equal(hl1, reference["hl"].to_numpy())
+    np.testing.assert_array_equal(zz1, reference["zz"].to_numpy())
+
+
+@pytest.mark.slow
+def test_find_hhlh_pivots_benchmark_50k_bars():
+    df = _bars(50_000, seed=1)
+
+    started = time.perf_counter()
+    find_hhlh_pivots(df)
+    linear = time.perf_counter() - started
+
+    started = time.perf_counter()
+    _reference_pivots(df)
+    reference = time.perf_counter() - started
+
+    assert linear < 1.0
+    assert reference / linear > 10
@@ -0,0 +1,131 @@
+"""
+Tests for the TickBus: dynamic subscriptions, the latest-tick table with its staleness bound,
+listener fan-out and DataManager.get_ltp served from live ticks.
+"""
+
+import asyncio
+
+import pytest
+
+from algosat.core.data_manager import DataManager
+from algosat.core.tick_bus import TickBus, TickSource
+
+
+class _FakeSource(TickSource):
+    broker_name = "fyers"
+
+    def __init__(self):
+        self.subscribed = set()
+        self.calls = []
+        self.on_message = None
+
+    async def connect(self, on_message, on_connect):
+        self.on_message = on_message
+        on_connect()
+
+    def subscribe(self, symbols):
+        self.calls.append(("subscribe", list(symbols)))
+        self.subscribed.update(symbols)
+
+    def unsubscribe(self, symbols):
+        self.calls.append(("unsubscribe", list(symbols)))
+        self.subscribed.difference_update(symbols)
+
+    def push(self, symbol, ltp):
+        self.on_message({"symbol": symbol, "ltp": ltp, "type": "sf"})
+
+
+class _RestBroker:
+    def __init__(self):
+        self.requests = []
+
+    async def get_ltp(self, symbol):
+        self.requests.append(symbol)
+        return {s: 1.0 for s in symbol.split(",")}
+
+
+async def _started_bus(**kwargs):
+    bus = TickBus(**kwargs)
+    source = _FakeSource()
+    bus.attach_source(source)
+    await bus.start()
+    await asyncio.sleep(0)  # let the connect callback and first sync run
+    await asyncio.sleep(0)
+    return bus, source
+
+
+@pytest.mark.asyncio
+async def test_subscriptions_follow_interest_union():
+    bus, source = await _started_bus()
+    try:
+        bus.set_interest("open_orders", {"NSE:A", "NSE:B"})
+        bus.set_interest("dashboard", ["NSE:B", "NSE:NIFTY50-INDEX"])
+        await asyncio.sleep(0.01)
+        assert source.subscribed == {"NSE:A", "NSE:B", "NSE:NIFTY50-INDEX"}
+
+        bus.set_interest("open_orders", {"NSE:B"})
+        await asyncio.sleep(0.01)
+        assert source.subscribed == {"NSE:B", "NSE:NIFTY50-INDEX"}
+        assert ("unsubscribe", ["NSE:A"]) in source.calls
+    finally:
+        await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_ltp_served_only_while_fresh_and_on_demand_expires():
+    bus, source = await _started_bus(max_tick_age=0.05, on_demand_ttl=0.1)
+    try:
+        assert bus.get_ltp("NSE:X") is None  # unknown: becomes an on-demand subscription
+        await asyncio.sleep(0.01)
+        assert "NSE:X" in source.subscribed
+
+        source.push("NSE:X", 101.5)
+        assert bus.get_ltp("NSE:X") == 101.5
+        await asyncio.sleep(0.06)
+        assert bus.get_ltp("NSE:X") is None  # stale
+
+        await asyncio.sleep(0.15)
+        bus.sync_subscriptions()
+        assert "NSE:X" not in source.subscribed
+        stats = bus.get_stats()
+        assert stats["ltp_hits"] == 1 and stats["ltp_misses"] == 2
+    finally:
+        await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_listeners_get_every_message_and_drop_oldest_when_full():
+    bus, source = await _started_bus()
+    try:
+        queue = bus.listen(maxsize=2)
+        for price in (1, 2, 3):
+            source.push("NSE:A", price)
+        await asyncio.sleep(0)
+        assert [queue.get_nowait()["ltp"] for _ in range(queue.qsize())] == [2, 3]
+        bus.unlisten(queue)
+        source.push("NSE:A", 4)
+        await asyncio.sleep(0)
+        assert queue.empty()
+    finally:
+        await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_data_manager_get_ltp_uses_rest_only_for_missing_symbols():
+    bus, source = await _started_bus()
+    broker = _RestBroker()
+    data_manager = DataManager(broker=broker, broker_name="fyers", tick_bus=bus)
+    try:
+        source.push("NSE:A", 10.0)
+        assert await data_manager.get_ltp("NSE:A") == {"NSE:A": 10.0}
+        assert broker.requests == []
+
+        assert await data_manager.get_ltp("NSE:A,NSE:B") == {"NSE:A": 10.0, "NSE:B": 1.0}
+        assert broker.requests == ["NSE:B"]
+
+        await asyncio.sleep(0.01)
+        source.push("NSE:B", 11.0)
+        assert await data_manager.get_ltp_batch(["NSE:A", "NSE:B"]) == {"NSE:A": 10.0, "NSE:B": 11.0}
+        assert broker.requests == ["NSE:B"]
+    finally:
+        await bus.stop()
@@ -0,0 +1,92 @@
+"""
+Tests for in-process tracing: spans of a sampled cycle (including concurrent tasks) are
+exported together with correct parent links, nothing is recorded when sampling is off, and
+log lines written inside a traced cycle carry its trace id.
+"""
+
+import asyncio
+import logging
+
+import pytest
+
+from algosat.common.logger import _TraceContextFilter
+from algosat.core.tracing import Tracer, current_span, span, traced
+
+
+class _Collector:
+    def __init__(self):
+        self.batches = []
+
+    def export(self, spans):
+        self.batches.append(spans)
+
+
+@traced("indicator.test")
+def _indicator(value):
+    return value * 2
+
+
+async def _fetch(symbol):
+    with span("data.get_history", symbol=symbol):
+        await asyncio.sleep(0)
+        return _indicator(1)
+
+
+async def test_sampled_cycle_exports_one_trace_with_parent_links():
+    collector = _Collector()
+    tracer = Tracer(sample_ratio=1.0, exporter=collector)
+
+    with tracer.root_span("strategy.cycle", strategy="OptionBuyStrategy") as root:
+        await asyncio.gather(_fetch("NIFTY"), _fetch("BANKNIFTY"))
+        with pytest.raises(ValueError):
+            with span("broker.place_order", broker="fyers"):
+                raise ValueError("rejected")
+    assert current_span() is None
+
+    [spans] = collector.batches
+    by_name = {}
+    for s in spans:
+        by_name.setdefault(s.name, []).append(s)
+    assert spans[-1] is root and root.parent_id is None
+    assert {s.trace_id for s in spans} == {root.trace_id} and len(root.trace_id) == 32
+    assert [s.parent_id for s in by_name["data.get_history"]] == [root.span_id] * 2
+    fetch_ids = {s.span_id for s in by_name["data.get_history"]}
+    assert {s.parent_id for s in by_name["indicator.test"]} == fetch_ids
+    placed = by_name["broker.place_order"][0].to_json()
+    assert placed["status"] == {"code": "STATUS_CODE_ERROR", "message": "ValueError: rejected"}
+    assert placed["attributes"] == {"broker": "fyers"}
+
+
+async def test_nothing_is_recorded_when_sampling_is_off():
+    collector = _Collector()
+    tracer = Tracer(sample_ratio=0.0, exporter=collector)
+    with tracer.root_span("strategy.cycle") as root:
+        assert root is None
+        assert await _fetch("NIFTY") == 2
+        with span("db.session") as child:
+            assert child is None
+    assert collector.batches == [] and tracer.get_stats()["roots_started"] == 0
+
+    # An unsampled root inside a traced task does not join the outer trace
+    sampled = Tracer(sample_ratio=1.0, exporter=collector)
+    unsampled = Tracer(sample_ratio=1e-12, exporter=collector)
+    with sampled.root_span("strategy.cycle"):
+        with unsampled.root_span("order_monitor.tick"):
+            assert current_span() is None
+            await _fetch("NIFTY")
+    assert [s.name for s in collector.batches[0]] == ["strategy.cycle"]
+
+
+def test_log_lines_inside_a_trace_carry_its_id():
+    tracer = Tracer(sample_ratio=1.0, exporter=_Collector())
+    trace_filter = _TraceContextFilter()
+
+    outside = logging.LogRecord("strategy", logging.INFO, "runner.py", 1, "no trace", None, None)
+    trace_filter.filter(outside)
+    assert outside.msg == "no trace"
+
+    with tracer.root_span("strategy.cycle") as root:
+        record = logging.LogRecord("strategy", logging.INFO, "runner.py", 1, "order %s placed", (7,), None)
+        trace_filter.filter(record)
+        trace_filter.filter(record)  # a second handler does not stamp it twice
+    assert record.getMessage() == f"order 7 placed [trace_id={root.trace_id}]"
@@ -0,0 +1,50 @@
+"""
+Tests for the precomputed trading calendar: trade-day lookups across weekends and
+holidays (in both cached holiday formats), session boundaries and candle closes.
+"""
+
+from datetime import date, datetime
+
+import pytz
+
+from algosat.core.trading_calendar import TradingCalendar
+
+# Republic Day 2026 is a Monday; Holi is written the way the fallback list stores dates
+HOLIDAYS = ["26-Jan-2026", "2026-03-03"]
+
+
+def _calendar():
+    return TradingCalendar(HOLIDAYS, today=date(2026, 1, 27))
+
+
+def test_trade_day_skips_weekends_and_holidays():
+    calendar = _calendar()
+    assert calendar.trade_day(datetime(2026, 1, 26, 10, 0)) == date(2026, 1, 23)  # Monday holiday -> Friday
+    assert calendar.trade_day(date(2026, 1, 27)) == date(2026, 1, 27)
+    assert calendar.previous_trading_day(date(2026, 1, 27)) == date(2026, 1, 23)
+    assert calendar.next_trading_day(date(2026, 1, 23)) == date(2026, 1, 27)
+    assert not calendar.is_trading_day(date(2026, 3, 3))
+    assert calendar.sessions_back(date(2026, 1, 27), 2) == date(2026, 1, 22)
+    assert calendar.trading_days(date(2026, 1, 23), date(2026, 1, 28)) == [
+        date(2026, 1, 23), date(2026, 1, 27), date(2026, 1, 28)]
+
+
+def test_dates_outside_the_precomputed_years_extend_the_calendar():
+    calendar = _calendar()
+    assert calendar.trade_day(date(2035, 6, 3)) == date(2035, 6, 1)  # Sunday -> Friday
+    assert calendar.previous_trading_day(date(2015, 1, 5)) == date(2015, 1, 2)
+    assert calendar.get_stats()["first_year"] <= 2014
+
+
+def test_sessions_and_candle_closes():
+    calendar = _calendar()
+    assert calendar.session(date(2026, 1, 26)) is None
+    ist = pytz.timezone("Asia/Kolkata")
+    assert calendar.is_market_open(ist.localize(datetime(2026, 1, 27, 9, 15)))
+    assert not calendar.is_market_open(datetime(2026, 1, 27, 15, 30))
+
+    assert calendar.next_candle_close(datetime(2026, 1, 27, 9, 0), 5) == datetime(2026, 1, 27, 9, 20)
+    assert calendar.next_candle_close(datetime(2026, 1, 27, 9, 20), 5) == datetime(2026, 1, 27, 9, 25)
+    assert calendar.next_candle_close(datetime(2026, 1, 27, 15, 20), 60) == datetime(2026, 1, 27, 15, 30)
+    # After the close on Friday the next candle is the first of Tuesday (Monday is a holiday)
+    assert calendar.next_candle_close(datetime(2026, 1, 23, 15, 45), 15) == datetime(2026, 1, 27, 9, 30)
@@ -0,0 +1,45 @@
+"""
+Tests for the hot-path latency metrics: rate-limiter waits are observed per broker and lane,
+observe_latency records failed blocks too, and the trading process can serve a registry
+over HTTP.
+"""
+
+import socket
+import urllib.request
+
+import pytest
+
+from algosat.core.monitoring import TradingMetrics, observe_latency, start_metrics_server, trading_metrics
+from algosat.core.rate_limiter import BrokerRateLimiter, RateConfig
+
+
+def _count(metric, **labels):
+    return trading_metrics.registry.get_sample_value(f"{metric}_count", labels) or 0
+
+
+async def test_rate_limiter_wait_is_observed_per_broker():
+    limiter = BrokerRateLimiter("metrics_test_broker", RateConfig(rps=50, burst=1))
+    before = _count("algosat_rate_limiter_wait_seconds", broker="metrics_test_broker", lane="market_data")
+    for _ in range(3):
+        async with limiter.acquire():
+            pass
+    assert _count("algosat_rate_limiter_wait_seconds", broker="metrics_test_broker", lane="market_data") == before + 3
+
+
+def test_observe_latency_records_failed_blocks():
+    metrics = TradingMetrics()
+    with pytest.raises(RuntimeError):
+        with observe_latency(metrics.ltp_fetch_seconds, source="broker"):
+            raise RuntimeError("broker down")
+    assert metrics.registry.get_sample_value("algosat_ltp_fetch_seconds_count", {"source": "broker"}) == 1
+
+
+def test_metrics_server_serves_the_registry():
+    metrics = TradingMetrics()
+    metrics.order_ack_seconds.labels(broker="fyers", outcome="ok").observe(0.2)
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    assert start_metrics_server(port, metrics)
+    body = urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5).read().decode()
+    assert 'algosat_order_ack_seconds_count{broker="fyers",outcome="ok"} 1.0' in body
@@ -0,0 +1,69 @@
+"""
+Backfill the local candle store used by DataManager.get_history.
+
+Usage (from the project root):
+    python -m algosat.tools.backfill_candles --symbols NSE:NIFTY50-INDEX NSE:NIFTYBANK-INDEX --intervals 1 5 --days 10
+
+A year of history for backtests needs a matching retention, both here and in the trading
+process (CANDLE_STORE_RETENTION_DAYS), or the next live save prunes it again:
+    python -m algosat.tools.backfill_candles --symbols NSE:NIFTY50-INDEX --intervals 1 --days 365 --retention-days 365
+"""
+
+import argparse
+import asyncio
+import sys
+
+from algosat.common.logger import get_logger
+from algosat.config import settings
+from algosat.core.broker_manager import BrokerManager
+from algosat.core.candle_store import CandleStore, DEFAULT_CANDLE_STORE_PATH
+from algosat.core.data_manager import DataManager
+
+logger = get_logger("backfill_candles")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill the local candle store from the data provider broker.")
+    parser.add_argument("--symbols", nargs="+", required=True, help="Broker symbols, e.g. NSE:NIFTY50-INDEX")
+    parser.add_argument("--intervals", nargs="+", type=int, default=[1, 5], help="Candle intervals in minutes")
+    parser.add_argument("--days", type=int, default=10, help="Number of calendar days to backfill")
+    parser.add_argument("--chunk-days", type=int, default=20, help="Days fetched per broker request")
+    parser.add_argument("--broker", default=None, help="Broker to fetch from (defaults to the data provider)")
+    parser.add_argument("--path", default=DEFAULT_CANDLE_STORE_PATH, help="Candle store directory")
+    parser.add_argument("--retention-days", type=int, default=settings.candle_store_retention_days,
+                        help="Days of candles the store keeps (defaults to CANDLE_STORE_RETENTION_DAYS)")
+    args = parser.parse_args(argv)
+    if args.days > args.retention_days:
+        parser.error(f"--days cannot exceed the store retention of {args.retention_days} days (see --retention-days)")
+    return args
+
+
+async def main(argv=None):
+    args = parse_args(argv)
+    broker_manager = BrokerManager()
+    await broker_manager.setup()
+    data_manager = DataManager(
+        broker_manager=broker_manager,
+        broker_name=args.broker,
+        candle_store=CandleStore(path=args.path, retention_days=args.retention_days),
+    )
+    await data_manager.ensure_broker()
+
+    failures = 0
+    for symbol in args.symbols:
+        for interval in args.intervals:
+            try:
+                await data_manager.backfill_candles(symbol, interval, args.days, chunk_days=args.chunk_days)
+            except Exception as e:
+                failures += 1
+                logger.error(f"Backfill failed for {symbol} {interval}m: {e}", exc_info=True)
+    logger.info(f"Candle backfill finished: {data_manager.candle_store.get_stats()}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(asyncio.run(main()))
+    except KeyboardInterrupt:
+        logger.warning("Candle backfill interrupted. Exiting.")
+        sys.exit(1)
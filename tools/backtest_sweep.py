@@ -0,0 +1,98 @@
+"""
+Sweep strategy trade parameters over stored candles with the backtest engine.
+
+Usage (from the project root):
+    python -m algosat.tools.backtest_sweep \
+        --strategy algosat.strategies.swing_highlow_buy:SwingHighLowBuyStrategy \
+        --config swing_config.json --grid grid.json \
+        --symbols NSE:NIFTY50-INDEX --workers 8 \
+        --checkpoint sweep.jsonl --output sweep_ranked.csv
+
+--config is a JSON StrategyConfig (id, strategy_id, exchange, symbol, trade, indicators).
+--grid maps trade-config paths to value lists, e.g.
+    {"entry_minutes": [3, 5], "target.atr_multiplier": [2, 3, 4]}
+Rerunning with the same --checkpoint skips combinations that already finished.
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import sys
+
+import pandas as pd
+
+from algosat.common.logger import get_logger
+from algosat.core.backtest_manager import BacktestConfig
+from algosat.core.backtest_sweep import run_sweep
+from algosat.core.candle_store import CandleStore, DEFAULT_CANDLE_STORE_PATH
+from algosat.models.strategy_config import StrategyConfig
+
+logger = get_logger("backtest_sweep")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run a backtest parameter sweep across a process pool.")
+    parser.add_argument("--strategy", required=True, help="Strategy class as module:Class")
+    parser.add_argument("--config", required=True, help="StrategyConfig JSON file")
+    parser.add_argument("--grid", required=True, help="Parameter grid JSON file")
+    parser.add_argument("--symbols", nargs="+", required=True, help="Symbols to load (underlying first, then strikes)")
+    parser.add_argument("--path", default=DEFAULT_CANDLE_STORE_PATH, help="Candle store directory")
+    parser.add_argument("--start", default=None, help="First trading day, YYYY-MM-DD")
+    parser.add_argument("--end", default=None, help="Last trading day, YYYY-MM-DD")
+    parser.add_argument("--slippage", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--checkpoint", default=None, help="JSONL checkpoint to resume from and append to")
+    parser.add_argument("--output", default="backtest_sweep.csv", help="Ranked results CSV")
+    parser.add_argument("--rank-by", default="net_pnl", help="Statistic to rank combinations by")
+    parser.add_argument("--ascending", action="store_true", help="Rank lowest first (e.g. for max_drawdown)")
+    return parser.parse_args(argv)
+
+
+def load_strategy_class(path: str):
+    module_name, _, class_name = path.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+async def load_candles(symbols, path):
+    store = CandleStore(path=path, retention_days=None)
+    candles = {}
+    for symbol in symbols:
+        series = await store.load(symbol, 1)
+        if series is None:
+            raise ValueError(f"No stored 1-minute candles for {symbol} in {path}")
+        candles[symbol] = series.frame
+    return candles
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with open(args.config) as f:
+        config = StrategyConfig(**json.load(f))
+    with open(args.grid) as f:
+        grid = json.load(f)
+    candles = asyncio.run(load_candles(args.symbols, args.path))
+    settings = BacktestConfig(
+        start=pd.Timestamp(args.start) if args.start else None,
+        end=pd.Timestamp(args.end) + pd.Timedelta(days=1) if args.end else None,
+        slippage=args.slippage,
+    )
+    result = run_sweep(
+        load_strategy_class(args.strategy), config, candles, grid,
+        settings=settings, max_workers=args.workers, checkpoint_path=args.checkpoint,
+        output_path=args.output, rank_by=args.rank_by, ascending=args.ascending,
+    )
+    logger.info(f"Sweep finished in {result.elapsed_seconds}s, ranked results written to {args.output}")
+    if not result.ranking.empty:
+        logger.info(f"Top combinations:\n{result.ranking.head(10).to_string(index=False)}")
+    for pid, entry in sorted(result.workers.items()):
+        logger.info(f"Worker {pid}: {entry['combinations']} runs, {entry['bars']} bars, {entry['bars_per_second']} bars/s")
+    return 1 if any(record.get("error") for record in result.results) else 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        logger.warning("Backtest sweep interrupted; rerun with the same --checkpoint to resume.")
+        sys.exit(1)
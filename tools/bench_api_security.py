@@ -0,0 +1,98 @@
+"""
+Benchmark the per-request cost of SecurityManager's API rate limiting.
+
+Compares the previous SQLite implementation (a connection plus DELETE/SUM/INSERT OR REPLACE
+per rate-limit check, on the event loop) with the in-memory sliding window. The rate-limit
+check is the only SecurityManager database work the API middleware does per request; access
+logging is not on the request path and is not measured.
+
+Usage (from the project root):
+    python -m algosat.tools.bench_api_security --requests 5000 --ips 50 --endpoints 10
+"""
+
+import argparse
+import asyncio
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from algosat.core.security import SecurityManager
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark API rate limiting.")
+    parser.add_argument("--requests", type=int, default=5000, help="Simulated API requests per run")
+    parser.add_argument("--ips", type=int, default=50, help="Distinct client IPs")
+    parser.add_argument("--endpoints", type=int, default=10, help="Distinct endpoints")
+    return parser.parse_args(argv)
+
+
+def _sqlite_check_rate_limit(db_path, ip_address, endpoint, max_requests=100, window_seconds=60):
+    """The rate-limit check as it was implemented on the security database."""
+    conn = sqlite3.connect(str(db_path))
+    cursor = conn.cursor()
+    current_time = datetime.utcnow()
+    window_start = current_time - timedelta(seconds=window_seconds)
+    cursor.execute("DELETE FROM rate_limits WHERE window_start < ?", (window_start,))
+    cursor.execute("""
+        SELECT SUM(request_count) FROM rate_limits
+        WHERE ip_address = ? AND endpoint = ? AND window_start >= ?
+    """, (ip_address, endpoint, window_start))
+    result = cursor.fetchone()
+    if (result[0] or 0) >= max_requests:
+        conn.close()
+        return False
+    cursor.execute("""
+        INSERT OR REPLACE INTO rate_limits
+        (ip_address, endpoint, request_count, window_start)
+        VALUES (?, ?, COALESCE((
+            SELECT request_count FROM rate_limits
+            WHERE ip_address = ? AND endpoint = ? AND window_start >= ?
+        ), 0) + 1, ?)
+    """, (ip_address, endpoint, ip_address, endpoint, window_start, current_time))
+    conn.commit()
+    conn.close()
+    return True
+
+
+def _requests(args):
+    return [(f"10.0.{i % args.ips // 256}.{i % args.ips % 256}", f"/api/endpoint/{i % args.endpoints}")
+            for i in range(args.requests)]
+
+
+async def _bench_sqlite(manager, requests):
+    started = time.perf_counter()
+    for ip_address, endpoint in requests:
+        _sqlite_check_rate_limit(manager.security_db_path, ip_address, endpoint)
+    return time.perf_counter() - started
+
+
+async def _bench_memory(manager, requests):
+    started = time.perf_counter()
+    for ip_address, endpoint in requests:
+        await manager.check_rate_limit(ip_address, endpoint)
+    elapsed = time.perf_counter() - started
+    await manager.close()
+    return elapsed
+
+
+async def main(argv=None):
+    args = parse_args(argv)
+    requests = _requests(args)
+    results = {}
+    for name, bench in (("sqlite", _bench_sqlite), ("in-memory", _bench_memory)):
+        with tempfile.TemporaryDirectory() as data_dir:
+            manager = SecurityManager(master_key="benchmark", data_dir=data_dir)
+            results[name] = await bench(manager, requests)
+    print(f"{args.requests} requests, {args.ips} IPs, {args.endpoints} endpoints")
+    for name, elapsed in results.items():
+        print(f"  {name:>9}: {elapsed * 1000:9.1f} ms total, {elapsed / args.requests * 1e6:8.1f} us/request, "
+              f"{args.requests / elapsed:10.0f} requests/s")
+    print(f"  speedup: {results['sqlite'] / results['in-memory']:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
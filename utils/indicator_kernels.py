@@ -0,0 +1,113 @@
+"""
+indicator_kernels.py
+
+Array implementations of the indicators in indicators.py. Every function takes and returns
+NumPy arrays (no DataFrame columns are created), so callers can compute several indicators
+on the same OHLC arrays without copying or mutating frames. The DataFrame functions in
+indicators.py are thin wrappers around these and keep their original outputs.
+
+Smoothing uses pandas' EWM on a bare Series so the numbers match the previous
+implementation exactly; the supertrend band recurrence runs as a single pass over
+Python floats instead of per-row DataFrame .loc reads and writes.
+"""
+import numpy as np
+import pandas as pd
+
+
+def as_float_array(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """max(high - low, |high - prev close|, |low - prev close|); the first bar is high - low."""
+    high, low, close = as_float_array(high), as_float_array(low), as_float_array(close)
+    prev_close = np.empty_like(close)
+    prev_close[:1] = np.nan
+    prev_close[1:] = close[:-1]
+    ranges = np.vstack((high - low, np.abs(high - prev_close), np.abs(low - prev_close)))
+    # NaN-skipping max like DataFrame.max(axis=1); all-NaN rows stay NaN
+    all_nan = np.isnan(ranges).all(axis=0)
+    tr = np.where(all_nan, np.nan, np.nanmax(np.where(np.isnan(ranges), -np.inf, ranges), axis=0))
+    return tr
+
+
+def smooth(values, period: int, smoothing: str = "RMA") -> np.ndarray:
+    """RMA (Wilder, ewm com=period-1), SMA (rolling mean) or EMA (ewm span=period, adjust=False)."""
+    series = pd.Series(as_float_array(values), copy=False)
+    if smoothing == "RMA":
+        return series.ewm(com=period - 1, min_periods=period).mean().to_numpy()
+    if smoothing == "SMA":
+        return series.rolling(window=period).mean().to_numpy()
+    if smoothing == "EMA":
+        return series.ewm(span=period, adjust=False).mean().to_numpy()
+    raise ValueError(f"Unknown smoothing {smoothing!r}; use RMA, SMA or EMA")
+
+
+def atr(high, low, close, period: int = 14, smoothing: str = "RMA") -> np.ndarray:
+    return smooth(true_range(high, low, close), period, smoothing)
+
+
+def supertrend_bands(basic_ub: np.ndarray, basic_lb: np.ndarray, close: np.ndarray, period: int):
+    """
+    Final upper/lower band recurrence. Bars before `period` stay 0.0, matching the
+    original loop, which only started ratcheting the bands at index `period`.
+    """
+    n = len(close)
+    final_ub = [0.0] * n
+    final_lb = [0.0] * n
+    ub, lb, c = basic_ub.tolist(), basic_lb.tolist(), close.tolist()
+    for i in range(period, n):
+        prev_ub, prev_lb, prev_close = final_ub[i - 1], final_lb[i - 1], c[i - 1]
+        final_ub[i] = ub[i] if (ub[i] < prev_ub or prev_close > prev_ub) else prev_ub
+        final_lb[i] = lb[i] if (lb[i] > prev_lb or prev_close < prev_lb) else prev_lb
+    return np.array(final_ub), np.array(final_lb)
+
+
+def supertrend_line(final_ub: np.ndarray, final_lb: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
+    """Supertrend follows the upper band until close breaks above it, then the lower band, and back."""
+    n = len(close)
+    st = [0.0] * n
+    ub, lb, c = final_ub.tolist(), final_lb.tolist(), close.tolist()
+    for i in range(period, n):
+        on_ub, on_lb = st[i - 1] == ub[i - 1], st[i - 1] == lb[i - 1]
+        if on_ub and c[i] <= ub[i]:
+            st[i] = ub[i]
+        elif on_ub and c[i] > ub[i]:
+            st[i] = lb[i]
+        elif on_lb and c[i] >= lb[i]:
+            st[i] = lb[i]
+        elif on_lb and c[i] < lb[i]:
+            st[i] = ub[i]
+        else:
+            st[i] = 0.0
+    return np.array(st)
+
+
+def supertrend(high, low, close, period: int = 7, multiplier: float = 3):
+    """Returns (supertrend, atr) arrays; supertrend is 0.0 where it is not yet defined."""
+    high, low, close = as_float_array(high), as_float_array(low), as_float_array(close)
+    atr_values = atr(high, low, close, period)
+    mid = (high + low) / 2
+    final_ub, final_lb = supertrend_bands(mid + atr_values * multiplier, mid - atr_values * multiplier, close, period)
+    return supertrend_line(final_ub, final_lb, close, period), atr_values
+
+
+def supertrend_signal(st: np.ndarray, close) -> np.ndarray:
+    """'BUY' when close >= supertrend, 'SELL' below it, None while the supertrend is undefined."""
+    close = as_float_array(close)
+    signal = np.full(len(st), None, dtype=object)
+    defined = st > 0.0
+    signal[defined] = "SELL"
+    signal[defined & (close >= st)] = "BUY"
+    return signal
+
+
+def rsi(close, period: int = 14) -> np.ndarray:
+    """Wilder RSI; the first bar's missing change counts as no gain and no loss."""
+    change = np.diff(as_float_array(close), prepend=np.nan)
+    gain = np.where(change > 0, change, 0.0)
+    loss = np.where(change < 0, -change, 0.0)
+    avg_gain = smooth(gain, period, "RMA")
+    avg_loss = smooth(loss, period, "RMA")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - (100 / (1 + avg_gain / avg_loss))
@@ -11,6 +11,10 @@ Supported Indicators:
 - Average True Range (ATR): Measures market volatility by analyzing the range of price movements.
 - Moving Averages (SMA/EMA): Calculates the average price over a specific period to smooth out price data.
 
+The supertrend, ATR and RSI math lives in indicator_kernels.py as NumPy array functions; the
+functions here wrap them for DataFrames and return new frames instead of adding and dropping
+temporary columns on the caller's frame.
+
 Features:
 - Modular design for easy integration into trading systems.
 - Optimized performance for large datasets.
@@ -37,6 +41,8 @@ Notes:
 """
 import pandas as pd
 from algosat.common.logger import get_logger
+from algosat.utils import indicator_kernels as kernels
+from algosat.core.tracing import traced
 
 logger = get_logger("indicators")
 
@@ -48,16 +54,12 @@ pd.set_option('display.max_rows', 500)
 def true_range(data):
     """
         True Range
-    :param data: Pandas Dataframe :return:  with new Column 'TR,' which has the True Range
+    :param data: Pandas Dataframe :return:  copy of the frame with new Column 'TR,' which has the True Range
     """
-    data['h-l'] = data['high'] - data['low']
-    data['h-c'] = abs(data['high'] - data['close'].shift(1))
-    data['l-pc'] = abs(data['low'] - data['close'].shift(1))
-    data['TR'] = data.loc[:, ['h-l', 'h-c', 'l-pc']].max(axis=1)
-    data.drop(['h-l', 'h-c', 'l-pc'], inplace=True, axis=1)
-    return data
+    return data.assign(TR=kernels.true_range(data['high'], data['low'], data['close']))
 
 
+@traced("indicator.atr")
 def calculate_atr(data, period=14, drop_tr=True, smoothing="RMA"):
     """
             Average True Range
@@ -65,20 +67,21 @@ def calculate_atr(data, period=14, drop_tr=True, smoothing="RMA"):
     :param period: Period for which the ATR needs to be calculated
     :param drop_tr: Whether to drop the TR field
     :param smoothing: Smoothing type - Possible values: RMA, SMA, EMA
-    :return: Pandas Dataframe with new column atr_<period>_<smoothing>. Ex: atr_14_sma
+    :return: Copy of the DataFrame with new column 'atr' (and 'TR' when drop_tr is False)
     """
-    data = true_range(data)
-    if smoothing == "RMA":
-        data['atr'] = data['TR'].ewm(com=period - 1, min_periods=period).mean()
-    elif smoothing == "SMA":
-        data['atr'] = data['TR'].rolling(window=period).mean()
-    elif smoothing == "EMA":
-        data['atr'] = data['TR'].ewm(span=period, adjust=False).mean()
+    tr = kernels.true_range(data['high'], data['low'], data['close'])
+    data = data.copy()
     if drop_tr:
-        data.drop(['TR'], inplace=True, axis=1)
+        if 'TR' in data.columns:
+            data.drop(['TR'], inplace=True, axis=1)
+    else:
+        data['TR'] = tr
+    if smoothing in ("RMA", "SMA", "EMA"):
+        data['atr'] = kernels.smooth(tr, period, smoothing)
     return data
 
 
+@traced("indicator.supertrend")
 def calculate_supertrend(df, period=7, multiplier=3):
     """
     Calculate Supertrend Indicator.
@@ -86,7 +89,7 @@ def calculate_supertrend(df, period=7, multiplier=3):
     :param df: Pandas DataFrame containing OHLC data.
     :param period: Period for ATR calculation (default is 7).
     :param multiplier: Multiplier for ATR in Supertrend calculation (default is 3).
-    :return: Pandas DataFrame with Supertrend and Supertrend signal columns added.
+    :return: Pandas DataFrame with atr, Supertrend and Supertrend signal columns added.
     """
     try:
         # Ensure the DataFrame has enough data
@@ -95,74 +98,14 @@ def calculate_supertrend(df, period=7, multiplier=3):
             return df
         # Reset index to ensure sequential indexing
         df = df.reset_index(drop=True)
-
-        # Calculate True Range (TR)
-        df['h-l'] = df['high'] - df['low']
-        df['h-pc'] = abs(df['high'] - df['close'].shift(1))
-        df['l-pc'] = abs(df['low'] - df['close'].shift(1))
-        df['TR'] = df[['h-l', 'h-pc', 'l-pc']].max(axis=1)
-        df.drop(['h-l', 'h-pc', 'l-pc'], axis=1, inplace=True)
-
-        # Calculate ATR
-        df = calculate_atr(df, period, True)
-
-        # Calculate basic upper and lower bands
-        atr_col = 'atr'
-        df['basic_ub'] = ((df['high'] + df['low']) / 2) + (df[atr_col] * multiplier)
-        df['basic_lb'] = ((df['high'] + df['low']) / 2) - (df[atr_col] * multiplier)
-
-        # Initialize final upper and lower bands
-        df['final_ub'] = 0.0
-        df['final_lb'] = 0.0
-
-        # Calculate final upper and lower bands
-        for i in range(period, len(df)):
-            if i >= len(df):
-                logger.error(f"Row {i} out of bounds for DataFrame with length {len(df)}.")
-                continue
-
-            df.loc[i, 'final_ub'] = (
-                df.loc[i, 'basic_ub']
-                if df.loc[i, 'basic_ub'] < df.loc[i - 1, 'final_ub'] or
-                   df.loc[i - 1, 'close'] > df.loc[i - 1, 'final_ub']
-                else df.loc[i - 1, 'final_ub']
-            )
-            df.loc[i, 'final_lb'] = (
-                df.loc[i, 'basic_lb']
-                if df.loc[i, 'basic_lb'] > df.loc[i - 1, 'final_lb']
-                   or df.loc[i - 1, 'close'] < df.loc[i - 1, 'final_lb']
-                else df.loc[i - 1, 'final_lb']
-            )
-
-        # Calculate Supertrend
-        st_col = 'supertrend'
-        df[st_col] = 0.0
-        for i in range(period, len(df)):
-
-            if i >= len(df):
-                logger.error(f"Row {i} out of bounds for DataFrame with length {len(df)}.")
-                continue
-
-            df.loc[i, st_col] = (
-                df.loc[i, 'final_ub']
-                if (df.loc[i - 1, st_col] == df.loc[i - 1, 'final_ub'] and df.loc[i, 'close'] <= df.loc[i, 'final_ub'])
-                else df.loc[i, 'final_lb']
-                if (df.loc[i - 1, st_col] == df.loc[i - 1, 'final_ub'] and df.loc[i, 'close'] > df.loc[i, 'final_ub'])
-                else df.loc[i, 'final_lb']
-                if (df.loc[i - 1, st_col] == df.loc[i - 1, 'final_lb'] and df.loc[i, 'close'] >= df.loc[i, 'final_lb'])
-                else df.loc[i, 'final_ub']
-                if (df.loc[i - 1, st_col] == df.loc[i - 1, 'final_lb'] and df.loc[i, 'close'] < df.loc[i, 'final_lb'])
-                else 0.0
-            )
-
-        # Drop intermediate columns
-        df.drop(['basic_ub', 'basic_lb', 'final_ub', 'final_lb'], axis=1, inplace=True)
-
-        # Calculate Supertrend signal
-        df[f'{st_col}_signal'] = None  # Initialize the signal column
-        df.loc[df[st_col] > 0.0, f'{st_col}_signal'] = 'SELL'
-        df.loc[(df[st_col] > 0.0) & (df['close'] >= df[st_col]), f'{st_col}_signal'] = 'BUY'
-
+        if 'TR' in df.columns:
+            df.drop(['TR'], inplace=True, axis=1)
+
+        close = kernels.as_float_array(df['close'])
+        supertrend, atr = kernels.supertrend(df['high'], df['low'], close, period, multiplier)
+        df['atr'] = atr
+        df['supertrend'] = supertrend
+        df['supertrend_signal'] = kernels.supertrend_signal(supertrend, close)
         return df
 
     except Exception as e:
@@ -170,6 +113,7 @@ def calculate_supertrend(df, period=7, multiplier=3):
         return df
 
 
+@traced("indicator.vwap")
 def calculate_vwap(df_ma):
     """
     Volume Weighted Average Price (VWAP). Not applicable on Day's candle. Apply on minute candle only.
@@ -210,6 +154,7 @@ def calculate_vwap(df_ma):
     return df_ma
 
 
+@traced("indicator.sma")
 def calculate_sma(df, period=14, field='close'):
     """
         Simple Moving average
@@ -254,6 +199,7 @@ def average_true_range(data, period=14, drop_tr=True, smoothing="RMA"):
         return pd.DataFrame()
 
 
+@traced("indicator.atr_trial_stops")
 def calculate_atr_trial_stops(data, atr_multiplier=3, atr_period=21, high_low=False):
     """
             ATR Trailing Stops
@@ -298,6 +244,7 @@ def rsi(df, period=14):
     return df
 
 
+@traced("indicator.rsi")
 def calculate_rsi(data, period=14):
     """
     Calculate Relative Strength Index (RSI).
@@ -315,27 +262,7 @@ def calculate_rsi(data, period=14):
             
         # Make a copy to avoid modifying original data
         df = data.copy()
-        
-        # Calculate price changes
-        df['price_change'] = df['close'].diff()
-        
-        # Separate gains and losses
-        df['gain'] = df['price_change'].where(df['price_change'] > 0, 0)
-        df['loss'] = -df['price_change'].where(df['price_change'] < 0, 0)
-        
-        # Calculate average gain and loss using exponential moving average
-
-        df['avg_gain'] = df['gain'].ewm(com=period - 1, min_periods=period).mean()
-        df['avg_loss'] = df['loss'].ewm(com=period - 1, min_periods=period).mean()
-        
-        
-        # Calculate RSI
-        df['rs'] = df['avg_gain'] / df['avg_loss']
-        df['rsi'] = 100 - (100 / (1 + df['rs']))
-        
-        # Clean up intermediate columns
-        df = df.drop(['price_change', 'gain', 'loss', 'avg_gain', 'avg_loss', 'rs'], axis=1)
-        
+        df['rsi'] = kernels.rsi(df['close'], period)
         return df
     except Exception as err:
         logger.error(f"Error calculating RSI. Error: {err}")
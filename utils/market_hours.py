@@ -11,22 +11,20 @@ Indian Stock Market Hours (NSE/BSE):
 - Holidays: As per NSE/BSE calendar
 """
 
-from datetime import datetime, time
+from datetime import datetime
 import pytz
 from typing import Tuple, Dict, Any
 from algosat.core.time_utils import get_ist_datetime
+from algosat.core.trading_calendar import (
+    MARKET_CLOSE, MARKET_OPEN, POST_MARKET_END, PRE_MARKET_START, get_trading_calendar,
+)
 from algosat.common.logger import get_logger
 
 logger = get_logger("market_hours")
 
-# Indian Stock Market Hours (IST)
-MARKET_OPEN_TIME = time(9, 15)  # 9:15 AM
-MARKET_CLOSE_TIME = time(15, 30)  # 3:30 PM
-PRE_MARKET_START = time(9, 0)  # 9:00 AM
-POST_MARKET_END = time(16, 0)  # 4:00 PM
-
-# Weekend days (0=Monday, 6=Sunday)
-WEEKEND_DAYS = [5, 6]  # Saturday, Sunday
+# Indian Stock Market Hours (IST), defined once in the trading calendar
+MARKET_OPEN_TIME = MARKET_OPEN  # 9:15 AM
+MARKET_CLOSE_TIME = MARKET_CLOSE  # 3:30 PM
 
 def is_market_open() -> bool:
     """
@@ -37,10 +35,9 @@ def is_market_open() -> bool:
     """
     now_ist = get_ist_datetime()
     current_time = now_ist.time()
-    current_weekday = now_ist.weekday()
     
-    # Check if it's a weekend
-    if current_weekday in WEEKEND_DAYS:
+    # Check if it's a weekend or holiday
+    if not get_trading_calendar().is_trading_day(now_ist):
         return False
     
     # Check if current time is within market hours
@@ -58,10 +55,9 @@ def is_pre_market() -> bool:
     """
     now_ist = get_ist_datetime()
     current_time = now_ist.time()
-    current_weekday = now_ist.weekday()
     
-    # Check if it's a weekend
-    if current_weekday in WEEKEND_DAYS:
+    # Check if it's a weekend or holiday
+    if not get_trading_calendar().is_trading_day(now_ist):
         return False
     
     # Check if current time is within pre-market hours
@@ -79,10 +75,9 @@ def is_post_market() -> bool:
     """
     now_ist = get_ist_datetime()
     current_time = now_ist.time()
-    current_weekday = now_ist.weekday()
     
-    # Check if it's a weekend
-    if current_weekday in WEEKEND_DAYS:
+    # Check if it's a weekend or holiday
+    if not get_trading_calendar().is_trading_day(now_ist):
         return False
     
     # Check if current time is within post-market hours
@@ -93,19 +88,12 @@ def is_post_market() -> bool:
 
 def is_trading_day() -> bool:
     """
-    Check if today is a trading day (Monday to Friday, excluding holidays).
-    
-    Note: This doesn't check for market holidays. You may want to extend
-    this to include a holiday calendar check.
+    Check if today is a trading day (Monday to Friday, excluding NSE holidays).
     
     Returns:
         bool: True if it's a trading day, False otherwise
     """
-    now_ist = get_ist_datetime()
-    current_weekday = now_ist.weekday()
-    
-    # Monday=0, Sunday=6
-    return current_weekday not in WEEKEND_DAYS
+    return get_trading_calendar().is_trading_day(get_ist_datetime())
 
 def get_market_status() -> Dict[str, Any]:
     """
@@ -116,7 +104,6 @@ def get_market_status() -> Dict[str, Any]:
     """
     now_ist = get_ist_datetime()
     current_time = now_ist.time()
-    current_weekday = now_ist.weekday()
     
     market_open = is_market_open()
     pre_market = is_pre_market()
@@ -151,13 +138,7 @@ def get_market_status() -> Dict[str, Any]:
             next_open_time = pytz.timezone("Asia/Kolkata").localize(next_open_time)
         else:
             # Market opens next trading day
-            days_ahead = 1
-            if current_weekday == 4:  # Friday
-                days_ahead = 3  # Skip to Monday
-            elif current_weekday == 5:  # Saturday
-                days_ahead = 2  # Skip to Monday
-            
-            next_trading_date = now_ist.date().replace(day=now_ist.day + days_ahead)
+            next_trading_date = get_trading_calendar().next_trading_day(now_ist)
             next_open_time = datetime.combine(next_trading_date, MARKET_OPEN_TIME)
             next_open_time = pytz.timezone("Asia/Kolkata").localize(next_open_time)
         
@@ -205,13 +186,11 @@ def get_next_market_session_change() -> Tuple[datetime, str]:
     """
     now_ist = get_ist_datetime()
     current_time = now_ist.time()
-    current_weekday = now_ist.weekday()
     
-    # If it's weekend, next change is Monday pre-market
-    if current_weekday in WEEKEND_DAYS:
-        days_ahead = 7 - current_weekday  # Days until Monday
-        next_monday = now_ist.date().replace(day=now_ist.day + days_ahead)
-        next_change = datetime.combine(next_monday, PRE_MARKET_START)
+    # If it's a weekend or holiday, next change is the next trading day's pre-market
+    if not get_trading_calendar().is_trading_day(now_ist):
+        next_trading_date = get_trading_calendar().next_trading_day(now_ist)
+        next_change = datetime.combine(next_trading_date, PRE_MARKET_START)
         next_change = pytz.timezone("Asia/Kolkata").localize(next_change)
         return next_change, "PRE_MARKET"
     
@@ -237,13 +216,8 @@ def get_next_market_session_change() -> Tuple[datetime, str]:
         next_change = pytz.timezone("Asia/Kolkata").localize(next_change)
         return next_change, "CLOSED"
     else:
-        # After market hours, next change is tomorrow pre-market
-        if current_weekday == 4:  # Friday
-            days_ahead = 3  # Skip to Monday
-        else:
-            days_ahead = 1
-        
-        next_trading_date = now_ist.date().replace(day=now_ist.day + days_ahead)
+        # After market hours, next change is the next trading day's pre-market
+        next_trading_date = get_trading_calendar().next_trading_day(now_ist)
         next_change = datetime.combine(next_trading_date, PRE_MARKET_START)
         next_change = pytz.timezone("Asia/Kolkata").localize(next_change)
         return next_change, "PRE_MARKET"